@@ -1,7 +1,10 @@
+import asyncio
 import json
 import math
+import threading
 import time
 import datetime
+from collections import OrderedDict
 from datetime import timedelta
 from io import BytesIO
 from dateutil import parser
@@ -16,7 +19,7 @@ from Helpers.database import DB, BatchBaselineQueryError, get_current_guild_data
 from Helpers.functions import date_diff, isInCurrDay, expand_image, addLine, generate_rank_badge, cap_playtime_window
 from Helpers.variables import rank_map as RANK_STARS_MAP, discord_ranks, HOME_GUILD_IDS
 
-from Helpers.pagination import add_paginator_buttons
+from Helpers.pagination import LazyPaginator, add_paginator_buttons
 
 # Rank order for kick suitability sorting (lower index = lower rank = kicked first)
 KICK_RANK_ORDER = {
@@ -88,6 +91,193 @@ def _clip_chars(text: str, max_chars: int) -> str:
     return text[: max_chars - 3] + '...'
 
 
+def _snapshot_key(db: DB) -> tuple:
+    """(guildData snapshot time, latest activity snapshot date) in one round trip.
+
+    These are the only inputs to the member rows that change during the day:
+    the guildData cache lands every 3 minutes, player_activity once a night.
+    """
+    db.cursor.execute("""
+        SELECT
+            (SELECT data->>'time' FROM cache_entries WHERE cache_key = 'guildData'),
+            (SELECT MAX(snapshot_date) FROM player_activity)
+    """)
+    row = db.cursor.fetchone() or (None, None)
+    return row[0], row[1]
+
+
+def _build_rows(db: DB, days: int, now_dt: datetime.datetime) -> tuple:
+    """
+    Compute one unsorted row per current member. Returns (snapshot_time, rows).
+    """
+    playerdata = []
+    current = get_current_guild_data_with_db(db)
+    current_members = current.get('members', []) if isinstance(current, dict) else []
+
+    db.cursor.execute("SELECT uuid, rank FROM discord_links")
+    uuid_to_rank = {u: r for u, r in db.cursor.fetchall()}
+
+    joined_dates_by_uuid = {}
+    joined_dt_by_uuid = {}
+    for member in current_members:
+        raw_joined = member.get('joined')
+        try:
+            joined_dt = parser.isoparse(raw_joined) if raw_joined else None
+            if joined_dt and joined_dt.tzinfo:
+                joined_dt = joined_dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        except Exception:
+            joined_dt = None
+        uuid = (member.get('uuid') or '').lower()
+        joined_dt_by_uuid[uuid] = joined_dt
+        joined_dates_by_uuid[uuid] = joined_dt.date() if joined_dt else None
+
+    baseline_by_uuid = get_player_activity_baselines_for_members_with_db(
+        db,
+        'playtime',
+        days,
+        joined_dates_by_uuid,
+    )
+
+    for member in current_members:
+        if not isinstance(member, dict):
+            continue
+
+        uuid = member.get('uuid')
+        last_join_iso = member.get('lastJoin')
+        if not last_join_iso:
+            # TAq creation date
+            last_join_iso = "2020-03-22T11:11:17.810000Z"
+
+        try:
+            days_since = date_diff(parser.isoparse(last_join_iso))
+        except Exception:
+            days_since = 9999
+        days_since = max(0, days_since)
+
+        raw_playtime = member.get('playtime')
+        playtime_is_private = raw_playtime is None  # Detect if playtime is actually null/private
+        playtime = raw_playtime if raw_playtime is not None else 0
+        uuid = member.get('uuid', '').lower()
+
+        joined_dt = joined_dt_by_uuid.get(uuid)
+        if joined_dt:
+            member_for = max(0, (now_dt - joined_dt).days)
+        else:
+            member_for = 0
+
+        baseline_pt, _ = baseline_by_uuid.get(uuid, (0, True))
+
+        # Compute actual playtime delta, capped at the window's max (TAQ-49)
+        real_pt = cap_playtime_window(max(0, float(playtime) - float(baseline_pt)), days)
+
+        # New members (joined within 1 day) have no reliable baseline
+        if member_for < 2:
+            real_pt = 0
+
+        discord_rank = uuid_to_rank.get(uuid, member.get('rank', 'unknown'))
+
+        # Detect if lastJoin is private/unavailable
+        last_join_is_private = member.get('lastJoin') is None
+
+        WEEKLY_REQUIREMENT = 5.0
+        below_threshold = real_pt < WEEKLY_REQUIREMENT
+
+        playerdata.append({
+            'uuid': uuid,
+            'name': member.get('name', 'Unknown'),
+            'playtime': real_pt,
+            'last_join': days_since,
+            'last_join_is_private': last_join_is_private,
+            'member_for': member_for,
+            'below_threshold': below_threshold,
+            'game_rank': member.get('rank'),
+            'discord_rank': discord_rank,
+            'playtime_is_private': playtime_is_private,
+        })
+    snapshot_time = current.get('time') if isinstance(current, dict) else None
+    return (str(snapshot_time) if snapshot_time is not None else None), playerdata
+
+
+def _sort_rows(playerdata: list, order_by: str) -> list:
+    """
+    Return a new list of rows in the requested order.
+    """
+    if order_by == 'Playtime':
+        # Private profiles at bottom, then by playtime descending
+        return sorted(playerdata, key=lambda x: (x['playtime_is_private'], -x['playtime']))
+    if order_by == 'Kick Suitability':
+        # Tiered sort:
+        # 1. Members in guild <=7 days go to the very bottom
+        # 2. Below threshold (red) members first, above threshold (blue) after
+        # 3. Lower ranks first (Starfish before Manatee before ... before Narwhal)
+        # 4. Lower playtime first (less active = more kickable)
+        # 5. Longer inactive first (more inactive = more kickable)
+        # 6. Newer members first (shorter tenure = more kickable)
+        return sorted(playerdata, key=lambda x: (
+            x['member_for'] <= 7,                                           # True (1) = bottom
+            not x['below_threshold'],                                       # False (0) = red on top, True (1) = blue after
+            KICK_RANK_ORDER.get((x['discord_rank'] or '').lower(), 99),     # lower rank = lower number = first
+            x['playtime'],                                                   # lower playtime first
+            -x['last_join'],                                                 # longer inactive first (negate so higher days_since sorts first)
+            x['member_for'],                                                 # newer members first
+        ))
+    return sorted(playerdata, key=lambda x: x['last_join'], reverse=True)
+
+
+# Computed rows keyed by (snapshot time, activity date, today, days, order).
+# order None holds the unsorted rows, so a second sort order for the same
+# window skips the DB work too. Rows are shared with the paginator read-only.
+_ROWS_CACHE: OrderedDict = OrderedDict()
+_ROWS_CACHE_MAX = 32
+_ROWS_LOCK = threading.Lock()
+
+
+def _cache_get(key):
+    with _ROWS_LOCK:
+        rows = _ROWS_CACHE.get(key)
+        if rows is not None:
+            _ROWS_CACHE.move_to_end(key)
+        return rows
+
+
+def _cache_put(key, rows):
+    with _ROWS_LOCK:
+        _ROWS_CACHE[key] = rows
+        _ROWS_CACHE.move_to_end(key)
+        while len(_ROWS_CACHE) > _ROWS_CACHE_MAX:
+            _ROWS_CACHE.popitem(last=False)
+
+
+def _load_sorted_rows(order_by: str, days: int) -> list:
+    """
+    Blocking: the sorted member rows for /activity, from cache when the
+    snapshots they derive from have not moved. Run via asyncio.to_thread.
+    """
+    now_dt = datetime.datetime.utcnow()
+    today = now_dt.date()   # days-inactive and member-for roll over at midnight
+    db = DB()
+    db.connect()
+    try:
+        snapshot_time, activity_date = _snapshot_key(db)
+        key = (snapshot_time, activity_date, today, days)
+        rows = _cache_get(key + (order_by,))
+        if rows is not None:
+            return rows
+
+        base = _cache_get(key + (None,))
+        if base is None:
+            snapshot_time, base = _build_rows(db, days, now_dt)
+            # Key by the snapshot actually read, in case one landed in between.
+            key = (snapshot_time, activity_date, today, days)
+            _cache_put(key + (None,), base)
+    finally:
+        db.close()
+
+    rows = _sort_rows(base, order_by)
+    _cache_put(key + (order_by,), rows)
+    return rows
+
+
 class Activity(commands.Cog):
     """
     Cog for generating and sending an activity leaderboard as paginated images.
@@ -98,7 +288,7 @@ class Activity(commands.Cog):
 
     def _make_activity_pages(self, playerdata: list, order_by: str, days: int) -> pages.Paginator:
         """
-        Create image pages for the leaderboard.
+        Create image pages for the leaderboard, drawn as each is first viewed.
         """
         # Load background templates
         bg_templates = {
@@ -130,7 +320,6 @@ class Activity(commands.Cog):
             icon.thumbnail((16, 16))
         header_img = Image.open(title_map[order_by])
 
-        pages_list = []
         items_per_page = 15
         total_items = len(playerdata)
         total_pages = max(1, math.ceil(total_items / items_per_page))
@@ -146,7 +335,7 @@ class Activity(commands.Cog):
         INACT_OFFSET = 130
         MEMBER_OFFSET = 160
 
-        for page_idx in range(total_pages):
+        def render_page(page_idx: int) -> Page:
             canvas = Image.new('RGBA', (980, 0), (0, 0, 0, 0))
             draw = ImageDraw.Draw(canvas)
             draw.fontmode = '1'
@@ -240,9 +429,9 @@ class Activity(commands.Cog):
             final_img.save(buffer, format='PNG')
             buffer.seek(0)
             file = discord.File(buffer, filename=f"activity_{int(time.time())}_{page_idx}.png")
-            pages_list.append(Page(content='', files=[file]))
+            return Page(content='', files=[file])
 
-        paginator = pages.Paginator(pages=pages_list)
+        paginator = LazyPaginator(total_pages, render_page)
         add_paginator_buttons(paginator)
         return paginator
 
@@ -261,123 +450,11 @@ class Activity(commands.Cog):
         """
         await ctx.interaction.response.defer()
         try:
-            db = DB()
-            db.connect()
-
-            playerdata = []
-            now_dt = datetime.datetime.utcnow()
-
-            try:
-                current = get_current_guild_data_with_db(db)
-                current_members = current.get('members', []) if isinstance(current, dict) else []
-
-                db.cursor.execute("SELECT uuid, rank FROM discord_links")
-                uuid_to_rank = {u: r for u, r in db.cursor.fetchall()}
-
-                joined_dates_by_uuid = {}
-                joined_dt_by_uuid = {}
-                for member in current_members:
-                    raw_joined = member.get('joined')
-                    try:
-                        joined_dt = parser.isoparse(raw_joined) if raw_joined else None
-                        if joined_dt and joined_dt.tzinfo:
-                            joined_dt = joined_dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
-                    except Exception:
-                        joined_dt = None
-                    uuid = (member.get('uuid') or '').lower()
-                    joined_dt_by_uuid[uuid] = joined_dt
-                    joined_dates_by_uuid[uuid] = joined_dt.date() if joined_dt else None
-
-                baseline_by_uuid = get_player_activity_baselines_for_members_with_db(
-                    db,
-                    'playtime',
-                    days,
-                    joined_dates_by_uuid,
-                )
-
-                for member in current_members:
-                    if not isinstance(member, dict):
-                        continue
-
-                    uuid = member.get('uuid')
-                    last_join_iso = member.get('lastJoin')
-                    if not last_join_iso:
-                        # TAq creation date
-                        last_join_iso = "2020-03-22T11:11:17.810000Z"
-
-                    try:
-                        days_since = date_diff(parser.isoparse(last_join_iso))
-                    except Exception:
-                        days_since = 9999
-                    days_since = max(0, days_since)
-
-                    raw_playtime = member.get('playtime')
-                    playtime_is_private = raw_playtime is None  # Detect if playtime is actually null/private
-                    playtime = raw_playtime if raw_playtime is not None else 0
-                    uuid = member.get('uuid', '').lower()
-
-                    joined_dt = joined_dt_by_uuid.get(uuid)
-                    if joined_dt:
-                        member_for = max(0, (now_dt - joined_dt).days)
-                    else:
-                        member_for = 0
-
-                    baseline_pt, _ = baseline_by_uuid.get(uuid, (0, True))
-
-                    # Compute actual playtime delta, capped at the window's max (TAQ-49)
-                    real_pt = cap_playtime_window(max(0, float(playtime) - float(baseline_pt)), days)
-
-                    # New members (joined within 1 day) have no reliable baseline
-                    if member_for < 2:
-                        real_pt = 0
-
-                    discord_rank = uuid_to_rank.get(uuid, member.get('rank', 'unknown'))
-
-                    # Detect if lastJoin is private/unavailable
-                    last_join_is_private = member.get('lastJoin') is None
-
-                    WEEKLY_REQUIREMENT = 5.0
-                    below_threshold = real_pt < WEEKLY_REQUIREMENT
-
-                    playerdata.append({
-                        'uuid': uuid,
-                        'name': member.get('name', 'Unknown'),
-                        'playtime': real_pt,
-                        'last_join': days_since,
-                        'last_join_is_private': last_join_is_private,
-                        'member_for': member_for,
-                        'below_threshold': below_threshold,
-                        'game_rank': member.get('rank'),
-                        'discord_rank': discord_rank,
-                        'playtime_is_private': playtime_is_private,
-                    })
-            finally:
-                db.close()
+            playerdata = await asyncio.to_thread(_load_sorted_rows, order_by, days)
         except BatchBaselineQueryError:
             await ctx.followup.send("Activity data is temporarily unavailable. Please try again later.", ephemeral=True)
             return
 
-        if order_by == 'Playtime':
-            # Private profiles at bottom, then by playtime descending
-            playerdata.sort(key=lambda x: (x['playtime_is_private'], -x['playtime']))
-        elif order_by == 'Kick Suitability':
-            # Tiered sort:
-            # 1. Members in guild <=7 days go to the very bottom
-            # 2. Below threshold (red) members first, above threshold (blue) after
-            # 3. Lower ranks first (Starfish before Manatee before ... before Narwhal)
-            # 4. Lower playtime first (less active = more kickable)
-            # 5. Longer inactive first (more inactive = more kickable)
-            # 6. Newer members first (shorter tenure = more kickable)
-            playerdata.sort(key=lambda x: (
-                x['member_for'] <= 7,                                           # True (1) = bottom
-                not x['below_threshold'],                                       # False (0) = red on top, True (1) = blue after
-                KICK_RANK_ORDER.get((x['discord_rank'] or '').lower(), 99),     # lower rank = lower number = first
-                x['playtime'],                                                   # lower playtime first
-                -x['last_join'],                                                 # longer inactive first (negate so higher days_since sorts first)
-                x['member_for'],                                                 # newer members first
-            ))
-        else:
-            playerdata.sort(key=lambda x: x['last_join'], reverse=True)
         paginator = self._make_activity_pages(playerdata, order_by, days)
         await paginator.respond(ctx.interaction, ephemeral=False)
 
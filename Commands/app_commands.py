@@ -6,6 +6,7 @@ import discord
 from discord import SlashCommandGroup, ApplicationContext
 from discord.ext import commands
 
+from Helpers import http_client
 from Helpers.classes import BasicPlayerStats
 from Helpers.app_transcript import (
     post_transcript,
@@ -15,7 +16,7 @@ from Helpers.app_transcript import (
 )
 from Helpers.database import DB
 from Helpers.embed_updater import update_web_poll_embed
-from Helpers.functions import generate_applicant_info, getPlayerUUID, getPlayerDatav3
+from Helpers.functions import generate_applicant_info
 from Helpers.links import LinkConflictError, assert_row_linkable, assert_uuid_free
 from Helpers.openai_helper import parse_recruiter_source
 from Helpers.recruiting import record_pending_recruit, get_recruiter_stats, resolve_recruiter
@@ -195,11 +196,11 @@ class WebAppCommands(commands.Cog):
         current_guild_name = None
 
         if ign:
-            uuid_data = await asyncio.to_thread(getPlayerUUID, ign)
+            uuid_data = await http_client.get_player_uuid(ign)
             uuid = uuid_data[1] if uuid_data else None
 
             if uuid:
-                player_data = await asyncio.to_thread(getPlayerDatav3, uuid)
+                player_data = await http_client.get_player_data(uuid)
                 if isinstance(player_data, dict):
                     guild_info = player_data.get("guild")
                     if guild_info and isinstance(guild_info, dict):
@@ -333,7 +334,7 @@ class WebAppCommands(commands.Cog):
         link_id = applicant.id if applicant else int(app["discord_id"])
         uuid = None
         if ign:
-            uuid_data = await asyncio.to_thread(getPlayerUUID, ign)
+            uuid_data = await http_client.get_player_uuid(ign)
             uuid = uuid_data[1] if uuid_data else None
             if uuid:
                 try:
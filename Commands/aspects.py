@@ -10,7 +10,6 @@ import datetime
 from datetime import timezone, timedelta
 from math import ceil
 
-import aiohttp
 import discord
 from discord.ext import commands
 from discord.commands import SlashCommandGroup, Option
@@ -20,7 +19,7 @@ from Helpers.classes import Guild, DB
 from Helpers.functions import getNameFromUUID
 from Helpers.variables import EXEC_GUILD_IDS, IS_TEST_MODE
 from Helpers.logger import log, INFO, WARN, ERROR
-from Helpers import aspect_db
+from Helpers import aspect_db, http_client
 MAX_COLUMNS = 4
 ROWS_PER_COLUMN = 10
 CELL_WIDTH = 205
@@ -82,24 +81,23 @@ class AspectDistribution(commands.Cog):
         url = f"https://vzge.me/face/64/{uuid}"
         headers = {'User-Agent': os.getenv("visage_UA", "")}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as resp:
-                    if resp.status != 200:
-                        log(WARN, f"Visage returned status {resp.status} for UUID {uuid}", context="aspects")
-                        return None
-                    
-                    data = await resp.read()
-                    
-                    if data.startswith(b'<!DOCTYPE') or data.startswith(b'<html'):
-                        log(WARN, f"Visage returned HTML error page for UUID {uuid}", context="aspects")
-                        return None
-                    
-                    is_png = data[:8] == b'\x89PNG\r\n\x1a\n'
-                    is_jpeg = data[:3] == b'\xff\xd8\xff'
-                    
-                    if not (is_png or is_jpeg):
-                        log(WARN, f"Invalid image data received for UUID {uuid}", context="aspects")
-                        return None
+            resp = await http_client.get(url, headers=headers)
+            if resp.status != 200:
+                log(WARN, f"Visage returned status {resp.status} for UUID {uuid}", context="aspects")
+                return None
+
+            data = resp.content
+
+            if data.startswith(b'<!DOCTYPE') or data.startswith(b'<html'):
+                log(WARN, f"Visage returned HTML error page for UUID {uuid}", context="aspects")
+                return None
+
+            is_png = data[:8] == b'\x89PNG\r\n\x1a\n'
+            is_jpeg = data[:3] == b'\xff\xd8\xff'
+
+            if not (is_png or is_jpeg):
+                log(WARN, f"Invalid image data received for UUID {uuid}", context="aspects")
+                return None
 
             return data
         except Exception as e:
@@ -17,8 +17,10 @@ from PIL import Image, ImageDraw, ImageFont
 from Helpers.classes import Page, PlaceTemplate
 from Helpers.database import DB
 from Helpers.functions import addLine, generate_rank_badge
-from Helpers.pagination import add_paginator_buttons
+from Helpers.logger import log, WARN
+from Helpers.pagination import LazyPaginator, add_paginator_buttons
 from Helpers.variables import HOME_GUILD_IDS, discord_ranks, rank_map
+from Tasks.graid_event_stop import schedule_stop
 
 RAID_NAMES = [
     "Nest of the Grootslangs",
@@ -377,9 +379,22 @@ def build_reward_rows(
         player["reached_at"] = item.get("completed_at")
 
     rows = [p for p in players.values() if include_below_threshold or p["ranking_points"] >= min_points]
-    rows.sort(key=lambda p: (-p["ranking_points"], p["reached_at"], (p["display_name"] or "").casefold()))
-
+    # lower(), not casefold(): RANK_STANDINGS in Helpers/graid_log.py must agree.
+    rows.sort(key=lambda p: (-p["ranking_points"], p["reached_at"], (p["display_name"] or "").lower()))
     for index, row in enumerate(rows, 1):
+        row["placement"] = index
+    return _apply_rewards(rows, milestones, placement_bonuses, le_per_point)
+
+
+def _apply_rewards(
+    rows: list[dict],
+    milestones: list[tuple[int, int]],
+    placement_bonuses: dict[int, int],
+    le_per_point: int,
+) -> list[dict]:
+    """Add milestone/placement bonuses and the payout to ranked rows."""
+    for row in rows:
+        index = row["placement"]
         milestone_bonus = 0
         bonus_details: list[str] = []
         for threshold, bonus in milestones:
@@ -392,7 +407,6 @@ def build_reward_rows(
             bonus_details.append(f"+{placement_bonus} from {_ordinal(index)} place")
 
         reward_points = round(row["ranking_points"] + milestone_bonus + placement_bonus, 2)
-        row["placement"] = index
         row["milestone_bonus_points"] = milestone_bonus
         row["placement_bonus_points"] = placement_bonus
         row["bonus_details"] = bonus_details
@@ -457,10 +471,8 @@ def _create_event_leaderboard(event: dict, rows: list[dict]) -> pages.Paginator:
     body_h = rows_per_page * row_h
     height = header_h + body_h + footer_h
     total_pages = math.ceil(len(rows) / rows_per_page)
-    rank_counter = 1
-    book: list[Page] = []
 
-    for page_index in range(total_pages):
+    def render_page(page_index: int) -> Page:
         img = Image.new("RGBA", (width, height), color="#00000000")
         draw = ImageDraw.Draw(img)
         draw.fontmode = "1"
@@ -474,6 +486,7 @@ def _create_event_leaderboard(event: dict, rows: list[dict]) -> pages.Paginator:
 
         page_chunk = rows[page_index * rows_per_page:(page_index + 1) * rows_per_page]
         for row_idx, player in enumerate(page_chunk):
+            rank_counter = page_index * rows_per_page + row_idx + 1
             bg_color = [bg1, bg2, bg3][rank_counter - 1] if rank_counter <= 3 else bg_other
 
             left_pad = 15
@@ -507,7 +520,6 @@ def _create_event_leaderboard(event: dict, rows: list[dict]) -> pages.Paginator:
                 reward_str = f"{_format_points(event['min_points'] - player['ranking_points'])} pts to qualify"
                 addLine(f"&f{reward_str}", draw, small_font, 585, row_top + 12)
             img.paste(bg_color.divider, (570, y), bg_color.divider)
-            rank_counter += 1
 
         background = Image.new("RGBA", (img.width, img.height), color="#00000000")
         bg_img = Image.open("images/profile/leaderboard_bg.png")
@@ -519,37 +531,112 @@ def _create_event_leaderboard(event: dict, rows: list[dict]) -> pages.Paginator:
         buf.seek(0)
         t = int(time.time())
         leaderboard_img = discord.File(buf, filename=f"graid_event_leaderboard{t}_{page_index}.png")
-        book.append(Page(content="", files=[leaderboard_img]))
+        return Page(content="", files=[leaderboard_img])
 
-    paginator = pages.Paginator(pages=book)
+    paginator = LazyPaginator(total_pages, render_page)
     add_paginator_buttons(paginator)
     return paginator
 
 
-def _get_rank_map(cur, uuids: list[str]) -> dict[str, str]:
-    if not uuids:
-        return {}
-    cur.execute("SELECT uuid::text, rank FROM discord_links WHERE uuid = ANY(%s::uuid[])", (uuids,))
-    return {str(uuid): rank for uuid, rank in cur.fetchall()}
-
-
-def _load_reward_rows(cur, event: dict, *, include_below_threshold: bool = False) -> list[dict]:
+def _recompute_rows(cur, event: dict) -> list[dict]:
+    """Every player's standing from the full graid_logs join (the slow path)."""
     contributions = _load_event_contributions(cur, event["id"])
-    rows = build_reward_rows(
+    return build_reward_rows(
         contributions,
         event["raid_points"],
         event["milestones"],
         event["placement_bonuses"],
         event["min_points"],
         event["le_per_point"],
-        include_below_threshold=include_below_threshold,
+        include_below_threshold=True,
     )
-    ranks = _get_rank_map(cur, [row["uuid"] for row in rows])
-    for row in rows:
-        row["rank"] = ranks.get(row["uuid"])
+
+
+def _load_standings(cur, event_id: int) -> list[dict]:
+    """The event's graid_event_standings rows in placement order, O(players)."""
+    cur.execute(
+        """
+        SELECT s.uuid::text, s.points, s.reached_at, s.placement,
+               COALESCE(dl.ign, s.display_name, s.uuid::text), dl.discord_id, dl.rank
+        FROM graid_event_standings s
+        LEFT JOIN LATERAL (
+            SELECT ign, discord_id, rank FROM discord_links WHERE uuid = s.uuid LIMIT 1
+        ) dl ON TRUE
+        WHERE s.event_id = %s
+        ORDER BY s.placement ASC NULLS LAST, s.points DESC, s.reached_at ASC
+        """,
+        (event_id,),
+    )
+    return [
+        {
+            "uuid": str(uuid),
+            "display_name": display_name or str(uuid)[:8],
+            "discord_id": discord_id,
+            "rank": rank,
+            "ranking_points": round(float(points), 2),
+            "reached_at": reached_at,
+            "placement": placement,
+        }
+        for uuid, points, reached_at, placement, display_name, discord_id, rank in cur.fetchall()
+    ]
+
+
+def rebuild_standings(cur, event: dict) -> list[dict]:
+    """Replace the event's standings with the full recompute. Caller commits."""
+    rows = _recompute_rows(cur, event)
+    cur.execute("DELETE FROM graid_event_standings WHERE event_id = %s", (event["id"],))
+    if rows:
+        cur.execute(
+            """
+            INSERT INTO graid_event_standings (event_id, uuid, points, reached_at, display_name, placement)
+            SELECT %s, r.uuid, r.points, r.reached_at, r.display_name, r.placement
+            FROM unnest(%s::uuid[], %s::numeric[], %s::timestamptz[], %s::varchar[], %s::int[])
+                 AS r(uuid, points, reached_at, display_name, placement)
+            """,
+            (
+                event["id"],
+                [r["uuid"] for r in rows],
+                [r["ranking_points"] for r in rows],
+                [r["reached_at"] for r in rows],
+                [r["display_name"] for r in rows],
+                [r["placement"] for r in rows],
+            ),
+        )
     return rows
 
 
+def check_standings(cur, event: dict) -> list[str]:
+    """Differences between the stored standings and the full recompute."""
+    expected = {r["uuid"]: r for r in _recompute_rows(cur, event)}
+    stored = {r["uuid"]: r for r in _load_standings(cur, event["id"])}
+    problems = []
+    for uuid in sorted(expected.keys() | stored.keys()):
+        want, have = expected.get(uuid), stored.get(uuid)
+        name = (want or have)["display_name"]
+        if have is None:
+            problems.append(f"{name}: missing ({_format_points(want['ranking_points'])} points)")
+        elif want is None:
+            problems.append(f"{name}: not in the recompute ({_format_points(have['ranking_points'])} points)")
+        else:
+            for field in ("ranking_points", "reached_at", "placement"):
+                if want[field] != have[field]:
+                    problems.append(f"{name}: {field} {have[field]} != {want[field]}")
+    return problems
+
+
+def _load_reward_rows(cur, event: dict, *, include_below_threshold: bool = False) -> list[dict]:
+    rows = _load_standings(cur, event["id"])
+    if not rows:
+        # Events that predate the standings table (or have no points yet):
+        # fill it once from the logs so later reads take the fast path.
+        rebuild_standings(cur, event)
+        cur.connection.commit()
+        rows = _load_standings(cur, event["id"])
+    if not include_below_threshold:
+        rows = [row for row in rows if row["ranking_points"] >= event["min_points"]]
+    return _apply_rewards(rows, event["milestones"], event["placement_bonuses"], event["le_per_point"])
+
+
 class GraidEvent(commands.Cog):
     def __init__(self, client):
         self.client = client
@@ -640,6 +727,7 @@ class GraidEvent(commands.Cog):
                 )
 
             db.connection.commit()
+            await schedule_stop(event_id, end_ts)
 
             event = {
                 "title": title,
@@ -673,12 +761,19 @@ class GraidEvent(commands.Cog):
                 await ctx.respond("No active GRAID event.", ephemeral=True)
                 return
 
+            # Final payouts must match the logs exactly; repair any drift first.
+            problems = check_standings(cur, event)
+            if problems:
+                log(WARN, f"GRAID standings for event {event['id']} drifted ({len(problems)} rows); rebuilt before stop",
+                    context="graidevent")
+                rebuild_standings(cur, event)
             rows = _load_reward_rows(cur, event)
             cur.execute(
                 "UPDATE graid_events SET active = FALSE, end_ts = COALESCE(end_ts, NOW()), updated_at = NOW() WHERE id = %s",
                 (event["id"],),
             )
             db.connection.commit()
+            await schedule_stop(event["id"], None)
 
             lines = [
                 f"`{row['placement']:>2}.` **{discord.utils.escape_markdown(row['display_name'])}** - {_format_points(row['ranking_points'])} points"
@@ -807,14 +902,62 @@ class GraidEvent(commands.Cog):
 
             if reset_counters:
                 cur.execute("DELETE FROM graid_event_totals WHERE event_id = %s", (event["id"],))
+                cur.execute("DELETE FROM graid_event_standings WHERE event_id = %s", (event["id"],))
                 cur.execute("UPDATE graid_logs SET event_id = NULL WHERE event_id = %s", (event["id"],))
                 cur.execute("UPDATE graid_events SET start_ts = NOW(), end_ts = NULL WHERE id = %s", (event["id"],))
+            else:
+                rebuild_standings(cur, event)
             cur.execute("UPDATE graid_events SET active = TRUE, updated_at = NOW() WHERE id = %s", (event["id"],))
             db.connection.commit()
+            await schedule_stop(event["id"], None if reset_counters else event["end_ts"])
             await ctx.respond(f"Activated **{title}** (id={event['id']})", ephemeral=True)
         finally:
             db.close()
 
 
+    @graid_event.command(name="verify", description="ADMIN: Check live GRAID standings against a full recompute")
+    async def graid_verify(
+        self,
+        ctx: discord.ApplicationContext,
+        title: Option(str, "Pick an event (default: active)", autocomplete=_graid_title_autocomplete, required=False, default=None),
+        repair: Option(bool, "Rebuild the standings if they differ", required=False, default=True),
+    ):
+        if not await _require_manage_roles(ctx):
+            return
+        await ctx.defer(ephemeral=True)
+
+        def _verify():
+            db = _db()
+            try:
+                cur = db.cursor
+                event = _load_event_config(cur, title=title) if title else _load_event_config(cur, active_only=True)
+                if not event:
+                    return None, []
+                problems = check_standings(cur, event)
+                if problems and repair:
+                    rebuild_standings(cur, event)
+                    db.connection.commit()
+                return event, problems
+            finally:
+                db.close()
+
+        event, problems = await asyncio.to_thread(_verify)
+        if not event:
+            await ctx.followup.send("No matching GRAID event.", ephemeral=True)
+            return
+        if not problems:
+            await ctx.followup.send(f"Standings for **{event['title']}** match the logs.", ephemeral=True)
+            return
+
+        log(WARN, f"GRAID standings for event {event['id']} drifted: {'; '.join(problems[:5])}", context="graidevent")
+        shown = "\n".join(f"- {p}" for p in problems[:15])
+        more = f"\n...and {len(problems) - 15} more" if len(problems) > 15 else ""
+        action = "Rebuilt from the logs." if repair else "Not repaired."
+        await ctx.followup.send(
+            f"**{event['title']}**: {len(problems)} difference(s). {action}\n{shown}{more}",
+            ephemeral=True,
+        )
+
+
 def setup(client):
     client.add_cog(GraidEvent(client))
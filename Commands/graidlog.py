@@ -8,6 +8,7 @@ from discord import Option
 from discord.ext import commands
 
 from Helpers.database import DB, get_current_guild_data
+from Helpers.graid_log import record_raids
 from Helpers.variables import HOME_GUILD_IDS, RAID_LOG_CHANNEL_ID, NOTG_EMOJI, TCC_EMOJI, TNA_EMOJI, NOL_EMOJI, TWP_EMOJI
 
 RAID_NAMES = [
@@ -148,17 +149,6 @@ class GraidCommands(commands.Cog):
         try:
             cur = db.cursor
 
-            # Check for active event
-            cur.execute("SELECT id FROM graid_events WHERE active = TRUE LIMIT 1")
-            row = cur.fetchone()
-            event_id = row[0] if row else None
-
-            cur.execute(
-                "INSERT INTO graid_logs (event_id, raid_type) VALUES (%s, %s) RETURNING id",
-                (event_id, full_raid_name)
-            )
-            log_id = cur.fetchone()[0]
-
             # Identity comes from the live guild data the players were just
             # validated against — discord_links.ign can lag a rename, and a
             # missed uuid here silently costs the player event points and payout.
@@ -171,23 +161,12 @@ class GraidCommands(commands.Cog):
                     uuid_val = uuid_row[0] if uuid_row else None
                 uuids[ign] = uuid_val
 
-            for ign in players:
-                cur.execute(
-                    "INSERT INTO graid_log_participants (log_id, uuid, ign) VALUES (%s, %s, %s)",
-                    (log_id, uuids[ign], ign)
-                )
-
-            # Upsert totals if event is active
-            if event_id is not None:
-                for ign in players:
-                    if uuids[ign]:
-                        cur.execute("""
-                            INSERT INTO graid_event_totals (event_id, uuid, total)
-                            VALUES (%s, %s, 1)
-                            ON CONFLICT (event_id, uuid) DO UPDATE
-                              SET total = graid_event_totals.total + 1,
-                                  last_updated = NOW()
-                        """, (event_id, uuids[ign]))
+            # Same write path as detected raids, so the active event's totals
+            # and standings include this raid as soon as it commits.
+            record_raids(db, [{
+                "raid_type": full_raid_name,
+                "participants": [{"uuid": uuids[ign], "ign": ign} for ign in players],
+            }], uncollected=False)
 
             db.connection.commit()
         finally:
@@ -4,8 +4,8 @@ import discord
 from discord import SlashCommandGroup, ApplicationContext
 from discord.ext import commands
 
+from Helpers import http_client
 from Helpers.database import DB
-from Helpers.functions import getPlayerUUID
 from Helpers.variables import HOME_GUILD_IDS
 from Tasks.kick_list_tracker import (
     _add_to_kick_list_sync,
@@ -36,7 +36,7 @@ class KickList(commands.Cog):
     ):
         await ctx.interaction.response.defer(ephemeral=True)
 
-        result = await asyncio.to_thread(getPlayerUUID, ign)
+        result = await http_client.get_player_uuid(ign)
         if not result:
             await ctx.followup.send(f"Could not find player **{discord.utils.escape_markdown(ign)}**.", ephemeral=True)
             return
@@ -70,7 +70,7 @@ class KickList(commands.Cog):
 
         # Resolve the current name to a uuid so a renamed player can still be
         # removed — the stored ign is a snapshot from when they were added.
-        result = await asyncio.to_thread(getPlayerUUID, ign)
+        result = await http_client.get_player_uuid(ign)
         uuid = result[1] if result else None
         removed = await asyncio.to_thread(_remove_from_kick_list_sync, ign, uuid)
         if not removed:
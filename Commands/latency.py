@@ -0,0 +1,77 @@
+import io
+import time
+
+import discord
+from discord.ext import commands
+from discord import slash_command
+
+from Helpers import histograms
+from Helpers.variables import EXEC_GUILD_IDS
+
+
+def _format_table(series: dict) -> str:
+    """Fixed-width table of histogram summaries, slowest p99 first."""
+    width = max([len("series")] + [len(k) for k in series])
+    lines = [f"{'series':<{width}} {'n':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"]
+    for name, s in sorted(series.items(), key=lambda kv: -kv[1]["p99"]):
+        lines.append(
+            f"{name:<{width}} {s['n']:>7} {s['p50']:>8.1f} {s['p90']:>8.1f} "
+            f"{s['p99']:>8.1f} {s['max']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+class Latency(commands.Cog):
+    def __init__(self, client):
+        self.client = client
+
+    @slash_command(
+        description="ADMIN: Dump in-process latency histograms (ms)",
+        guild_ids=EXEC_GUILD_IDS,
+        default_member_permissions=discord.Permissions(administrator=True)
+    )
+    async def latency(
+        self,
+        ctx: discord.ApplicationContext,
+        window: discord.Option(
+            str, "Since process start, or the current (partial) minute",
+            choices=["since start", "current minute"], default="since start"
+        ),
+        prefix: discord.Option(
+            str, "Only series starting with this (e.g. command., task., db., http.)",
+            required=False, default=None
+        ),
+        reset: discord.Option(
+            bool, "Clear the histograms after dumping (e.g. to baseline a deploy)",
+            default=False
+        ),
+    ):
+        series = histograms.snapshot(lifetime=(window == "since start"))
+        if prefix:
+            series = {k: v for k, v in series.items() if k.startswith(prefix)}
+        if reset:
+            histograms.reset()
+
+        header = f"**Latency histograms** — {window}, uptime {histograms.uptime_s() / 3600:.1f}h"
+        if histograms.dropped_series():
+            header += f" ({histograms.dropped_series()} series dropped over the cap)"
+        if reset:
+            header += " — reset"
+        if not series:
+            await ctx.respond(f"{header}\nNo samples recorded.", ephemeral=True)
+            return
+
+        table = _format_table(series)
+        if len(table) + len(header) < 1900:
+            await ctx.respond(f"{header}\n```\n{table}\n```", ephemeral=True)
+        else:
+            file = discord.File(io.BytesIO(table.encode()), filename=f"latency_{int(time.time())}.txt")
+            await ctx.respond(header, file=file, ephemeral=True)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        pass
+
+
+def setup(client):
+    client.add_cog(Latency(client))
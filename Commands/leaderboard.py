@@ -17,7 +17,7 @@ from Helpers.functions import addLine, expand_image, generate_rank_badge, cap_pl
 from Helpers.logger import log, ERROR
 from Helpers.variables import rank_map, discord_ranks, HOME_GUILD_IDS
 
-from Helpers.pagination import add_paginator_buttons
+from Helpers.pagination import LazyPaginator, add_paginator_buttons
 
 # ============================
 # Core leaderboard generator
@@ -25,7 +25,8 @@ from Helpers.pagination import add_paginator_buttons
 
 def create_leaderboard(order_key: str, key_icon: str, header: str, days: int = 7) -> pages.Paginator:
     """
-    Build a paginator filled with leaderboard images for a given metric.
+    Build a paginator of leaderboard images for a given metric. No page is
+    drawn here; each renders off the event loop when first shown.
 
     Uses current guild data (live) minus baseline from player_activity database table.
 
@@ -219,9 +220,6 @@ def create_leaderboard(order_key: str, key_icon: str, header: str, days: int = 7
     # Sort by: private profiles last, then by contributed (descending)
     player_rows.sort(key=lambda x: (x['is_private'], -x['contributed']))
     total_pages = math.ceil(len(player_rows) / 10)
-    rank_counter = 1
-    widest = 0
-    book: List[Page] = []
 
     # Row geometry. The bar is centered in the canvas; the gutter on each side is sized
     # to fit the warning icon that overhangs the bar's right edge (16px icon + 6px gap
@@ -232,13 +230,19 @@ def create_leaderboard(order_key: str, key_icon: str, header: str, days: int = 7
     BAR_R = SIDE_PAD + BAR_W
     CANVAS_W = BAR_R + SIDE_PAD
 
-    for page_index in range(total_pages):
+    # The value column is aligned to the #1 value's width on every page.
+    measure = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+    measure.fontmode = '1'
+    _, _, widest, _ = measure.textbbox((0, 0), "{:,}".format(int(player_rows[0]['contributed'])), font=game_font)
+
+    def render_page(page_index: int) -> Page:
         img = Image.new('RGBA', (CANVAS_W, 0), color='#00000000')
         draw = ImageDraw.Draw(img)
         draw.fontmode = '1'
 
         page_chunk = player_rows[page_index * 10:(page_index + 1) * 10]
         for row_idx, player in enumerate(page_chunk):
+            rank_counter = page_index * 10 + row_idx + 1
             img, draw = expand_image(img, border=(0, 0, 0, 36), fill='#00000000')
 
             # Choose background color: red for private, ranked colors for top 3, blue for others
@@ -278,16 +282,12 @@ def create_leaderboard(order_key: str, key_icon: str, header: str, days: int = 7
             # Value text right aligned, 10px inside the bar to mirror the rank number
             value_str = "{:,}".format(int(player['contributed']))
             _, _, w, _ = draw.textbbox((0, 0), value_str, font=game_font)
-            if rank_counter == 1:
-                widest = w
             addLine(f'&f{value_str}', draw, game_font, BAR_R - 10 - w, row_idx * 36 + 9)
 
             # Icon & divider near value
             img.paste(icon, (BAR_R - 35 - widest, row_idx * 36 + 11), icon)
             img.paste(bg_color.divider, (BAR_R - 45 - widest, row_idx * 36 + 3), bg_color.divider)
 
-            rank_counter += 1
-
         # Footer (title + badge)
         img, draw = expand_image(img, border=(0, 120, 0, 20), fill='#00000000')
         title_img = Image.open(header)
@@ -307,9 +307,9 @@ def create_leaderboard(order_key: str, key_icon: str, header: str, days: int = 7
         buf.seek(0)
         t = int(time.time())
         leaderboard_img = discord.File(buf, filename=f"leaderboard{t}_{page_index}.png")
-        book.append(Page(content='', files=[leaderboard_img]))
+        return Page(content='', files=[leaderboard_img])
 
-    paginator = pages.Paginator(pages=book)
+    paginator = LazyPaginator(total_pages, render_page)
     add_paginator_buttons(paginator)
 
     return paginator
@@ -2,12 +2,18 @@ import discord
 from discord.ext import commands
 from discord.commands import slash_command, Option
 from Helpers.rate_limiter import external_rate_limit
+from Helpers import guild_colors
 from Helpers.functions import timed_get
+from Tasks import territory_tracker
 from PIL import Image, ImageDraw, ImageFont
+from collections import OrderedDict
 from datetime import datetime, timezone
 from io import BytesIO
 import asyncio
+import hashlib
 import json
+import threading
+import time
 from typing import Tuple, Optional
 
 
@@ -17,51 +23,44 @@ def coordToPixel(x: int, z: int) -> Tuple[int, int]:
     return x + 2562, z + 6634
 
 
-def mapCreator(guild_prefix: Optional[str] = None):
-    """Builds the territory map. If guild_prefix is provided, zooms to that guild's territories.
-    Returns (discord.File, None) on success — the image is sent bare, no embed wrapper.
-    On failure returns (None, discord.Embed) and only the error embed should be sent.
-    """
-    map_img = Image.open("images/map/fruma_map.png").convert("RGBA")
-    font = ImageFont.truetype("images/profile/minecraft_font.ttf", 40)
+# Output scale. The base map and trade routes are drawn at full resolution and
+# downscaled once per scale; territory overlays are then drawn straight at it.
+SCALE = 0.4
 
-    with open("data/territories_verbose.json", "r") as f:
-        local_territories = json.load(f)
+# A tracker snapshot older than this is ignored and /map fetches its own.
+SNAPSHOT_MAX_AGE_S = 60
+# A fallback fetch is reused for this long.
+TERRITORY_TTL_S = 30
 
-    # Build a map of guild prefix to color
-    try:
-        guilds_data = timed_get("https://athena.wynntils.com/cache/get/guildList", timeout=10).json()
-        color_map = {g["prefix"]: g.get("color", "#FFFFFF") for g in guilds_data if g.get("prefix")}
-    except Exception:
-        color_map = {}
+# Encoded PNGs kept for the current ownership version (full map + filters).
+MAX_PNGS = 32
 
-    # Fetch territory data
-    try:
-        territory_data = timed_get("https://api.wynncraft.com/v3/guild/list/territory", timeout=10).json()
-    except Exception:
-        territory_data = {}
+_lock = threading.Lock()
+_base_layers: dict = {}        # scale -> RGBA base map with trade routes
+_overlay = {"key": None, "img": None}   # full-map territory layer, current version
+_pngs: "OrderedDict[tuple, bytes]" = OrderedDict()   # (version, filter) -> PNG
+_fetched = {"territories": (0.0, {})}
+_font_cache: dict = {}
 
-    target_prefix = guild_prefix.strip().upper() if guild_prefix else None
 
-    # Early-out if the specified guild owns 0 territories
-    if target_prefix:
-        owns_any = any(
-            (info.get("guild", {}) or {}).get("prefix", "").upper() == target_prefix
-            for info in territory_data.values()
-        )
-        if not owns_any:
-            embed = discord.Embed(
-                title=f"No territories found for `{guild_prefix}`",
-                description="That guild currently owns 0 territories.",
-                color=discord.Color.red(),
-            )
-            return None, embed
-
-    overlay = Image.new("RGBA", map_img.size)
-    overlay_draw = ImageDraw.Draw(overlay)
+def _font(size: int):
+    font = _font_cache.get(size)
+    if font is None:
+        font = _font_cache[size] = ImageFont.truetype("images/profile/minecraft_font.ttf", size)
+    return font
+
+
+def _base_layer(scale: float) -> Image.Image:
+    """fruma_map.png plus trading routes, downscaled to `scale`. Built once."""
+    base = _base_layers.get(scale)
+    if base is not None:
+        return base
+
+    map_img = Image.open("images/map/fruma_map.png").convert("RGBA")
+    with open("data/territories_verbose.json", "r") as f:
+        local_territories = json.load(f)
     draw = ImageDraw.Draw(map_img)
 
-    # Draw trading routes
     for data in local_territories.values():
         routes = data.get("Trading Routes")
         if not routes:
@@ -86,23 +85,70 @@ def mapCreator(guild_prefix: Optional[str] = None):
             except KeyError:
                 continue
 
-    # Determine crop bounds if zooming
-    do_zoom = target_prefix is not None
-    bounds = [map_img.width, map_img.height, 0, 0] if do_zoom else None
-    rects_drawn = 0
+    base = map_img.resize((int(map_img.width * scale), int(map_img.height * scale)), Image.LANCZOS)
+    _base_layers[scale] = base
+    return base
+
+
+def _territories() -> dict:
+    """Latest territory list: the tracker's snapshot, else a short-lived fetch."""
+    snap = territory_tracker.latest_snapshot
+    if snap.get("data") and time.time() - snap.get("at", 0) < SNAPSHOT_MAX_AGE_S:
+        return snap["data"]
+    at, data = _fetched["territories"]
+    if data and time.time() - at < TERRITORY_TTL_S:
+        return data
+    try:
+        data = timed_get("https://api.wynncraft.com/v3/guild/list/territory", timeout=10).json()
+    except Exception:
+        data = {}
+    if data:
+        _fetched["territories"] = (time.time(), data)
+    return data
+
 
-    # Draw territories
-    for info in territory_data.values():
+def _owned_rects(territory_data: dict) -> list:
+    """(prefix, start, end) for every owned territory, sorted for a stable key."""
+    rects = []
+    for name, info in territory_data.items():
         try:
             (startX, startZ), (endX, endZ) = info["location"]["start"], info["location"]["end"]
             prefix = info["guild"]["prefix"]
-        except (KeyError, TypeError):
+        except (KeyError, TypeError, ValueError):
             continue
+        rects.append((name, prefix, startX, startZ, endX, endZ))
+    rects.sort()
+    return rects
+
+
+def _ownership_version(rects: list, color_map: dict) -> str:
+    """Changes whenever any territory changes hands or a drawn colour changes."""
+    h = hashlib.blake2b(digest_size=12)
+    for name, prefix, *_ in rects:
+        h.update(f"{name}\0{prefix}\0{color_map.get(prefix.upper(), '')}\n".encode())
+    return h.hexdigest()
+
 
-        if target_prefix and prefix.upper() != target_prefix:
+def _draw_overlay(size, rects, color_map, scale, only_prefix=None):
+    """Transparent layer with territory fills, outlines and tags at `scale`.
+
+    Returns (layer, bounds) where bounds is [x0, y0, x1, y1] of drawn rects
+    or None if nothing was drawn.
+    """
+    lines = Image.new("RGBA", size)
+    fills = Image.new("RGBA", size)
+    line_draw = ImageDraw.Draw(lines)
+    fill_draw = ImageDraw.Draw(fills)
+    font = _font(max(1, round(40 * scale)))
+    width = max(1, round(8 * scale))
+    shadow = max(1, round(2 * scale))
+    bounds = None
+
+    for _name, prefix, startX, startZ, endX, endZ in rects:
+        if only_prefix and prefix.upper() != only_prefix:
             continue
 
-        color_hex = color_map.get(prefix, "#FFFFFF")
+        color_hex = color_map.get(prefix.upper(), "#FFFFFF")
         try:
             color_rgb = tuple(int(color_hex[i : i + 2], 16) for i in (1, 3, 5))
         except Exception:
@@ -110,17 +156,16 @@ def mapCreator(guild_prefix: Optional[str] = None):
 
         x1, y1 = coordToPixel(startX, startZ)
         x2, y2 = coordToPixel(endX, endZ)
-        xMin, xMax = sorted([x1, x2])
-        yMin, yMax = sorted([y1, y2])
+        xMin, xMax = (int(v * scale) for v in sorted([x1, x2]))
+        yMin, yMax = (int(v * scale) for v in sorted([y1, y2]))
 
-        if bounds:
-            bounds[0] = min(bounds[0], xMin)
-            bounds[1] = min(bounds[1], yMin)
-            bounds[2] = max(bounds[2], xMax)
-            bounds[3] = max(bounds[3], yMax)
+        if bounds is None:
+            bounds = [xMin, yMin, xMax, yMax]
+        else:
+            bounds = [min(bounds[0], xMin), min(bounds[1], yMin), max(bounds[2], xMax), max(bounds[3], yMax)]
 
-        overlay_draw.rectangle([xMin, yMin, xMax, yMax], fill=(*color_rgb, 64))
-        draw.rectangle([xMin, yMin, xMax, yMax], outline=color_rgb, width=8)
+        fill_draw.rectangle([xMin, yMin, xMax, yMax], fill=(*color_rgb, 64))
+        line_draw.rectangle([xMin, yMin, xMax, yMax], outline=color_rgb, width=width)
 
         if prefix:
             try:
@@ -128,42 +173,89 @@ def mapCreator(guild_prefix: Optional[str] = None):
                 w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
                 tx, ty = (xMin + xMax) // 2 - w // 2, (yMin + yMax) // 2 - h // 2
                 # outline text
-                for dx in (-2, 0, 2):
-                    for dy in (-2, 0, 2):
+                for dx in (-shadow, 0, shadow):
+                    for dy in (-shadow, 0, shadow):
                         if dx or dy:
-                            draw.text((tx + dx, ty + dy), prefix, font=font, fill="black")
-                draw.text((tx, ty), prefix, font=font, fill=color_rgb)
-            except Exception as e:
+                            line_draw.text((tx + dx, ty + dy), prefix, font=font, fill="black")
+                line_draw.text((tx, ty), prefix, font=font, fill=color_rgb)
+            except Exception:
                 pass
 
-        rects_drawn += 1
-
-    # Composite overlay
-    mapImg = Image.alpha_composite(map_img, overlay)
+    # Fills go over outlines and tags, as when everything was drawn on the map.
+    return Image.alpha_composite(lines, fills), bounds
 
-    # Crop if zoomed and at least one rect was drawn
-    if do_zoom and rects_drawn:
-        pad = 100
-        x0 = max(bounds[0] - pad, 0)
-        y0 = max(bounds[1] - pad, 0)
-        x1 = min(bounds[2] + pad, mapImg.width)
-        y1 = min(bounds[3] + pad, mapImg.height)
 
+def _encode(img: Image.Image) -> bytes:
+    buf = BytesIO()
+    img.save(buf, format="PNG", optimize=True, compress_level=5)
+    return buf.getvalue()
+
+
+def _render_png(version, rects, color_map, target_prefix) -> bytes:
+    """Composite base + overlay for one (version, filter) and encode it."""
+    base = _base_layer(SCALE)
+
+    if target_prefix is None:
+        if _overlay["key"] != version:
+            _overlay["img"], _ = _draw_overlay(base.size, rects, color_map, SCALE)
+            _overlay["key"] = version
+        return _encode(Image.alpha_composite(base, _overlay["img"]))
+
+    layer, bounds = _draw_overlay(base.size, rects, color_map, SCALE, only_prefix=target_prefix)
+    box = (0, 0, base.width, base.height)
+    if bounds:
+        pad = int(100 * SCALE)
+        x0, y0 = max(bounds[0] - pad, 0), max(bounds[1] - pad, 0)
+        x1, y1 = min(bounds[2] + pad, base.width), min(bounds[3] + pad, base.height)
         # Guard against invalid crop box
         if x1 > x0 and y1 > y0:
-            mapImg = mapImg.crop((x0, y0, x1, y1))
+            box = (x0, y0, x1, y1)
+    return _encode(Image.alpha_composite(base.crop(box), layer.crop(box)))
 
-    # Resize
-    sf = 0.4
-    mapImg = mapImg.resize((int(mapImg.width * sf), int(mapImg.height * sf)), Image.LANCZOS)
 
-    # Prepare file
-    buf = BytesIO()
-    mapImg.save(buf, format="PNG", optimize=True, compress_level=5)
-    buf.seek(0)
-    file = discord.File(buf, filename="wynn_map.png")
+def mapCreator(guild_prefix: Optional[str] = None):
+    """Builds the territory map. If guild_prefix is provided, zooms to that guild's territories.
+    Returns (discord.File, None) on success — the image is sent bare, no embed wrapper.
+    On failure returns (None, discord.Embed) and only the error embed should be sent.
+
+    The base map is baked once, the territory overlay once per ownership
+    version, and the PNG once per (version, guild filter); while ownership is
+    unchanged a call is a dictionary lookup.
+    """
+    rects = _owned_rects(_territories())
+    color_map = guild_colors.lookup(prefix for _, prefix, *_ in rects)
+    target_prefix = guild_prefix.strip().upper() if guild_prefix else None
+
+    # Early-out if the specified guild owns 0 territories
+    if target_prefix and not any(prefix.upper() == target_prefix for _, prefix, *_ in rects):
+        embed = discord.Embed(
+            title=f"No territories found for `{guild_prefix}`",
+            description="That guild currently owns 0 territories.",
+            color=discord.Color.red(),
+        )
+        return None, embed
+
+    version = _ownership_version(rects, color_map)
+    key = (version, target_prefix)
+    png = _pngs.get(key)
+    if png is None:
+        with _lock:
+            png = _pngs.get(key)
+            if png is None:
+                png = _render_png(version, rects, color_map, target_prefix)
+                # Older versions are never served again.
+                for stale in [k for k in _pngs if k[0] != version]:
+                    del _pngs[stale]
+                _pngs[key] = png
+                while len(_pngs) > MAX_PNGS:
+                    _pngs.popitem(last=False)
+    else:
+        try:
+            _pngs.move_to_end(key)
+        except KeyError:
+            pass
 
-    return file, None
+    return discord.File(BytesIO(png), filename="wynn_map.png"), None
 
 
 class Map(commands.Cog):
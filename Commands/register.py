@@ -4,8 +4,8 @@ import discord
 from discord import ApplicationContext, Option, SlashCommandGroup
 from discord.ext import commands
 
+from Helpers import http_client
 from Helpers.database import DB
-from Helpers.functions import getPlayerUUID
 from Helpers.links import LinkConflictError, assert_uuid_free
 from Helpers.variables import HOME_GUILD_IDS
 
@@ -57,7 +57,7 @@ class Register(commands.Cog):
             )
             return
 
-        player_data = await asyncio.to_thread(getPlayerUUID, ign)
+        player_data = await http_client.get_player_uuid(ign)
         if not player_data:
             await ctx.followup.send(
                 f'Could not find a Minecraft account for `{ign}`.',
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import time
 import aiohttp
@@ -7,7 +8,7 @@ from discord.commands import slash_command
 from io import BytesIO
 from PIL import Image
 
-from Helpers.shell_exchange_generator import generate_images
+from Helpers.shell_exchange_generator import generate_images, panel_png
 from Helpers.database import (
     get_shell_exchange_config,
     save_shell_exchange_config,
@@ -16,6 +17,7 @@ from Helpers.database import (
     get_shell_exchange_mats,
     save_shell_exchange_mats,
 )
+from Helpers import http_client
 from Helpers.storage import delete_shell_exchange_icon
 from Helpers.variables import (
     HOME_GUILD_IDS,
@@ -130,49 +132,44 @@ class ShellExchange(commands.Cog):
         return "\n".join(lines)
 
     async def _update_legacy_message(self, embed, files):
-        async with aiohttp.ClientSession() as session:
-            url = f"{LEGACY_WEBHOOK_URL}/messages/{LEGACY_MESSAGE_ID}"
-            async with session.get(url) as resp:
-                resp.raise_for_status()
-                legacy_msg = await resp.json()
-
-            components = legacy_msg.get("components", [])
-            allow_content_embeds = True
-            if legacy_msg.get("flags") and components:
-                allow_content_embeds = False
-
-            if files:
-                form = aiohttp.FormData()
-                attachments = [{"id": i, "filename": f.filename} for i, f in enumerate(files)]
-                payload = {
-                    "components": components,
-                    "attachments": attachments,
-                }
-                if allow_content_embeds:
-                    payload["embeds"] = [embed.to_dict()]
-                form.add_field("payload_json", json.dumps(payload), content_type="application/json")
-                for i, f in enumerate(files):
-                    f.fp.seek(0)
-                    form.add_field(
-                        f"files[{i}]",
-                        f.fp,
-                        filename=f.filename,
-                        content_type="application/octet-stream",
-                    )
-                async with session.patch(url, data=form) as resp:
-                    if resp.status >= 400:
-                        detail = await resp.text()
-                        raise RuntimeError(f"Legacy webhook update failed ({resp.status}): {detail}")
-            else:
-                payload = {
-                    "components": components,
-                }
-                if allow_content_embeds:
-                    payload["embeds"] = [embed.to_dict()]
-                async with session.patch(url, json=payload) as resp:
-                    if resp.status >= 400:
-                        detail = await resp.text()
-                        raise RuntimeError(f"Legacy webhook update failed ({resp.status}): {detail}")
+        url = f"{LEGACY_WEBHOOK_URL}/messages/{LEGACY_MESSAGE_ID}"
+        resp = await http_client.get(url)
+        resp.raise_for_status()
+        legacy_msg = resp.json()
+
+        components = legacy_msg.get("components", [])
+        allow_content_embeds = True
+        if legacy_msg.get("flags") and components:
+            allow_content_embeds = False
+
+        if files:
+            form = aiohttp.FormData()
+            attachments = [{"id": i, "filename": f.filename} for i, f in enumerate(files)]
+            payload = {
+                "components": components,
+                "attachments": attachments,
+            }
+            if allow_content_embeds:
+                payload["embeds"] = [embed.to_dict()]
+            form.add_field("payload_json", json.dumps(payload), content_type="application/json")
+            for i, f in enumerate(files):
+                f.fp.seek(0)
+                form.add_field(
+                    f"files[{i}]",
+                    f.fp,
+                    filename=f.filename,
+                    content_type="application/octet-stream",
+                )
+            resp = await http_client.request("PATCH", url, data=form)
+        else:
+            payload = {
+                "components": components,
+            }
+            if allow_content_embeds:
+                payload["embeds"] = [embed.to_dict()]
+            resp = await http_client.request("PATCH", url, json=payload)
+        if resp.status >= 400:
+            raise RuntimeError(f"Legacy webhook update failed ({resp.status}): {resp.text}")
 
     async def _post_rates_update(self, config):
         old_rates = config.get("rates_snapshot")
@@ -297,6 +294,26 @@ class ShellExchange(commands.Cog):
             self.save_config(config)
             await ctx.respond(f"Material columns set to {cols}", ephemeral=True)
 
+    async def _post_panel(self, channel, config, prefix, file, digest):
+        """Send or update one panel message.
+
+        The attachment is only re-uploaded when the PNG differs from the one
+        last posted; an unchanged panel costs one fetch to confirm it exists.
+        """
+        msg_id = config.get(f"{prefix}_message_id")
+        if msg_id:
+            try:
+                msg = await channel.fetch_message(msg_id)
+                if config.get(f"{prefix}_panel_sha256") != digest:
+                    await msg.edit(attachments=[], files=[file])
+                config[f"{prefix}_panel_sha256"] = digest
+                return
+            except Exception:
+                pass
+        msg = await channel.send(file=file)
+        config[f"{prefix}_message_id"] = msg.id
+        config[f"{prefix}_panel_sha256"] = digest
+
     @shell_exchange_group.command(name="generate", description='Generate and post/update shell exchange')
     async def shell_exchange_generate(self, ctx: discord.ApplicationContext):
         await ctx.defer(ephemeral=True)
@@ -315,7 +332,7 @@ class ShellExchange(commands.Cog):
         output_mode = config.get("output_mode", "both")
         ings_data = self.load_ings_config()
         mats_data = self.load_mats_config()
-        images = generate_images(output_mode, config, ings_data=ings_data, mats_data=mats_data)
+        images = await asyncio.to_thread(generate_images, output_mode, config, ings_data=ings_data, mats_data=mats_data)
 
         if not images:
             await ctx.followup.send("No images generated.", ephemeral=True)
@@ -328,20 +345,17 @@ class ShellExchange(commands.Cog):
 
         ings_file = None
         mats_file = None
+        ings_hash = mats_hash = None
 
         ings_img = images.get("ingredients")
         if ings_img:
-            buffer = BytesIO()
-            ings_img.save(buffer, format="PNG")
-            buffer.seek(0)
-            ings_file = discord.File(buffer, "ingredient_shell_panel.png")
+            data, ings_hash = await asyncio.to_thread(panel_png, ings_img)
+            ings_file = discord.File(BytesIO(data), "ingredient_shell_panel.png")
 
         mats_img = images.get("materials")
         if mats_img:
-            buffer = BytesIO()
-            mats_img.save(buffer, format="PNG")
-            buffer.seek(0)
-            mats_file = discord.File(buffer, "materials_shell_panel.png")
+            data, mats_hash = await asyncio.to_thread(panel_png, mats_img)
+            mats_file = discord.File(BytesIO(data), "materials_shell_panel.png")
 
         # Send or update text message
         if legacy_mode:
@@ -367,33 +381,10 @@ class ShellExchange(commands.Cog):
                 config["text_message_id"] = text_msg.id
                 updated = False
 
-            # Send or update ingredients panel
             if ings_file is not None:
-                ings_msg_id = config.get("ings_message_id")
-                if ings_msg_id:
-                    try:
-                        ings_msg = await channel.fetch_message(ings_msg_id)
-                        await ings_msg.edit(attachments=[], files=[ings_file])
-                    except Exception as e:
-                        ings_msg = await channel.send(file=ings_file)
-                        config["ings_message_id"] = ings_msg.id
-                else:
-                    ings_msg = await channel.send(file=ings_file)
-                    config["ings_message_id"] = ings_msg.id
-
-            # Send or update materials panel
+                await self._post_panel(channel, config, "ings", ings_file, ings_hash)
             if mats_file is not None:
-                mats_msg_id = config.get("mats_message_id")
-                if mats_msg_id:
-                    try:
-                        mats_msg = await channel.fetch_message(mats_msg_id)
-                        await mats_msg.edit(attachments=[], files=[mats_file])
-                    except Exception as e:
-                        mats_msg = await channel.send(file=mats_file)
-                        config["mats_message_id"] = mats_msg.id
-                else:
-                    mats_msg = await channel.send(file=mats_file)
-                    config["mats_message_id"] = mats_msg.id
+                await self._post_panel(channel, config, "mats", mats_file, mats_hash)
 
         await self._post_rates_update(config)
         self.save_config(config)
@@ -12,10 +12,12 @@ from discord.ext import commands, pages
 from discord.commands import SlashCommandGroup, slash_command
 from PIL import Image, ImageDraw, ImageFont
 
-from Helpers.classes import Guild, Page, PlayerStats
+from Helpers import guild_colors, http_client
+from Helpers.classes import Page, PlayerStats
 from Helpers.database import DB, get_current_guild_data
-from Helpers.functions import addLine, generate_badge, get_guild_color, getPlayerUUID, vertical_gradient, round_corners, timed_get
+from Helpers.functions import addLine, generate_badge, vertical_gradient, round_corners
 from Helpers.logger import log, ERROR
+from Helpers.pagination import LazyPaginator
 from Helpers.snipe_utils import ALL_TERRITORY_NAMES, display_hq, is_dry, normalize_hq_for_storage
 from Helpers.variables import ALL_GUILD_IDS, HQ_TEAM_ROLE_ID, TAQ_GUILD_ID, SNIPE_LOG_CHANNEL_ID, discord_ranks
 
@@ -47,12 +49,7 @@ _LIST_ORDER_SQL     = {
     'Easiest':     "sl.difficulty ASC, sl.sniped_at DESC",
     'Least Conns': "sl.conns ASC, sl.sniped_at DESC",
 }
-_ATHENA_GUILD_LIST_URL = 'https://athena.wynntils.com/cache/get/guildList'
-_ATHENA_GUILD_TTL      = 6 * 60 * 60
-_DEFAULT_GUILD_COLOR = '#ffffff'
-_GUILD_COLOR_CACHE   = {}
-_ATHENA_GUILD_COLORS = None
-_ATHENA_GUILD_FETCHED_AT = 0.0
+_DEFAULT_GUILD_COLOR = guild_colors.DEFAULT_COLOR
 
 # ── Season helpers ───────────────────────────────────────────────────────────
 
@@ -188,7 +185,7 @@ async def _resolve_identity(db, ign: str) -> tuple[str, str | None]:
     """
     uuid = _resolve_uuid_db(db, ign)
     if uuid is None:
-        looked_up = await asyncio.to_thread(getPlayerUUID, ign)
+        looked_up = await http_client.get_player_uuid(ign)
         if looked_up:
             uuid = looked_up[1]
     if uuid is not None:
@@ -232,8 +229,15 @@ def _player_key_parts(uuid: str | None, ign: str, alias: str = 'sp') -> tuple[st
 
 # ── Paginator helper ─────────────────────────────────────────────────────────
 
-def _make_paginator(book: list) -> pages.Paginator:
-    p = pages.Paginator(pages=book)
+def _make_paginator(total_pages: int, make_card, prefix: str) -> pages.Paginator:
+    """Paginator over `make_card(i)` PIL cards; each card is drawn on first view."""
+    def render(i):
+        buf = BytesIO()
+        make_card(i).save(buf, format='PNG')
+        buf.seek(0)
+        return Page(content='', files=[discord.File(buf, filename=f'{prefix}_{i}.png')])
+
+    p = LazyPaginator(total_pages, render)
     p.add_button(pages.PaginatorButton("prev",  emoji="<:left_arrow:1198703157501509682>",   style=discord.ButtonStyle.red))
     p.add_button(pages.PaginatorButton("next",  emoji="<:right_arrow:1198703156088021112>",  style=discord.ButtonStyle.green))
     p.add_button(pages.PaginatorButton("first", emoji="<:first_arrows:1198703152204103760>", style=discord.ButtonStyle.blurple))
@@ -241,17 +245,6 @@ def _make_paginator(book: list) -> pages.Paginator:
     return p
 
 
-def _pages_from_cards(cards: list, prefix: str) -> list:
-    """Convert a list of PIL Images to a list of Page objects with Discord Files."""
-    book = []
-    for i, card in enumerate(cards):
-        buf = BytesIO()
-        card.save(buf, format='PNG')
-        buf.seek(0)
-        book.append(Page(content='', files=[discord.File(buf, filename=f'{prefix}_{i}.png')]))
-    return book
-
-
 # ── Comprehensive leaderboard data fetch ─────────────────────────────────────
 
 def _fetch_lb_data(db, sc: str, sp: list) -> list:
@@ -479,64 +472,10 @@ def _draw_role_columns(draw, pairs: list[tuple[str, str]], start_x: int, y: int,
         addLine(f'&#{_PARTICIPANT_NAME_COLOR[1:]}{fitted_text}', draw, names_font, names_x, names_y, drop_x=2, drop_y=2)
 
 
-def _load_athena_guild_colors_sync() -> dict[str, str]:
-    global _ATHENA_GUILD_COLORS, _ATHENA_GUILD_FETCHED_AT
-
-    now = time.time()
-    if _ATHENA_GUILD_COLORS is not None and (now - _ATHENA_GUILD_FETCHED_AT) < _ATHENA_GUILD_TTL:
-        return _ATHENA_GUILD_COLORS
-
-    try:
-        response = timed_get(_ATHENA_GUILD_LIST_URL, timeout=15)
-        response.raise_for_status()
-        payload = response.json()
-        colors = {}
-        for row in payload:
-            prefix = _normalize_guild_tag(row.get('prefix'))
-            color = (row.get('color') or '').strip()
-            if prefix and color:
-                colors[prefix] = color
-        _ATHENA_GUILD_COLORS = colors
-    except Exception:
-        if _ATHENA_GUILD_COLORS is None:
-            _ATHENA_GUILD_COLORS = {}
-    finally:
-        _ATHENA_GUILD_FETCHED_AT = now
-
-    return _ATHENA_GUILD_COLORS
-
-
-def _fetch_guild_color_sync(tag: str | None) -> str:
-    norm = _normalize_guild_tag(tag)
-    if not norm:
-        return _DEFAULT_GUILD_COLOR
-    cached = _GUILD_COLOR_CACHE.get(norm)
-    if cached:
-        return cached
-    athena_color = _load_athena_guild_colors_sync().get(norm)
-    if athena_color:
-        _GUILD_COLOR_CACHE[norm] = athena_color
-        return athena_color
-    try:
-        guild = Guild(norm)
-        color = get_guild_color({'banner': guild.banner})
-    except Exception:
-        color = _DEFAULT_GUILD_COLOR
-    _GUILD_COLOR_CACHE[norm] = color
-    return color
-
-
 async def _get_guild_color_map(tags) -> dict[str, str]:
-    unique = {_normalize_guild_tag(tag) for tag in tags if _normalize_guild_tag(tag)}
-    if unique:
-        await asyncio.to_thread(_load_athena_guild_colors_sync)
-    uncached = [tag for tag in unique if tag not in _GUILD_COLOR_CACHE]
-    if uncached:
-        await asyncio.gather(*(
-            asyncio.to_thread(_fetch_guild_color_sync, tag)
-            for tag in uncached
-        ))
-    return {tag: _GUILD_COLOR_CACHE.get(tag, _DEFAULT_GUILD_COLOR) for tag in unique}
+    # In-memory only: unknown tags get the default and are resolved in the
+    # background by Tasks/cache_guild_colors.py.
+    return guild_colors.lookup(tags, _DEFAULT_GUILD_COLOR)
 
 
 def _row_bg_img(W, ROW_H=40):
@@ -1384,7 +1323,7 @@ class SnipeTracker(commands.Cog):
                 # The snipe is already recorded and the user already saw the
                 # success embed; a failed image fetch must not error the command.
                 try:
-                    resp = await asyncio.to_thread(timed_get, image.url)
+                    resp = await http_client.get(image.url)
                     img_file = discord.File(BytesIO(resp.content), filename=image.filename)
                     await channel.send(content=log_text, file=img_file)
                 except Exception as e:
@@ -1593,14 +1532,12 @@ class SnipeTracker(commands.Cog):
         # Paginate into leaderboard cards
         PER_PAGE    = 10
         total_pages = max(1, math.ceil(len(player_stats) / PER_PAGE))
-        cards = [
-            _generate_lb_card(
+        def card(i):
+            return _generate_lb_card(
                 player_stats[i * PER_PAGE:(i + 1) * PER_PAGE],
                 sort, sl, i + 1, total_pages, i * PER_PAGE + 1
             )
-            for i in range(total_pages)
-        ]
-        await _make_paginator(_pages_from_cards(cards, 'lb')).respond(ctx.interaction)
+        await _make_paginator(total_pages, card, 'lb').respond(ctx.interaction)
 
     # ── /snipe roles ──────────────────────────────────────────────────────────
 
@@ -1638,14 +1575,12 @@ class SnipeTracker(commands.Cog):
         # Paginate into role leaderboard cards
         PER_PAGE    = 10
         total_pages = max(1, math.ceil(len(all_rows) / PER_PAGE))
-        cards = [
-            _generate_roles_card(
+        def card(i):
+            return _generate_roles_card(
                 all_rows[i * PER_PAGE:(i + 1) * PER_PAGE],
                 role, sort, sl, i + 1, total_pages, i * PER_PAGE + 1
             )
-            for i in range(total_pages)
-        ]
-        await _make_paginator(_pages_from_cards(cards, 'roles')).respond(ctx.interaction)
+        await _make_paginator(total_pages, card, 'roles').respond(ctx.interaction)
 
     # ── /snipe team ───────────────────────────────────────────────────────────
 
@@ -1768,17 +1703,15 @@ class SnipeTracker(commands.Cog):
 
         # Paginate into duo leaderboard cards
         total_pages = max(1, math.ceil(len(rows) / _LB_PER_PAGE))
-        cards = [
-            _generate_duo_card(
+        def card(i):
+            return _generate_duo_card(
                 rows[i * _LB_PER_PAGE:(i + 1) * _LB_PER_PAGE],
                 sl,
                 i + 1,
                 total_pages,
                 i * _LB_PER_PAGE + 1,
             )
-            for i in range(total_pages)
-        ]
-        await _make_paginator(_pages_from_cards(cards, 'duos')).respond(ctx.interaction)
+        await _make_paginator(total_pages, card, 'duos').respond(ctx.interaction)
 
     # ── /snipe overview ───────────────────────────────────────────────────────
 
@@ -1973,8 +1906,8 @@ class SnipeTracker(commands.Cog):
 
         # Paginate into list cards
         total_pages = max(1, math.ceil(len(all_rows) / _LIST_PER_PAGE))
-        cards = [
-            _generate_list_card(
+        def card(i):
+            return _generate_list_card(
                 all_rows[i * _LIST_PER_PAGE:(i + 1) * _LIST_PER_PAGE],
                 participants_map,
                 guild_colors,
@@ -1984,9 +1917,7 @@ class SnipeTracker(commands.Cog):
                 total_pages,
                 i * _LIST_PER_PAGE + 1,
             )
-            for i in range(total_pages)
-        ]
-        await _make_paginator(_pages_from_cards(cards, 'snipe_list')).respond(ctx.interaction)
+        await _make_paginator(total_pages, card, 'snipe_list').respond(ctx.interaction)
 
     # ── /warseason ────────────────────────────────────────────────────────────
 
@@ -1,8 +1,10 @@
+import asyncio
+
 import discord
 from discord import SlashCommandGroup, ApplicationContext
 from discord.ext import commands
 
-from Helpers.database import DB
+from Helpers.settings import settings
 from Helpers.variables import HOME_GUILD_IDS
 
 
@@ -20,42 +22,16 @@ class Toggle(commands.Cog):
     async def attack_ping(self, ctx: ApplicationContext):
         await ctx.defer(ephemeral=True)
 
-        db = DB()
-        db.connect()
-
-        # Create table if it doesn't exist
-        db.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS guild_settings (
-                guild_id      BIGINT       NOT NULL,
-                setting_key   VARCHAR(64)  NOT NULL,
-                setting_value BOOLEAN      NOT NULL DEFAULT TRUE,
-                updated_at    TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
-                PRIMARY KEY (guild_id, setting_key)
-            )
-        """)
-        db.connection.commit()
-
-        # Check current setting
-        db.cursor.execute(
-            "SELECT setting_value FROM guild_settings WHERE guild_id = %s AND setting_key = %s",
-            (ctx.guild_id, 'attack_ping')
-        )
-        result = db.cursor.fetchone()
+        # Flipping a default would overwrite a stored value we could not read
+        if not await asyncio.to_thread(settings.load):
+            await ctx.followup.send("Settings are temporarily unavailable. Please try again later.", ephemeral=True)
+            return
 
         # Default is True (pings enabled), toggle to opposite
-        current_value = result[0] if result else True
-        new_value = not current_value
-
-        # Upsert the setting
-        db.cursor.execute("""
-            INSERT INTO guild_settings (guild_id, setting_key, setting_value, updated_at)
-            VALUES (%s, %s, %s, NOW())
-            ON CONFLICT (guild_id, setting_key)
-            DO UPDATE SET setting_value = EXCLUDED.setting_value, updated_at = NOW()
-        """, (ctx.guild_id, 'attack_ping', new_value))
+        new_value = not settings.guild(ctx.guild_id, 'attack_ping', True)
 
-        db.connection.commit()
-        db.close()
+        # Write-through: the territory tracker reads the new value from memory
+        await asyncio.to_thread(settings.set_guild, ctx.guild_id, 'attack_ping', new_value)
 
         status = "enabled" if new_value else "disabled"
         emoji = "🔔" if new_value else "🔕"
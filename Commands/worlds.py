@@ -1,5 +1,3 @@
-import asyncio
-
 import discord
 from discord.ext import commands
 from discord.commands import slash_command
@@ -9,7 +7,7 @@ import time
 import datetime
 import math
 
-from Helpers.functions import timed_get
+from Helpers import http_client
 from Helpers.rate_limiter import external_rate_limit
 from Helpers.pagination import add_paginator_buttons
 
@@ -31,7 +29,7 @@ class Worlds(commands.Cog):
         await message.defer()
         url = 'https://athena.wynntils.com/cache/get/serverList'
 
-        data = await asyncio.to_thread(timed_get, url, timeout=10)
+        data = await http_client.get(url, timeout=10)
         data.raise_for_status()
         worlds = data.json()
         
@@ -0,0 +1,184 @@
+"""
+Helpers/app_classifier.py
+Deterministic pre-classifier for application tickets and recruiter names.
+
+Most ticket messages are obviously an application (a filled-in questionnaire)
+or obviously not ("hi", "when will my app be reviewed?"), and most recruiter
+answers are a roster name typed correctly or one typo away. Those are settled
+here from keyword, structure and name features in well under a millisecond.
+Only what is left goes to the model in Helpers/openai_helper.py:
+
+  * classify_application -> detect_application's result, or None to defer
+  * match_recruiter      -> the roster name, or None to defer
+
+Both must be right whenever they answer, so they defer rather than guess. The
+thresholds below were tuned against tests/fixtures/application_corpus.json;
+re-run tests/test_app_classifier.py after changing either.
+"""
+
+import re
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Thresholds:
+    # Questionnaire fields answered before a message counts as that form.
+    guild_min_fields: int = 5
+    community_min_fields: int = 3
+    # A message this short, with at most this many field hits, is chatter.
+    chatter_max_chars: int = 120
+    chatter_max_lines: int = 2
+    chatter_max_fields: int = 1
+    # Typos tolerated in a recruiter name, and the shortest name they apply to.
+    fuzzy_max_edits: int = 1
+    fuzzy_min_length: int = 5
+
+
+DEFAULT_THRESHOLDS = Thresholds()
+
+_STATS_LINK = r"wynncraft\.com/stats"
+
+# One pattern per question on the guild member form (see _DETECT_INSTRUCTIONS).
+GUILD_FIELDS = {
+    "ign": r"\b(ign|in[- ]?game name|username)\b",
+    "timezone": r"\b(time ?zone|tz|gmt|utc|est|edt|pst|pdt|cet|cest|aest|bst)\b",
+    "stats_link": _STATS_LINK,
+    "playtime": r"\b(playtime|play(ing)?\b.{0,30}\b(day|daily|week)|hours?\b.{0,15}\b(a|per) day|h ?/ ?day)",
+    "guild_experience": r"\b(previous guilds?|guild experience|was in (a guild|\w+ for)|previous guild|guilds? before)\b",
+    "warring": r"\bwar(s|ring)?\b",
+    "know_about_taq": r"\b(know|knowledge)\b.{0,20}\btaq\b|\babout taq\b",
+    "gain": r"\bgain\b",
+    "contribute": r"\bcontribut(e|ion)\b",
+    "how_learned": r"\b(learn(ed)? about|reference|referr(ed|al)|recruited|told me|found (it|taq|you))\b",
+}
+
+# Questions only the community member form asks.
+COMMUNITY_FIELDS = {
+    "community_member": r"\bcommunity member\b",
+    "current_guild": r"\b(what guild are you in|current guild)\b|^\W*guild\s*:",
+    "why_join": r"\bwhy\b.{0,60}\b(community|join)|\b(want|like) to (become|be|join)\b.{0,30}\bcommunity\b",
+    "contribute_community": r"\bcontribut\w*\b.{0,25}\bcommunity\b|\bcommunity\b.{0,25}\bcontribut\w*\b",
+}
+
+# Asking to join without the form ("can I come back?") is never chatter.
+_JOIN_INTENT = re.compile(r"\b(re-?join|join|come back|re-?apply(ing)?|community member)\b", re.IGNORECASE)
+
+_FLAGS = re.IGNORECASE | re.MULTILINE
+_GUILD_RE = {k: re.compile(v, _FLAGS) for k, v in GUILD_FIELDS.items()}
+_COMMUNITY_RE = {k: re.compile(v, _FLAGS) for k, v in COMMUNITY_FIELDS.items()}
+_ANY_FIELD = [*_GUILD_RE.values(), *_COMMUNITY_RE.values()]
+_LABEL_LINE = re.compile(r"^\s*(\d+[.)]|[-*•]|\*\*[^*]+\*\*|[^:\n]{2,60}[:\-–?])\s*\S")
+
+
+def features(text: str) -> dict:
+    """Field hits and layout of a message; what the decision rules look at."""
+    text = text or ""
+    lines = [line for line in text.splitlines() if line.strip()]
+    return {
+        "chars": len(text.strip()),
+        "lines": len(lines),
+        "labelled_lines": sum(1 for line in lines if _LABEL_LINE.match(line)),
+        "field_lines": sum(1 for line in lines if any(rx.search(line) for rx in _ANY_FIELD)),
+        "guild": sorted(k for k, rx in _GUILD_RE.items() if rx.search(text)),
+        "community": sorted(k for k, rx in _COMMUNITY_RE.items() if rx.search(text)),
+    }
+
+
+def _result(app_type: str, confidence: float) -> dict:
+    return {
+        "is_application": app_type != "none",
+        "app_type": app_type,
+        "confidence": confidence,
+        "error": None,
+    }
+
+
+def classify_application(text: str, thresholds: Thresholds = DEFAULT_THRESHOLDS) -> dict | None:
+    """detect_application's answer when the message is unambiguous, else None."""
+    f = features(text)
+    guild, community = len(f["guild"]), len(f["community"])
+    # Questionnaires are answered one question per line, labelled or not; a
+    # paragraph that happens to mention wars and a timezone is left for the model.
+    structured = f["lines"] >= 4 and max(f["labelled_lines"], f["field_lines"]) * 2 >= f["lines"]
+
+    if structured and community >= thresholds.community_min_fields and guild < thresholds.guild_min_fields + 2:
+        return _result("community_member", min(0.99, 0.6 + 0.1 * community))
+    if structured and guild >= thresholds.guild_min_fields and community < 2:
+        return _result("guild_member", min(0.99, 0.5 + 0.05 * guild))
+    if (
+        f["chars"] <= thresholds.chatter_max_chars
+        and f["lines"] <= thresholds.chatter_max_lines
+        and guild + community <= thresholds.chatter_max_fields
+        and "stats_link" not in f["guild"]
+        and not _JOIN_INTENT.search(text or "")
+    ):
+        return _result("none", 0.95)
+    return None
+
+
+# --- Recruiter names -----------------------------------------------------------
+
+_IGN_TOKEN = re.compile(r"[A-Za-z0-9_]{3,16}")
+
+
+def _squash(name: str) -> str:
+    """Lowercase with separators dropped, so "Seaweed Sam" meets "Seaweed_Sam"."""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, or limit + 1 as soon as it is known to exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+def match_recruiter(text: str, names: list[str], thresholds: Thresholds = DEFAULT_THRESHOLDS) -> str | None:
+    """The one roster name ``text`` refers to, or None when unsure.
+
+    In order: exact (case-insensitive), exact ignoring separators, a single
+    roster name mentioned as a word ("my friend X told me"), a unique
+    substring, then a unique closest name within the typo budget. A substring
+    shared by several names stops the search: "Kraken" may be any of them.
+    """
+    text = (text or "").strip()
+    if not text or not names:
+        return None
+    lower, squashed = text.lower(), _squash(text)
+
+    for name in names:
+        if name.lower() == lower:
+            return name
+    by_squash = [n for n in names if _squash(n) == squashed]
+    if len(by_squash) == 1:
+        return by_squash[0]
+
+    by_lower = {n.lower(): n for n in names}
+    mentioned = {by_lower[t.lower()] for t in _IGN_TOKEN.findall(text) if t.lower() in by_lower}
+    if len(mentioned) == 1:
+        return mentioned.pop()
+    if mentioned:
+        return None
+
+    containing = [n for n in names if lower in n.lower()]
+    if len(containing) == 1:
+        return containing[0]
+    if containing:
+        return None
+
+    if not _IGN_TOKEN.fullmatch(text) or len(text) < thresholds.fuzzy_min_length:
+        return None
+    limit = thresholds.fuzzy_max_edits
+    scored = sorted((_edit_distance(lower, n.lower(), limit), n) for n in names)
+    best = [n for d, n in scored if d == scored[0][0]]
+    if scored[0][0] <= limit and len(best) == 1:
+        return best[0]
+    return None
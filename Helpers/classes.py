@@ -1,13 +1,14 @@
-import asyncio
 from datetime import datetime, timezone
 import json
 import os
+from functools import lru_cache
 
 from PIL import Image, ImageOps
 from dateutil import parser
 import discord
 from discord.ui import InputText, Modal
 
+from Helpers import http_client
 from Helpers.database import (
     DB,
     get_current_guild_data_and_snapshot_count_with_db,
@@ -478,7 +479,7 @@ class LinkAccount(Modal):
         # Resolve the Minecraft uuid up front — a row without one is invisible
         # to every uuid-keyed join (shells snapshot, raid credit, profiles).
         ign = self.children[0].value
-        player_data = await asyncio.to_thread(getPlayerUUID, ign)
+        player_data = await http_client.get_player_uuid(ign)
         uuid = player_data[1] if player_data else None
         canonical_ign = player_data[0] if player_data else ign
 
@@ -595,12 +596,28 @@ class NewMember(Modal):
             await welcome_location.send(embed=welcome_embed)
 
 
+@lru_cache(maxsize=32)
+def _place_template_parts(image):
+    """Decode a row template once per process; the parts are only ever read."""
+    loaded = Image.open(image)
+    loaded.load()
+    return (
+        loaded,
+        loaded.crop((0, 0, 2, 32)),
+        loaded.crop((2, 0, 3, 32)),
+        loaded.crop((3, 0, 8, 32)),
+    )
+
+
 class PlaceTemplate:
     def __init__(self, image):
-        self.loaded_image = Image.open(image)
-        self.divider = self.loaded_image.crop((0, 0, 2, 32))
-        self.filling = self.loaded_image.crop((2, 0, 3, 32))
-        self.ending = self.loaded_image.crop((3, 0, 8, 32))
+        if isinstance(image, str):
+            self.loaded_image, self.divider, self.filling, self.ending = _place_template_parts(image)
+        else:
+            self.loaded_image = Image.open(image)
+            self.divider = self.loaded_image.crop((0, 0, 2, 32))
+            self.filling = self.loaded_image.crop((2, 0, 3, 32))
+            self.ending = self.loaded_image.crop((3, 0, 8, 32))
 
     def add(self, img, width, pos, start=False):
         x, y = pos
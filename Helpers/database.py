@@ -75,6 +75,11 @@ class DB:
     # ride out transient contention; real exhaustion still fails, loudly.
     _POOL_RETRY_DELAYS: ClassVar[tuple] = (0.2, 0.4)
 
+    # Process-lifetime counters behind the metrics endpoint: retries taken on
+    # an exhausted pool, and checkouts that failed after spending them.
+    _pool_waits: ClassVar[int] = 0
+    _pool_exhausted: ClassVar[int] = 0
+
     def __init__(self, *, use_pool: bool = True, pool_min: int = 1, pool_max: int | None = None):
         self.connection = None
         self.cursor = None
@@ -179,6 +184,11 @@ class DB:
             try:
                 return self._pool.getconn()
             except psycopg2.pool.PoolError:
+                with DB._pool_lock:
+                    if attempt >= len(self._POOL_RETRY_DELAYS):
+                        DB._pool_exhausted += 1
+                    else:
+                        DB._pool_waits += 1
                 if attempt >= len(self._POOL_RETRY_DELAYS):
                     raise
                 log(WARN, f"DB pool exhausted, retrying (attempt {attempt + 1})", context="database")
@@ -218,6 +228,28 @@ class DB:
         self._raw_connection = None
         self._pool = None
 
+    @classmethod
+    def pool_stats(cls) -> list[dict]:
+        """In-use/idle counts per pool, for the metrics endpoint. Never raises.
+
+        Pools are keyed by config; the label is the mode plus size bounds,
+        which is what distinguishes them in practice (credentials never leave).
+        """
+        stats = []
+        with cls._pool_lock:
+            items = list(cls._pools.items())
+        for (mode, minconn, maxconn, _), pool in items:
+            try:
+                stats.append({
+                    "pool": f"{'test' if mode == 'true' else 'prod'}:{minconn}-{maxconn}",
+                    "in_use": len(pool._used),
+                    "idle": len(pool._pool),
+                    "max": maxconn,
+                })
+            except Exception:
+                continue
+        return stats
+
     @classmethod
     def _reset_pools_for_tests(cls):
         """Close and drop every pool. Test hook only."""
@@ -641,6 +673,22 @@ def set_last_online(data: dict):
         db.close()
 
 
+# guild_settings live in the process-wide store (Helpers/settings.py); these
+# wrappers keep the original call signatures.
+
+def get_guild_setting(guild_id: int, key: str, default: bool = True) -> bool:
+    """Boolean guild setting, served from memory. Returns `default` when unset
+    or before the settings store has loaded."""
+    from Helpers.settings import settings
+    return settings.guild(guild_id, key, default)
+
+
+def set_guild_setting(db: DB, guild_id: int, key: str, value: bool):
+    """Upsert and commit a guild setting on `db`, then update the store."""
+    from Helpers.settings import settings
+    settings.set_guild(guild_id, key, value, db=db)
+
+
 def get_territory_data() -> dict:
     """Load territory data from cache_entries.
     Replaces: territories.json reads
@@ -0,0 +1,128 @@
+"""
+Helpers/embed_feed.py
+Queued, batched embed delivery for high-volume feed channels.
+
+A producer (e.g. the territory tracker tick) hands over all of one tick's
+embeds with ``submit`` and returns immediately. One background worker per
+channel sends them in order, packing up to 10 embeds per message — Discord's
+limit — and, when a single tick carries more than ``summary_threshold``
+embeds, posting one compact summary instead so a war rush costs a couple of
+messages rather than dozens. The producer never waits on Discord's rate
+limit; a backlog only delays the feed, and beyond ``MAX_PENDING_TICKS`` the
+oldest ticks are dropped (and logged) rather than held indefinitely.
+"""
+
+import asyncio
+from collections import deque
+
+import discord
+
+from Helpers.logger import log, WARN, ERROR
+
+EMBEDS_PER_MESSAGE = 10
+SUMMARY_THRESHOLD = 20
+MAX_PENDING_TICKS = 30
+# Embed description hard limit is 4096; leave room for the overflow line.
+_DESCRIPTION_BUDGET = 3900
+
+
+class _Tick:
+    __slots__ = ("channel", "embeds", "summary_lines", "summary_title", "summary_color")
+
+    def __init__(self, channel, embeds, summary_lines, summary_title, summary_color):
+        self.channel = channel
+        self.embeds = embeds
+        self.summary_lines = summary_lines
+        self.summary_title = summary_title
+        self.summary_color = summary_color
+
+
+def summary_embeds(title: str, lines: list[str], color=None) -> list[discord.Embed]:
+    """One embed listing `lines`; anything past the description limit is counted."""
+    shown, size = [], 0
+    for line in lines:
+        if size + len(line) + 1 > _DESCRIPTION_BUDGET:
+            break
+        shown.append(line)
+        size += len(line) + 1
+    description = "\n".join(shown)
+    if len(shown) < len(lines):
+        description += f"\n…and {len(lines) - len(shown)} more"
+    return [discord.Embed(title=title, description=description, color=color or discord.Color.light_grey())]
+
+
+def messages_for(tick: _Tick, threshold: int = SUMMARY_THRESHOLD) -> list[list[discord.Embed]]:
+    """The embed lists to send for one tick, in order."""
+    if len(tick.embeds) > threshold and tick.summary_lines:
+        return [summary_embeds(tick.summary_title, tick.summary_lines, tick.summary_color)]
+    return [tick.embeds[i:i + EMBEDS_PER_MESSAGE] for i in range(0, len(tick.embeds), EMBEDS_PER_MESSAGE)]
+
+
+class EmbedFeed:
+    """Ordered background sender for one channel."""
+
+    def __init__(self, name: str, summary_threshold: int = SUMMARY_THRESHOLD):
+        self.name = name
+        self.summary_threshold = summary_threshold
+        self._queue: deque = deque()
+        self._wake = None
+        self._worker = None
+        self.sent_messages = 0
+        self.dropped_ticks = 0
+
+    def submit(self, channel, embeds: list, summary_lines: list[str] | None = None,
+               summary_title: str = "", summary_color=None):
+        """Queue one tick's embeds. Never blocks; must be called on the event loop."""
+        if not embeds or channel is None:
+            return
+        if len(self._queue) >= MAX_PENDING_TICKS:
+            dropped = self._queue.popleft()
+            self.dropped_ticks += 1
+            log(WARN, f"{self.name} feed backlogged; dropped a tick of {len(dropped.embeds)} embeds",
+                context="embed_feed")
+        self._queue.append(_Tick(channel, list(embeds), summary_lines or [], summary_title, summary_color))
+        self._ensure_worker()
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._wake = asyncio.Event()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        self._wake.set()
+
+    async def _run(self):
+        while True:
+            if not self._queue:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            tick = self._queue.popleft()
+            for batch in messages_for(tick, self.summary_threshold):
+                try:
+                    await tick.channel.send(embeds=batch)
+                    self.sent_messages += 1
+                except Exception as e:
+                    log(ERROR, f"{self.name} feed send failed: {e!r}", context="embed_feed")
+
+    async def drain(self):
+        """Wait until everything queued so far has been sent (tests, shutdown)."""
+        while self._queue or (self._worker and not self._worker.done() and self._wake and self._wake.is_set()):
+            await asyncio.sleep(0)
+
+    def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+
+_feeds: dict = {}
+
+
+def for_name(name: str, **kwargs) -> EmbedFeed:
+    """The process-wide feed registered under `name`."""
+    feed = _feeds.get(name)
+    if feed is None:
+        feed = _feeds[name] = EmbedFeed(name, **kwargs)
+    return feed
@@ -16,7 +16,7 @@ from PIL import Image, ImageFilter, ImageEnhance, ImageDraw, ImageFont, ImageOps
 
 from Helpers.variables import minecraft_colors, minecraft_banner_colors, colours, shadows, IS_TEST_MODE
 from Helpers.logger import log, WARN, ERROR
-from Helpers import telemetry
+from Helpers import telemetry, wynn_budget
 
 
 @lru_cache(maxsize=64)
@@ -56,8 +56,19 @@ def timed_get(url, **kwargs):
     # Default timeout: a hung upstream must fail loudly, not pin a session
     # socket (and its caller's thread) forever. Explicit timeouts always win.
     kwargs.setdefault("timeout", 15)
-    with telemetry.track(f"http.{host}"):
-        return _session.get(url, **kwargs)
+    if host != "api.wynncraft.com":
+        with telemetry.track(f"http.{host}"):
+            return _session.get(url, **kwargs)
+
+    auth = (kwargs.get("headers") or {}).get("Authorization")
+    try:
+        with telemetry.track(f"http.{host}"):
+            resp = _session.get(url, **kwargs)
+    except Exception:
+        wynn_budget.record_failure(auth)
+        raise
+    wynn_budget.record_response(auth, getattr(resp, "headers", None) or {}, getattr(resp, "status_code", None))
+    return resp
 
 
 def isInCurrDay(data, uuid):
@@ -0,0 +1,204 @@
+"""Write guild raid completions to graid_logs and the tallies that hang off it.
+
+Every path that records a raid — auto-detection, the website's manual queue
+and the channel-history backfill — goes through ``record_raids`` so they agree
+on the rules:
+
+  * Participants without a uuid are logged by ign but never tallied; a NULL
+    uuid cannot be credited in uncollected_raids or graid_event_totals.
+  * A participant with no ign takes the one on their discord_links row.
+  * Tallies (uncollected_raids, graid_event_totals) are opt-out, because a
+    backfill replays history that was already paid out. A manual /graid log
+    counts for the event but is not a collectable raid, so it opts out of
+    uncollected_raids alone.
+  * graid_event_standings always follows the logs: it is derived data (each
+    player's event points, when they reached them, and their placement), kept
+    current here so leaderboard reads never re-aggregate the whole event.
+
+The writes are set-based: a batch of any size costs the same handful of
+statements, with the per-participant rows passed as parallel ``unnest``
+arrays. Over a managed endpoint the round trips, not the rows, are the cost.
+"""
+from collections import Counter
+
+# Marker for "whichever event is active when the batch is written".
+ACTIVE_EVENT = object()
+
+_ACTIVE_EVENT = "SELECT id FROM graid_events WHERE active = TRUE LIMIT 1"
+
+# Ids are drawn up front so each raid's participants can reference its log row
+# without relying on the order of a multi-row RETURNING.
+_NEXT_IDS = """
+    SELECT nextval(pg_get_serial_sequence('graid_logs', 'id'))
+    FROM generate_series(1, %s)
+"""
+
+_INSERT_LOGS = """
+    INSERT INTO graid_logs (id, event_id, raid_type, completed_at)
+    SELECT l.id, l.event_id, l.raid_type, COALESCE(l.completed_at, NOW())
+    FROM unnest(%s::int[], %s::bigint[], %s::varchar[], %s::timestamptz[])
+         AS l(id, event_id, raid_type, completed_at)
+"""
+
+_INSERT_PARTICIPANTS = """
+    INSERT INTO graid_log_participants (log_id, uuid, ign)
+    SELECT p.log_id, p.uuid,
+           COALESCE(p.ign, (SELECT dl.ign FROM discord_links dl
+                            WHERE dl.uuid = p.uuid LIMIT 1))
+    FROM unnest(%s::int[], %s::uuid[], %s::varchar[]) AS p(log_id, uuid, ign)
+    RETURNING log_id, uuid, ign
+"""
+
+_UPSERT_UNCOLLECTED = """
+    INSERT INTO uncollected_raids AS ur (uuid, ign, uncollected_raids, collected_raids)
+    SELECT u.uuid, u.ign, u.n, 0
+    FROM unnest(%s::uuid[], %s::varchar[], %s::int[]) AS u(uuid, ign, n)
+    ON CONFLICT (uuid) DO UPDATE
+      SET uncollected_raids = ur.uncollected_raids + EXCLUDED.uncollected_raids,
+          ign               = COALESCE(EXCLUDED.ign, ur.ign)
+"""
+
+_UPSERT_EVENT_TOTALS = """
+    INSERT INTO graid_event_totals (event_id, uuid, total)
+    SELECT t.event_id, t.uuid, t.n
+    FROM unnest(%s::bigint[], %s::uuid[], %s::int[]) AS t(event_id, uuid, n)
+    ON CONFLICT (event_id, uuid) DO UPDATE
+      SET total        = graid_event_totals.total + EXCLUDED.total,
+          last_updated = NOW()
+"""
+
+
+# Points come from the event's own raid values, so raids worth nothing (or
+# of unknown type) never create a standings row — same as build_reward_rows.
+_UPSERT_STANDINGS = """
+    INSERT INTO graid_event_standings AS s (event_id, uuid, points, reached_at, display_name)
+    SELECT gl.event_id, glp.uuid, SUM(rp.points), MAX(gl.completed_at),
+           (array_agg(COALESCE(dl.ign, glp.ign, glp.uuid::text)
+                      ORDER BY gl.completed_at DESC, gl.id DESC))[1]
+    FROM graid_logs gl
+    JOIN graid_log_participants glp ON glp.log_id = gl.id
+    JOIN graid_event_raid_points rp
+      ON rp.event_id = gl.event_id AND rp.raid_type = gl.raid_type AND rp.points > 0
+    LEFT JOIN LATERAL (
+        SELECT ign FROM discord_links WHERE uuid = glp.uuid LIMIT 1
+    ) dl ON TRUE
+    WHERE gl.id = ANY(%s) AND gl.event_id IS NOT NULL AND glp.uuid IS NOT NULL
+    GROUP BY gl.event_id, glp.uuid
+    ON CONFLICT (event_id, uuid) DO UPDATE
+      SET points       = s.points + EXCLUDED.points,
+          reached_at   = GREATEST(s.reached_at, EXCLUDED.reached_at),
+          -- A backfilled older batch must not replace a newer name.
+          display_name = CASE WHEN EXCLUDED.reached_at >= s.reached_at
+                              THEN EXCLUDED.display_name ELSE s.display_name END
+"""
+
+# Same order as build_reward_rows: points, then who got there first, then name.
+# lower() there too, and COLLATE "C" compares code points, as Python's string
+# sort does.
+RANK_STANDINGS = """
+    UPDATE graid_event_standings s
+    SET placement = r.placement
+    FROM (
+        SELECT event_id, uuid,
+               ROW_NUMBER() OVER (
+                   PARTITION BY event_id
+                   ORDER BY points DESC, reached_at ASC, lower(display_name) COLLATE "C" ASC
+               ) AS placement
+        FROM graid_event_standings
+        WHERE event_id = ANY(%s)
+    ) r
+    WHERE s.event_id = r.event_id AND s.uuid = r.uuid
+      AND s.placement IS DISTINCT FROM r.placement
+"""
+
+
+def _participants(raid):
+    """The raid's (uuid, ign) pairs in order, without repeats."""
+    seen, out = set(), []
+    for p in raid.get("participants") or ():
+        uuid = str(p["uuid"]) if p.get("uuid") else None
+        ign = p.get("ign") or None
+        key = ("uuid", uuid) if uuid else ("ign", (ign or "").lower())
+        if key in seen or (uuid is None and ign is None):
+            continue
+        seen.add(key)
+        out.append((uuid, ign))
+    return out
+
+
+def record_raids(db, raids, tally=True, uncollected=True):
+    """Insert a batch of raid logs and their participants. Caller commits.
+
+    raids: iterable of dicts with
+      raid_type:    full raid name, or None for unknown
+      participants: list of {uuid: str|None, ign: str|None}
+      completed_at: optional datetime (defaults to NOW())
+      event_id:     optional; ACTIVE_EVENT (the default) uses the active event
+
+    With ``uncollected=False`` a tallied batch credits the event totals only.
+    Returns the new graid_logs ids, in the order of ``raids``.
+    """
+    raids = [r for r in raids if _participants(r)]
+    if not raids:
+        return []
+    cur = db.cursor
+
+    active = None
+    if any(r.get("event_id", ACTIVE_EVENT) is ACTIVE_EVENT for r in raids):
+        cur.execute(_ACTIVE_EVENT)
+        row = cur.fetchone()
+        active = row[0] if row else None
+
+    cur.execute(_NEXT_IDS, (len(raids),))
+    log_ids = [row[0] for row in cur.fetchall()]
+
+    event_ids = []
+    p_logs, p_uuids, p_igns = [], [], []
+    for log_id, raid in zip(log_ids, raids):
+        event_id = raid.get("event_id", ACTIVE_EVENT)
+        event_ids.append(active if event_id is ACTIVE_EVENT else event_id)
+        for uuid, ign in _participants(raid):
+            p_logs.append(log_id)
+            p_uuids.append(uuid)
+            p_igns.append(ign)
+
+    cur.execute(_INSERT_LOGS, (
+        log_ids, event_ids,
+        [r.get("raid_type") for r in raids],
+        [r.get("completed_at") for r in raids],
+    ))
+    cur.execute(_INSERT_PARTICIPANTS, (p_logs, p_uuids, p_igns))
+    inserted = cur.fetchall()
+
+    if tally:
+        _tally(cur, inserted, dict(zip(log_ids, event_ids)), uncollected)
+
+    events = sorted({e for e in event_ids if e is not None})
+    if events:
+        cur.execute(_UPSERT_STANDINGS, (log_ids,))
+        cur.execute(RANK_STANDINGS, (events,))
+    return log_ids
+
+
+def _tally(cur, inserted, event_by_log, uncollected=True):
+    """Credit each uuid once per raid in uncollected_raids and the event totals."""
+    raids, igns, totals = Counter(), {}, Counter()
+    for log_id, uuid, ign in inserted:
+        if uuid is None:
+            continue
+        uuid = str(uuid)
+        raids[uuid] += 1
+        if ign:
+            igns[uuid] = ign
+        event_id = event_by_log.get(log_id)
+        if event_id is not None:
+            totals[(event_id, uuid)] += 1
+
+    if raids and uncollected:
+        uuids = list(raids)
+        cur.execute(_UPSERT_UNCOLLECTED, (uuids, [igns.get(u) for u in uuids], [raids[u] for u in uuids]))
+    if totals:
+        keys = list(totals)
+        cur.execute(_UPSERT_EVENT_TOTALS, (
+            [e for e, _ in keys], [u for _, u in keys], [totals[k] for k in keys],
+        ))
@@ -0,0 +1,182 @@
+"""
+Helpers/guild_colors.py
+In-memory guild prefix -> colour map shared by /map, the snipe cards and
+anything else that colours a guild tag.
+
+Fed by the hourly Athena refresh in Tasks/cache_guild_colors.py (and, until
+that first runs, by the copy it stored in ``cache_entries``). Lookups never do
+I/O: a tag Athena doesn't know gets the default colour and is queued, and the
+same task resolves queued tags from their Wynncraft banner in small batches.
+Keys are normalised (stripped, upper-case).
+"""
+
+import json
+import os
+import threading
+import time
+
+from Helpers.database import DB
+from Helpers.functions import get_guild_color, timed_get, urlify
+from Helpers.logger import log, ERROR
+
+DEFAULT_COLOR = '#ffffff'
+
+# Queued tags resolved per batch, and how many may wait at once.
+RESOLVE_BATCH = 10
+MAX_PENDING = 500
+# A tag that couldn't be resolved is not retried for this long.
+RETRY_AFTER_S = 6 * 60 * 60
+
+_lock = threading.Lock()
+_athena: dict = {}        # prefix -> colour from the Athena guild list
+_resolved: dict = {}      # prefix -> colour from a Wynncraft banner
+_pending: dict = {}       # prefix -> queued at (insertion-ordered)
+_failed: dict = {}        # prefix -> failed at
+version = 0               # bumped whenever any colour changes
+
+
+def normalize(tag) -> str:
+    return (tag or '').strip().upper()
+
+
+def _bump():
+    global version
+    version += 1
+
+
+def load_athena(guilds) -> int:
+    """Replace the Athena map from a guildList payload. Returns entries kept."""
+    colors = {}
+    for row in guilds or ():
+        try:
+            prefix = normalize(row.get('prefix'))
+            color = (row.get('color') or '').strip()
+        except AttributeError:
+            continue
+        if prefix and color:
+            colors[prefix] = color
+    if not colors:
+        return 0
+    with _lock:
+        if colors != _athena:
+            _athena.clear()
+            _athena.update(colors)
+            for prefix in colors:
+                _pending.pop(prefix, None)
+            _bump()
+    return len(colors)
+
+
+def load_from_db_sync() -> int:
+    """Seed from the last stored Athena list (blocking; call via to_thread)."""
+    try:
+        with DB() as db:
+            db.cursor.execute("SELECT data FROM cache_entries WHERE cache_key = 'guildColors'")
+            row = db.cursor.fetchone()
+    except Exception as e:
+        log(ERROR, f"Failed to load stored guild colours: {e}", context="guild_colors")
+        return 0
+    if not row or not row[0]:
+        return 0
+    data = row[0] if isinstance(row[0], list) else json.loads(row[0])
+    return load_athena(data)
+
+
+def _known(prefix):
+    return _athena.get(prefix) or _resolved.get(prefix)
+
+
+def _queue(prefix, now):
+    failed_at = _failed.get(prefix)
+    if failed_at is not None and now - failed_at < RETRY_AFTER_S:
+        return
+    if prefix not in _pending and len(_pending) < MAX_PENDING:
+        _pending[prefix] = now
+
+
+def get(tag, default=DEFAULT_COLOR) -> str:
+    """Colour for one tag; unknown tags are queued for background resolution."""
+    prefix = normalize(tag)
+    if not prefix:
+        return default
+    with _lock:
+        color = _known(prefix)
+        if color is None:
+            _queue(prefix, time.time())
+    return color or default
+
+
+def lookup(tags, default=DEFAULT_COLOR) -> dict:
+    """{normalised tag: colour} for every non-empty tag in `tags`."""
+    now = time.time()
+    result = {}
+    with _lock:
+        for tag in tags:
+            prefix = normalize(tag)
+            if not prefix or prefix in result:
+                continue
+            color = _known(prefix)
+            if color is None:
+                _queue(prefix, now)
+            result[prefix] = color or default
+    return result
+
+
+def _banner_color_sync(prefix):
+    resp = timed_get(
+        f'https://api.wynncraft.com/v3/guild/prefix/{urlify(prefix)}',
+        timeout=10,
+        headers={"Authorization": f"Bearer {os.getenv('WYNN_TOKEN')}"},
+    )
+    if resp.status_code == 404:
+        return None
+    resp.raise_for_status()
+    return get_guild_color(resp.json())
+
+
+def next_batch(limit=RESOLVE_BATCH) -> list:
+    """The oldest queued tags, for the background resolver."""
+    with _lock:
+        return list(_pending)[:limit]
+
+
+def resolve_sync(prefix, fetch=None) -> bool:
+    """Resolve one queued tag from its Wynncraft banner (blocking).
+
+    A tag that is unknown upstream or fails is parked for RETRY_AFTER_S so it
+    is not fetched on every pass.
+    """
+    try:
+        color = (fetch or _banner_color_sync)(prefix)
+    except Exception:
+        color = None
+    with _lock:
+        _pending.pop(prefix, None)
+        if color:
+            _resolved[prefix] = color
+            _failed.pop(prefix, None)
+            _bump()
+        else:
+            _failed[prefix] = time.time()
+    return bool(color)
+
+
+def stats() -> dict:
+    with _lock:
+        return {
+            "athena": len(_athena),
+            "resolved": len(_resolved),
+            "pending": len(_pending),
+            "failed": len(_failed),
+            "version": version,
+        }
+
+
+def _reset_for_tests():
+    global version
+    with _lock:
+        _athena.clear()
+        _resolved.clear()
+        _pending.clear()
+        _failed.clear()
+        version = 0
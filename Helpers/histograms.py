@@ -0,0 +1,163 @@
+"""
+Helpers/histograms.py
+Fixed-memory latency histograms, kept in-process.
+
+Per-event telemetry lines only survive as long as Railway's log retention, and
+are too sparse to compare one deploy against the next. These histograms keep
+the distribution itself: every command total and every bucket span
+(db.connect, db.query, http.<host>, s3.get, render, ...) lands in a
+log-linear histogram — HDR-style, 16 sub-buckets per power of two, so any
+percentile is within ~6% of the true value — over a fixed 464-slot array,
+whatever the traffic.
+
+Each series keeps two histograms: a one-minute window, drained into a
+`latency_summary` record by Tasks/latency_summary.py, and a since-start one
+for the /latency admin dump.
+
+Like telemetry, nothing here may raise into a caller.
+"""
+
+import threading
+import time
+
+# Values are recorded in integer microseconds. Below 2**(_SUB_BITS+1) µs every
+# value has its own slot; above that each power of two is split into
+# 2**_SUB_BITS equal slots.
+_SUB_BITS = 4
+_SUB_COUNT = 1 << _SUB_BITS          # 16
+_LINEAR = _SUB_COUNT * 2             # 32 exact slots for 0..31 µs
+_MAX_US = (1 << 32) - 1              # ~71 minutes; larger values clamp here
+_SLOTS = _LINEAR + (_MAX_US.bit_length() - _SUB_BITS - 1) * _SUB_COUNT
+
+# Bounds the number of series, so an unexpected http.<host> fan-out can't grow
+# memory without limit. Series beyond it are counted and dropped.
+MAX_SERIES = 256
+
+PERCENTILES = (0.50, 0.90, 0.99)
+
+
+def _index(us):
+    if us < _LINEAR:
+        return us
+    shift = us.bit_length() - _SUB_BITS - 1
+    return _LINEAR + (shift - 1) * _SUB_COUNT + (us >> shift) - _SUB_COUNT
+
+
+def _upper_us(idx):
+    """Highest value (µs) that lands in slot `idx`."""
+    if idx < _LINEAR:
+        return idx
+    shift, sub = divmod(idx - _LINEAR, _SUB_COUNT)
+    shift += 1
+    return ((sub + _SUB_COUNT + 1) << shift) - 1
+
+
+class Histogram:
+    """Log-linear histogram over a fixed slot array; values in milliseconds."""
+
+    __slots__ = ("counts", "n", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * _SLOTS
+        self.n = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        us = min(_MAX_US, max(0, int(ms * 1000.0)))
+        self.counts[_index(us)] += 1
+        self.n += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q):
+        """Upper bound of the slot holding the q-quantile, capped at the max."""
+        if self.n == 0:
+            return 0.0
+        rank = max(1, int(round(q * self.n)))
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            if not c:
+                continue
+            seen += c
+            if seen >= rank:
+                return min(self.max_ms, _upper_us(idx) / 1000.0)
+        return self.max_ms
+
+    def summary(self):
+        out = {"n": self.n}
+        for q in PERCENTILES:
+            out[f"p{int(q * 100)}"] = round(self.percentile(q), 2)
+        out["max"] = round(self.max_ms, 2)
+        out["mean"] = round(self.total_ms / self.n, 2) if self.n else 0.0
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+# Samples are recorded from worker threads (asyncio.to_thread helpers) as well
+# as the loop.
+_lock = threading.Lock()
+_window: dict = {}      # series -> Histogram, reset every summary
+_lifetime: dict = {}    # series -> Histogram, since process start
+_window_started = time.monotonic()
+_started = time.monotonic()
+_dropped_series = 0
+
+
+def record(series: str, ms: float) -> None:
+    """Add one duration (ms) to a series. Never raises."""
+    global _dropped_series
+    try:
+        with _lock:
+            life = _lifetime.get(series)
+            if life is None:
+                if len(_lifetime) >= MAX_SERIES:
+                    _dropped_series += 1
+                    return
+                life = _lifetime[series] = Histogram()
+            win = _window.get(series)
+            if win is None:
+                win = _window[series] = Histogram()
+            life.record(ms)
+            win.record(ms)
+    except Exception:
+        pass
+
+
+def drain_window(now=None):
+    """Summarise and reset the current window. Returns (window_s, {series: summary})."""
+    global _window, _window_started
+    if now is None:
+        now = time.monotonic()
+    with _lock:
+        window, _window = _window, {}
+        window_s = now - _window_started
+        _window_started = now
+    return round(window_s, 1), {k: h.summary() for k, h in sorted(window.items()) if h.n}
+
+
+def snapshot(lifetime=True):
+    """Summaries for every series, without resetting anything."""
+    with _lock:
+        source = _lifetime if lifetime else _window
+        return {k: h.summary() for k, h in sorted(source.items()) if h.n}
+
+
+def uptime_s():
+    return round(time.monotonic() - _started, 1)
+
+
+def dropped_series():
+    return _dropped_series
+
+
+def reset():
+    """Clear everything (tests, and the admin command's reset option)."""
+    global _window, _lifetime, _window_started, _dropped_series
+    with _lock:
+        _window, _lifetime = {}, {}
+        _window_started = time.monotonic()
+        _dropped_series = 0
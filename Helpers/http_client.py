@@ -0,0 +1,182 @@
+"""
+Helpers/http_client.py
+Shared async HTTP client for code already running on the event loop.
+
+``timed_get`` is the blocking twin: it stays for the threaded helpers (Guild,
+BasicPlayerStats, ...) that have to be synchronous. Async callers should use
+``get`` here instead of ``asyncio.to_thread(timed_get, ...)`` or a throwaway
+``aiohttp.ClientSession()``, so that:
+
+  * one keep-alive connection pool serves every host (no fresh TLS per call,
+    no default-executor slot held for the length of a request);
+  * concurrency is capped per host, so a loop that fans out cannot open more
+    sockets to one upstream than it will tolerate;
+  * timings land in the same ``http.<host>`` telemetry buckets, Wynncraft
+    responses feed the same token budgets, and the default timeout is the same
+    15s as timed_get.
+
+HTTP/2 is not offered: aiohttp speaks HTTP/1.1 only and none of our upstreams
+need more than keep-alive. Cookies are never stored, for the same reason as
+timed_get's session — several token identities share the pool.
+
+The session and per-host semaphores are bound to the running loop and are
+recreated if the loop changes (tests run one loop per case).
+"""
+
+import asyncio
+import json as _json
+import os
+from urllib.parse import quote, urlparse
+from uuid import UUID
+
+import aiohttp
+
+from Helpers import telemetry, wynn_budget
+
+DEFAULT_TIMEOUT = 15
+POOL_SIZE = 32
+HOST_LIMITS = {
+    "api.wynncraft.com": 8,
+}
+DEFAULT_HOST_LIMIT = 6
+
+_state = {"loop": None, "session": None, "limits": {}}
+
+
+class HTTPStatusError(Exception):
+    """Raised by Response.raise_for_status for 4xx/5xx responses."""
+
+    def __init__(self, response):
+        super().__init__(f"{response.status} for {response.url}")
+        self.response = response
+
+
+# Everything a request through this module can raise.
+RequestError = (aiohttp.ClientError, asyncio.TimeoutError, HTTPStatusError)
+
+
+class Response:
+    """A fully-read response with the requests-style accessors callers expect."""
+
+    __slots__ = ("url", "status", "headers", "content")
+
+    def __init__(self, url: str, status: int, headers, content: bytes):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.content = content
+
+    @property
+    def status_code(self) -> int:
+        return self.status
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return _json.loads(self.content)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise HTTPStatusError(self)
+
+
+def _session() -> aiohttp.ClientSession:
+    loop = asyncio.get_running_loop()
+    session = _state["session"]
+    if _state["loop"] is not loop or session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=POOL_SIZE, keepalive_timeout=60, ttl_dns_cache=300)
+        _state.update(
+            loop=loop,
+            session=aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar()),
+            limits={},
+        )
+    return _state["session"]
+
+
+def _host_limit(host: str) -> asyncio.Semaphore:
+    sem = _state["limits"].get(host)
+    if sem is None:
+        sem = _state["limits"][host] = asyncio.Semaphore(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+    return sem
+
+
+async def get(url: str, *, headers: dict | None = None, params: dict | None = None,
+              timeout: float = DEFAULT_TIMEOUT) -> Response:
+    """GET through the shared pool. Raises RequestError on transport failures."""
+    return await request("GET", url, headers=headers, params=params, timeout=timeout)
+
+
+async def request(method: str, url: str, *, headers: dict | None = None, params: dict | None = None,
+                  json=None, data=None, timeout: float = DEFAULT_TIMEOUT) -> Response:
+    """Any method through the shared pool; ``json``/``data`` are passed to aiohttp as-is."""
+    try:
+        host = urlparse(url).hostname or "unknown"
+    except Exception:
+        host = "unknown"
+    session = _session()
+    auth = (headers or {}).get("Authorization") if host == "api.wynncraft.com" else None
+    client_timeout = aiohttp.ClientTimeout(total=timeout, connect=min(5, timeout))
+
+    try:
+        async with _host_limit(host):
+            with telemetry.track(f"http.{host}"):
+                async with session.request(method, url, headers=headers, params=params, json=json, data=data,
+                                           timeout=client_timeout, allow_redirects=method != "HEAD") as resp:
+                    body = await resp.read()
+                    response = Response(str(resp.url), resp.status, resp.headers, body)
+    except BaseException:
+        # Cancellation too (cog unload, an outer wait_for): an acquired
+        # budget slot must be given back however the request ends.
+        if host == "api.wynncraft.com":
+            wynn_budget.record_failure(auth)
+        raise
+
+    if host == "api.wynncraft.com":
+        wynn_budget.record_response(auth, response.headers, response.status)
+    return response
+
+
+async def close():
+    session = _state["session"]
+    if session is not None and not session.closed:
+        await session.close()
+    _state.update(loop=None, session=None, limits={})
+
+
+# --- Wynncraft / Mojang helpers (async twins of Helpers/functions) ---
+
+def _bearer(token: str | None) -> dict:
+    return {"Authorization": f"Bearer {os.getenv(token or 'WYNN_TOKEN')}"}
+
+
+async def get_player_data(uuid: str, token: str | None = None):
+    """Async getPlayerDatav3: the full player payload, or False on any failure."""
+    try:
+        resp = await get(f"https://api.wynncraft.com/v3/player/{uuid}?fullResult",
+                         headers=_bearer(token), timeout=20)
+        resp.raise_for_status()
+        return resp.json()
+    except (*RequestError, ValueError):
+        return False
+
+
+async def get_player_uuid(player: str, token: str | None = None):
+    """Async getPlayerUUID: [username, uuid] via Mojang, then Wynncraft, else False."""
+    try:
+        data = (await get(f"https://api.mojang.com/users/profiles/minecraft/{quote(player)}")).json()
+        return [data["name"], str(UUID(data["id"]))]
+    except Exception:
+        pass
+    try:
+        resp = await get(f"https://api.wynncraft.com/v3/player/{quote(player)}",
+                         headers=_bearer(token), timeout=10)
+        data = resp.json()
+        return [data["username"], str(UUID(data["uuid"]))]
+    except Exception:
+        return False
@@ -7,10 +7,27 @@ Usage:
 
     log(INFO, "Something happened")
     log(ERROR, "Uh oh", context="task_name")
+
+The console gets every line. The Discord side is deliberately lossy so an API
+outage can't flood the log channel for minutes afterwards:
+
+- Repeats are aggregated. Lines that only differ by numbers/UUIDs share a key;
+  a repeat inside AGGREGATE_WINDOW_S bumps a counter instead of queueing, and
+  surfaces as ``(×37)`` on the queued line or as a ``(×37 in the last 5 min)``
+  summary once the window closes.
+- Each context is rate limited (CONTEXT_RATE_PER_MIN). ERROR and SYSTEM lines
+  are exempt.
+- The queue is bounded (MAX_QUEUED). On overflow the oldest lowest-priority
+  line is evicted, so errors survive a flood of INFO.
+- Everything dropped is counted (see ``stats()``) and reported in the channel
+  with the next flush.
 """
 
 import asyncio
 import datetime
+import re
+import threading
+import time
 from datetime import timezone
 from collections import deque
 
@@ -25,10 +42,57 @@ INFO    = "🟦"   # General info, loop lifecycle, task progress
 WARN    = "🟨"   # Non-critical warnings
 ERROR   = "🟥"   # Errors, exceptions, failures
 
+# Higher survives overflow longer. Levels at or above _EXEMPT_PRIORITY skip
+# the per-context rate limit.
+_PRIORITY = {INFO: 0, SUCCESS: 0, WARN: 1, SYSTEM: 2, ERROR: 3}
+_EXEMPT_PRIORITY = 2
+
+# ---------------------------------------------------------------------------
+# Limits
+# ---------------------------------------------------------------------------
+MAX_QUEUED = 300               # lines waiting for the Discord channel
+AGGREGATE_WINDOW_S = 300.0     # repeats inside this window collapse into one line
+MAX_AGGREGATE_KEYS = 2000      # bound on distinct keys tracked for aggregation
+CONTEXT_RATE_PER_MIN = 30      # Discord lines per context per minute (token bucket)
+FLUSH_INTERVAL_S = 5
+MAX_MESSAGE_CHARS = 1900
+
+_UUID_RE = re.compile(r"[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}")
+_NUM_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+class _Entry:
+    """One queued Discord line plus the repeats folded into it."""
+
+    __slots__ = ("level", "stamp", "ctx", "message", "key", "opened", "count", "queued")
+
+    def __init__(self, level, stamp, ctx, message, key, opened):
+        self.level = level
+        self.stamp = stamp
+        self.ctx = ctx
+        self.message = message
+        self.key = key
+        self.opened = opened   # monotonic start of the aggregation window
+        self.count = 1         # occurrences not yet reported to Discord
+        self.queued = True
+
+    def render(self):
+        suffix = f" (×{self.count})" if self.count > 1 else ""
+        return f"{self.level} `{self.stamp}` {self.ctx}{self.message}{suffix}"
+
+
 # ---------------------------------------------------------------------------
 # Internal state
 # ---------------------------------------------------------------------------
+# log() is called from worker threads (asyncio.to_thread helpers) as well as the
+# loop, and the aggregation bookkeeping below is multi-step, so it is locked.
+_lock = threading.Lock()
 _queue: deque = deque()
+_recent: dict = {}             # aggregation key -> _Entry
+_buckets: dict = {}            # context -> [tokens, last_refill]
+_dropped = {"overflow": 0, "rate_limited": 0}
+_dropped_unreported = 0
+_aggregated = 0
 _client = None
 _flush_task = None
 
@@ -63,14 +127,159 @@ def log(level: str, message: str, *, context: str | None = None):
     context : str, optional
         Module or task name shown as ``[context]``.
     """
-    now = datetime.datetime.now(timezone.utc).strftime("%H:%M:%S")
     ctx = f"[{context}] " if context else ""
 
     # Console
     print(f"{level} {ctx}{message}", flush=True)
 
     # Discord queue
-    _queue.append(f"{level} `{now}` {ctx}{message}")
+    try:
+        with _lock:
+            _enqueue(level, message, context, ctx, time.monotonic())
+    except Exception:
+        pass  # never break a caller over a log failure
+
+
+def stats() -> dict:
+    """Snapshot of the Discord sink's counters."""
+    with _lock:
+        return {
+            "queued": len(_queue),
+            "aggregating": len(_recent),
+            "aggregated": _aggregated,
+            "dropped_overflow": _dropped["overflow"],
+            "dropped_rate_limited": _dropped["rate_limited"],
+        }
+
+
+# ---------------------------------------------------------------------------
+# Queueing (call with _lock held)
+# ---------------------------------------------------------------------------
+
+def _aggregate_key(level, context, message):
+    masked = _NUM_RE.sub("#", _UUID_RE.sub("<uuid>", message))
+    return level, context, masked
+
+
+def _enqueue(level, message, context, ctx, now):
+    global _aggregated
+    key = _aggregate_key(level, context, message)
+    entry = _recent.get(key)
+    if entry is not None:
+        if now - entry.opened < AGGREGATE_WINDOW_S:
+            entry.count += 1
+            _aggregated += 1
+            return
+        _close_window(entry)
+
+    priority = _PRIORITY.get(level, 0)
+    if priority < _EXEMPT_PRIORITY and not _take_token(context or "", now):
+        _drop("rate_limited")
+        return
+
+    stamp = datetime.datetime.now(timezone.utc).strftime("%H:%M:%S")
+    entry = _Entry(level, stamp, ctx, message, key, now)
+    if len(_recent) >= MAX_AGGREGATE_KEYS:
+        _expire(now, force=True)
+    _recent[key] = entry
+    _push(entry)
+
+
+def _push(entry):
+    """Append to the bounded queue, evicting the oldest lowest-priority line."""
+    if len(_queue) >= MAX_QUEUED:
+        priority = _PRIORITY.get(entry.level, 0)
+        victim = min(_queue, key=lambda e: _PRIORITY.get(e.level, 0))
+        if _PRIORITY.get(victim.level, 0) > priority:
+            victim = entry
+        else:
+            _queue.remove(victim)
+        # Only repeats seen after the drop are summarised when the window closes.
+        victim.queued = False
+        victim.count = 0
+        _drop("overflow")
+        if victim is entry:
+            return
+    entry.queued = True
+    _queue.append(entry)
+
+
+def _drop(reason):
+    global _dropped_unreported
+    _dropped[reason] += 1
+    _dropped_unreported += 1
+
+
+def _take_token(context, now):
+    bucket = _buckets.get(context)
+    if bucket is None:
+        bucket = _buckets[context] = [float(CONTEXT_RATE_PER_MIN), now]
+    tokens, last = bucket
+    tokens = min(float(CONTEXT_RATE_PER_MIN), tokens + (now - last) * CONTEXT_RATE_PER_MIN / 60.0)
+    if tokens < 1.0:
+        bucket[0], bucket[1] = tokens, now
+        return False
+    bucket[0], bucket[1] = tokens - 1.0, now
+    return True
+
+
+def _close_window(entry):
+    """Retire an aggregation key, queueing a summary of unreported repeats."""
+    _recent.pop(entry.key, None)
+    if entry.queued or entry.count == 0:
+        return
+    minutes = max(1, round(AGGREGATE_WINDOW_S / 60))
+    summary = _Entry(
+        entry.level, entry.stamp, entry.ctx,
+        f"{entry.message} (×{entry.count} in the last {minutes} min)",
+        entry.key, entry.opened,
+    )
+    summary.count = 1
+    _push(summary)
+
+
+def _expire(now, force=False):
+    """Close windows that have run out; with force, also the oldest half."""
+    for entry in list(_recent.values()):
+        if now - entry.opened >= AGGREGATE_WINDOW_S:
+            _close_window(entry)
+    if force and len(_recent) >= MAX_AGGREGATE_KEYS:
+        oldest = sorted(_recent.values(), key=lambda e: e.opened)
+        for entry in oldest[: len(oldest) // 2]:
+            _close_window(entry)
+
+
+def _drain():
+    """Pop queued lines into Discord-sized batches."""
+    global _dropped_unreported
+    lines = []
+    with _lock:
+        _expire(time.monotonic())
+        if _dropped_unreported:
+            lines.append(f"{WARN} `{datetime.datetime.now(timezone.utc).strftime('%H:%M:%S')}` "
+                         f"[logger] {_dropped_unreported} log line(s) dropped "
+                         f"(overflow/rate limit; see console)")
+            _dropped_unreported = 0
+        while _queue:
+            entry = _queue.popleft()
+            entry.queued = False
+            lines.append(entry.render())
+            # Later repeats in this window are counted from zero and reported
+            # as a summary when the window closes.
+            entry.count = 0
+
+    batches = []
+    batch = ""
+    for line in lines:
+        line = line[:MAX_MESSAGE_CHARS]
+        # +1 for the newline
+        if batch and len(batch) + len(line) + 1 > MAX_MESSAGE_CHARS:
+            batches.append(batch)
+            batch = ""
+        batch = f"{batch}\n{line}" if batch else line
+    if batch:
+        batches.append(batch)
+    return batches
 
 
 # ---------------------------------------------------------------------------
@@ -84,31 +293,19 @@ async def _flush_loop():
             await _flush()
         except Exception:
             pass  # never crash the bot over a log failure
-        await asyncio.sleep(5)
+        await asyncio.sleep(FLUSH_INTERVAL_S)
 
 
 async def _flush():
-    if not _client or not _queue:
+    if not _client:
         return
 
     channel = _client.get_channel(LOG_CHANNEL_ID)
     if not channel:
         return
 
-    while _queue:
-        batch = ""
-        while _queue:
-            line = _queue[0]
-            # +1 for the newline
-            if batch and len(batch) + len(line) + 1 > 1900:
-                break
-            _queue.popleft()
-            if batch:
-                batch += "\n"
-            batch += line
-
-        if batch:
-            try:
-                await channel.send(batch)
-            except Exception:
-                pass
+    for batch in _drain():
+        try:
+            await channel.send(batch)
+        except Exception:
+            pass
@@ -0,0 +1,250 @@
+"""
+Helpers/metrics.py
+Opt-in OpenMetrics endpoint for the bot's in-process state.
+
+Pool exhaustion, loop lag, cache and rate-limiter state otherwise only exist
+as log lines or not at all. This serves them as OpenMetrics text on
+``GET /metrics`` so they can be scraped and alerted on.
+
+Disabled unless METRICS_PORT is set. Binds METRICS_HOST, default 127.0.0.1;
+on Railway set ``METRICS_HOST=::`` to expose it on the private network only
+(the worker has no public domain).
+
+Collection reads in-memory state only — no DB, HTTP or S3 — and each source
+is isolated, so one broken collector drops its own families, never the page.
+"""
+
+import math
+import os
+import time
+
+from aiohttp import web
+
+from Helpers.logger import log, ERROR, SUCCESS
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = "tort"
+
+_STARTED = time.time()
+_runner = None
+
+
+class Family:
+    """One metric family: a TYPE/HELP header plus its samples."""
+
+    def __init__(self, name, kind, help_text):
+        self.name = f"{PREFIX}_{name}"
+        self.kind = kind
+        self.help = help_text
+        self.samples = []
+
+    def add(self, value, suffix="", **labels):
+        self.samples.append((suffix, labels, value))
+        return self
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(int(value)) if value.is_integer() else repr(value)
+
+
+def render(families) -> str:
+    lines = []
+    for fam in families:
+        if not fam.samples:
+            continue
+        lines.append(f"# TYPE {fam.name} {fam.kind}")
+        lines.append(f"# HELP {fam.name} {_escape(fam.help)}")
+        for suffix, labels, value in fam.samples:
+            label_str = ""
+            if labels:
+                label_str = "{" + ",".join(
+                    f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())
+                ) + "}"
+            lines.append(f"{fam.name}{suffix}{label_str} {_number(value)}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Collectors
+# ---------------------------------------------------------------------------
+
+def _db_pools():
+    from Helpers.database import DB
+
+    conns = Family("db_pool_connections", "gauge", "Pooled DB connections by state")
+    limit = Family("db_pool_max_connections", "gauge", "Pool size bound (DB_POOL_MAX)")
+    for stat in DB.pool_stats():
+        conns.add(stat["in_use"], pool=stat["pool"], state="in_use")
+        conns.add(stat["idle"], pool=stat["pool"], state="idle")
+        limit.add(stat["max"], pool=stat["pool"])
+    waits = Family("db_pool_waits", "counter", "Checkout retries taken on an exhausted pool")
+    waits.add(DB._pool_waits, "_total")
+    exhausted = Family("db_pool_exhausted", "counter", "Checkouts that failed after all retries")
+    exhausted.add(DB._pool_exhausted, "_total")
+    return [conns, limit, waits, exhausted]
+
+
+def _caches():
+    from Helpers.functions import _cached_font
+    from Helpers.openai_helper import result_cache_stats
+    from Helpers.settings import settings
+    from Helpers.storage import background_cache_stats, storage
+
+    entries = Family("cache_entries", "gauge", "Entries held by an in-process cache")
+    hits = Family("cache_hits", "counter", "In-process cache hits")
+    misses = Family("cache_misses", "counter", "In-process cache misses")
+
+    bg = background_cache_stats()
+    entries.add(bg["entries"], cache="backgrounds")
+    hits.add(bg["hits"], "_total", cache="backgrounds")
+    misses.add(bg["misses"], "_total", cache="backgrounds")
+
+    fonts = _cached_font.cache_info()
+    entries.add(fonts.currsize, cache="fonts")
+    hits.add(fonts.hits, "_total", cache="fonts")
+    misses.add(fonts.misses, "_total", cache="fonts")
+
+    images = storage.image_cache_info()
+    entries.add(images["entries"], cache="s3_images")
+    hits.add(images["hits"] + images["revalidated"] + images["disk_hits"], "_total", cache="s3_images")
+    misses.add(images["misses"], "_total", cache="s3_images")
+
+    ai = result_cache_stats()
+    entries.add(ai["entries"], cache="openai_results")
+    hits.add(ai["hits"], "_total", cache="openai_results")
+    misses.add(ai["misses"], "_total", cache="openai_results")
+
+    st = settings.cache_stats()
+    entries.add(st["entries"], cache="settings")
+    hits.add(st["hits"], "_total", cache="settings")
+    misses.add(st["misses"], "_total", cache="settings")
+    return [entries, hits, misses]
+
+
+def _loop_lag():
+    from Tasks import loop_lag
+
+    summary = dict(loop_lag.latest_summary)
+    fam = Family("loop_lag_ms", "gauge", "Event-loop drift over the last one-minute window")
+    if summary:
+        fam.add(summary.get("p50_ms", 0), quantile="0.5")
+        fam.add(summary.get("p95_ms", 0), quantile="0.95")
+        fam.add(summary.get("max_ms", 0), quantile="1")
+    return [fam]
+
+
+def _rate_limits():
+    from Helpers import wynn_budget
+    from Helpers.rate_limiter import limiter_stats
+
+    keys = Family("command_rate_limiter_keys", "gauge", "Keys tracked by a command rate limiter")
+    rejected = Family("command_rate_limiter_rejected", "counter", "Invocations refused by a limiter")
+    for stat in limiter_stats():
+        keys.add(stat["users"], limiter=stat["limiter"], kind="user")
+        keys.add(stat["guilds"], limiter=stat["limiter"], kind="guild")
+        rejected.add(stat["rejected"], "_total", limiter=stat["limiter"])
+
+    budget = Family("wynn_rate_budget_remaining", "gauge", "Wynncraft API calls left in the current window")
+    limit = Family("wynn_rate_budget_limit", "gauge", "Wynncraft per-window limit as last reported")
+    waits = Family("wynn_rate_budget_waits", "counter", "Background calls that waited for a window reset")
+    throttled = Family("wynn_rate_budget_throttled", "counter", "429 responses from the Wynncraft API")
+    for stat in wynn_budget.stats():
+        budget.add(stat["remaining"], token=stat["token"])
+        limit.add(stat["limit"], token=stat["token"])
+        waits.add(stat["waits"], "_total", token=stat["token"])
+        throttled.add(stat["throttled"], "_total", token=stat["token"])
+    return [keys, rejected, budget, limit, waits, throttled]
+
+
+def _tasks():
+    from Helpers import telemetry
+
+    last_run = Family("task_last_run_timestamp_seconds", "gauge", "When a task loop iteration last finished")
+    duration = Family("task_last_duration_seconds", "gauge", "Duration of the last task loop iteration")
+    runs = Family("task_runs", "counter", "Task loop iterations since start")
+    failures = Family("task_failures", "counter", "Task loop iterations that raised")
+    for name, status in sorted(telemetry.task_status().items()):
+        last_run.add(status.get("last_end", 0), task=name)
+        duration.add(status.get("last_ms", 0) / 1000.0, task=name)
+        runs.add(status["runs"], "_total", task=name)
+        failures.add(status["failures"], "_total", task=name)
+    return [last_run, duration, runs, failures]
+
+
+def _logger():
+    from Helpers import logger
+
+    stats = logger.stats()
+    queued = Family("log_queue_lines", "gauge", "Log lines waiting for the Discord channel")
+    queued.add(stats["queued"])
+    dropped = Family("log_dropped_lines", "counter", "Log lines dropped before reaching Discord")
+    dropped.add(stats["dropped_overflow"], "_total", reason="overflow")
+    dropped.add(stats["dropped_rate_limited"], "_total", reason="rate_limited")
+    return [queued, dropped]
+
+
+def collect(client=None) -> list:
+    """Every family from every source. A failing source is logged and skipped."""
+    families = []
+    sources = (
+        ("db_pools", _db_pools),
+        ("caches", _caches),
+        ("loop_lag", _loop_lag),
+        ("rate_limits", _rate_limits),
+        ("tasks", _tasks),
+        ("logger", _logger),
+    )
+    for name, source in sources:
+        try:
+            families.extend(source())
+        except Exception as e:
+            log(ERROR, f"Metrics collector {name} failed: {e}", context="metrics")
+    up = Family("process_start_time_seconds", "gauge", "Process start time")
+    up.add(_STARTED)
+    families.append(up)
+    return families
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+async def start(client):
+    """Start serving /metrics if METRICS_PORT is set. Idempotent; never raises."""
+    global _runner
+    port = os.getenv("METRICS_PORT", "").strip()
+    if _runner is not None or not port:
+        return
+    host = os.getenv("METRICS_HOST", "127.0.0.1")
+
+    async def handle(request):
+        body = render(collect(client))
+        return web.Response(body=body.encode(), headers={"Content-Type": CONTENT_TYPE})
+
+    try:
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, int(port)).start()
+        _runner = runner
+        log(SUCCESS, f"Metrics endpoint listening on {host}:{port}/metrics", context="metrics")
+    except Exception as e:
+        log(ERROR, f"Metrics endpoint failed to start: {e}", context="metrics")
+
+
+async def stop():
+    global _runner
+    if _runner is not None:
+        await _runner.cleanup()
+        _runner = None
@@ -1,8 +1,17 @@
+import hashlib
+import json
 import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+
 from openai import OpenAI
 from pydantic import BaseModel
 
-from Helpers.logger import log, INFO, ERROR
+from Helpers.app_classifier import classify_application
+from Helpers.database import DB
+from Helpers.logger import log, INFO, WARN, ERROR
 
 _client = None
 
@@ -68,7 +77,53 @@ def query(
     temperature: float | None = None,
     max_tokens: int = 500,
     reasoning_effort: str | None = None,
+    cache: bool = True,
 ) -> dict:
+    """Run one completion, answering from the result cache when possible.
+
+    Successful results are cached by ``cache_key``; concurrent calls for the
+    same key share one request. Errors are never cached. Pass ``cache=False``
+    when a fresh answer is needed.
+    """
+    call = (instructions, input_text, model, json_schema, temperature, max_tokens, reasoning_effort)
+    if not cache:
+        return _query_remote(*call)
+
+    key = cache_key(*call)
+    hit = _cache_get(key)
+    if hit is not None:
+        return hit
+
+    with _cache_lock:
+        # Re-check under the lock: the owner of an identical call may have
+        # finished between the lookup above and here.
+        hit = _memory_get(key)
+        pending = _inflight.get(key) if hit is None else None
+        owner = hit is None and pending is None
+        if owner:
+            pending = _inflight[key] = Future()
+    if hit is not None:
+        return hit
+    if not owner:
+        cache_stats["shared"] += 1
+        return dict(pending.result())
+
+    try:
+        cache_stats["misses"] += 1
+        result = _query_remote(*call)
+        if result["error"] is None and result["content"]:
+            _cache_put(key, model, result)
+        pending.set_result(result)
+        return result
+    except BaseException as e:
+        pending.set_exception(e)
+        raise
+    finally:
+        with _cache_lock:
+            _inflight.pop(key, None)
+
+
+def _query_remote(instructions, input_text, model, json_schema, temperature, max_tokens, reasoning_effort) -> dict:
     client = _get_client()
     try:
         kwargs = {
@@ -107,13 +162,156 @@ def query(
             )
         data = None
         if json_schema is not None:
-            import json
             data = json.loads(text)
         return {"content": text, "data": data, "error": None}
     except Exception as e:
         return {"content": None, "data": None, "error": str(e)}
 
 
+# ---------------------------------------------------------------------------
+# Result cache
+# ---------------------------------------------------------------------------
+# The same recruiter names and application texts are classified again every
+# time a ticket is edited, re-read or re-scanned, and each call is a remote
+# round trip of several seconds. Results are kept in a small in-process LRU in
+# front of the openai_result_cache table, so they also survive restarts.
+
+CACHE_TTL_DAYS = 30
+MEMORY_CACHE_SIZE = 512
+# Expired rows are swept on every Nth write rather than by a separate task.
+_PRUNE_EVERY = 100
+
+_memory: OrderedDict = OrderedDict()
+_inflight: dict[str, Future] = {}
+_cache_lock = threading.Lock()
+cache_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "shared": 0, "writes": 0}
+
+
+def _normalise(text: str) -> str:
+    """Unicode-normalised with whitespace runs collapsed; case is kept (IGNs)."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def _template_version(instructions: str, json_schema: type[BaseModel] | None) -> str:
+    """Fingerprint of the prompt and output schema.
+
+    Editing either changes every key built from it, so a reworded prompt never
+    serves answers given to the old one. No version constant to remember.
+    """
+    schema = _strict_schema(json_schema) if json_schema is not None else None
+    blob = json.dumps([instructions, schema], sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+def cache_key(instructions, input_text, model, json_schema=None, temperature=None,
+              max_tokens=500, reasoning_effort=None) -> str:
+    blob = json.dumps([
+        model,
+        _template_version(instructions, json_schema),
+        temperature,
+        max_tokens,
+        reasoning_effort,
+        _normalise(input_text),
+    ])
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def _memory_get(key: str) -> dict | None:
+    result = _memory.get(key)
+    if result is None:
+        return None
+    _memory.move_to_end(key)
+    return dict(result)
+
+
+def _memory_put(key: str, result: dict):
+    _memory[key] = dict(result)
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_CACHE_SIZE:
+        _memory.popitem(last=False)
+
+
+def _cache_get(key: str) -> dict | None:
+    with _cache_lock:
+        hit = _memory_get(key)
+    if hit is not None:
+        cache_stats["memory_hits"] += 1
+        return hit
+
+    db = DB()
+    try:
+        db.connect()
+        db.cursor.execute(
+            """
+            UPDATE openai_result_cache
+               SET hits = hits + 1, last_hit_at = NOW()
+             WHERE cache_key = %s
+               AND created_at > NOW() - make_interval(days => %s)
+            RETURNING content, data
+            """,
+            (key, CACHE_TTL_DAYS),
+        )
+        row = db.cursor.fetchone()
+        db.connection.commit()
+    except Exception as e:
+        log(WARN, f"Result cache read failed: {e}", context="openai_helper")
+        return None
+    finally:
+        db.close()
+
+    if row is None:
+        return None
+    result = {"content": row[0], "data": row[1], "error": None}
+    with _cache_lock:
+        _memory_put(key, result)
+    cache_stats["db_hits"] += 1
+    return dict(result)
+
+
+def _cache_put(key: str, model: str, result: dict):
+    with _cache_lock:
+        _memory_put(key, result)
+    db = DB()
+    try:
+        db.connect()
+        db.cursor.execute(
+            """
+            INSERT INTO openai_result_cache (cache_key, model, content, data)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (cache_key) DO UPDATE SET
+                content = EXCLUDED.content,
+                data = EXCLUDED.data,
+                created_at = NOW()
+            """,
+            (key, model, result["content"], json.dumps(result["data"])),
+        )
+        cache_stats["writes"] += 1
+        if cache_stats["writes"] % _PRUNE_EVERY == 0:
+            db.cursor.execute(
+                "DELETE FROM openai_result_cache WHERE created_at < NOW() - make_interval(days => %s)",
+                (CACHE_TTL_DAYS,),
+            )
+        db.connection.commit()
+    except Exception as e:
+        log(WARN, f"Result cache write failed: {e}", context="openai_helper")
+    finally:
+        db.close()
+
+
+def result_cache_stats() -> dict:
+    with _cache_lock:
+        entries = len(_memory)
+    return {
+        "entries": entries,
+        "hits": cache_stats["memory_hits"] + cache_stats["db_hits"] + cache_stats["shared"],
+        "misses": cache_stats["misses"],
+    }
+
+
+def clear_memory_cache():
+    with _cache_lock:
+        _memory.clear()
+
 
 class RecruiterSource(BaseModel):
     recruiter: str
@@ -295,8 +493,15 @@ Set confidence between 0.0 and 1.0."""
 
 
 def detect_application(message_text: str) -> dict:
-    """Determine if a message is an application response and what type."""
+    """Determine if a message is an application response and what type.
+
+    Clear-cut messages are settled by Helpers/app_classifier.py without a call.
+    """
     preview = message_text[:100].replace('\n', ' ')
+    local = classify_application(message_text)
+    if local is not None:
+        log(INFO, f"\"{preview}\" -> {local['app_type']} (local, confidence: {local['confidence']})", context="openai")
+        return local
     result = query(
         instructions=_DETECT_INSTRUCTIONS,
         input_text=message_text,
@@ -1,8 +1,14 @@
-"""Centralised paginator button helper with emoji fallback."""
+"""Centralised paginator button helper with emoji fallback, and a paginator
+that renders image pages on demand."""
+
+import asyncio
+import threading
 
 import discord
 from discord.ext import pages
 
+from Helpers.logger import log, WARN
+
 # Standard button configuration: (action, custom_emoji, style, unicode_fallback)
 _BUTTON_CONFIG = [
     ('first', '<:first_arrows:1198703152204103760>', discord.ButtonStyle.blurple, '\u23ea'),
@@ -24,3 +30,77 @@ def add_paginator_buttons(paginator):
             paginator.add_button(pages.PaginatorButton(action, emoji=emoji, style=style))
         except Exception:
             paginator.add_button(pages.PaginatorButton(action, emoji=fallback, style=style))
+
+
+class LazyPaginator(pages.Paginator):
+    """Paginator whose pages are rendered on first view instead of up front.
+
+    ``render(index)`` is a blocking function returning the Page for one
+    zero-based index. Every page, the first included, is rendered off the
+    event loop: the first in ``respond``, any other the first time it is
+    navigated to, and the pages next to the one on screen are prefetched in
+    the background. Rendered pages are memoized for
+    the paginator's lifetime, so going back is free.
+
+    Pages should be ``Helpers.classes.Page`` (its files rewind for re-sends).
+    Renders of one paginator are serialised, so ``render`` may share Pillow
+    images and fonts between pages.
+    """
+
+    def __init__(self, page_count: int, render, prefetch: int = 1, **kwargs):
+        self._render_fn = render
+        self._render_lock = threading.Lock()
+        self._prefetch = prefetch
+        self._rendering = {}
+        self._rendered = set()
+        placeholders = [pages.Page(content='\u200b') for _ in range(max(1, page_count))]
+        super().__init__(pages=placeholders, **kwargs)
+
+    def _render(self, index: int):
+        with self._render_lock:
+            return self._render_fn(index)
+
+    async def _ensure(self, index: int):
+        if index in self._rendered or not 0 <= index < len(self.pages):
+            return
+        task = self._rendering.get(index)
+        if task is None:
+            task = self._rendering[index] = asyncio.ensure_future(asyncio.to_thread(self._render, index))
+        try:
+            page = await task
+        finally:
+            self._rendering.pop(index, None)
+        if index not in self._rendered:
+            self.pages[index] = page
+            self._rendered.add(index)
+
+    def _prefetch_around(self, index: int):
+        for offset in range(1, self._prefetch + 1):
+            for neighbour in (index + offset, index - offset):
+                if 0 <= neighbour < len(self.pages) and neighbour not in self._rendered \
+                        and neighbour not in self._rendering:
+                    asyncio.ensure_future(self._quiet_ensure(neighbour))
+
+    async def _quiet_ensure(self, index: int):
+        try:
+            await self._ensure(index)
+        except Exception as e:
+            log(WARN, f"Prefetch of page {index + 1} failed: {e}", context="pagination")
+
+    async def goto_page(self, page_number: int = 0, *, interaction=None) -> None:
+        if interaction is not None and page_number not in self._rendered:
+            # A cold render can outlast the 3 s Discord allows to acknowledge
+            # a click. Acknowledge it first; the base class would defer it a
+            # second time, so it then edits through the stored message.
+            if not interaction.response.is_done():
+                await interaction.response.defer()
+            interaction = None
+        await self._ensure(page_number)
+        await super().goto_page(page_number, interaction=interaction)
+        self._prefetch_around(page_number)
+
+    async def respond(self, *args, **kwargs):
+        await self._ensure(self.current_page)
+        msg = await super().respond(*args, **kwargs)
+        self._prefetch_around(self.current_page)
+        return msg
@@ -0,0 +1,225 @@
+"""Monthly range partitions for the append-only history tables.
+
+player_activity, presence_buckets, presence_ticks and territory_exchanges only
+ever grow, and nearly every read of them is bounded by time: a baseline a
+week back, an hour being rolled up, a season's captures. Partitioned by month
+on that time column, those reads only open the partitions their bounds touch,
+and retention becomes dropping a whole month instead of a DELETE that scans
+an index and leaves dead rows for vacuum.
+
+Each table has a ``<table>_default`` partition so a row never fails to insert
+just because its month was not created yet (a fresh install, or a timestamp
+from an API that is older than expected). Tasks/partition_maintenance.py
+creates months ahead of need, so in practice the default stays empty; when it
+does not, _create_partition moves the stranded rows into their month.
+
+Partition names are ``<table>_pYYYYMM``. Callers commit.
+"""
+import datetime
+import re
+from dataclasses import dataclass
+from datetime import timezone, timedelta
+
+# Months created ahead of the current one, so a late maintenance run never
+# leaves inserts falling through to the default partition.
+MONTHS_AHEAD = 2
+
+
+@dataclass(frozen=True)
+class PartitionPolicy:
+    table: str
+    column: str
+    # TIMESTAMPTZ partition keys get UTC bounds; DATE keys get plain dates.
+    timestamptz: bool = False
+    # Months whose end is older than this are expired. None keeps everything.
+    retention_days: int | None = None
+    # "drop" deletes an expired month; "detach" leaves it as a standalone
+    # table, out of every query on the parent but still there to archive.
+    expire: str = "drop"
+
+
+def month_floor(day: datetime.date) -> datetime.date:
+    return datetime.date(day.year, day.month, 1)
+
+
+def add_months(month: datetime.date, n: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + n
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def months_between(first: datetime.date, last: datetime.date) -> list[datetime.date]:
+    """Every month from first's to last's, inclusive."""
+    months, month, last = [], month_floor(first), month_floor(last)
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def partition_name(table: str, month: datetime.date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def default_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def partition_month(table: str, name: str) -> datetime.date | None:
+    """The month a partition holds, parsed back from its name."""
+    match = re.fullmatch(re.escape(table) + r"_p(\d{4})(\d{2})", name)
+    if not match:
+        return None
+    return datetime.date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def retention_cutoff(policy: PartitionPolicy, today: datetime.date) -> datetime.date | None:
+    if policy.retention_days is None:
+        return None
+    return today - timedelta(days=policy.retention_days)
+
+
+def expired_months(months, cutoff: datetime.date | None) -> list[datetime.date]:
+    """Months lying wholly before the cutoff.
+
+    A month is only expired once its last day has passed the cutoff, so rows
+    are kept for at least the retention period and at most a month beyond it.
+    """
+    if cutoff is None:
+        return []
+    return sorted(m for m in months if add_months(m, 1) <= cutoff)
+
+
+def _bound(policy: PartitionPolicy, day: datetime.date):
+    if policy.timestamptz:
+        return datetime.datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    return day
+
+
+# --- Catalog ------------------------------------------------------------------
+
+def is_partitioned(db, table: str) -> bool:
+    db.cursor.execute(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+        (table,),
+    )
+    return bool(db.cursor.fetchone()[0])
+
+
+def _exists(db, relation: str) -> bool:
+    db.cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (relation,))
+    return bool(db.cursor.fetchone()[0])
+
+
+def attached_months(db, table: str, parent: str | None = None) -> list[datetime.date]:
+    """Months attached to ``parent`` (default: the table itself)."""
+    db.cursor.execute("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+    """, (parent or table,))
+    months = (partition_month(table, row[0]) for row in db.cursor.fetchall())
+    return sorted(m for m in months if m is not None)
+
+
+# --- DDL ----------------------------------------------------------------------
+
+def create_default(db, policy: PartitionPolicy, parent: str | None = None):
+    db.cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {default_name(policy.table)} "
+        f"PARTITION OF {parent or policy.table} DEFAULT"
+    )
+
+
+def _create_partition(db, policy: PartitionPolicy, month: datetime.date, parent: str | None = None):
+    """Create one month's partition, moving any of its rows out of the default.
+
+    Postgres refuses a new partition while the default holds rows in its
+    range, so those are moved across with the default briefly detached.
+    """
+    parent = parent or policy.table
+    name, default, col = partition_name(policy.table, month), default_name(policy.table), policy.column
+    lo, hi = _bound(policy, month), _bound(policy, add_months(month, 1))
+    create = f"CREATE TABLE {name} PARTITION OF {parent} FOR VALUES FROM (%s) TO (%s)"
+
+    stranded = False
+    if _exists(db, default):
+        db.cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {col} >= %s AND {col} < %s)", (lo, hi))
+        stranded = bool(db.cursor.fetchone()[0])
+
+    if not stranded:
+        db.cursor.execute(create, (lo, hi))
+        return
+    db.cursor.execute(f"ALTER TABLE {parent} DETACH PARTITION {default}")
+    db.cursor.execute(create, (lo, hi))
+    db.cursor.execute(f"INSERT INTO {name} SELECT * FROM {default} WHERE {col} >= %s AND {col} < %s", (lo, hi))
+    db.cursor.execute(f"DELETE FROM {default} WHERE {col} >= %s AND {col} < %s", (lo, hi))
+    db.cursor.execute(f"ALTER TABLE {parent} ATTACH PARTITION {default} DEFAULT")
+
+
+def ensure_partitions(db, policy: PartitionPolicy, today: datetime.date, since: datetime.date | None = None,
+                      ahead: int = MONTHS_AHEAD, parent: str | None = None,
+                      include_expired: bool = False) -> list[str]:
+    """Create the missing months from ``since`` (default: this month) to ``ahead``
+    months out, skipping any already past retention unless ``include_expired``.
+    Returns the names created."""
+    cutoff = retention_cutoff(policy, today)
+    have = set(attached_months(db, policy.table, parent))
+    wanted = months_between(since or today, add_months(month_floor(today), ahead))
+    expired = set() if include_expired else set(expired_months(wanted, cutoff))
+    created = []
+    for month in wanted:
+        if month in have or month in expired:
+            continue
+        _create_partition(db, policy, month, parent=parent)
+        created.append(partition_name(policy.table, month))
+    return created
+
+
+def expire_partitions(db, policy: PartitionPolicy, today: datetime.date) -> list[str]:
+    """Drop or detach the months past retention. Returns the names expired."""
+    cutoff = retention_cutoff(policy, today)
+    if cutoff is None:
+        return []
+    names = []
+    for month in expired_months(attached_months(db, policy.table), cutoff):
+        name = partition_name(policy.table, month)
+        if policy.expire == "detach":
+            db.cursor.execute(f"ALTER TABLE {policy.table} DETACH PARTITION {name}")
+        else:
+            db.cursor.execute(f"DROP TABLE {name}")
+        names.append(name)
+    # The default only ever holds a handful of strays; prune them by row.
+    # Archived tables keep theirs: nothing under a detach policy is deleted.
+    if policy.expire != "detach" and _exists(db, default_name(policy.table)):
+        db.cursor.execute(f"DELETE FROM {default_name(policy.table)} WHERE {policy.column} < %s",
+                          (_bound(policy, cutoff),))
+    return names
+
+
+def maintain(db, policy: PartitionPolicy, today: datetime.date | None = None) -> str:
+    """Create upcoming months and expire old ones. Returns a summary string.
+
+    A table not yet migrated (scripts/partition_history_tables.py) keeps its
+    retention the old way, by DELETE, so it does not grow in the meantime —
+    except under a detach policy, whose old rows are meant to be archived, not
+    destroyed; those wait for the migration to detach them.
+    """
+    today = today or datetime.datetime.now(timezone.utc).date()
+    if not is_partitioned(db, policy.table):
+        cutoff = retention_cutoff(policy, today)
+        if cutoff is None or policy.expire == "detach":
+            return f"{policy.table}: not partitioned"
+        db.cursor.execute(f"DELETE FROM {policy.table} WHERE {policy.column} < %s", (_bound(policy, cutoff),))
+        return f"{policy.table}: not partitioned, deleted {db.cursor.rowcount} rows"
+
+    created = ensure_partitions(db, policy, today)
+    expired = expire_partitions(db, policy, today)
+    parts = [f"{policy.table}:"]
+    if created:
+        parts.append(f"created {', '.join(created)}")
+    if expired:
+        parts.append(f"{'detached' if policy.expire == 'detach' else 'dropped'} {', '.join(expired)}")
+    if not created and not expired:
+        parts.append("current")
+    return " ".join(parts)
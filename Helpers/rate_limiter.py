@@ -15,30 +15,61 @@ class RateLimitExceeded(commands.CheckFailure):
     pass
 
 
+# Every limiter constructed, so the metrics endpoint can report on them.
+_limiters: list = []
+
+
 class RateLimiter:
-    """Tracks per-user and per-guild command invocations within a sliding time window."""
+    """Per-user and per-guild limits of N invocations per window, as GCRA buckets.
+
+    Each key stores one number, its theoretical arrival time (TAT): when its
+    bucket would be full again. A call is allowed if, after adding one emission
+    interval (window / limit), the TAT is no more than a window ahead of now.
+    That allows a burst of ``limit`` calls and then one call per interval, and
+    each check is O(1) however busy the key.
+
+    N calls are always allowed within a window, bunched or spread out. The
+    bucket refills continuously, though, so a caller who bursts and then keeps
+    retrying can fit up to 2N - 1 calls into one window-long stretch (the
+    burst plus N - 1 refills), where a timestamp log would stop at N.
+
+    A key whose TAT has passed is in the same state as one never seen, so it
+    is dropped. Keys are kept in order of last use and every TAT is within a
+    window of its key's last use, so each check evicts expired keys from the
+    front of the dict. No key outlives a window of idleness by more than one
+    check.
+    """
 
     def __init__(self, per_user_limit: int, per_guild_limit: int, window_seconds: int):
         self.per_user_limit = per_user_limit
         self.per_guild_limit = per_guild_limit
         self.window_seconds = window_seconds
-        self._user_calls: dict[int, list[float]] = {}
-        self._guild_calls: dict[int, list[float]] = {}
-
-    def _prune_bucket(self, bucket: list[float], cutoff: float) -> list[float]:
-        """Remove expired timestamps from a single bucket."""
-        return [ts for ts in bucket if ts > cutoff]
-
-    def _full_cleanup(self, calls: dict[int, list[float]], cutoff: float) -> None:
-        """Remove all expired entries across all keys to reclaim memory."""
-        expired_keys = []
-        for key, timestamps in calls.items():
-            calls[key] = [ts for ts in timestamps if ts > cutoff]
-            if not calls[key]:
-                expired_keys.append(key)
-        for key in expired_keys:
+        self._user_calls: dict[int, float] = {}
+        self._guild_calls: dict[int, float] = {}
+        self.rejected = 0
+        _limiters.append(self)
+
+    @staticmethod
+    def _evict(calls: dict[int, float], now: float) -> None:
+        """Drop expired keys from the front, stopping at the first live one."""
+        while calls:
+            key = next(iter(calls))
+            if calls[key] > now:
+                return
             del calls[key]
 
+    def _next_tat(self, calls: dict[int, float], key: int, limit: int, now: float) -> float | None:
+        """The key's TAT after one more call, or None if that call is over the limit."""
+        tat = max(calls.get(key, now), now) + self.window_seconds / limit
+        # The epsilon keeps float error in window / limit from refusing the last call of a burst.
+        return tat if tat - now <= self.window_seconds + 1e-9 else None
+
+    @staticmethod
+    def _record(calls: dict[int, float], key: int, tat: float) -> None:
+        # Re-insert so the dict stays in order of last use.
+        calls.pop(key, None)
+        calls[key] = tat
+
     def check(self, user_id: int, guild_id: int) -> tuple[bool, str]:
         """
         Check if a command invocation is allowed.
@@ -47,36 +78,36 @@ class RateLimiter:
             (allowed, reason) — True if allowed, False with a reason if rate limited.
         """
         now = time.monotonic()
-        cutoff = now - self.window_seconds
-
-        # Periodic full cleanup to prevent unbounded memory growth
-        if len(self._user_calls) > 10000:
-            self._full_cleanup(self._user_calls, cutoff)
-        if len(self._guild_calls) > 10000:
-            self._full_cleanup(self._guild_calls, cutoff)
-
-        # Prune and check per-user limit
-        user_timestamps = self._user_calls.get(user_id, [])
-        user_timestamps = self._prune_bucket(user_timestamps, cutoff)
-        if len(user_timestamps) >= self.per_user_limit:
-            self._user_calls[user_id] = user_timestamps
+        self._evict(self._user_calls, now)
+        self._evict(self._guild_calls, now)
+
+        user_tat = self._next_tat(self._user_calls, user_id, self.per_user_limit, now)
+        if user_tat is None:
+            self.rejected += 1
             return False, 'Per-user rate limit exceeded.'
 
-        # Prune and check per-guild limit
-        guild_timestamps = self._guild_calls.get(guild_id, [])
-        guild_timestamps = self._prune_bucket(guild_timestamps, cutoff)
-        if len(guild_timestamps) >= self.per_guild_limit:
-            self._guild_calls[guild_id] = guild_timestamps
+        guild_tat = self._next_tat(self._guild_calls, guild_id, self.per_guild_limit, now)
+        if guild_tat is None:
+            self.rejected += 1
             return False, 'Per-guild rate limit exceeded.'
 
-        # Record the call
-        user_timestamps.append(now)
-        self._user_calls[user_id] = user_timestamps
+        # Only charge either bucket once both allow the call.
+        self._record(self._user_calls, user_id, user_tat)
+        self._record(self._guild_calls, guild_id, guild_tat)
+        return True, ''
 
-        guild_timestamps.append(now)
-        self._guild_calls[guild_id] = guild_timestamps
 
-        return True, ''
+def limiter_stats() -> list[dict]:
+    """Tracked keys and rejections per limiter, for the metrics endpoint."""
+    return [
+        {
+            "limiter": f"{lim.per_user_limit}u-{lim.per_guild_limit}g-{lim.window_seconds}s",
+            "users": len(lim._user_calls),
+            "guilds": len(lim._guild_calls),
+            "rejected": lim.rejected,
+        }
+        for lim in _limiters
+    ]
 
 
 # Module-level default instance
@@ -91,7 +122,8 @@ def external_rate_limit(per_user: int = 5, per_guild: int = 30, window: int = 60
     Sends an ephemeral response and raises RateLimitExceeded if the limit is hit.
 
     Args:
-        per_user: Max invocations per user within the time window.
+        per_user: Max invocations per user within the time window (a
+            sustained rate; see RateLimiter for how bursts are counted).
         per_guild: Max invocations per guild within the time window.
         window: Time window in seconds.
     """
@@ -12,6 +12,7 @@ import asyncio
 
 import discord
 
+from Helpers.app_classifier import match_recruiter
 from Helpers.database import DB
 from Helpers.logger import log, ERROR
 from Helpers.variables import TASK_BOARD_CHANNEL_ID
@@ -32,15 +33,6 @@ def payout_for_count(recruit_number: int) -> int:
 # --- Recruiter matching ------------------------------------------------------
 
 
-def _fuzzy_match(text: str, names: list[str]) -> str | None:
-    lower = text.lower()
-    for name in names:
-        if name.lower() == lower:
-            return name
-    matches = [n for n in names if lower in n.lower()]
-    return matches[0] if len(matches) == 1 else None
-
-
 def _all_known_igns() -> list[str]:
     db = DB(); db.connect()
     try:
@@ -67,7 +59,9 @@ async def resolve_recruiter(text: str, use_ai_fallback: bool = False) -> tuple[s
         if name not in member_names:
             member_names.append(name)
 
-    matched = _fuzzy_match(text, member_names)
+    # Exact names and near-certain typos are settled locally; only the rest
+    # costs a model call.
+    matched = match_recruiter(text, member_names)
     if matched is None and use_ai_fallback:
         from Helpers.openai_helper import match_recruiter_name
         ai_result = await asyncio.to_thread(match_recruiter_name, text, member_names)
@@ -0,0 +1,262 @@
+"""Deadline scheduler: one sleeper for every "do X at time T" in the bot.
+
+Cogs used to wake on a fixed interval only to ask the database whether
+anything was due, and then acted up to one interval late. Jobs now live in
+scheduled_jobs and in an in-memory min-heap of (due_at, id); a single task
+sleeps exactly until the earliest deadline and is woken early when a sooner
+job is added. Pending rows are reloaded on start, so a restart neither drops
+nor repeats a job.
+
+    scheduler.register("graid_event_stop", handler)       # async handler(payload)
+    await scheduler.schedule("graid_event_stop", end_ts, {"event_id": 7},
+                             key="graid_event_stop:7")
+    await scheduler.cancel("graid_event_stop:7")
+
+``key`` makes a job idempotent: scheduling the same key again moves the
+existing job instead of adding a second one. A job's row is deleted once its
+handler returns. A handler that raises is retried with a growing delay, up to
+MAX_ATTEMPTS; a job whose handler is not registered is logged and dropped.
+A database error while firing a job never stops the sleeper: the job is put
+back on the heap and tried again after RETRY_AFTER_S.
+Handlers run one at a time on the event loop and should hand blocking work to
+``asyncio.to_thread``.
+"""
+import asyncio
+import datetime
+import heapq
+import json
+from datetime import timezone
+
+from Helpers import telemetry
+from Helpers.database import DB
+from Helpers.logger import log, ERROR, WARN
+
+MAX_ATTEMPTS = 5
+RETRY_AFTER_S = 60
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(timezone.utc)
+
+
+class Scheduler:
+    def __init__(self):
+        self._handlers = {}
+        self._heap: list[tuple[datetime.datetime, int]] = []
+        # id -> when it should next fire. Heap entries that no longer match
+        # (moved or cancelled jobs) are skipped when they surface.
+        self._due: dict[int, datetime.datetime] = {}
+        # id -> due_at as stored in its row. Differs from _due only while a
+        # job waits out a failed attempt to run it.
+        self._row_due: dict[int, datetime.datetime] = {}
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.stats = {"fired": 0, "failed": 0, "dropped": 0, "wakeups": 0}
+
+    # -- registration and scheduling -----------------------------------------
+
+    def register(self, job: str, handler):
+        """Route due ``job`` rows to ``async handler(payload)``. Each run emits a task record."""
+        self._handlers[job] = telemetry.wrap_task(f"scheduler.{job}", handler)
+
+    async def schedule(self, job: str, due_at: datetime.datetime, payload: dict | None = None,
+                       key: str | None = None) -> int:
+        """Persist a job, then wake the sleeper if it is now the earliest. Returns its id.
+
+        A naive ``due_at`` is taken as UTC.
+        """
+        if due_at.tzinfo is None:
+            due_at = due_at.replace(tzinfo=timezone.utc)
+        job_id = await asyncio.to_thread(self._insert_sync, job, due_at, payload or {}, key)
+        self._push(job_id, due_at)
+        return job_id
+
+    async def cancel(self, key: str) -> bool:
+        """Remove a pending job by key. Returns whether one existed."""
+        job_id = await asyncio.to_thread(self._delete_key_sync, key)
+        if job_id is None:
+            return False
+        self._due.pop(job_id, None)
+        self._row_due.pop(job_id, None)
+        return True
+
+    def _push(self, job_id: int, due_at: datetime.datetime, fire_at: datetime.datetime | None = None):
+        fire_at = fire_at or due_at
+        self._due[job_id] = fire_at
+        self._row_due[job_id] = due_at
+        heapq.heappush(self._heap, (fire_at, job_id))
+        if self._heap[0] == (fire_at, job_id):
+            self._wake.set()
+
+    # -- the sleeper ----------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Reload pending jobs and start sleeping on them. Idempotent."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self.running:
+            self._task.cancel()
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                pending = await asyncio.to_thread(self._load_pending_sync)
+                break
+            except Exception as e:
+                log(ERROR, f"Could not load pending jobs, retrying: {e!r}", context="scheduler")
+                await asyncio.sleep(RETRY_AFTER_S)
+        for job_id, due_at in pending:
+            if job_id not in self._due:  # scheduled meanwhile; memory is newer
+                self._push(job_id, due_at)
+        while True:
+            self._wake.clear()
+            delay = self.next_delay(_now())
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                continue  # a sooner job arrived; recompute
+            except asyncio.TimeoutError:
+                pass
+            self.stats["wakeups"] += 1
+            for job_id, due_at in self.pop_due(_now()):
+                try:
+                    await self._fire(job_id, due_at)
+                except Exception as e:
+                    # Bookkeeping failed (the database, usually); the row is
+                    # untouched or will be matched again, so try it later.
+                    log(ERROR, f"Job id={job_id} could not be run, retrying: {e!r}", context="scheduler")
+                    self.stats["failed"] += 1
+                    self._push(job_id, due_at, fire_at=_now() + datetime.timedelta(seconds=RETRY_AFTER_S))
+
+    def next_delay(self, now: datetime.datetime) -> float | None:
+        """Seconds until the earliest live job, or None to sleep until woken."""
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(0.0, (self._heap[0][0] - now).total_seconds())
+
+    def pop_due(self, now: datetime.datetime) -> list[tuple[int, datetime.datetime]]:
+        """Remove and return (id, row due_at) for every live job due at or before ``now``, earliest first."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, job_id = heapq.heappop(self._heap)
+            if self._due.get(job_id) == fire_at:
+                due.append((job_id, self._row_due[job_id]))
+        return due
+
+    async def _fire(self, job_id: int, due_at: datetime.datetime):
+        row = await asyncio.to_thread(self._fetch_sync, job_id, due_at)
+        if row is None:
+            # Moved or cancelled by another writer since it was queued.
+            self._forget(job_id, due_at)
+            return
+        job, payload, attempts = row
+        handler = self._handlers.get(job)
+        if handler is None:
+            log(WARN, f"No handler for job {job!r} (id={job_id}); dropping it", context="scheduler")
+            self.stats["dropped"] += 1
+            await asyncio.to_thread(self._finish_sync, job_id, due_at)
+            self._forget(job_id, due_at)
+            return
+
+        try:
+            await handler(payload)
+        except Exception as e:
+            self.stats["failed"] += 1
+            attempts += 1
+            if attempts >= MAX_ATTEMPTS:
+                log(ERROR, f"Job {job!r} (id={job_id}) failed {attempts} times, giving up: {e!r}", context="scheduler")
+                await asyncio.to_thread(self._finish_sync, job_id, due_at)
+                self._forget(job_id, due_at)
+                return
+            log(ERROR, f"Job {job!r} (id={job_id}) failed, retrying: {e!r}", context="scheduler")
+            retry_at = _now() + datetime.timedelta(seconds=RETRY_AFTER_S * attempts)
+            if await asyncio.to_thread(self._retry_sync, job_id, due_at, retry_at, attempts):
+                self._push(job_id, retry_at)
+            return
+
+        self.stats["fired"] += 1
+        await asyncio.to_thread(self._finish_sync, job_id, due_at)
+        self._forget(job_id, due_at)
+
+    def _forget(self, job_id: int, due_at: datetime.datetime):
+        # A handler may have moved its own job (same key, new due_at); keep that.
+        if self._row_due.get(job_id) == due_at:
+            del self._row_due[job_id]
+            self._due.pop(job_id, None)
+
+    def status(self) -> dict:
+        return {"pending": len(self._due), **self.stats}
+
+    # -- persistence ----------------------------------------------------------
+    # Every statement matches on (id, due_at) where it can, so a row moved by
+    # schedule() while its old deadline was firing is left alone.
+
+    @staticmethod
+    def _insert_sync(job, due_at, payload, key):
+        with DB() as db:
+            db.cursor.execute("""
+                INSERT INTO scheduled_jobs (job, job_key, due_at, payload)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (job_key) DO UPDATE
+                SET job = EXCLUDED.job, due_at = EXCLUDED.due_at,
+                    payload = EXCLUDED.payload, attempts = 0
+                RETURNING id
+            """, (job, key, due_at, json.dumps(payload)))
+            job_id = db.cursor.fetchone()[0]
+            db.connection.commit()
+        return job_id
+
+    @staticmethod
+    def _delete_key_sync(key):
+        with DB() as db:
+            db.cursor.execute("DELETE FROM scheduled_jobs WHERE job_key = %s RETURNING id", (key,))
+            row = db.cursor.fetchone()
+            db.connection.commit()
+        return row[0] if row else None
+
+    @staticmethod
+    def _load_pending_sync():
+        with DB() as db:
+            db.cursor.execute("SELECT id, due_at FROM scheduled_jobs")
+            return db.cursor.fetchall()
+
+    @staticmethod
+    def _fetch_sync(job_id, due_at):
+        with DB() as db:
+            db.cursor.execute(
+                "SELECT job, payload, attempts FROM scheduled_jobs WHERE id = %s AND due_at = %s",
+                (job_id, due_at),
+            )
+            row = db.cursor.fetchone()
+        if row is None:
+            return None
+        job, payload, attempts = row
+        return job, payload if isinstance(payload, dict) else json.loads(payload), attempts
+
+    @staticmethod
+    def _finish_sync(job_id, due_at):
+        with DB() as db:
+            db.cursor.execute("DELETE FROM scheduled_jobs WHERE id = %s AND due_at = %s", (job_id, due_at))
+            db.connection.commit()
+
+    @staticmethod
+    def _retry_sync(job_id, due_at, retry_at, attempts) -> bool:
+        with DB() as db:
+            db.cursor.execute(
+                "UPDATE scheduled_jobs SET due_at = %s, attempts = %s WHERE id = %s AND due_at = %s",
+                (retry_at, attempts, job_id, due_at),
+            )
+            moved = db.cursor.rowcount == 1
+            db.connection.commit()
+        return moved
+
+
+scheduler = Scheduler()
@@ -0,0 +1,163 @@
+"""Process-wide settings store: bot_settings and guild_settings, held in memory.
+
+Both tables are a few dozen rows that polling loops used to re-read on every
+tick, each read opening a connection for one SELECT. The store loads both
+tables once and serves reads from memory; writes go through to Postgres
+first and only then update memory, so a failed write never shows up as a
+value the database does not hold.
+
+    settings.get("kick_list_message_id")             -> str | None
+    settings.get_int("musing_index", 0)              -> int
+    settings.guild(guild_id, "attack_ping", True)    -> bool
+    settings.set("musing_index", 4)                  # write-through
+    settings.set_guild(guild_id, "attack_ping", False)
+
+Every successful write bumps ``version`` and calls the subscribers with
+``(key, value)``, where key is the bot_settings key or ``(guild_id, key)``.
+Subscribers run on the writer's thread and must not block.
+
+The bot is the only writer of these rows, so memory is never refreshed behind
+its back; call ``reload()`` after editing them by hand. Counters that need an
+atomic increment (app_counter, hh_app_counter) stay with their UPDATE ...
+RETURNING helpers in Helpers/database.py and are not read through here.
+
+Reads never touch the database: they run on the event loop, and until a
+``load()`` has succeeded they serve the defaults. Callers that would act on a
+default (post a new kick-list message, a second musing) check ``loaded`` and
+call ``load()`` off-loop first, skipping their tick if it still fails.
+"""
+import threading
+
+from Helpers.database import DB
+from Helpers.logger import log, ERROR
+
+
+class SettingsStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bot: dict[str, str] = {}
+        self._guild: dict[tuple[int, str], bool] = {}
+        self._loaded = False
+        self._subscribers = []
+        self.version = 0
+        self.stats = {"hits": 0, "misses": 0, "loads": 0, "writes": 0}
+
+    # -- loading ---------------------------------------------------------------
+
+    def load(self, force: bool = False) -> bool:
+        """Read both tables into memory unless already loaded. Returns success."""
+        if self._loaded and not force:
+            return True
+        try:
+            with DB() as db:
+                db.cursor.execute("SELECT key, value FROM bot_settings")
+                bot = {k: v for k, v in db.cursor.fetchall()}
+                db.cursor.execute("SELECT guild_id, setting_key, setting_value FROM guild_settings")
+                guild = {(int(g), k): bool(v) for g, k, v in db.cursor.fetchall()}
+        except Exception as e:
+            log(ERROR, f"Settings load failed: {e}", context="settings")
+            return False
+        with self._lock:
+            self._bot, self._guild = bot, guild
+            self._loaded = True
+            self.stats["loads"] += 1
+        return True
+
+    def reload(self) -> bool:
+        return self.load(force=True)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether reads reflect the database, rather than defaults."""
+        return self._loaded
+
+    # -- reads -----------------------------------------------------------------
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        with self._lock:
+            value = self._bot.get(key)
+            self.stats["hits" if value is not None else "misses"] += 1
+        return default if value is None else value
+
+    def get_int(self, key: str, default: int | None = None) -> int | None:
+        value = self.get(key)
+        try:
+            return int(value) if value is not None else default
+        except ValueError:
+            return default
+
+    def guild(self, guild_id: int, key: str, default: bool = True) -> bool:
+        with self._lock:
+            value = self._guild.get((guild_id, key))
+            self.stats["hits" if value is not None else "misses"] += 1
+        return default if value is None else value
+
+    # -- writes ----------------------------------------------------------------
+
+    def set(self, key: str, value, db: DB | None = None):
+        """Upsert a bot setting (stored as text), then update memory."""
+        value = str(value)
+        self._write(db, """
+            INSERT INTO bot_settings (key, value) VALUES (%s, %s)
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+        """, (key, value))
+        with self._lock:
+            self._bot[key] = value
+        self._changed(key, value)
+
+    def set_guild(self, guild_id: int, key: str, value: bool, db: DB | None = None):
+        """Upsert a boolean guild setting, then update memory."""
+        value = bool(value)
+        self._write(db, """
+            INSERT INTO guild_settings (guild_id, setting_key, setting_value, updated_at)
+            VALUES (%s, %s, %s, NOW())
+            ON CONFLICT (guild_id, setting_key)
+            DO UPDATE SET setting_value = EXCLUDED.setting_value, updated_at = NOW()
+        """, (guild_id, key, value))
+        with self._lock:
+            self._guild[(guild_id, key)] = value
+        self._changed((guild_id, key), value)
+
+    def _write(self, db, sql, params):
+        """Run and commit one write, on ``db`` if given, else on a connection of its own."""
+        # Load first, so a later initial load cannot replace this write with
+        # an older snapshot.
+        self.load()
+        if db is not None:
+            db.cursor.execute(sql, params)
+            db.connection.commit()
+            return
+        with DB() as own:
+            own.cursor.execute(sql, params)
+            own.connection.commit()
+
+    # -- change notification ---------------------------------------------------
+
+    def subscribe(self, callback):
+        """Call ``callback(key, value)`` after every write. Returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _changed(self, key, value):
+        with self._lock:
+            self.version += 1
+            self.stats["writes"] += 1
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(key, value)
+            except Exception as e:
+                log(ERROR, f"Settings subscriber failed for {key!r}: {e}", context="settings")
+
+    def cache_stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._bot) + len(self._guild), **self.stats, "version": self.version}
+
+
+settings = SettingsStore()
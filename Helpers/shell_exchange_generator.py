@@ -1,5 +1,10 @@
+import hashlib
+import io
 import os
 import math
+import threading
+from collections import OrderedDict
+
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
 from Helpers.storage import get_shell_exchange_icon
@@ -218,6 +223,91 @@ def load_entries(category, cfg_data, material):
     return entries
 
 # Render
+#
+# A panel is a grid of independent tiles (one entry's row cell) on a flat
+# background. Each tile is cached by a hash of everything that affects its
+# pixels, and the last composed panel per category is kept with the tile key
+# in each slot. A re-render then only draws and pastes the tiles whose inputs
+# changed: a one-price edit costs one tile, not the whole panel. The output is
+# pixel-identical to drawing every row onto one canvas, since tiles never
+# overlap and each is drawn over the same background.
+
+TILE_CACHE_SIZE = 512
+
+_tiles: OrderedDict = OrderedDict()
+_panels: dict = {}
+_render_lock = threading.Lock()
+render_stats = {"tiles_drawn": 0, "tiles_reused": 0, "tiles_pasted": 0}
+
+
+def _style_key():
+    return (
+        HIGHLIGHT_MODE, COLOR_BG, COLOR_ROW, COLOR_TEXT, HIGHLIGHT_TEXT_COLOR,
+        tuple(OUTLINE_GRADIENT_POINTS), tuple(sorted(TIER_COLORS.items())),
+    )
+
+
+def _tile_key(e, striped, col_w, reserve_shell_str, reserve_per_str, style):
+    h = hashlib.sha1()
+    h.update(repr((
+        e["name"], e["tier"], e["shells"], e["per"], e["highlight"],
+        striped, col_w, reserve_shell_str, reserve_per_str, style, e["icon"].size,
+    )).encode())
+    h.update(e["icon"].tobytes())
+    return h.hexdigest()
+
+
+def draw_tile(e, striped, col_w, font, shell_icon, reserve_shell_str, reserve_per_str):
+    """One entry's cell: (col_w + 1) x (ROW_H + 1), since the row box is inclusive."""
+    img = Image.new("RGBA", (col_w + 1, ROW_H + 1), COLOR_BG)
+    draw = ImageDraw.Draw(img)
+    x0, y0, x1, y1 = 0, 0, col_w, ROW_H
+
+    if striped:
+        draw.rounded_rectangle((x0, y0, x1, y1), 6, fill=COLOR_ROW)
+
+    if e["highlight"] and HIGHLIGHT_MODE in ("outline", "both"):
+        draw_gradient_outline(draw, x0, y0, x1, y1)
+
+    ix = x0 + 6
+    iy = y0 + (ROW_H - e["ih"]) // 2
+    img.paste(e["icon"], (ix, iy), e["icon"])
+
+    name_color = (
+        HIGHLIGHT_TEXT_COLOR if e["highlight"] and HIGHLIGHT_MODE in ("text", "both")
+        else TIER_COLORS.get(e["tier"], COLOR_TEXT)
+    )
+
+    draw.text((ix + e["iw"] + 6, y0 + 10), e["name"], fill=name_color, font=font)
+
+    # Trade block: shells -> icon -> slash -> per (anchored + reserved widths)
+    draw_trade_block(
+        img,
+        draw,
+        e["shells"],
+        e["per"],
+        shell_icon,
+        font,
+        xr=x1 - RIGHT_PAD,
+        yt=y0 + 10,
+        reserve_shell_str=reserve_shell_str,
+        reserve_per_str=reserve_per_str,
+    )
+    return img
+
+
+def _tile(key, draw_fn):
+    tile = _tiles.get(key)
+    if tile is not None:
+        _tiles.move_to_end(key)
+        render_stats["tiles_reused"] += 1
+        return tile
+    tile = _tiles[key] = draw_fn()
+    render_stats["tiles_drawn"] += 1
+    while len(_tiles) > TILE_CACHE_SIZE:
+        _tiles.popitem(last=False)
+    return tile
+
 
 def render_panel(material_mode=False, ings_data=None, mats_data=None):
     category = "mats" if material_mode else "ings"
@@ -242,54 +332,50 @@ def render_panel(material_mode=False, ings_data=None, mats_data=None):
 
     w = GRID_COLUMNS * col_w + (GRID_COLUMNS + 1) * COL_GAP
     h = rows * (ROW_H + ROW_GAP) + 40
-
-    img = Image.new("RGBA", (w, h), COLOR_BG)
-    draw = ImageDraw.Draw(img)
-
-    col = row = 0
-    for e in entries:
-        x0 = COL_GAP + col * (col_w + COL_GAP)
-        y0 = 20 + row * (ROW_H + ROW_GAP)
-        x1 = x0 + col_w
-        y1 = y0 + ROW_H
-
-        if row % 2 == 0:
-            draw.rounded_rectangle((x0, y0, x1, y1), 6, fill=COLOR_ROW)
-
-        if e["highlight"] and HIGHLIGHT_MODE in ("outline", "both"):
-            draw_gradient_outline(draw, x0, y0, x1, y1)
-
-        ix = x0 + 6
-        iy = y0 + (ROW_H - e["ih"]) // 2
-        img.paste(e["icon"], (ix, iy), e["icon"])
-
-        name_color = (
-            HIGHLIGHT_TEXT_COLOR if e["highlight"] and HIGHLIGHT_MODE in ("text", "both")
-            else TIER_COLORS.get(e["tier"], COLOR_TEXT)
-        )
-
-        draw.text((ix + e["iw"] + 6, y0 + 10), e["name"], fill=name_color, font=font)
-
-        # Trade block: shells -> icon -> slash -> per (anchored + reserved widths)
-        draw_trade_block(
-            img,
-            draw,
-            e["shells"],
-            e["per"],
-            shell_icon,
-            font,
-            xr=x1 - RIGHT_PAD,
-            yt=y0 + 10,
-            reserve_shell_str=reserve_shell_str,
-            reserve_per_str=reserve_per_str,
-        )
-
-        row += 1
-        if row >= rows:
-            row = 0
-            col += 1
-
-    return img
+    style = _style_key()
+
+    with _render_lock:
+        panel = _panels.get(category)
+        if panel is None or panel["base"] != (w, h, style):
+            panel = _panels[category] = {
+                "base": (w, h, style),
+                "image": Image.new("RGBA", (w, h), COLOR_BG),
+                "slots": {},
+            }
+        img, slots = panel["image"], panel["slots"]
+
+        wanted = {}
+        col = row = 0
+        for e in entries:
+            x0 = COL_GAP + col * (col_w + COL_GAP)
+            y0 = 20 + row * (ROW_H + ROW_GAP)
+            striped = row % 2 == 0
+            key = _tile_key(e, striped, col_w, reserve_shell_str, reserve_per_str, style)
+            wanted[(x0, y0)] = key
+            if slots.get((x0, y0)) != key:
+                tile = _tile(key, lambda: draw_tile(e, striped, col_w, font, shell_icon,
+                                                    reserve_shell_str, reserve_per_str))
+                img.paste(tile, (x0, y0))
+                render_stats["tiles_pasted"] += 1
+
+            row += 1
+            if row >= rows:
+                row = 0
+                col += 1
+
+        # Slots that held an entry last time but not now go back to background.
+        for x0, y0 in set(slots) - set(wanted):
+            img.paste(COLOR_BG, (x0, y0, x0 + col_w + 1, y0 + ROW_H + 1))
+        panel["slots"] = wanted
+        return img.copy()
+
+
+def panel_png(img) -> tuple[bytes, str]:
+    """PNG bytes of a rendered panel and their SHA-256, to skip no-op reposts."""
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    data = buf.getvalue()
+    return data, hashlib.sha256(data).hexdigest()
 
 def generate_images(output_mode, config, ings_data=None, mats_data=None):
     apply_config(config)
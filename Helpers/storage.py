@@ -5,8 +5,13 @@ exchange icons.
 Currently backed by Supabase Storage (S3-compatible API).
 """
 
+import hashlib
 import io
 import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 
 import certifi
 import boto3
@@ -19,7 +24,20 @@ from Helpers import telemetry
 
 
 class S3Storage:
-    """S3-compatible storage client for Supabase Storage."""
+    """S3-compatible storage client for Supabase Storage.
+
+    ``get_cached_image`` reads through two tiers in front of the bucket: a
+    bounded LRU of decoded images, and a disk copy of the object bytes kept
+    with its ETag so it survives restarts. A memory entry is trusted for
+    ``IMAGE_REVALIDATE_S``; after that (or on a memory miss with a disk copy)
+    the object is re-requested with If-None-Match, which costs a bodiless 304
+    when nothing changed. Writes and deletes made through this class update
+    both tiers immediately; uploads made elsewhere (the website) are picked up
+    at the next revalidation.
+    """
+
+    IMAGE_CACHE_SIZE = 256
+    IMAGE_REVALIDATE_S = 3600
 
     def __init__(self):
         self._client = None
@@ -28,6 +46,10 @@ class S3Storage:
             self._bucket = os.getenv("TEST_S3_BUCKET_NAME", "Tort-Reborn-Dev")
         else:
             self._bucket = os.getenv("S3_BUCKET_NAME", "Tort-Reborn-Prod")
+        # key -> (image, etag, validated_at)
+        self._images: OrderedDict = OrderedDict()
+        self._images_lock = threading.Lock()
+        self.image_cache_stats = {"hits": 0, "revalidated": 0, "disk_hits": 0, "misses": 0}
 
     @property
     def _is_configured(self) -> bool:
@@ -78,20 +100,159 @@ class S3Storage:
         except Exception:
             return []
 
-    def put_bytes(self, key: str, data: bytes, content_type: str = "image/png"):
+    def put_bytes(self, key: str, data: bytes, content_type: str = "image/png") -> str | None:
+        """Upload an object. Returns its ETag."""
         with telemetry.track("s3.put"):
-            self.client.put_object(
+            resp = self.client.put_object(
                 Bucket=self._bucket,
                 Key=key,
                 Body=data,
                 ContentType=content_type,
             )
+        return resp.get("ETag") if isinstance(resp, dict) else None
 
     def put_image(self, key: str, image: Image.Image):
         buf = io.BytesIO()
         image.save(buf, format="PNG")
-        buf.seek(0)
-        self.put_bytes(key, buf.getvalue())
+        data = buf.getvalue()
+        etag = self.put_bytes(key, data)
+        if etag:
+            self._disk_write(key, data, etag)
+            self._remember(key, image.convert("RGBA"), etag)
+        else:
+            self.forget(key)
+
+    def delete(self, key: str):
+        """Delete an object (missing is fine) and drop it from the image cache."""
+        self.forget(key)
+        try:
+            with telemetry.track("s3.delete"):
+                self.client.delete_object(Bucket=self._bucket, Key=key)
+        except ClientError:
+            pass
+
+    # --- Tiered image cache ---
+
+    @property
+    def _disk_dir(self) -> str:
+        root = os.getenv("S3_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "tort-s3-cache")
+        return os.path.join(root, self._bucket)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self._disk_dir, hashlib.sha1(key.encode()).hexdigest())
+
+    def _disk_read(self, key: str) -> tuple[bytes, str] | None:
+        path = self._disk_path(key)
+        try:
+            with open(path + ".etag", encoding="utf-8") as f:
+                etag = f.read()
+            with open(path, "rb") as f:
+                return f.read(), etag
+        except OSError:
+            return None
+
+    def _disk_write(self, key: str, data: bytes, etag: str):
+        path = self._disk_path(key)
+        try:
+            os.makedirs(self._disk_dir, exist_ok=True)
+            # Data first, ETag last: a crash in between leaves a stale ETag
+            # with fresh bytes at worst, which the next 200 overwrites.
+            for suffix, payload, mode in (("", data, "wb"), (".etag", etag, "w")):
+                tmp = f"{path}{suffix}.tmp"
+                with open(tmp, mode) as f:
+                    f.write(payload)
+                os.replace(tmp, path + suffix)
+        except OSError as e:
+            log(WARN, f"Could not write disk cache for {key}: {e}", context="storage")
+
+    def _disk_remove(self, key: str):
+        path = self._disk_path(key)
+        for suffix in (".etag", ""):
+            try:
+                os.remove(path + suffix)
+            except OSError:
+                pass
+
+    def _remember(self, key: str, image: Image.Image, etag: str):
+        with self._images_lock:
+            self._images[key] = (image, etag, time.monotonic())
+            self._images.move_to_end(key)
+            while len(self._images) > self.IMAGE_CACHE_SIZE:
+                self._images.popitem(last=False)
+
+    def forget(self, key: str):
+        """Drop a key from both cache tiers."""
+        with self._images_lock:
+            self._images.pop(key, None)
+        self._disk_remove(key)
+
+    def get_cached_image(self, key: str) -> Image.Image | None:
+        """Image at ``key`` via the memory and disk tiers. Returns a copy."""
+        with self._images_lock:
+            entry = self._images.get(key)
+            if entry is not None:
+                self._images.move_to_end(key)
+        if entry is not None and time.monotonic() - entry[2] < self.IMAGE_REVALIDATE_S:
+            self.image_cache_stats["hits"] += 1
+            return entry[0].copy()
+
+        disk = None if entry is not None else self._disk_read(key)
+        etag = entry[1] if entry is not None else (disk[1] if disk else None)
+
+        if not self._is_configured:
+            # Nothing to validate against; a disk copy is better than nothing.
+            entry = entry or self._decode(key, disk)
+            return entry[0].copy() if entry else None
+
+        try:
+            kwargs = {"Bucket": self._bucket, "Key": key}
+            if etag:
+                kwargs["IfNoneMatch"] = etag
+            with telemetry.track("s3.get"):
+                resp = self.client.get_object(**kwargs)
+                data = resp["Body"].read()
+                resp["Body"].close()
+        except ClientError as e:
+            status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            code = str(e.response.get("Error", {}).get("Code"))
+            if status == 304 or code in ("304", "NotModified"):
+                entry = entry or self._decode(key, disk)
+                if entry is None:
+                    return None
+                self._remember(key, entry[0], entry[1])
+                self.image_cache_stats["revalidated" if disk is None else "disk_hits"] += 1
+                return entry[0].copy()
+            if status == 404 or code in ("404", "NoSuchKey"):
+                self.forget(key)
+                return None
+            entry = entry or self._decode(key, disk)
+            return entry[0].copy() if entry else None
+        except Exception:
+            # Unreachable bucket: serve whatever we had, however old.
+            entry = entry or self._decode(key, disk)
+            return entry[0].copy() if entry else None
+
+        self.image_cache_stats["misses"] += 1
+        new_etag = resp.get("ETag")
+        image = Image.open(io.BytesIO(data)).convert("RGBA")
+        if new_etag:
+            self._disk_write(key, data, new_etag)
+            self._remember(key, image, new_etag)
+        return image.copy()
+
+    def _decode(self, key: str, disk) -> tuple | None:
+        if not disk:
+            return None
+        try:
+            return Image.open(io.BytesIO(disk[0])).convert("RGBA"), disk[1], time.monotonic()
+        except Exception:
+            self._disk_remove(key)
+            return None
+
+    def image_cache_info(self) -> dict:
+        with self._images_lock:
+            entries = len(self._images)
+        return {"entries": entries, **self.image_cache_stats}
 
 
 # Singleton
@@ -105,6 +266,7 @@ storage = S3Storage()
 # versus the ~300ms S3 round trip Phase 0 measured. Values are the pristine
 # fetched images; reads hand out copies because callers mutate them in place.
 _bg_cache: dict = {}
+_bg_stats = {"hits": 0, "misses": 0}
 
 
 def get_background(bg_id) -> Image.Image:
@@ -113,7 +275,9 @@ def get_background(bg_id) -> Image.Image:
 
     cached = _bg_cache.get(bg_id)
     if cached is not None:
+        _bg_stats["hits"] += 1
         return cached.copy()
+    _bg_stats["misses"] += 1
     img = storage.get_image(f"profile_backgrounds/{bg_id}.png")
     if img:
         _bg_cache[bg_id] = img
@@ -130,6 +294,11 @@ def get_background(bg_id) -> Image.Image:
     raise FileNotFoundError(f"Background {bg_id} not found in S3")
 
 
+def background_cache_stats() -> dict:
+    """Size and hit/miss counters of the background memory cache."""
+    return {"entries": len(_bg_cache), **_bg_stats}
+
+
 def get_background_file(bg_id):
     """Download a profile background and return as a discord.File."""
     import discord
@@ -180,8 +349,8 @@ def _se_icon_key(category: str, name_key: str) -> str:
 
 
 def get_shell_exchange_icon(category: str, name_key: str) -> Image.Image | None:
-    """Download a shell exchange icon from S3."""
-    return storage.get_image(_se_icon_key(category, name_key))
+    """Shell exchange icon through the memory/disk cache, falling back to S3."""
+    return storage.get_cached_image(_se_icon_key(category, name_key))
 
 
 def save_shell_exchange_icon(category: str, name_key: str, image: Image.Image):
@@ -190,9 +359,5 @@ def save_shell_exchange_icon(category: str, name_key: str, image: Image.Image):
 
 
 def delete_shell_exchange_icon(category: str, name_key: str):
-    """Delete a shell exchange icon from S3."""
-    key = _se_icon_key(category, name_key)
-    try:
-        storage.client.delete_object(Bucket=storage._bucket, Key=key)
-    except ClientError:
-        pass
+    """Delete a shell exchange icon from S3 and the icon cache."""
+    storage.delete(_se_icon_key(category, name_key))
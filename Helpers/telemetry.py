@@ -2,6 +2,12 @@
 Helpers/telemetry.py
 Phase 0 latency instrumentation. Emits one JSON object per line on stdout.
 
+Two record shapes carry buckets: `command` (one per slash-command invocation,
+see begin/finish) and `task` (one per background-loop iteration, see
+wrap_task). Both accumulate into the same Sample, so db.* / http.* / s3.* /
+render timings land in whichever one is current. Every span and every record's
+total is also folded into the in-process histograms (Helpers/histograms.py).
+
 This module deliberately does NOT route through Helpers/logger.py. That logger
 queues messages to a Discord channel; per-command telemetry there would spam the
 channel and add Discord API calls to the very code path being measured.
@@ -12,12 +18,15 @@ a command.
 
 import contextvars
 import datetime
+import functools
 import json
 import os
 import sys
 import time
 from contextlib import contextmanager
 
+from Helpers import histograms
+
 
 def queue_ms_from(created, now=None):
     """Milliseconds between an interaction's creation time and `now`.
@@ -45,6 +54,10 @@ _current: contextvars.ContextVar = contextvars.ContextVar("telemetry_sample", de
 
 _DISABLED_VALUES = ("0", "false", "no")
 
+# Last-run bookkeeping per wrapped task loop, for the metrics endpoint:
+# name -> {"last_end": epoch s, "last_ms": float, "runs": int, "failures": int}
+_task_status: dict = {}
+
 
 def enabled() -> bool:
     return os.getenv("LATENCY_TELEMETRY", "1").strip().lower() not in _DISABLED_VALUES
@@ -60,11 +73,13 @@ class Sample:
         self.queue_ms = queue_ms
         self.started = time.perf_counter()
         self.buckets = {}
+        self.counts = {}
         # Per-bucket nesting depth, so nested spans are not counted twice.
         self.depth = {}
 
     def add(self, bucket, seconds):
         ms = seconds * 1000.0
+        histograms.record(bucket, ms)
         entry = self.buckets.get(bucket)
         if entry is None:
             self.buckets[bucket] = {"n": 1, "ms": round(ms, 2)}
@@ -72,8 +87,11 @@ class Sample:
             entry["n"] += 1
             entry["ms"] = round(entry["ms"] + ms, 2)
 
+    def add_count(self, name, n):
+        self.counts[name] = self.counts.get(name, 0) + n
+
     def payload(self, ok):
-        return {
+        payload = {
             "type": "command",
             "command": self.command,
             "guild_id": self.guild_id,
@@ -83,6 +101,44 @@ class Sample:
             "ok": ok,
             "buckets": self.buckets,
         }
+        if self.counts:
+            payload["counts"] = self.counts
+        return payload
+
+
+class TaskSample(Sample):
+    """Timing accumulator for one iteration of a background task loop.
+
+    On top of the command buckets it records how long the iteration held the
+    event loop: `loop_ms` is the summed synchronous time between awaits, and
+    `max_block_ms` the longest single stretch — the most this iteration can
+    have added to any one loop_lag tick.
+    """
+
+    def __init__(self, task):
+        super().__init__(task)
+        self.loop_s = 0.0
+        self.max_block_s = 0.0
+        self.steps = 0
+
+    def on_loop(self, seconds):
+        self.loop_s += seconds
+        self.steps += 1
+        if seconds > self.max_block_s:
+            self.max_block_s = seconds
+
+    def payload(self, ok):
+        return {
+            "type": "task",
+            "task": self.command,
+            "total_ms": round((time.perf_counter() - self.started) * 1000.0, 2),
+            "loop_ms": round(self.loop_s * 1000.0, 2),
+            "max_block_ms": round(self.max_block_s * 1000.0, 2),
+            "steps": self.steps,
+            "ok": ok,
+            "buckets": self.buckets,
+            "counts": self.counts,
+        }
 
 
 def emit(payload: dict) -> None:
@@ -107,6 +163,16 @@ def record(bucket: str, seconds: float) -> None:
         pass
 
 
+def count(name: str, n: int = 1) -> None:
+    """Add `n` items to a named counter on the current record. Never raises."""
+    try:
+        sample = _current.get()
+        if sample is not None:
+            sample.add_count(name, n)
+    except Exception:
+        pass
+
+
 @contextmanager
 def track(bucket: str):
     """Time a block into `bucket`.
@@ -166,6 +232,98 @@ def finish(ok: bool = True) -> None:
         if sample is None:
             return
         _current.set(None)
-        emit(sample.payload(ok))
+        payload = sample.payload(ok)
+        histograms.record(f"command.{sample.command}", payload["total_ms"])
+        emit(payload)
     except Exception:
         pass
+
+
+def _note_task(name, total_ms, ok):
+    status = _task_status.get(name)
+    if status is None:
+        status = _task_status[name] = {"runs": 0, "failures": 0}
+    status["runs"] += 1
+    if not ok:
+        status["failures"] += 1
+    status["last_end"] = time.time()
+    status["last_ms"] = total_ms
+
+
+def task_status() -> dict:
+    """Copy of the per-loop last-run bookkeeping."""
+    return {name: dict(status) for name, status in _task_status.items()}
+
+
+class _Stepped:
+    """Awaitable that drives a coroutine one step at a time, timing each step.
+
+    Every send/throw into the coroutine runs synchronously on the event loop
+    until its next suspension, so each step's duration is time the loop could
+    do nothing else. Yielded futures and values sent back are passed through
+    untouched, so the wrapped coroutine behaves exactly as if awaited directly.
+    """
+
+    def __init__(self, coro, sample):
+        self._coro = coro
+        self._sample = sample
+
+    def __await__(self):
+        it = self._coro.__await__()
+        value, error = None, None
+        while True:
+            start = time.perf_counter()
+            try:
+                if error is not None:
+                    yielded = it.throw(error)
+                else:
+                    yielded = it.send(value)
+            except StopIteration as stop:
+                self._sample.on_loop(time.perf_counter() - start)
+                return stop.value
+            except BaseException:
+                self._sample.on_loop(time.perf_counter() - start)
+                raise
+            self._sample.on_loop(time.perf_counter() - start)
+            try:
+                value, error = (yield yielded), None
+            except BaseException as exc:
+                value, error = None, exc
+
+
+def wrap_task(name: str, fn):
+    """Wrap a loop's coroutine function so each call emits one `task` record.
+
+    Idempotent: wrapping an already-wrapped function returns it unchanged.
+    Telemetry failures never reach the loop; the loop's own exceptions (and
+    cancellation) propagate exactly as before, recorded as ok=false.
+    """
+    if getattr(fn, "__telemetry_task__", None) is not None:
+        return fn
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if not enabled():
+            return await fn(*args, **kwargs)
+        try:
+            sample = TaskSample(name)
+            token = _current.set(sample)
+        except Exception:
+            return await fn(*args, **kwargs)
+        ok = False
+        try:
+            result = await _Stepped(fn(*args, **kwargs), sample)
+            ok = True
+            return result
+        finally:
+            try:
+                _current.reset(token)
+                payload = sample.payload(ok)
+                histograms.record(f"task.{name}", payload["total_ms"])
+                _note_task(name, payload["total_ms"], ok)
+                emit(payload)
+            except Exception:
+                pass
+
+    wrapper.__telemetry_task__ = name
+    return wrapper
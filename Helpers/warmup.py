@@ -0,0 +1,191 @@
+"""
+Helpers/warmup.py
+Startup warmup and keep-warm for the bot's hot paths.
+
+Traffic is sparse, so nearly every command is the first one after an idle
+stretch and pays every cold cost at once: a fresh Neon connection, new TLS
+handshakes to Wynncraft, visage and S3 (3-5x the warm latency), and decoding
+the same fonts and row templates from disk. ``warm_up`` pays those once at
+startup, concurrently and without holding up on_ready; blocking steps run in
+worker threads, coroutine steps on the loop.
+``start_keepalive`` then issues one cheap request per pooled socket on an
+interval so they never sit idle long enough to be dropped.
+
+Every step swallows its own errors: warming is an optimisation, and a host
+that is down at startup must not take anything else with it.
+"""
+
+import asyncio
+import time
+
+from Helpers import guild_colors, http_client
+from Helpers.classes import _place_template_parts
+from Helpers.database import DB
+from Helpers.functions import _cached_font
+from Helpers.logger import log, SUCCESS, WARN
+from Helpers.storage import storage, warm_background_cache
+
+KEEPALIVE_INTERVAL_S = 90
+
+# HEAD to the host root: enough to open (or reuse) the pooled TLS connection,
+# with no API payload and no Authorization header, so no token budget is spent.
+HTTP_HOSTS = (
+    "https://api.wynncraft.com/",
+    "https://visage.surgeplay.com/",
+)
+
+FONTS = (
+    ("images/profile/game.ttf", 18),
+    ("images/profile/game.ttf", 19),
+    ("images/profile/game.ttf", 24),
+    ("images/profile/game.ttf", 26),
+    ("images/profile/5x5.ttf", 20),
+    ("images/profile/5x5.ttf", 30),
+)
+
+PLACE_TEMPLATES = (
+    "images/profile/first.png",
+    "images/profile/second.png",
+    "images/profile/third.png",
+    "images/profile/other.png",
+    "images/profile/warning.png",
+)
+
+_keepalive_task = None
+stats = {"warmups": 0, "keepalives": 0, "failures": 0}
+
+
+def ping_db() -> int:
+    """Round-trip the pool's idle connection, opening the pool if needed.
+
+    The pool keeps only its minimum of connections idle (psycopg2 closes the
+    rest on return), so one checkout is what "warm to minimum size" means.
+    """
+    with DB() as db:
+        db.cursor.execute("SELECT 1")
+        db.cursor.fetchone()
+    return 1
+
+
+async def ping_http() -> int:
+    """HEAD each host through the shared aiohttp pool that async callers use."""
+    ok = 0
+    for url in HTTP_HOSTS:
+        try:
+            await http_client.request("HEAD", url, timeout=5)
+            ok += 1
+        except Exception as e:
+            log(WARN, f"Keep-warm request to {url} failed: {e}", context="warmup")
+    return ok
+
+
+def ping_s3() -> int:
+    if not storage._is_configured:
+        return 0
+    storage.client.head_bucket(Bucket=storage._bucket)
+    return 1
+
+
+def warm_assets() -> int:
+    """Decode the fonts and row templates every leaderboard render uses."""
+    loaded = 0
+    for path, size in FONTS:
+        try:
+            _cached_font(path, size)
+            loaded += 1
+        except OSError:
+            pass
+    for path in PLACE_TEMPLATES:
+        try:
+            _place_template_parts(path)
+            loaded += 1
+        except OSError:
+            pass
+    return loaded
+
+
+def warm_map() -> int:
+    """Render /map once: base layer, territory list, overlay and PNG cache."""
+    from Commands import map as map_cmd
+
+    file, _ = map_cmd.mapCreator()
+    return int(file is not None)
+
+
+def warm_activity() -> int:
+    """Compute the default /activity window from the current guild snapshot."""
+    from Commands import activity
+
+    return len(activity._load_sorted_rows("Inactivity", 7))
+
+
+STARTUP_STEPS = {
+    "db": ping_db,
+    "http": ping_http,
+    "s3": ping_s3,
+    "assets": warm_assets,
+    "backgrounds": warm_background_cache,
+    "guild_colors": guild_colors.load_from_db_sync,
+    "activity": warm_activity,
+    "map": warm_map,
+}
+
+KEEPALIVE_STEPS = {
+    "db": ping_db,
+    "http": ping_http,
+    "s3": ping_s3,
+}
+
+
+async def _run_step(name: str, fn) -> tuple[str, object, float]:
+    t = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(fn):
+            result = await fn()
+        else:
+            result = await asyncio.to_thread(fn)
+    except Exception as e:
+        stats["failures"] += 1
+        result = e
+        log(WARN, f"Warmup step {name} failed: {e}", context="warmup")
+    return name, result, time.perf_counter() - t
+
+
+async def run_steps(steps: dict) -> dict:
+    """Run the given steps concurrently. Returns {name: result or exception}."""
+    done = await asyncio.gather(*(_run_step(name, fn) for name, fn in steps.items()))
+    return {name: result for name, result, _ in done}
+
+
+async def warm_up() -> dict:
+    """Warm every startup step once. Never raises."""
+    t = time.perf_counter()
+    done = await asyncio.gather(*(_run_step(name, fn) for name, fn in STARTUP_STEPS.items()))
+    stats["warmups"] += 1
+    summary = ", ".join(
+        f"{name}={'fail' if isinstance(result, Exception) else result} ({elapsed:.1f}s)"
+        for name, result, elapsed in done
+    )
+    log(SUCCESS, f"Warmup finished in {time.perf_counter() - t:.1f}s: {summary}", context="warmup")
+    return {name: result for name, result, _ in done}
+
+
+async def _keepalive_loop(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        await run_steps(KEEPALIVE_STEPS)
+        stats["keepalives"] += 1
+
+
+def start_keepalive(interval: float = KEEPALIVE_INTERVAL_S):
+    """Begin the keep-warm loop. Idempotent; call from on_ready."""
+    global _keepalive_task
+    if _keepalive_task is None or _keepalive_task.done():
+        _keepalive_task = asyncio.create_task(_keepalive_loop(interval))
+
+
+def stop_keepalive():
+    global _keepalive_task
+    if _keepalive_task is not None:
+        _keepalive_task.cancel()
+        _keepalive_task = None
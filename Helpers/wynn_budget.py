@@ -0,0 +1,255 @@
+"""
+Helpers/wynn_budget.py
+Process-wide Wynncraft API rate budget, one per token.
+
+Wynncraft rate-limits per token and reports the live state on every response
+(``ratelimit-limit`` / ``ratelimit-remaining`` / ``ratelimit-reset``). Every
+Wynncraft response that goes through ``timed_get`` (and the aiohttp callers
+that opt in) is fed to ``observe``, so the budget tracks what the API itself
+says rather than a hard-coded guess.
+
+Background loops call ``acquire_async`` before each request. It debits the
+budget and, when only the interactive reserve is left, sleeps until the
+window resets — so the member loop and the recruiter scan back off instead of
+tripping 429s, and ``/profile`` still has headroom on the same token.
+Interactive (command) paths never wait here; they only report what they spent
+via the response headers.
+
+Budgets are keyed by the token's value, not the env var name, so two env vars
+holding the same key share one budget — as they do upstream.
+
+A slot taken by ``acquire_async`` is released by the next response (or
+failure, cancellation included) recorded in the same context, so
+``acquire`` → ``http_client.get(...)`` in one task pairs up without the caller
+passing anything through; ``asyncio.to_thread(timed_get, ...)`` works the same
+way, as to_thread copies the context. A slot nothing ever settles (a caller
+that acquired and then never made its request) is forgotten when the window
+rolls, so a leak costs at most one window.
+"""
+
+import asyncio
+import contextvars
+import math
+import os
+import threading
+import time
+
+# Until a response says otherwise. Wynncraft's documented default for an
+# authenticated token; the live limit replaces this on the first response.
+DEFAULT_LIMIT = 120
+DEFAULT_WINDOW_S = 60.0
+
+# Share of the limit background callers may not touch.
+INTERACTIVE_RESERVE = 0.2
+
+# Added to every reset wait, so a waiter wakes just after the window rolls.
+RESET_SLACK_S = 0.5
+
+
+def _header(headers, name):
+    try:
+        value = headers.get(name)
+        return None if value is None else int(float(value))
+    except Exception:
+        return None
+
+
+class RateBudget:
+    """Live rate state for one token."""
+
+    def __init__(self, label, limit=DEFAULT_LIMIT, window_s=DEFAULT_WINDOW_S):
+        self.label = label
+        self.limit = limit
+        self.window_s = window_s
+        self.remaining = limit
+        self.reset_at = time.monotonic() + window_s
+        self.in_flight = 0
+        # Bumped whenever in_flight is cleared; tickets from an older
+        # generation no longer count against it.
+        self.generation = 0
+        self.learned = False
+        self.waits = 0
+        self.throttled = 0   # 429s seen
+        self._lock = threading.Lock()
+
+    @property
+    def reserve(self):
+        return max(1, math.ceil(self.limit * INTERACTIVE_RESERVE))
+
+    def _roll(self, now):
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.window_s
+            self.in_flight = 0
+            self.generation += 1
+
+    def _take(self, now):
+        with self._lock:
+            self._roll(now)
+            if self.remaining - self.in_flight > self.reserve:
+                self.in_flight += 1
+                return 0.0, self.generation
+            return max(0.0, self.reset_at - now) + RESET_SLACK_S, None
+
+    def try_acquire(self, now=None):
+        """Debit one background call. Returns 0.0 on success, else seconds to wait."""
+        return self._take(time.monotonic() if now is None else now)[0]
+
+    async def acquire_async(self):
+        """Wait (without blocking the loop) until a background call fits."""
+        while True:
+            wait, generation = self._take(time.monotonic())
+            if wait == 0.0:
+                _ticket.set([self, generation])
+                return
+            self.waits += 1
+            await asyncio.sleep(wait)
+
+    def observe(self, headers, status=None, acquired=False, now=None):
+        """Fold one response's rate headers in. Never raises.
+
+        ``acquired`` marks a response to a call that went through try_acquire,
+        so its in-flight debit is released.
+        """
+        try:
+            if now is None:
+                now = time.monotonic()
+            limit = _header(headers, "ratelimit-limit")
+            remaining = _header(headers, "ratelimit-remaining")
+            reset = _header(headers, "ratelimit-reset")
+            with self._lock:
+                if acquired and self.in_flight > 0:
+                    self.in_flight -= 1
+                if limit:
+                    self.limit = limit
+                    self.learned = True
+                if reset is not None:
+                    self.reset_at = now + reset
+                if status == 429:
+                    self.throttled += 1
+                    self.remaining = 0
+                    if reset is None:
+                        self.reset_at = now + self.window_s
+                elif remaining is not None:
+                    self.remaining = remaining
+                else:
+                    self._roll(now)
+                    self.remaining = max(0, self.remaining - 1)
+        except Exception:
+            pass
+
+    def release(self):
+        """Give back an acquired slot whose request never got a response."""
+        with self._lock:
+            if self.in_flight > 0:
+                self.in_flight -= 1
+
+    def stats(self):
+        with self._lock:
+            self._roll(time.monotonic())
+            return {
+                "token": self.label,
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "in_flight": self.in_flight,
+                "reserve": self.reserve,
+                "reset_in_s": round(max(0.0, self.reset_at - time.monotonic()), 1),
+                "learned": self.learned,
+                "waits": self.waits,
+                "throttled": self.throttled,
+            }
+
+
+# [budget, generation] for the slot an acquire debited; emptied by the
+# response that settles it. Mutable so a to_thread copy of the context can
+# settle the caller's ticket.
+_ticket: contextvars.ContextVar = contextvars.ContextVar("wynn_budget_ticket", default=None)
+
+
+def _settle(budget):
+    """True if the current context holds an unsettled acquire on `budget` that
+    still counts against its in-flight total."""
+    ticket = _ticket.get()
+    if ticket and ticket[0] is budget:
+        generation = ticket[1]
+        ticket.clear()
+        return generation == budget.generation
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+_registry_lock = threading.Lock()
+_budgets: dict = {}          # token value -> RateBudget
+_TOKEN_ENVS = ("WYNN_TOKEN", "WYNN_LOOP_TOKEN", "RECRUITMENT_TOKEN")
+
+
+def _normalise(secret):
+    # Helpers that format an unset env var send "Bearer None"; that is the
+    # same unauthenticated identity as no header at all.
+    return None if not secret or secret == "None" else secret
+
+
+def _label_for(secret):
+    names = [env for env in _TOKEN_ENVS if secret and os.getenv(env) == secret]
+    return "+".join(names) or ("anonymous" if not secret else "other")
+
+
+def for_secret(secret):
+    """Budget for a raw token value (None/''/'None' for unauthenticated calls)."""
+    secret = _normalise(secret)
+    key = secret or ""
+    with _registry_lock:
+        budget = _budgets.get(key)
+        if budget is None:
+            budget = _budgets[key] = RateBudget(_label_for(secret))
+        return budget
+
+
+def for_token(token_env=None):
+    """Budget for the token an env var names (default WYNN_TOKEN)."""
+    return for_secret(os.getenv(token_env or "WYNN_TOKEN"))
+
+
+def for_authorization(auth_header):
+    """Budget for an ``Authorization: Bearer <token>`` header value."""
+    secret = None
+    if auth_header and auth_header.startswith("Bearer "):
+        secret = auth_header[len("Bearer "):].strip() or None
+    return for_secret(secret)
+
+
+def record_response(auth_header, headers, status=None):
+    """Feed one Wynncraft response to its token's budget. Never raises."""
+    try:
+        budget = for_authorization(auth_header)
+        budget.observe(headers, status, acquired=_settle(budget))
+    except Exception:
+        pass
+
+
+def record_failure(auth_header):
+    """A request that got no response: give back its acquired slot, if any."""
+    try:
+        budget = for_authorization(auth_header)
+        if _settle(budget):
+            budget.release()
+    except Exception:
+        pass
+
+
+async def acquire(token_env=None):
+    """Background-priority wait for one call on `token_env`'s budget."""
+    await for_token(token_env).acquire_async()
+
+
+def stats() -> list[dict]:
+    with _registry_lock:
+        budgets = list(_budgets.values())
+    return [b.stats() for b in budgets]
+
+
+def _reset_for_tests():
+    with _registry_lock:
+        _budgets.clear()
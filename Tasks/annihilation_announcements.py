@@ -4,12 +4,13 @@ import json
 import random
 from pathlib import Path
 
-import aiohttp
 import discord
 from discord.ext import commands, tasks
 
+from Helpers import http_client
 from Helpers.database import DB
 from Helpers.logger import ERROR, SUCCESS, WARN, log
+from Helpers.scheduler import scheduler
 from Helpers.variables import (
     ANNIHILATION_ANNOUNCEMENT_CHANNEL_ID,
     ANNIHILATION_PING_ROLE_ID,
@@ -20,7 +21,7 @@ from Helpers.variables import (
 WYNNCRAFT_WORLD_EVENTS_URL = "https://api.wynncraft.com/v3/map/world-events"
 PRELUDE_EVENT_NAME = "Prelude to Annihilation"
 ANNOUNCEMENT_STATE_KEY = "annihilationAnnouncements"
-TIMER_CHECK_MINUTES = 1
+ONE_HOUR_JOB = "annihilation_one_hour"
 WYNNCRAFT_POLL_SECONDS = 5 * 60
 LATE_ALERT_GRACE_SECONDS = 5 * 60
 ONE_HOUR_NOTICE_SECONDS = 60 * 60
@@ -212,33 +213,26 @@ async def send_annihilation_announcement(
 class AnnihilationAnnouncements(commands.Cog):
     def __init__(self, client):
         self.client = client
-        self._http_session: aiohttp.ClientSession | None = None
         self._memory_state = _default_state()
-        self._last_api_poll_at: datetime.datetime | None = None
+        # Runs whose one-hour alert is already scheduled (this process).
+        self._armed: set[str] = set()
+        scheduler.register(ONE_HOUR_JOB, self._send_one_hour)
         self._task.start()
 
     def cog_unload(self):
         if self._task.is_running():
             self._task.cancel()
-        if self._http_session and not self._http_session.closed:
-            asyncio.create_task(self._http_session.close())
-
-    async def _session(self) -> aiohttp.ClientSession:
-        if self._http_session is None or self._http_session.closed:
-            timeout = aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
-            self._http_session = aiohttp.ClientSession(timeout=timeout, raise_for_status=True)
-        return self._http_session
 
     async def _fetch_world_events(self) -> list[dict]:
-        session = await self._session()
         for attempt in range(3):
             try:
-                async with session.get(WYNNCRAFT_WORLD_EVENTS_URL) as response:
-                    data = await response.json()
-                    if isinstance(data, list):
-                        return data
-                    raise ValueError(f"Unexpected response type: {type(data).__name__}")
-            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, json.JSONDecodeError) as exc:
+                response = await http_client.get(WYNNCRAFT_WORLD_EVENTS_URL)
+                response.raise_for_status()
+                data = response.json()
+                if isinstance(data, list):
+                    return data
+                raise ValueError(f"Unexpected response type: {type(data).__name__}")
+            except (*http_client.RequestError, ValueError) as exc:
                 if attempt == 2:
                     raise exc
                 await asyncio.sleep((2 ** attempt) + random.uniform(0, 0.3))
@@ -313,13 +307,6 @@ class AnnihilationAnnouncements(commands.Cog):
             )
 
     async def _poll_api(self, state: dict, now: datetime.datetime) -> bool:
-        if (
-            self._last_api_poll_at is not None
-            and (now - self._last_api_poll_at).total_seconds() < WYNNCRAFT_POLL_SECONDS
-        ):
-            return False
-
-        self._last_api_poll_at = now
         events = await self._fetch_world_events()
         event = self._find_prelude_event(events)
         if not event:
@@ -361,16 +348,36 @@ class AnnihilationAnnouncements(commands.Cog):
             if not sent_detection and run_state.get("detected"):
                 await self._ensure_party_board(schedule_dt)
 
-            if sent_detection:
-                continue
-
-            if not run_state.get("one_hour") and _is_one_hour_due(seconds_until):
-                if await self._maybe_send(state, schedule_dt, "one_hour"):
-                    sent_count += 1
+            if not run_state.get("one_hour"):
+                await self._arm_one_hour(run_key, schedule_dt)
 
         return sent_count
 
-    @tasks.loop(minutes=TIMER_CHECK_MINUTES)
+    async def _arm_one_hour(self, run_key: str, schedule_dt: datetime.datetime) -> None:
+        """Schedule the one-hour alert for a run. Keyed by run, so re-arming after a restart is a no-op."""
+        if run_key in self._armed:
+            return
+        await scheduler.schedule(
+            ONE_HOUR_JOB,
+            schedule_dt - datetime.timedelta(seconds=ONE_HOUR_NOTICE_SECONDS),
+            {"schedule": run_key},
+            key=f"{ONE_HOUR_JOB}:{run_key}",
+        )
+        self._armed.add(run_key)
+
+    async def _send_one_hour(self, payload: dict) -> None:
+        run_key = payload["schedule"]
+        schedule_dt = _parse_wynncraft_datetime(run_key)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        # Fired long after its time (the bot was down): skip, as a late
+        # "1 hour left" would be wrong.
+        if not _is_one_hour_due((schedule_dt - now).total_seconds()):
+            return
+        state = await self._load_state()
+        if await self._maybe_send(state, schedule_dt, "one_hour"):
+            log(SUCCESS, f"Sent {PRELUDE_EVENT_NAME} one-hour alert", context="annihilation")
+
+    @tasks.loop(seconds=WYNNCRAFT_POLL_SECONDS)
     async def _task(self):
         try:
             now = datetime.datetime.now(datetime.timezone.utc)
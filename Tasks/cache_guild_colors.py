@@ -1,20 +1,47 @@
+import asyncio
 import datetime
 import json
-import aiohttp
 
 from discord.ext import tasks, commands
 
+from Helpers import guild_colors, http_client, wynn_budget
 from Helpers.logger import log, INFO, ERROR
 from Helpers.database import DB
 
 
+def _store_guild_colors_sync(guilds):
+    db = DB()
+    db.connect()
+    try:
+        epoch_time = datetime.datetime.fromtimestamp(0, tz=datetime.timezone.utc)
+
+        db.cursor.execute("""
+            INSERT INTO cache_entries (cache_key, data, expires_at, fetch_count)
+            VALUES (%s, %s, %s, 1)
+            ON CONFLICT (cache_key)
+            DO UPDATE SET
+                data = EXCLUDED.data,
+                created_at = NOW(),
+                expires_at = EXCLUDED.expires_at,
+                fetch_count = cache_entries.fetch_count + 1,
+                last_error = NULL,
+                error_count = 0
+        """, ('guildColors', json.dumps(guilds), epoch_time))
+
+        db.connection.commit()
+    finally:
+        db.close()
+
+
 class CacheGuildColors(commands.Cog):
     def __init__(self, client):
         self.client = client
         self.cache_guild_colors.start()
+        self.resolve_guild_colors.start()
 
     def cog_unload(self):
         self.cache_guild_colors.cancel()
+        self.resolve_guild_colors.cancel()
 
     @tasks.loop(hours=1)
     async def cache_guild_colors(self):
@@ -23,48 +50,53 @@ class CacheGuildColors(commands.Cog):
             return
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get('https://athena.wynntils.com/cache/get/guildList') as resp:
-                    if resp.status != 200:
-                        log(ERROR, f"Failed to fetch from Wynntils API: {resp.status}", context="cache_guild_colors")
-                        return
-                    guilds = await resp.json()
-
-            # Store in database cache
-            db = DB()
-            db.connect()
-
-            epoch_time = datetime.datetime.fromtimestamp(0, tz=datetime.timezone.utc)
-
-            db.cursor.execute("""
-                INSERT INTO cache_entries (cache_key, data, expires_at, fetch_count)
-                VALUES (%s, %s, %s, 1)
-                ON CONFLICT (cache_key)
-                DO UPDATE SET
-                    data = EXCLUDED.data,
-                    created_at = NOW(),
-                    expires_at = EXCLUDED.expires_at,
-                    fetch_count = cache_entries.fetch_count + 1,
-                    last_error = NULL,
-                    error_count = 0
-            """, ('guildColors', json.dumps(guilds), epoch_time))
-
-            db.connection.commit()
-            db.close()
+            try:
+                resp = await http_client.get('https://athena.wynntils.com/cache/get/guildList')
+                if resp.status != 200:
+                    log(ERROR, f"Failed to fetch from Wynntils API: {resp.status}", context="cache_guild_colors")
+                    guilds = None
+                else:
+                    guilds = resp.json()
+            except (*http_client.RequestError, ValueError) as e:
+                log(ERROR, f"Failed to fetch from Wynntils API: {e!r}", context="cache_guild_colors")
+                guilds = None
+
+            if guilds is None:
+                # Athena is down: fall back to the last stored list so
+                # consumers still have colours after a restart.
+                if not guild_colors.stats()["athena"]:
+                    await asyncio.to_thread(guild_colors.load_from_db_sync)
+                return
+
+            guild_colors.load_athena(guilds)
+            await asyncio.to_thread(_store_guild_colors_sync, guilds)
 
             log(INFO, f"Updated cache with {len(guilds)} guilds", context="cache_guild_colors")
 
         except Exception as e:
             log(ERROR, f"Error: {e}", context="cache_guild_colors")
 
+    @tasks.loop(minutes=1)
+    async def resolve_guild_colors(self):
+        # Guild restriction: no Discord guild interaction — resolves tags Athena doesn't know
+        for prefix in guild_colors.next_batch():
+            await wynn_budget.acquire("WYNN_TOKEN")
+            await asyncio.to_thread(guild_colors.resolve_sync, prefix)
+
     @cache_guild_colors.before_loop
     async def before_cache(self):
         await self.client.wait_until_ready()
 
+    @resolve_guild_colors.before_loop
+    async def before_resolve(self):
+        await self.client.wait_until_ready()
+
     @commands.Cog.listener()
     async def on_ready(self):
         if not self.cache_guild_colors.is_running():
             self.cache_guild_colors.start()
+        if not self.resolve_guild_colors.is_running():
+            self.resolve_guild_colors.start()
 
 
 def setup(client):
@@ -5,9 +5,9 @@ from datetime import datetime, timezone
 import discord
 from discord.ext import tasks, commands
 
+from Helpers import http_client
 from Helpers.logger import log, INFO, ERROR
 from Helpers.database import DB
-from Helpers.functions import getPlayerDatav3, getPlayerUUID
 from Helpers.app_transcript import (
     classify_transcript_candidate,
     post_transcript,
@@ -78,13 +78,13 @@ class CheckApps(commands.Cog):
                 uuid = str(link_row[0])
 
         if not uuid:
-            uuid_data = await asyncio.to_thread(getPlayerUUID, ign)
+            uuid_data = await http_client.get_player_uuid(ign)
             uuid = uuid_data[1] if uuid_data else None
 
         if not uuid:
             return
 
-        player_data = await asyncio.to_thread(getPlayerDatav3, uuid)
+        player_data = await http_client.get_player_data(uuid)
         if not isinstance(player_data, dict):
             return
 
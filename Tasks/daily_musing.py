@@ -5,6 +5,8 @@ Design notes:
   * At most once per calendar day (UTC). Restart-safe: state lives in bot_settings.
   * The *time* of day is random — each day a target minute is rolled inside an
     active-hours window and persisted, so a restart won't re-roll or double-post.
+    The post is a scheduler job (Helpers/scheduler.py) due at that minute; each
+    post schedules the next day's.
   * The *content* rotates sequentially through MUSINGS (persisted index), so the
     upcoming order is fully predictable and every line is seen before any repeats.
 """
@@ -14,10 +16,11 @@ import datetime
 import random
 
 import discord
-from discord.ext import tasks, commands
+from discord.ext import commands
 
-from Helpers.database import DB
 from Helpers.logger import log, ERROR, INFO
+from Helpers.scheduler import scheduler
+from Helpers.settings import settings
 from Helpers.variables import BOT_COMMAND_CHANNEL_ID, is_home_guild
 
 
@@ -38,6 +41,10 @@ _TARGET_DATE_KEY = "musing_target_date"     # YYYY-MM-DD the current target was
 _TARGET_MINUTE_KEY = "musing_target_minute"  # minute-of-day (UTC) to post at
 _INDEX_KEY = "musing_index"                 # next index into MUSINGS
 
+JOB = "daily_musing"
+# After a failed post, try again this much later.
+RETRY_AFTER = datetime.timedelta(minutes=10)
+
 
 # ---------------------------------------------------------------------------
 # The musings.
@@ -134,35 +141,6 @@ def _interleave(a: list[str], b: list[str]) -> list[str]:
 MUSINGS = _interleave(AQUATIC, CONTEMPLATIVE)
 
 
-# ---------------------------------------------------------------------------
-# DB helpers (synchronous — run via asyncio.to_thread)
-# ---------------------------------------------------------------------------
-
-def _get_setting_sync(key: str) -> str | None:
-    db = DB()
-    db.connect()
-    try:
-        db.cursor.execute("SELECT value FROM bot_settings WHERE key = %s", (key,))
-        row = db.cursor.fetchone()
-        return row[0] if row else None
-    finally:
-        db.close()
-
-
-def _set_setting_sync(key: str, value: str):
-    db = DB()
-    db.connect()
-    try:
-        db.cursor.execute(
-            "INSERT INTO bot_settings (key, value) VALUES (%s, %s) "
-            "ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value",
-            (key, value),
-        )
-        db.connection.commit()
-    finally:
-        db.close()
-
-
 # ---------------------------------------------------------------------------
 # Cog
 # ---------------------------------------------------------------------------
@@ -170,67 +148,89 @@ def _set_setting_sync(key: str, value: str):
 class DailyMusing(commands.Cog):
     def __init__(self, client: discord.Bot):
         self.client = client
+        scheduler.register(JOB, self._on_due)
 
-    # -- background loop -----------------------------------------------------
-
-    @tasks.loop(minutes=10)
-    async def musing_loop(self):
-        # Guild restriction: posts only to the home guild's bot-command channel.
-        try:
-            await self._maybe_post()
-        except Exception as e:
-            log(ERROR, f"error: {e!r}", context="daily_musing")
-
-    async def _maybe_post(self):
-        now = datetime.datetime.now(datetime.timezone.utc)
-        today = now.date().isoformat()
+    # -- scheduling ----------------------------------------------------------
 
-        # Already posted today? Nothing to do.
-        if await asyncio.to_thread(_get_setting_sync, _LAST_DATE_KEY) == today:
-            return
+    async def _arm(self, now: datetime.datetime):
+        """Schedule the next post: today's target if not yet posted, else tomorrow's."""
+        day = now.date()
+        if settings.get(_LAST_DATE_KEY) == day.isoformat():
+            day += datetime.timedelta(days=1)
 
         # Roll (once per day) the random target minute we'll post at.
-        target_minute_raw = await asyncio.to_thread(_get_setting_sync, _TARGET_MINUTE_KEY)
-        if await asyncio.to_thread(_get_setting_sync, _TARGET_DATE_KEY) != today or target_minute_raw is None:
+        target_minute_raw = settings.get(_TARGET_MINUTE_KEY)
+        if settings.get(_TARGET_DATE_KEY) != day.isoformat() or target_minute_raw is None:
             target_minute = random.randint(WINDOW_START_MINUTE, WINDOW_END_MINUTE)
-            await asyncio.to_thread(_set_setting_sync, _TARGET_MINUTE_KEY, str(target_minute))
-            await asyncio.to_thread(_set_setting_sync, _TARGET_DATE_KEY, today)
+            await asyncio.to_thread(settings.set, _TARGET_MINUTE_KEY, target_minute)
+            await asyncio.to_thread(settings.set, _TARGET_DATE_KEY, day.isoformat())
         else:
             target_minute = int(target_minute_raw)
 
-        # Not time yet.
-        if now.hour * 60 + now.minute < target_minute:
-            return
+        # A target already past (restart late in the day) is due immediately.
+        due = datetime.datetime.combine(day, datetime.time(), datetime.timezone.utc)
+        due += datetime.timedelta(minutes=target_minute)
+        await scheduler.schedule(JOB, due, {"date": day.isoformat()}, key=JOB)
+
+    async def _on_due(self, payload: dict):
+        # Guild restriction: posts only to the home guild's bot-command channel.
+        now = datetime.datetime.now(datetime.timezone.utc)
+        try:
+            # Unloaded settings read as "not posted today": wait them out
+            # rather than post twice.
+            if not settings.loaded and not await asyncio.to_thread(settings.load):
+                await scheduler.schedule(JOB, now + RETRY_AFTER, payload, key=JOB)
+                return
+            # A job left over from a day the bot was down re-rolls for today.
+            if payload.get("date") == now.date().isoformat() and not await self._post(now):
+                await scheduler.schedule(JOB, now + RETRY_AFTER, payload, key=JOB)
+                return
+            await self._arm(now)
+        except Exception as e:
+            log(ERROR, f"error: {e!r}", context="daily_musing")
+            await scheduler.schedule(JOB, now + RETRY_AFTER, payload, key=JOB)
+
+    async def _post(self, now: datetime.datetime) -> bool:
+        """Post today's musing unless already posted. Returns False to retry later."""
+        today = now.date().isoformat()
+        if settings.get(_LAST_DATE_KEY) == today:
+            return True
 
         channel = self.client.get_channel(BOT_COMMAND_CHANNEL_ID)
         if channel is None:
             log(ERROR, f"Bot-command channel {BOT_COMMAND_CHANNEL_ID} not found", context="daily_musing")
-            return
+            return False
         if not channel.guild or not is_home_guild(channel.guild.id):
             log(ERROR, f"Bot-command channel {BOT_COMMAND_CHANNEL_ID} not in home guild — skipping", context="daily_musing")
-            return
+            return False
 
         # Pick the next musing in rotation.
-        idx = int(await asyncio.to_thread(_get_setting_sync, _INDEX_KEY) or 0) % len(MUSINGS)
+        idx = settings.get_int(_INDEX_KEY, 0) % len(MUSINGS)
         musing = MUSINGS[idx]
 
         await channel.send(musing)
 
-        # Persist rotation + mark as posted for today (last, so a failed send retries next tick).
-        await asyncio.to_thread(_set_setting_sync, _INDEX_KEY, str((idx + 1) % len(MUSINGS)))
-        await asyncio.to_thread(_set_setting_sync, _LAST_DATE_KEY, today)
+        # Persist rotation + mark as posted for today (last, so a failed send retries).
+        await asyncio.to_thread(settings.set, _INDEX_KEY, (idx + 1) % len(MUSINGS))
+        await asyncio.to_thread(settings.set, _LAST_DATE_KEY, today)
         log(INFO, f"Posted daily musing #{idx} at {now.strftime('%H:%M')} UTC", context="daily_musing")
+        return True
 
     # -- lifecycle -----------------------------------------------------------
 
-    @musing_loop.before_loop
-    async def before_loop(self):
-        await self.client.wait_until_ready()
-
     @commands.Cog.listener()
     async def on_ready(self):
-        if not self.musing_loop.is_running():
-            self.musing_loop.start()
+        # Reads are then served from memory. Re-arming is keyed, so a
+        # reconnect's on_ready just confirms the pending job; if the settings
+        # cannot be read yet, _on_due arms it once they can.
+        now = datetime.datetime.now(datetime.timezone.utc)
+        try:
+            if await asyncio.to_thread(settings.load):
+                await self._arm(now)
+            else:
+                await scheduler.schedule(JOB, now + RETRY_AFTER, {}, key=JOB)
+        except Exception as e:
+            log(ERROR, f"error: {e!r}", context="daily_musing")
 
 
 def setup(client):
@@ -1,56 +1,103 @@
 # Commands/graid_event_stop.py
-from discord.ext import commands, tasks
+import asyncio
+
+from discord.ext import commands
 
 from Helpers.logger import log, INFO, ERROR
 from Helpers.database import DB
+from Helpers.scheduler import scheduler
+
+JOB = "graid_event_stop"
+
 
 def _db():
     db = DB(); db.connect(); return db
 
+
+def _job_key(event_id: int) -> str:
+    return f"{JOB}:{event_id}"
+
+
+async def schedule_stop(event_id: int, end_ts):
+    """Stop event ``event_id`` at ``end_ts``; with no end_ts, drop any pending stop."""
+    if end_ts is None:
+        await scheduler.cancel(_job_key(event_id))
+    else:
+        await scheduler.schedule(JOB, end_ts, {"event_id": event_id}, key=_job_key(event_id))
+
+
+def _stop_sync(event_id: int):
+    """Mark the event inactive if its end_ts has passed.
+
+    Returns (stopped_row, end_ts_if_still_pending); the second is set when the
+    end was moved later after the job was scheduled.
+    """
+    db = _db()
+    try:
+        cur = db.cursor
+        cur.execute(
+            """
+            UPDATE graid_events
+            SET active = FALSE
+            WHERE id = %s
+              AND active = TRUE
+              AND end_ts IS NOT NULL
+              AND now() >= end_ts
+            RETURNING id, title, end_ts
+            """,
+            (event_id,),
+        )
+        row = cur.fetchone()
+        if row:
+            db.connection.commit()
+            return row, None
+        cur.execute("SELECT end_ts FROM graid_events WHERE id = %s AND active = TRUE", (event_id,))
+        pending = cur.fetchone()
+        return None, pending[0] if pending else None
+    finally:
+        db.close()
+
+
+def _active_with_end_sync():
+    db = _db()
+    try:
+        db.cursor.execute("SELECT id, end_ts FROM graid_events WHERE active = TRUE AND end_ts IS NOT NULL")
+        return db.cursor.fetchall()
+    finally:
+        db.close()
+
+
 class GraidAutoStop(commands.Cog):
-    """Background task that auto-stops any active GRAID whose end_ts has passed."""
+    """Auto-stops an active GRAID at its end_ts, via a scheduled job per event."""
     def __init__(self, client):
         self.client = client
-        self._task.start()
-
-    def cog_unload(self):
-        if self._task.is_running():
-            self._task.cancel()
+        scheduler.register(JOB, self._stop)
 
-    @tasks.loop(minutes=1)
-    async def _task(self):
+    async def _stop(self, payload):
         """
-        Runs every minute. If there are active events with end_ts in the past,
-        mark them inactive. We do the comparison in the DB (now() vs end_ts).
-        Guild restriction: DB-only operations, no Discord guild interaction.
+        Fires at the event's end_ts. The comparison is still done in the DB
+        (now() vs end_ts), so a job for an end that was since moved later just
+        re-arms itself. Guild restriction: DB-only operations, no Discord guild
+        interaction.
         """
-        db = _db()
+        event_id = payload["event_id"]
+        row, pending_end = await asyncio.to_thread(_stop_sync, event_id)
+        if row:
+            eid, title, ts = row
+            log(INFO, f"auto-stopped id={eid} title={title!r} at end_ts={ts.isoformat()}", context="graid_autostop")
+        elif pending_end is not None:
+            await schedule_stop(event_id, pending_end)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Re-arm stops for events whose end_ts was set outside the commands
+        # (or before the scheduler existed). Scheduling by key is idempotent.
         try:
-            cur = db.cursor
-            cur.execute(
-                """
-                UPDATE graid_events
-                SET active = FALSE
-                WHERE active = TRUE
-                  AND end_ts IS NOT NULL
-                  AND now() >= end_ts
-                RETURNING id, title, end_ts
-                """
-            )
-            rows = cur.fetchall()  # events auto-stopped (usually 0 or 1)
-            if rows:
-                db.connection.commit()
-                for eid, title, ts in rows:
-                    log(INFO, f"auto-stopped id={eid} title={title!r} at end_ts={ts.isoformat()}", context="graid_autostop")
+            for event_id, end_ts in await asyncio.to_thread(_active_with_end_sync):
+                await schedule_stop(event_id, end_ts)
         except Exception as e:
             log(ERROR, f"error: {e!r}", context="graid_autostop")
-        finally:
-            db.close()
 
-    @_task.before_loop
-    async def _wait_until_ready(self):
-        # Ensure the bot is fully ready before the first run
-        await self.client.wait_until_ready()
 
 def setup(client):
     client.add_cog(GraidAutoStop(client))
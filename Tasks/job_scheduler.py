@@ -0,0 +1,31 @@
+"""
+Tasks/job_scheduler.py
+Runs the deadline scheduler (Helpers/scheduler.py).
+
+Cogs register their job handlers when they load and schedule jobs whenever
+they like; this cog only starts the sleeper once the client is ready, so no
+handler fires before the channels it posts to are cached.
+"""
+
+from discord.ext import commands
+
+from Helpers.logger import log, INFO
+from Helpers.scheduler import scheduler
+
+
+class JobScheduler(commands.Cog):
+    def __init__(self, client):
+        self.client = client
+
+    def cog_unload(self):
+        scheduler.stop()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if not scheduler.running:
+            scheduler.start()
+            log(INFO, "Deadline scheduler started", context="scheduler")
+
+
+def setup(client):
+    client.add_cog(JobScheduler(client))
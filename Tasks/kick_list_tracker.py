@@ -6,6 +6,7 @@ from discord.ext import tasks, commands
 
 from Helpers.database import DB
 from Helpers.logger import log, ERROR, INFO
+from Helpers.settings import settings
 from Helpers.variables import KICK_LIST_CHANNEL_ID, is_home_guild
 
 
@@ -26,33 +27,6 @@ def _fetch_kick_list_sync() -> list[tuple]:
         db.close()
 
 
-def _get_setting_sync(key: str) -> str | None:
-    db = DB()
-    db.connect()
-    try:
-        db.cursor.execute(
-            "SELECT value FROM bot_settings WHERE key = %s", (key,)
-        )
-        row = db.cursor.fetchone()
-        return row[0] if row else None
-    finally:
-        db.close()
-
-
-def _set_setting_sync(key: str, value: str):
-    db = DB()
-    db.connect()
-    try:
-        db.cursor.execute(
-            "INSERT INTO bot_settings (key, value) VALUES (%s, %s) "
-            "ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value",
-            (key, value),
-        )
-        db.connection.commit()
-    finally:
-        db.close()
-
-
 def _add_to_kick_list_sync(uuid: str, ign: str, tier: int, added_by: str):
     db = DB()
     db.connect()
@@ -166,6 +140,11 @@ class KickListTracker(commands.Cog):
             log(ERROR, f"Kick list channel {KICK_LIST_CHANNEL_ID} not in home guild - skipping", context="kick_list_tracker")
             return
 
+        # Without the stored message id we would post a second list (and
+        # thread); wait for a tick where the settings can be read.
+        if not settings.loaded and not await asyncio.to_thread(settings.load):
+            return
+
         rows = await asyncio.to_thread(_fetch_kick_list_sync)
 
         # Skip edit if nothing changed
@@ -174,8 +153,7 @@ class KickListTracker(commands.Cog):
         self._last_rows = rows
 
         embed = build_kick_list_embed(rows)
-        raw_id = await asyncio.to_thread(_get_setting_sync, "kick_list_message_id")
-        message_id = int(raw_id) if raw_id else None
+        message_id = settings.get_int("kick_list_message_id")
 
         if message_id:
             try:
@@ -190,11 +168,11 @@ class KickListTracker(commands.Cog):
 
         # Send new message, store its ID, and create a discussion thread
         msg = await channel.send(embed=embed)
-        await asyncio.to_thread(_set_setting_sync, "kick_list_message_id", str(msg.id))
+        await asyncio.to_thread(settings.set, "kick_list_message_id", msg.id)
 
         try:
             thread = await msg.create_thread(name="Kick List Discussion")
-            await asyncio.to_thread(_set_setting_sync, "kick_list_thread_id", str(thread.id))
+            await asyncio.to_thread(settings.set, "kick_list_thread_id", thread.id)
         except Exception as e:
             log(ERROR, f"Failed to create kick list thread: {e!r}", context="kick_list_tracker")
 
@@ -203,6 +181,7 @@ class KickListTracker(commands.Cog):
     @kick_list_loop.before_loop
     async def before_loop(self):
         await self.client.wait_until_ready()
+        await asyncio.to_thread(settings.load)
 
     @commands.Cog.listener()
     async def on_ready(self):
@@ -0,0 +1,46 @@
+"""
+Tasks/latency_summary.py
+Once-a-minute percentile summary of the in-process latency histograms.
+
+Drains the one-minute window of Helpers/histograms.py into a single
+`latency_summary` record: p50/p90/p99/max/mean and n for every command,
+task loop and bucket that saw traffic in the window. Quiet windows emit
+nothing — loop_lag_summary is already the liveness heartbeat.
+"""
+
+from discord.ext import commands, tasks
+
+from Helpers import histograms, telemetry
+
+SUMMARY_INTERVAL_S = 60.0
+
+
+class LatencySummary(commands.Cog):
+    def __init__(self, client):
+        self.client = client
+        self.latency_summary.start()
+
+    def cog_unload(self):
+        self.latency_summary.cancel()
+
+    @tasks.loop(seconds=SUMMARY_INTERVAL_S)
+    async def latency_summary(self):
+        self._emit_summary()
+
+    def _emit_summary(self, now=None):
+        window_s, series = histograms.drain_window(now)
+        if not series:
+            return
+        telemetry.emit({
+            "type": "latency_summary",
+            "window_s": window_s,
+            "series": series,
+        })
+
+    @latency_summary.before_loop
+    async def before_latency_summary(self):
+        await self.client.wait_until_ready()
+
+
+def setup(client):
+    client.add_cog(LatencySummary(client))
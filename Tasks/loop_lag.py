@@ -21,6 +21,9 @@ INTERVAL_S = 1.0
 LAG_THRESHOLD_MS = 250.0
 SUMMARY_INTERVAL_S = 60.0
 
+# The most recent summary payload, for the metrics endpoint.
+latest_summary: dict = {}
+
 
 def _percentile(sorted_samples, q):
     """Nearest-rank percentile over an already-sorted list."""
@@ -60,14 +63,17 @@ class LoopLag(commands.Cog):
         # summary is a reliable once-a-minute heartbeat: absence of a line then
         # means the monitor (or the loop) is dead, not merely a quiet window.
         samples = sorted(self._samples)
-        telemetry.emit({
+        summary = {
             "type": "loop_lag_summary",
             "window_s": round(now - self._window_started, 1),
             "n": len(samples),
             "p50_ms": round(_percentile(samples, 0.50), 2),
             "p95_ms": round(_percentile(samples, 0.95), 2),
             "max_ms": round(samples[-1], 2) if samples else 0.0,
-        })
+        }
+        latest_summary.clear()
+        latest_summary.update(summary)
+        telemetry.emit(dict(summary))
         self._samples = []
         self._window_started = now
 
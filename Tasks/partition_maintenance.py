@@ -0,0 +1,78 @@
+"""Keep the history tables' monthly partitions ahead of the clock and trimmed.
+
+Each run creates the coming months (so inserts never land in a table's
+default partition) and expires months past their table's retention. Expiring
+is a DROP or DETACH of a whole month, which replaces the row-by-row DELETEs
+presence_rollup used to run and never touches the months still in use.
+
+Tables not yet converted by scripts/partition_history_tables.py fall back to
+a DELETE for their retention; see Helpers/partitions.maintain.
+"""
+import asyncio
+
+from discord.ext import tasks, commands
+
+from Helpers.database import DB
+from Helpers.logger import log, ERROR, INFO
+from Helpers.partitions import PartitionPolicy, maintain
+from Tasks.presence_rollup import RAW_RETENTION_DAYS
+
+# Captures feed the season and activity views, which look back a season or
+# two at most. Older months are detached rather than dropped: out of every
+# query, but kept as plain tables in case they are wanted for an archive.
+EXCHANGE_RETENTION_DAYS = 730
+
+POLICIES = (
+    # The daily snapshots are the only record of long-range history (all-time
+    # baselines, playtime_daily rebuilds), so nothing expires.
+    PartitionPolicy("player_activity", "snapshot_date"),
+    # The raw presence tables are only kept long enough to re-derive an hour;
+    # presence_hourly is the record past that.
+    PartitionPolicy("presence_buckets", "bucket_start", timestamptz=True, retention_days=RAW_RETENTION_DAYS),
+    PartitionPolicy("presence_ticks", "tick_at", timestamptz=True, retention_days=RAW_RETENTION_DAYS),
+    PartitionPolicy("territory_exchanges", "exchange_time", timestamptz=True,
+                    retention_days=EXCHANGE_RETENTION_DAYS, expire="detach"),
+)
+
+
+def _maintain_sync() -> list[str]:
+    """One pass over every policy, each in its own transaction."""
+    summaries = []
+    db = DB()
+    db.connect()
+    try:
+        for policy in POLICIES:
+            try:
+                summaries.append(maintain(db, policy))
+                db.connection.commit()
+            except Exception as e:
+                db.connection.rollback()
+                log(ERROR, f"{policy.table}: {e}", context="partition_maintenance")
+    finally:
+        db.close()
+    return summaries
+
+
+class PartitionMaintenance(commands.Cog):
+    def __init__(self, client):
+        self.client = client
+        self.partition_maintenance.start()
+
+    def cog_unload(self):
+        self.partition_maintenance.cancel()
+
+    @tasks.loop(hours=6)
+    async def partition_maintenance(self):
+        try:
+            summaries = await asyncio.to_thread(_maintain_sync)
+            log(INFO, "; ".join(summaries), context="partition_maintenance")
+        except Exception as e:
+            log(ERROR, f"Partition maintenance failed: {e}", context="partition_maintenance")
+
+    @partition_maintenance.before_loop
+    async def before_maintenance(self):
+        await self.client.wait_until_ready()
+
+
+def setup(client):
+    client.add_cog(PartitionMaintenance(client))
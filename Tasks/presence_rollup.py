@@ -1,10 +1,11 @@
-"""Fold 15-minute presence buckets into hourly rollups, and prune the raw.
+"""Fold 15-minute presence buckets into hourly rollups.
 
 The sampler in update_member_data writes one bucket row per member per 15
 minutes. That is the right grain to collect at and the wrong grain to chart a
 year from, so this task folds completed hours into presence_hourly (per
-member) and presence_coverage_hourly (guild-wide), then drops raw buckets past
-the retention window.
+member) and presence_coverage_hourly (guild-wide). Raw rows past
+RAW_RETENTION_DAYS are expired a month at a time by
+Tasks/partition_maintenance.py.
 
 Converting samples to minutes is where the tick log earns its place. A sample
 is not worth a fixed three minutes: it is worth 15 / (ticks observed in its
@@ -13,8 +14,14 @@ stretched over the interval it stands for, instead of reading as a quiet hour.
 An hour with no ticks at all produces no rows — a gap the charts can draw as a
 gap.
 
-Only whole hours that have passed are rolled up, so the current hour is never
-written half-finished and then left stale.
+Each run is incremental. presence_rollup_state holds a watermark: every hour
+before it is final and is never read again. A run aggregates only from the
+watermark to the end of the open hour (normally the previous hour plus the
+current one), then moves the watermark up to the last hour that has closed.
+The open hour is rewritten on every run, so charts see it filling in, and is
+finalised by the first run after it closes. A tick that lands behind the
+watermark anyway (a slow commit, a backfill) marks its hour in
+presence_dirty_hours, and the next run re-aggregates just that hour.
 """
 import asyncio
 import datetime
@@ -22,6 +29,7 @@ from datetime import timezone, timedelta
 
 from discord.ext import tasks, commands
 
+from Helpers import telemetry
 from Helpers.database import DB
 from Helpers.logger import log, ERROR, INFO
 
@@ -32,6 +40,10 @@ RAW_RETENTION_DAYS = 90
 # Guards a cold start (or a long outage) from scanning the whole table.
 MAX_HOURS_PER_RUN = 168
 
+# An hour counts as closed this long after it ends, so a tick stamped at :59
+# that commits a moment late is still inside the run that finalises it.
+CLOSE_GRACE = timedelta(minutes=5)
+
 ROLLUP_SQL = """
 WITH bounds AS (
     SELECT %s::timestamptz AS from_hour, %s::timestamptz AS to_hour
@@ -96,51 +108,77 @@ SELECT (SELECT COUNT(*) FROM inserted_members),
 """
 
 
+def _floor_hour(ts):
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def _rollup_window(db, from_hour, to_hour):
+    db.cursor.execute(ROLLUP_SQL, (from_hour, to_hour))
+    return db.cursor.fetchone()
+
+
 def _rollup_sync():
-    """Roll up every whole hour not yet covered. Returns a summary string."""
+    """Roll up the hours past the watermark, plus any marked dirty.
+
+    Returns a summary string.
+    """
     db = DB()
     db.connect()
     try:
         now = datetime.datetime.now(timezone.utc)
-        current_hour = now.replace(minute=0, second=0, microsecond=0)
+        open_hour = _floor_hour(now)
+        closed_before = _floor_hour(now - CLOSE_GRACE)
 
-        # Resume from the last rolled-up hour; on a cold start, from the
-        # oldest raw tick.
-        db.cursor.execute("SELECT MAX(hour) FROM presence_coverage_hourly")
+        db.cursor.execute("SELECT watermark FROM presence_rollup_state FOR UPDATE")
         row = db.cursor.fetchone()
-        last_hour = row[0] if row else None
+        watermark = row[0] if row else None
 
-        if last_hour is None:
+        if watermark is None:
+            # First run: resume after the hours the old full-window rollup
+            # already wrote (its last one may have been partial), else start
+            # at the oldest raw tick.
+            db.cursor.execute("SELECT MAX(hour) FROM presence_coverage_hourly")
+            row = db.cursor.fetchone()
+            watermark = row[0] if row else None
+        if watermark is None:
             db.cursor.execute("SELECT MIN(tick_at) FROM presence_ticks")
             row = db.cursor.fetchone()
             if not row or row[0] is None:
                 return "no presence data yet"
-            from_hour = row[0].replace(minute=0, second=0, microsecond=0)
-        else:
-            # Recompute the most recent rolled-up hour: it may have been
-            # written while still in progress on the previous run.
-            from_hour = last_hour
-
-        to_hour = min(current_hour, from_hour + timedelta(hours=MAX_HOURS_PER_RUN))
-        if to_hour <= from_hour:
-            return "already current"
-
-        db.cursor.execute(ROLLUP_SQL, (from_hour, to_hour))
-        members, hours = db.cursor.fetchone()
-
-        cutoff = current_hour - timedelta(days=RAW_RETENTION_DAYS)
-        db.cursor.execute("DELETE FROM presence_buckets WHERE bucket_start < %s", (cutoff,))
-        pruned_buckets = db.cursor.rowcount
-        db.cursor.execute("DELETE FROM presence_ticks WHERE tick_at < %s", (cutoff,))
-        pruned_ticks = db.cursor.rowcount
+            watermark = _floor_hour(row[0])
+
+        # Late ticks for finalised hours: re-aggregate each such hour alone.
+        db.cursor.execute("DELETE FROM presence_dirty_hours WHERE hour < %s RETURNING hour", (watermark,))
+        dirty = sorted(r[0] for r in db.cursor.fetchall())
+        members = hours = 0
+        for hour in dirty:
+            m, h = _rollup_window(db, hour, hour + timedelta(hours=1))
+            members, hours = members + m, hours + h
+
+        to_hour = min(open_hour + timedelta(hours=1), watermark + timedelta(hours=MAX_HOURS_PER_RUN))
+        m, h = _rollup_window(db, watermark, to_hour)
+        members, hours = members + m, hours + h
+        new_watermark = max(watermark, min(closed_before, to_hour))
+
+        db.cursor.execute("""
+            INSERT INTO presence_rollup_state (id, watermark, updated_at)
+            VALUES (TRUE, %s, NOW())
+            ON CONFLICT (id) DO UPDATE SET watermark = EXCLUDED.watermark, updated_at = NOW()
+        """, (new_watermark,))
+
+        telemetry.count("member_hours", members)
+        telemetry.count("coverage_hours", hours)
+        telemetry.count("dirty_hours", len(dirty))
 
         db.connection.commit()
         # Postgres hands back timestamps in the session timezone; the rollup
         # reasons in UTC, so say so rather than logging a shifted hour.
-        span = (f"{from_hour.astimezone(timezone.utc):%Y-%m-%d %H:%M} → "
+        span = (f"{watermark.astimezone(timezone.utc):%Y-%m-%d %H:%M} → "
                 f"{to_hour.astimezone(timezone.utc):%Y-%m-%d %H:%M} UTC")
-        return (f"{span}: {members} member-hours, {hours} coverage hours, "
-                f"pruned {pruned_buckets} buckets / {pruned_ticks} ticks")
+        summary = f"{span}: {members} member-hours, {hours} coverage hours"
+        if dirty:
+            summary += f", {len(dirty)} late hour(s) redone"
+        return summary
     finally:
         db.close()
 
@@ -6,10 +6,10 @@ from io import BytesIO
 import discord
 from discord.ext import tasks, commands
 
+from Helpers import http_client
 from Helpers.logger import log, INFO, ERROR
 from Helpers.database import DB
 from Helpers.embed_updater import update_web_poll_embed, update_hammerhead_poll_embed
-from Helpers.functions import getPlayerDatav3, getPlayerUUID
 from Helpers.links import LinkConflictError, assert_uuid_free
 from Helpers.variables import TAQ_GUILD_ID, INVITED_CATEGORY_NAME
 
@@ -147,11 +147,11 @@ class ProcessWebsiteDecisions(commands.Cog):
         current_guild_name = None
 
         if ign:
-            uuid_data = await asyncio.to_thread(getPlayerUUID, ign)
+            uuid_data = await http_client.get_player_uuid(ign)
             uuid = uuid_data[1] if uuid_data else None
 
             if uuid:
-                player_data = await asyncio.to_thread(getPlayerDatav3, uuid)
+                player_data = await http_client.get_player_data(uuid)
                 if isinstance(player_data, dict):
                     guild_info = player_data.get("guild")
                     if guild_info and isinstance(guild_info, dict):
@@ -304,7 +304,7 @@ class ProcessWebsiteDecisions(commands.Cog):
         link_id = applicant.id if applicant else int(discord_id)
         uuid = None
         if ign:
-            uuid_data = await asyncio.to_thread(getPlayerUUID, ign)
+            uuid_data = await http_client.get_player_uuid(ign)
             uuid = uuid_data[1] if uuid_data else None
             if uuid:
                 await self._link_or_report(channel, link_id, ign, uuid, linked=True)
@@ -4,8 +4,8 @@ import random
 import asyncio
 from datetime import datetime, timezone
 from discord.ext import tasks, commands
-import aiohttp
 
+from Helpers import http_client, telemetry, wynn_budget
 from Helpers.logger import log, INFO, WARN, ERROR
 from Helpers.database import save_recruitment_data
 
@@ -14,8 +14,6 @@ class RecruitmentChecker(commands.Cog):
     def __init__(self, client):
         self.client = client
         self.API_TOKEN = os.getenv('RECRUITMENT_TOKEN')
-        self.MAX_REQUESTS_PER_MINUTE = 120
-        self.SAFETY_MARGIN = 0.9  # Use 90% of rate limit to be safe
         self.LOOP_DURATION = 600  # 10 minutes in seconds
         self.CUTOFF_TIME = 585  # 9:45 in seconds - stop early if not done
         self.recruitment_loop.start()
@@ -23,16 +21,6 @@ class RecruitmentChecker(commands.Cog):
     def cog_unload(self):
         self.recruitment_loop.cancel()
 
-    def calculate_request_delay(self) -> float:
-        """Calculate delay between requests to stay under rate limit.
-
-        With 120 req/min limit and safety margin, we target ~108 req/min.
-        That's 60/108 = ~0.56 seconds minimum between requests.
-        """
-        effective_limit = self.MAX_REQUESTS_PER_MINUTE * self.SAFETY_MARGIN
-        min_delay = 60.0 / effective_limit  # ~0.56 seconds
-        return max(min_delay, 0.5)  # Never go below 0.5s
-
     def extract_server_region(self, server_name: str) -> str:
         """Extract region prefix from server name (e.g., 'NA44' -> 'NA')"""
         if not server_name:
@@ -65,94 +53,87 @@ class RecruitmentChecker(commands.Cog):
             total_scanned = 0
 
             headers = {'Authorization': f'Bearer {self.API_TOKEN}'}
-            request_delay = self.calculate_request_delay()
-
-            async with aiohttp.ClientSession(headers=headers) as session:
-                # Fetch online players
-                async with session.get('https://api.wynncraft.com/v3/player') as resp:
-                    if resp.status != 200:
-                        log(ERROR, f"Failed to fetch online players: {resp.status}", context="recruitment")
-                        return
-                    online_data = await resp.json()
-
-                players = online_data.get('players', {})
-                total_players = len(players)
-
-                # Randomize player order for fairness
-                player_list = list(players.items())
-                random.shuffle(player_list)
-
-                log(INFO, f"Found {total_players} online players", context="recruitment")
-
-                for player_name, server_name in player_list:
-                    # Check if we've hit the cutoff time (9:45)
-                    elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
-                    if elapsed >= self.CUTOFF_TIME:
-                        log(INFO, f"Reached time cutoff ({self.CUTOFF_TIME}s), ending scan early", context="recruitment")
-                        break
 
-                    total_scanned += 1
-
-                    retries = 0
-                    max_retries = 3
-
-                    while retries < max_retries:
-                        try:
-                            async with session.get(
-                                f'https://api.wynncraft.com/v3/player/{player_name}?fullResult'
-                            ) as response:
-                                # Handle rate limiting
-                                remaining = int(response.headers.get('ratelimit-remaining', 50))
-                                reset_time = int(response.headers.get('ratelimit-reset', 60))
-
-                                if remaining <= 2:
-                                    log(WARN, f"Rate limit low, waiting {reset_time}s", context="recruitment")
-                                    await asyncio.sleep(reset_time + 1)
-
-                                if response.status == 429:
-                                    reset_time = int(response.headers.get('ratelimit-reset', 60))
-                                    log(WARN, f"Rate limited, waiting {reset_time}s", context="recruitment")
-                                    await asyncio.sleep(reset_time + 1)
-                                    retries += 1
-                                    continue
-
-                                if response.status != 200:
-                                    break
-
-                                pdata = await response.json()
-
-                                # Skip players in a guild
-                                if pdata.get('guild'):
-                                    break
-
-                                # Extract candidate data
-                                first_join_raw = pdata.get('firstJoin', '')
-                                first_join = first_join_raw[:10] if first_join_raw else ''  # Extract YYYY-MM-DD
-
-                                candidate = {
-                                    'username': pdata.get('username', player_name),
-                                    'uuid': pdata.get('uuid', ''),
-                                    'server': self.extract_server_region(server_name),
-                                    'rank': pdata.get('supportRank', ''),
-                                    'wars': pdata.get('globalData', {}).get('wars', 0),
-                                    'first_join': first_join,
-                                    'playtime': pdata.get('playtime', 0),
-                                    'raids': pdata.get('globalData', {}).get('raids', {}).get('total', 0),
-                                    'max_level': self.get_max_character_level(pdata.get('characters', {}))
-                                }
-                                candidates.append(candidate)
-                                break
-
-                        except Exception as e:
+            # Fetch online players
+            resp = await http_client.get('https://api.wynncraft.com/v3/player', headers=headers)
+            if resp.status != 200:
+                log(ERROR, f"Failed to fetch online players: {resp.status}", context="recruitment")
+                return
+            online_data = resp.json()
+
+            players = online_data.get('players', {})
+            total_players = len(players)
+
+            # Randomize player order for fairness
+            player_list = list(players.items())
+            random.shuffle(player_list)
+
+            log(INFO, f"Found {total_players} online players", context="recruitment")
+
+            for player_name, server_name in player_list:
+                # Check if we've hit the cutoff time (9:45)
+                elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
+                if elapsed >= self.CUTOFF_TIME:
+                    log(INFO, f"Reached time cutoff ({self.CUTOFF_TIME}s), ending scan early", context="recruitment")
+                    break
+
+                total_scanned += 1
+
+                retries = 0
+                max_retries = 3
+
+                while retries < max_retries:
+                    # Paced by the live RECRUITMENT_TOKEN budget; waits out
+                    # the window when only the interactive reserve is left.
+                    # http_client records each response (or failure) against it.
+                    await wynn_budget.acquire("RECRUITMENT_TOKEN")
+                    try:
+                        response = await http_client.get(
+                            f'https://api.wynncraft.com/v3/player/{player_name}?fullResult',
+                            headers=headers,
+                        )
+
+                        if response.status == 429:
+                            # The budget now holds the reset; the next
+                            # acquire waits it out.
+                            log(WARN, f"Rate limited on {player_name}, backing off", context="recruitment")
                             retries += 1
-                            if retries < max_retries:
-                                await asyncio.sleep(5 * retries)
-                            else:
-                                log(ERROR, f"Failed to fetch {player_name}: {e}", context="recruitment")
-                                break
+                            continue
+
+                        if response.status != 200:
+                            break
+
+                        pdata = response.json()
+
+                        # Skip players in a guild
+                        if pdata.get('guild'):
+                            break
+
+                        # Extract candidate data
+                        first_join_raw = pdata.get('firstJoin', '')
+                        first_join = first_join_raw[:10] if first_join_raw else ''  # Extract YYYY-MM-DD
+
+                        candidate = {
+                            'username': pdata.get('username', player_name),
+                            'uuid': pdata.get('uuid', ''),
+                            'server': self.extract_server_region(server_name),
+                            'rank': pdata.get('supportRank', ''),
+                            'wars': pdata.get('globalData', {}).get('wars', 0),
+                            'first_join': first_join,
+                            'playtime': pdata.get('playtime', 0),
+                            'raids': pdata.get('globalData', {}).get('raids', {}).get('total', 0),
+                            'max_level': self.get_max_character_level(pdata.get('characters', {}))
+                        }
+                        candidates.append(candidate)
+                        break
 
-                    # Rate limit delay after each player (not before)
-                    await asyncio.sleep(request_delay)
+                    except Exception as e:
+                        retries += 1
+                        if retries < max_retries:
+                            await asyncio.sleep(5 * retries)
+                        else:
+                            log(ERROR, f"Failed to fetch {player_name}: {e}", context="recruitment")
+                            break
 
             # Calculate scan duration
             end_time = datetime.now(timezone.utc)
@@ -168,6 +149,8 @@ class RecruitmentChecker(commands.Cog):
             }
 
             save_recruitment_data(result)
+            telemetry.count("scanned", total_scanned)
+            telemetry.count("candidates", len(candidates))
 
             log(INFO, f"Scan complete. Found {len(candidates)} guildless candidates "
                   f"out of {total_scanned}/{total_players} players in {duration:.1f}s", context="recruitment")
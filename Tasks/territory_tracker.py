@@ -1,17 +1,20 @@
 from collections import Counter
+from functools import lru_cache
 import datetime
 import discord
 import json
 import asyncio
 import os
 import random
+import time
 from typing import Dict, List, Set
 
-import aiohttp
 from discord.ext import tasks, commands
 
 from Helpers.logger import log, INFO, ERROR
-from Helpers.database import DB
+from Helpers.database import DB, get_guild_setting
+from Helpers import embed_feed, http_client, telemetry
+from Helpers.settings import settings
 from Helpers.variables import (
     SPEARHEAD_ROLE_ID,
     TERRITORY_TRACKER_CHANNEL_ID,
@@ -23,32 +26,26 @@ from Helpers.variables import (
 _TERRITORY_EXTERNALS_CACHE = None
 DEBUG_HQ_CONGRATS = False
 
-# ---------- HTTP (aiohttp single session + retries) ----------
+# ---------- HTTP (shared async client + retries) ----------
 
 _TERRITORY_URL = "https://api.wynncraft.com/v3/guild/list/territory"
-_http_session: aiohttp.ClientSession | None = None
 
-async def _get_session() -> aiohttp.ClientSession:
-    global _http_session
-    if _http_session is None or _http_session.closed:
-        timeout = aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
-        headers = {"Authorization": f"Bearer {os.getenv('WYNN_LOOP_TOKEN')}"}
-        _http_session = aiohttp.ClientSession(timeout=timeout, raise_for_status=True, headers=headers)
-    return _http_session
-
-async def _close_session():
-    global _http_session
-    if _http_session and not _http_session.closed:
-        await _http_session.close()
+# Last territory list the tracker fetched ({"data": ..., "at": epoch}), so
+# readers such as /map can skip their own API call while the loop is running.
+latest_snapshot: dict = {}
 
 async def getTerritoryData():
+    # Not paced by the budget (ownership changes can't wait a window), but its
+    # spend is recorded (by http_client) so the member loop on the same token
+    # backs off for it.
+    headers = {"Authorization": f"Bearer {os.getenv('WYNN_LOOP_TOKEN')}"}
     try:
-        sess = await _get_session()
         for attempt in range(3):
             try:
-                async with sess.get(_TERRITORY_URL) as resp:
-                    return await resp.json()
-            except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError):
+                resp = await http_client.get(_TERRITORY_URL, headers=headers)
+                resp.raise_for_status()
+                return resp.json()
+            except (*http_client.RequestError, json.JSONDecodeError):
                 if attempt == 2:
                     return False
                 await asyncio.sleep((2 ** attempt) + random.uniform(0, 0.3))
@@ -57,6 +54,9 @@ async def getTerritoryData():
 
 # ---------- Territory persistence (database cache) ----------
 
+def _publish(data: dict):
+    latest_snapshot.update(data=data, at=time.time())
+
 def _read_territories_sync() -> dict:
     try:
         db = DB()
@@ -124,7 +124,19 @@ def save_territory_exchanges(owner_changes: dict):
                 territory     VARCHAR(100) NOT NULL,
                 attacker_name VARCHAR(100) NOT NULL,
                 defender_name VARCHAR(100)
-            )
+            ) PARTITION BY RANGE (exchange_time)
+        """)
+        # Months are created by Tasks/partition_maintenance.py; the default
+        # catches inserts until then (and is skipped on a pre-partition table).
+        db.cursor.execute("""
+            DO $$
+            BEGIN
+              IF EXISTS (SELECT 1 FROM pg_partitioned_table
+                         WHERE partrelid = to_regclass('territory_exchanges')) THEN
+                CREATE TABLE IF NOT EXISTS territory_exchanges_default
+                  PARTITION OF territory_exchanges DEFAULT;
+              END IF;
+            END $$
         """)
         # Drop NOT NULL on defender_name for existing tables (season start = no defenders)
         db.cursor.execute("""
@@ -203,14 +215,83 @@ def timeHeld(date_time_old, date_time_new):
 
 
 # Helper functions for new features
+_CLAIM_INDEX = None
+
+
+def _claim_index():
+    """Static lookups over the claims config, built once:
+    (tiles by claim, claims by territory, (claim, cfg) by HQ)."""
+    global _CLAIM_INDEX
+    if _CLAIM_INDEX is None:
+        members_by_claim = {}
+        claims_by_terr = {}
+        claim_by_hq = {}
+        for claim_name, cfg in claims.items():
+            hq = cfg.get("hq")
+            conns = cfg.get("connections", [])
+            members = [hq] + conns if hq else list(conns)
+            members_by_claim[claim_name] = members
+            for terr in members:
+                claims_by_terr.setdefault(terr, []).append(claim_name)
+            if hq and hq not in claim_by_hq:
+                claim_by_hq[hq] = (claim_name, cfg)
+        _CLAIM_INDEX = (members_by_claim, claims_by_terr, claim_by_hq)
+    return _CLAIM_INDEX
+
+
 def get_all_hq_territories():
     """Get a set of all HQ territory names from claims configuration."""
-    hq_territories = set()
-    for claim_name, cfg in claims.items():
-        hq = cfg.get("hq")
-        if hq:
-            hq_territories.add(hq)
-    return hq_territories
+    return set(_claim_index()[2])
+
+
+@lru_cache(maxsize=4096)
+def _parse_acquired(acquired: str):
+    if not acquired:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(acquired.rstrip('Z')).replace(tzinfo=datetime.timezone.utc)
+    except ValueError:
+        return None
+
+
+class OwnershipIndex:
+    """Per-snapshot ownership lookups, built once per tick so alert checks are
+    dict/set lookups instead of rescans of every territory."""
+
+    __slots__ = ("owners", "prefixes", "by_guild", "_acquired")
+
+    def __init__(self, data: Dict):
+        self.owners: Dict[str, str | None] = {}
+        self.prefixes: Dict[str, str | None] = {}
+        self.by_guild: Dict[str, Set[str]] = {}
+        self._acquired: Dict[str, str] = {}
+        for terr, info in (data or {}).items():
+            guild = (info or {}).get("guild") or {}
+            name = guild.get("name")
+            self.owners[terr] = name
+            self.prefixes[terr] = guild.get("prefix")
+            self._acquired[terr] = info.get("acquired") or ""
+            if name:
+                self.by_guild.setdefault(name, set()).add(terr)
+
+    def owner(self, terr: str):
+        return self.owners.get(terr)
+
+    def count(self, guild: str) -> int:
+        return len(self.by_guild.get(guild, ()))
+
+    def owns_all(self, guild: str, terrs) -> bool:
+        return all(self.owners.get(t) == guild for t in terrs)
+
+    def acquired(self, terr: str):
+        return _parse_acquired(self._acquired.get(terr, ""))
+
+    def changes(self, old: "OwnershipIndex") -> List[str]:
+        """Territories present in both snapshots whose owner differs."""
+        return [
+            terr for terr, owner in self.owners.items()
+            if terr in old.owners and old.owners[terr] != owner
+        ]
 
 
 def _load_territory_externals():
@@ -226,57 +307,38 @@ def _load_territory_externals():
 
 
 def _get_claim_by_hq(hq_name: str):
-    for claim_name, cfg in claims.items():
-        if cfg.get("hq") == hq_name:
-            return claim_name, cfg
-    return None, None
+    return _claim_index()[2].get(hq_name, (None, None))
 
 
-def _hq_connections_by_hq():
-    return {
-        cfg.get("hq"): cfg.get("connections", [])
-        for cfg in claims.values()
-        if cfg.get("hq")
-    }
-
-
-def _evaluate_hq_difficulty(hq_name: str, claim_holder_guild: str, data: Dict):
+def _evaluate_hq_difficulty(hq_name: str, claim_holder_guild: str, index: OwnershipIndex):
     territory_externals = _load_territory_externals()
     externals = list(territory_externals.get(hq_name, []))
-    conns_by_hq = _hq_connections_by_hq()
-    excluded = set(conns_by_hq.get(hq_name, []))
+    _, cfg = _get_claim_by_hq(hq_name)
+    excluded = set((cfg or {}).get("connections", []))
     filtered = [t for t in externals if t not in excluded]
     reduced = len(filtered) != len(externals)
     total = len(filtered)
     if total <= 1:
         return False, total, 0, reduced
-    owned = sum(
-        1
-        for t in filtered
-        if data.get(t, {}).get("guild", {}).get("name") == claim_holder_guild
-    )
+    owned = sum(1 for t in filtered if index.owner(t) == claim_holder_guild)
     return (owned / total) >= 0.5, total, owned, reduced
 
 
-def _claim_owner_counts(claim_cfg: Dict, data: Dict):
-    hq = claim_cfg.get("hq")
-    conns = claim_cfg.get("connections", [])
-    members = [hq] + conns if hq else conns
+def _claim_owner_counts(claim_name: str, index: OwnershipIndex):
+    members = _claim_index()[0].get(claim_name, [])
     counts = Counter()
     for terr in members:
-        owner = data.get(terr, {}).get("guild", {}).get("name")
+        owner = index.owner(terr)
         if owner:
             counts[owner] += 1
     return len(members), counts
 
 
-def _mega_claim_suppressed(data: Dict):
-    ragni_cfg = claims.get("Ragni")
-    detlas_cfg = claims.get("Detlas")
-    if not ragni_cfg or not detlas_cfg:
+def _mega_claim_suppressed(index: OwnershipIndex):
+    if "Ragni" not in claims or "Detlas" not in claims:
         return False
-    ragni_total, ragni_counts = _claim_owner_counts(ragni_cfg, data)
-    detlas_total, detlas_counts = _claim_owner_counts(detlas_cfg, data)
+    ragni_total, ragni_counts = _claim_owner_counts("Ragni", index)
+    detlas_total, detlas_counts = _claim_owner_counts("Detlas", index)
     if ragni_total == 0 or detlas_total == 0:
         return False
     guilds = set(ragni_counts.keys()) | set(detlas_counts.keys())
@@ -289,6 +351,29 @@ def _mega_claim_suppressed(data: Dict):
     return False
 
 
+async def _attack_ping_enabled(guild_id: int) -> bool:
+    """The guild's attack_ping toggle, loading the settings store off-loop if needed.
+
+    Until the store has loaded it only knows defaults, and the default is to
+    ping; while it cannot be loaded, alerts go out without the ping.
+    """
+    if not settings.loaded and not await asyncio.to_thread(settings.load):
+        log(ERROR, "Settings unavailable; sending the attack alert without a ping", context="territory_tracker")
+        return False
+    return get_guild_setting(guild_id, 'attack_ping', True)
+
+
+def _change_line(terr: str, old: dict, new: dict) -> str:
+    """One summary-embed line for an ownership change."""
+    if new['owner'] == 'The Aquarium':
+        mark = "🟢"
+    elif old['owner'] == 'The Aquarium':
+        mark = "🔴"
+    else:
+        mark = "⚪"
+    return f"{mark} **{terr}**: {old['owner']} [{old['prefix']}] ➜ {new['owner']} [{new['prefix']}]"
+
+
 class TerritoryTracker(commands.Cog):
     def __init__(self, client):
         self.client = client
@@ -296,7 +381,8 @@ class TerritoryTracker(commands.Cog):
 
     def cog_unload(self):
         self.territory_tracker.cancel()
-        asyncio.create_task(_close_session())
+        for feed in ("territory_home", "territory_global"):
+            embed_feed.for_name(feed).close()
 
     @tasks.loop(seconds=10)
     async def territory_tracker(self):
@@ -317,6 +403,7 @@ class TerritoryTracker(commands.Cog):
             new_data = await getTerritoryData()
             if not new_data:
                 return
+            _publish(new_data)
 
             # Write-on-change: the full snapshot is ~350KB and rewriting it
             # every tick dominates Railway egress. Skipping identical writes
@@ -326,39 +413,37 @@ class TerritoryTracker(commands.Cog):
             if new_data != old_data:
                 await asyncio.to_thread(saveTerritoryData, new_data)
 
+            # One ownership index per snapshot; every decision below is a
+            # lookup into these, scoped to the territories that changed.
+            old_index = OwnershipIndex(old_data)
+            new_index = OwnershipIndex(new_data)
+            changed = new_index.changes(old_index)
+
             # tally post-update counts
-            new_counts = Counter()
-            for info in new_data.values():
-                guild_name = (info.get('guild') or {}).get('name')
-                if guild_name:
-                    new_counts[guild_name] += 1
+            new_counts = Counter({guild: len(terrs) for guild, terrs in new_index.by_guild.items()})
 
             # ---------- CLAIM-BROKEN ALERTS (CONFIG-DRIVEN) ----------
             # fires on transition: previously owned ALL tiles in claim → now missing any tile
-            if old_data and claims:
+            if old_data and claims and changed:
+                members_by_claim, claims_by_terr, _ = _claim_index()
+                touched = {c for terr in changed for c in claims_by_terr.get(terr, ())}
                 for claim_name, cfg in claims.items():
+                    if claim_name not in touched:
+                        continue
                     hq = cfg.get("hq")
-                    conns: List[str] = cfg.get("connections", [])
                     if not hq:
                         continue
-                    members: List[str] = [hq] + conns
-
-                    def _owns_all(data: Dict) -> bool:
-                        for t in members:
-                            owner = data.get(t, {}).get("guild", {}).get("name")
-                            if owner != 'The Aquarium':
-                                return False
-                        return True
+                    members: List[str] = members_by_claim[claim_name]
 
-                    old_all = _owns_all(old_data)
-                    new_all = _owns_all(new_data)
+                    old_all = old_index.owns_all('The Aquarium', members)
+                    new_all = new_index.owns_all('The Aquarium', members)
 
                     if old_all and not new_all:
                         # what flipped away from our guild?
                         lost = [
                             t for t in members
-                            if old_data.get(t, {}).get("guild", {}).get("name") == "The Aquarium"
-                            and new_data.get(t, {}).get("guild", {}).get("name") != "The Aquarium"
+                            if old_index.owner(t) == "The Aquarium"
+                            and new_index.owner(t) != "The Aquarium"
                         ]
 
                         # determine which territory and who took it
@@ -375,26 +460,16 @@ class TerritoryTracker(commands.Cog):
                         # Check spearhead ping conditions:
                         # 1. Guild owns more than 7 territories
                         # 2. We had held all territories in this claim for >20 minutes
-                        aquarium_territory_count = sum(
-                            1 for info in old_data.values()
-                            if info.get('guild', {}).get('name') == 'The Aquarium'
-                        )
-
                         should_ping_spearhead = False
-                        if aquarium_territory_count > 7:
+                        if old_index.count('The Aquarium') > 7:
                             # Check if we had held all claim territories for >20 minutes
                             current_time = datetime.datetime.now(datetime.timezone.utc)
-                            most_recent_acquisition = None
-
-                            for terr in members:
-                                terr_info = old_data.get(terr)
-                                if terr_info and terr_info.get('guild', {}).get('name') == 'The Aquarium':
-                                    acquired_str = terr_info.get('acquired', '')
-                                    if acquired_str:
-                                        acquired_time = datetime.datetime.fromisoformat(acquired_str.rstrip('Z'))
-                                        acquired_time = acquired_time.replace(tzinfo=datetime.timezone.utc)
-                                        if most_recent_acquisition is None or acquired_time > most_recent_acquisition:
-                                            most_recent_acquisition = acquired_time
+                            acquisitions = [
+                                old_index.acquired(t) for t in members
+                                if old_index.owner(t) == 'The Aquarium'
+                            ]
+                            acquisitions = [a for a in acquisitions if a is not None]
+                            most_recent_acquisition = max(acquisitions) if acquisitions else None
 
                             if most_recent_acquisition:
                                 time_held = current_time - most_recent_acquisition
@@ -404,27 +479,15 @@ class TerritoryTracker(commands.Cog):
                         # Alert
                         alert_chan = self.client.get_channel(MILITARY_CHANNEL_ID)
 
-                        # Check if attack pings are enabled via toggle
+                        # Check if attack pings are enabled via toggle (served
+                        # from the settings store, which /toggle writes through)
                         if should_ping_spearhead and alert_chan:
-                            try:
-                                db = DB()
-                                db.connect()
-                                db.cursor.execute(
-                                    "SELECT setting_value FROM guild_settings WHERE guild_id = %s AND setting_key = %s",
-                                    (alert_chan.guild.id, 'attack_ping')
-                                )
-                                result = db.cursor.fetchone()
-                                db.close()
-                                # Default to True if no setting exists, but respect toggle if set
-                                if result is not None and not result[0]:
-                                    should_ping_spearhead = False
-                            except Exception:
-                                pass  # If DB check fails, use the existing should_ping_spearhead value
+                            should_ping_spearhead = await _attack_ping_enabled(alert_chan.guild.id)
 
                         # get the guild that took the territory and build message
                         if lost_terr:
-                            attacker = discord.utils.escape_markdown(new_data.get(lost_terr, {}).get("guild", {}).get("name", "Unknown"))
-                            attacker_prefix = discord.utils.escape_markdown(new_data.get(lost_terr, {}).get("guild", {}).get("prefix", "???"))
+                            attacker = discord.utils.escape_markdown(new_index.owner(lost_terr) or "Unknown")
+                            attacker_prefix = discord.utils.escape_markdown(new_index.prefixes.get(lost_terr) or "???")
                             if should_ping_spearhead:
                                 mention = f"<@&{SPEARHEAD_ROLE_ID}>"
                                 msg = f"{mention} **Attack on {claim_name}!** {terr_type.capitalize()} **{lost_terr}** taken by **{attacker} [{attacker_prefix}]**"
@@ -443,37 +506,40 @@ class TerritoryTracker(commands.Cog):
             # ---------- Territory Change Embeds ----------
             owner_changes = {}
             all_owner_changes = {}
-            for terr, new_info in new_data.items():
-                old_info = old_data.get(terr)
-                if not old_info:
-                    continue
+            for terr in changed:
+                old_info = old_data[terr]
+                new_info = new_data[terr]
                 old_guild = old_info.get('guild') or {}
                 new_guild = new_info.get('guild') or {}
                 old_owner = old_guild.get('name')
                 new_owner = new_guild.get('name')
-                if old_owner != new_owner:
-                    change_data = {
-                        'old': {
-                            'owner': old_owner,
-                            'prefix': old_guild.get('prefix'),
-                            'acquired': old_info.get('acquired')
-                        },
-                        'new': {
-                            'owner': new_owner,
-                            'prefix': new_guild.get('prefix'),
-                            'acquired': new_info.get('acquired')
-                        }
+                change_data = {
+                    'old': {
+                        'owner': old_owner,
+                        'prefix': old_guild.get('prefix'),
+                        'acquired': old_info.get('acquired')
+                    },
+                    'new': {
+                        'owner': new_owner,
+                        'prefix': new_guild.get('prefix'),
+                        'acquired': new_info.get('acquired')
                     }
-                    all_owner_changes[terr] = change_data
-                    if 'The Aquarium' in (old_owner, new_owner):
-                        owner_changes[terr] = change_data
+                }
+                all_owner_changes[terr] = change_data
+                if 'The Aquarium' in (old_owner, new_owner):
+                    owner_changes[terr] = change_data
+
+            telemetry.count("territories", len(new_data))
+            telemetry.count("changes", len(all_owner_changes))
 
             # Persist exchanges to territory_exchanges table
             if all_owner_changes:
                 await asyncio.to_thread(save_territory_exchanges, all_owner_changes)
 
             # Check for HQ captures and send congratulations
-            hq_territories = get_all_hq_territories()
+            hq_territories = _claim_index()[2]
+            home_embeds = []
+            home_lines = []
             for terr, change in owner_changes.items():
                 old = change['old']
                 new = change['new']
@@ -490,7 +556,7 @@ class TerritoryTracker(commands.Cog):
                         claim_holder_guild = old['owner']
                         mega_suppressed = False
                         if terr in ("Nomads' Refuge", "Mine Base Plains"):
-                            mega_suppressed = _mega_claim_suppressed(new_data)
+                            mega_suppressed = _mega_claim_suppressed(new_index)
 
                         difficulty_valid = False
                         total_externals = 0
@@ -499,7 +565,7 @@ class TerritoryTracker(commands.Cog):
                         if not mega_suppressed:
                             (difficulty_valid, total_externals, owned_externals,
                              conns_reduced) = _evaluate_hq_difficulty(
-                                terr, claim_holder_guild, new_data
+                                terr, claim_holder_guild, new_index
                             )
 
                         if not mega_suppressed and difficulty_valid:
@@ -561,10 +627,20 @@ class TerritoryTracker(commands.Cog):
                     inline=True
                 )
 
-                await channel.send(embed=embed)
+                home_embeds.append(embed)
+                home_lines.append(_change_line(terr, old, new))
+
+            # Queued and sent in the background, ≤10 embeds per message (one
+            # summary above the threshold) so a war rush can't stall the tick.
+            embed_feed.for_name("territory_home").submit(
+                channel, home_embeds, home_lines,
+                summary_title=f"{len(home_embeds)} of our territories changed hands",
+            )
 
             # ---------- Global Territory Tracker Embeds ----------
             if global_channel:
+                global_embeds = []
+                global_lines = []
                 for terr, change in all_owner_changes.items():
                     old = change['old']
                     new = change['new']
@@ -603,7 +679,13 @@ class TerritoryTracker(commands.Cog):
                         inline=True
                     )
 
-                    await global_channel.send(embed=global_embed)
+                    global_embeds.append(global_embed)
+                    global_lines.append(_change_line(terr, old, new))
+
+                embed_feed.for_name("territory_global").submit(
+                    global_channel, global_embeds, global_lines,
+                    summary_title=f"{len(global_embeds)} territories changed hands",
+                )
 
         except Exception as e:
             # Log and continue; the task loop will run again next tick
@@ -611,8 +693,12 @@ class TerritoryTracker(commands.Cog):
 
     @commands.Cog.listener()
     async def on_ready(self):
+        # Attack pings read the attack_ping toggle from the settings store;
+        # load it now rather than on the first alert. Ticks retry on failure.
+        await asyncio.to_thread(settings.load)
         data = await getTerritoryData()
         if data:
+            _publish(data)
             await asyncio.to_thread(saveTerritoryData, data)
         if not self.territory_tracker.is_running():
             self.territory_tracker.start()
@@ -9,7 +9,6 @@ import datetime
 import time
 import traceback
 from datetime import timezone, timedelta, time as dtime
-from collections import deque
 from discord.ext import tasks, commands
 from discord.commands import slash_command
 from discord import default_permissions
@@ -22,10 +21,12 @@ else:
     import os as _os
     sys.stdout = _os.fdopen(sys.stdout.fileno(), 'w', buffering=1)
 
+from Helpers import http_client, telemetry, wynn_budget
 from Helpers.logger import log, INFO, WARN, ERROR
 from Helpers.classes import Guild, DB, BasicPlayerStats
 from Helpers.embed_updater import update_web_poll_embed
-from Helpers.functions import getPlayerDatav3, getNameFromUUID, getPlayerUUID, determine_starting_rank, create_progress_bar, addLine, round_corners
+from Helpers.functions import getNameFromUUID, determine_starting_rank, create_progress_bar, addLine, round_corners
+from Helpers.graid_log import record_raids
 from Helpers.links import LinkConflictError, assert_row_linkable
 from Helpers.member_roles import honorific_flags, registration_role_names
 from Helpers.playtime_daily import refresh_playtime_daily
@@ -58,7 +59,6 @@ LOG_CHANNEL = BOT_LOG_CHANNEL_ID
 GUILD_LOG = GUILD_LOG_CHANNEL_ID
 GUILD_TTL = timedelta(minutes=10)
 CONTRIBUTION_THRESHOLD = 2_500_000_000
-RATE_LIMIT = 100  # max calls per minute
 RAID_DETECTION_ENABLED = False
 
 EMBED_FIELD_CAP = 25  # Discord rejects embeds with more fields (error 50035)
@@ -243,6 +243,14 @@ def _write_presence_sample_sync(online_map, member_count, guild_online):
                 DO UPDATE SET samples = presence_buckets.samples + 1
             """, (bucket_start, online_uuids))
 
+        # A tick behind the rollup's watermark (it committed after the run
+        # that finalised its hour) would otherwise never be counted.
+        db.cursor.execute("""
+            INSERT INTO presence_dirty_hours (hour)
+            SELECT %s FROM presence_rollup_state WHERE watermark > %s
+            ON CONFLICT (hour) DO NOTHING
+        """, (now.replace(minute=0, second=0), now))
+
         db.connection.commit()
 
     except Exception as e:
@@ -255,126 +263,44 @@ def _write_presence_sample_sync(online_map, member_count, guild_online):
                 pass
 
 
-def _upsert_raid_group_sync(uuid_list):
+def _graid_record_group_sync(uuid_list, raid_name):
+    """Log a detected raid and credit its group, in one transaction."""
     if not uuid_list:
         return
     db = _db_connect_with_retry()
     try:
-        for uid in uuid_list:
-            db.cursor.execute("SELECT ign FROM discord_links WHERE uuid = %s", (uid,))
-            row = db.cursor.fetchone()
-            ign = row[0] if row else None
-            db.cursor.execute(
-                """
-                INSERT INTO uncollected_raids AS ur (uuid, ign, uncollected_raids, collected_raids)
-                VALUES (%s, %s, 1, 0)
-                ON CONFLICT (uuid) DO UPDATE
-                  SET uncollected_raids = ur.uncollected_raids + EXCLUDED.uncollected_raids,
-                      ign               = EXCLUDED.ign;
-                """,
-                (uid, ign)
-            )
-        db.connection.commit()
-    finally:
-        db.close()
-
-def _graid_increment_group_sync(uuid_list, raid_name: str):
-    if not uuid_list: return
-    db = _db_connect_with_retry()
-    try:
-        cur = db.cursor
-        # find active event (may be None — raids happen outside events too)
-        cur.execute("SELECT id FROM graid_events WHERE active = TRUE LIMIT 1")
-        row = cur.fetchone()
-        event_id = row[0] if row else None
-
-        # always log individual raid completion with type and participants
-        cur.execute(
-            "INSERT INTO graid_logs (event_id, raid_type) VALUES (%s, %s) RETURNING id",
-            (event_id, raid_name)
-        )
-        log_id = cur.fetchone()[0]
-
-        for uid in uuid_list:
-            cur.execute("SELECT ign FROM discord_links WHERE uuid = %s", (uid,))
-            ign_row = cur.fetchone()
-            ign = ign_row[0] if ign_row else None
-            cur.execute(
-                "INSERT INTO graid_log_participants (log_id, uuid, ign) VALUES (%s, %s, %s)",
-                (log_id, uid, ign)
-            )
-
-        # upsert totals only if there's an active event
-        if event_id is not None:
-            for uid in uuid_list:
-                cur.execute("""
-                    INSERT INTO graid_event_totals (event_id, uuid, total)
-                    VALUES (%s, %s, 1)
-                    ON CONFLICT (event_id, uuid) DO UPDATE
-                      SET total = graid_event_totals.total + 1,
-                          last_updated = NOW()
-                """, (event_id, uid))
+        record_raids(db, [{
+            "raid_type": raid_name,
+            "participants": [{"uuid": uid} for uid in uuid_list],
+        }])
         db.connection.commit()
     finally:
         db.close()
 
 
-def _graid_log_manual_sync(participants, raid_type):
+def _graid_log_queue_sync(entries):
     """
-    Apply a manually-submitted raid log atomically.
-      participants: list of dicts {uuid: str|None, ign: str}
-      raid_type:    full raid name, or None for unknown
-    Mirrors the combined effect of _upsert_raid_group_sync and _graid_increment_group_sync,
-    but tolerates IGN-only participants (no Discord link). Players without a UUID
-    appear in graid_log_participants but are skipped for graid_event_totals and
-    uncollected_raids — same rule as the auto-detection path.
-    Returns the new graid_logs.id.
+    Apply manually-submitted raid logs and mark their queue rows done, atomically.
+      entries: list of (queue_id, participants, raid_type), where participants
+               is a list of dicts {uuid: str|None, ign: str}
+    Same rules as auto-detection: players without a UUID appear in
+    graid_log_participants but are skipped for graid_event_totals and
+    uncollected_raids. Marking done in the same transaction means a crash can
+    never leave a raid credited but still pending, to be credited again.
     """
-    if not participants:
-        return None
+    if not entries:
+        return
     db = _db_connect_with_retry()
     try:
-        cur = db.cursor
-
-        cur.execute("SELECT id FROM graid_events WHERE active = TRUE LIMIT 1")
-        row = cur.fetchone()
-        event_id = row[0] if row else None
-
-        cur.execute(
-            "INSERT INTO graid_logs (event_id, raid_type) VALUES (%s, %s) RETURNING id",
-            (event_id, raid_type)
+        record_raids(db, [
+            {"raid_type": raid_type, "participants": participants}
+            for _, participants, raid_type in entries
+        ])
+        db.cursor.execute(
+            "UPDATE graid_log_queue SET status='done', processed_at=NOW() WHERE id = ANY(%s)",
+            ([queue_id for queue_id, _, _ in entries],)
         )
-        log_id = cur.fetchone()[0]
-
-        for p in participants:
-            cur.execute(
-                "INSERT INTO graid_log_participants (log_id, uuid, ign) VALUES (%s, %s, %s)",
-                (log_id, p.get('uuid'), p.get('ign'))
-            )
-
-        if event_id is not None:
-            for p in participants:
-                if p.get('uuid'):
-                    cur.execute("""
-                        INSERT INTO graid_event_totals (event_id, uuid, total)
-                        VALUES (%s, %s, 1)
-                        ON CONFLICT (event_id, uuid) DO UPDATE
-                          SET total = graid_event_totals.total + 1,
-                              last_updated = NOW()
-                    """, (event_id, p['uuid']))
-
-        for p in participants:
-            if p.get('uuid'):
-                cur.execute("""
-                    INSERT INTO uncollected_raids AS ur (uuid, ign, uncollected_raids, collected_raids)
-                    VALUES (%s, %s, 1, 0)
-                    ON CONFLICT (uuid) DO UPDATE
-                      SET uncollected_raids = ur.uncollected_raids + 1,
-                          ign               = EXCLUDED.ign
-                """, (p['uuid'], p.get('ign')))
-
         db.connection.commit()
-        return log_id
     finally:
         db.close()
 
@@ -532,7 +458,6 @@ class UpdateMemberData(commands.Cog):
         self.raid_participants = {raid: {"unvalidated": {}, "validated": {}} for raid in self.RAID_NAMES}
         self.xp_only_validated = {}  # uuid -> {"name": str, "first_seen": datetime} for players with XP jump but no detected raid type
         self.cold_start = True
-        self.request_times = deque()
         self._semaphore = asyncio.Semaphore(5)
 
     def _load_from_cache(self, key, default):
@@ -612,8 +537,7 @@ class UpdateMemberData(commands.Cog):
 
         await self._post_raid_announcement(raid, names, guild)
 
-        await asyncio.to_thread(_upsert_raid_group_sync, list(group))
-        await asyncio.to_thread(_graid_increment_group_sync, list(group), raid)
+        await asyncio.to_thread(_graid_record_group_sync, list(group), raid)
 
     async def _process_graid_queue(self, guild):
         """Drain pending manually-logged raids submitted via the website.
@@ -644,6 +568,22 @@ class UpdateMemberData(commands.Cog):
 
         log(INFO, f"Processing {len(rows)} queued graid log(s)", context="graid_queue")
 
+        def _mark_error(qid, msg):
+            try:
+                db = _db_connect_with_retry()
+                try:
+                    db.cursor.execute(
+                        "UPDATE graid_log_queue SET status='error', error_message=%s, processed_at=NOW() WHERE id=%s",
+                        (msg[:500], qid)
+                    )
+                    db.connection.commit()
+                finally:
+                    db.close()
+            except Exception:
+                pass
+
+        # 1. Parse every row and resolve missing uuids; a bad row fails alone.
+        ready = []
         for queue_id, raid_type, announce, participants_data in rows:
             try:
                 # JSONB columns come back as already-parsed objects from psycopg,
@@ -664,54 +604,52 @@ class UpdateMemberData(commands.Cog):
                 for p in participants:
                     if not p.get('uuid'):
                         ign = p.get('ign')
-                        pdata = await asyncio.to_thread(getPlayerUUID, ign) if ign else None
+                        pdata = await http_client.get_player_uuid(ign) if ign else None
                         if pdata:
                             p['uuid'] = pdata[1]
                         else:
                             log(WARN, f"Could not resolve uuid for '{ign}' in queued graid log #{queue_id}; writing with NULL uuid", context="graid_queue")
 
-                # 1. DB writes (graid_logs, participants, event totals, uncollected_raids).
-                await asyncio.to_thread(_graid_log_manual_sync, participants, raid_type)
-
-                # 2. Discord announcement — only when requested and the raid type
-                # is known. Unknown-type raids are silent fix-ups for missed or
-                # desynced raids, whatever the party size.
-                if announce and raid_type:
-                    names = [p['ign'] for p in participants]
-                    await self._post_raid_announcement(raid_type, names, guild)
-
-                # 3. Mark done.
-                def _mark_done(qid):
-                    db = _db_connect_with_retry()
-                    try:
-                        db.cursor.execute(
-                            "UPDATE graid_log_queue SET status='done', processed_at=NOW() WHERE id=%s",
-                            (qid,)
-                        )
-                        db.connection.commit()
-                    finally:
-                        db.close()
-                await asyncio.to_thread(_mark_done, queue_id)
-                log(INFO, f"Processed queued graid log #{queue_id} ({raid_type or 'Unknown'}, {'announced' if announce and raid_type else 'silent'})", context="graid_queue")
-
+                ready.append((queue_id, raid_type, announce, participants))
             except Exception as e:
                 log(ERROR, f"Failed to process queued graid log #{queue_id}: {e}", context="graid_queue")
                 traceback.print_exc()
-                def _mark_error(qid, msg):
-                    try:
-                        db = _db_connect_with_retry()
-                        try:
-                            db.cursor.execute(
-                                "UPDATE graid_log_queue SET status='error', error_message=%s, processed_at=NOW() WHERE id=%s",
-                                (msg[:500], qid)
-                            )
-                            db.connection.commit()
-                        finally:
-                            db.close()
-                    except Exception:
-                        pass
                 await asyncio.to_thread(_mark_error, queue_id, str(e))
 
+        if not ready:
+            return
+
+        # 2. DB writes for the whole drain in one transaction (graid_logs,
+        # participants, event totals, uncollected_raids, queue status). If the
+        # batch fails, retry row by row so one bad row can't hold up the rest.
+        entries = [(qid, participants, raid_type) for qid, raid_type, _, participants in ready]
+        try:
+            await asyncio.to_thread(_graid_log_queue_sync, entries)
+            written = ready
+        except Exception as e:
+            log(WARN, f"Batched write of {len(entries)} queued graid log(s) failed ({e}); retrying individually", context="graid_queue")
+            written = []
+            for item, entry in zip(ready, entries):
+                try:
+                    await asyncio.to_thread(_graid_log_queue_sync, [entry])
+                    written.append(item)
+                except Exception as row_error:
+                    log(ERROR, f"Failed to process queued graid log #{entry[0]}: {row_error}", context="graid_queue")
+                    traceback.print_exc()
+                    await asyncio.to_thread(_mark_error, entry[0], str(row_error))
+
+        # 3. Discord announcement — only when requested and the raid type
+        # is known. Unknown-type raids are silent fix-ups for missed or
+        # desynced raids, whatever the party size.
+        for queue_id, raid_type, announce, participants in written:
+            if announce and raid_type:
+                try:
+                    names = [p['ign'] for p in participants]
+                    await self._post_raid_announcement(raid_type, names, guild)
+                except Exception as e:
+                    log(ERROR, f"Failed to announce queued graid log #{queue_id}: {e}", context="graid_queue")
+            log(INFO, f"Processed queued graid log #{queue_id} ({raid_type or 'Unknown'}, {'announced' if announce and raid_type else 'silent'})", context="graid_queue")
+
     def _render_guild_progress(self, level, xp_percent):
         """Render a styled guild level progress bar image."""
         width = 400
@@ -868,18 +806,14 @@ class UpdateMemberData(commands.Cog):
         results=[]
         for m in guild.all_members:
             async with self._semaphore:
-                cutoff_ts=datetime.datetime.now(timezone.utc)-timedelta(minutes=1)
-                while self.request_times and self.request_times[0]<cutoff_ts:
-                    self.request_times.popleft()
-                if len(self.request_times)>=RATE_LIMIT:
-                    wait=(self.request_times[0]+timedelta(minutes=1)-datetime.datetime.now(timezone.utc)).total_seconds()
-                    if wait > 5:
-                        log(INFO, f"Rate limit reached, sleeping {wait:.1f}s", context="update_member_data")
-                    await asyncio.sleep(wait)
-                self.request_times.append(datetime.datetime.now(timezone.utc))
-                res=await asyncio.to_thread(getPlayerDatav3,m['uuid'],"WYNN_LOOP_TOKEN")
+                # Paced by the live WYNN_LOOP_TOKEN budget (response headers),
+                # leaving the interactive reserve for commands on the same key.
+                await wynn_budget.acquire("WYNN_LOOP_TOKEN")
+                res=await http_client.get_player_data(m['uuid'], "WYNN_LOOP_TOKEN")
             results.append(res)
 
+        telemetry.count("members", len(guild.all_members))
+
         prev = self.previous_data
 
         # --- 7: Build new snapshot (carry forward) & detect unvalidated only with fresh data ---
@@ -927,6 +861,8 @@ class UpdateMemberData(commands.Cog):
                         }
                         log(INFO, f"DETECT unvalidated {uname} in {raid}", context="update_member_data")
 
+        telemetry.count("fetched", len(fresh))
+
         if RAID_DETECTION_ENABLED:
             # --- 8: XP jumps (only consider fresh data + existing baseline) ---
             xp_jumps = set()
@@ -1263,7 +1199,8 @@ class UpdateMemberData(commands.Cog):
                 username = m['name']
 
                 async with self._semaphore:
-                    pf = await asyncio.to_thread(getPlayerDatav3, uuid, "WYNN_LOOP_TOKEN")
+                    await wynn_budget.acquire("WYNN_LOOP_TOKEN")
+                    pf = await http_client.get_player_data(uuid, "WYNN_LOOP_TOKEN")
                 if not isinstance(pf, dict):
                     failed_members.append(m)
                     continue
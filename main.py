@@ -10,14 +10,17 @@ import os
 
 import discord
 from discord import Embed
+from discord.ext import tasks
 
 from Helpers.classes import Guild
 from Helpers.database import get_last_online, set_last_online
-from Helpers.storage import warm_background_cache
 from Helpers.variables import IS_TEST_MODE, ERROR_CHANNEL_ID, PUBLIC_COMMANDS, ERROR_PING_USER_ID
 from Helpers.logger import log, SYSTEM, SUCCESS, ERROR, INFO
 from Helpers import logger
+from Helpers import http_client
 from Helpers import telemetry
+from Helpers import metrics
+from Helpers import warmup
 from Commands.generate import ApplicationButtonView
 from Helpers.views import ApplicationVoteView, ThreadVoteView, RecruitPaidView, RecruiterReviewView
 
@@ -50,7 +53,18 @@ intents.presences = True
 intents.members = True
 intents.message_content = True
 
-client = discord.Bot(intents=intents)
+class Bot(discord.Bot):
+    async def close(self):
+        # The shared aiohttp pool belongs to no cog, so nothing else closes
+        # it. Stop the keepalive first: its next ping would reopen the pool.
+        try:
+            await super().close()
+        finally:
+            warmup.stop_keepalive()
+            await http_client.close()
+
+
+client = Bot(intents=intents)
 logger.init(client)
 
 
@@ -86,27 +100,24 @@ async def on_ready():
             log(ERROR, f"Slash command sync failed; continuing startup: {e}")
 
     logger.start()
+    await metrics.start(client)
 
-    if not getattr(client, 'bg_cache_warmed', False):
-        client.bg_cache_warmed = True
-
-        async def _warm_backgrounds():
-            # Pre-fill the background memory cache so the first profile render
-            # after a deploy skips the cold S3 read (~1.4s measured). Runs in a
-            # worker thread, fire-and-forget: startup never waits on it.
-            try:
-                t = time.time()
-                warmed = await asyncio.to_thread(warm_background_cache)
-                log(SUCCESS, f"Warmed {warmed} profile backgrounds in {time.time() - t:.1f}s")
-            except Exception as e:
-                log(ERROR, f"Background cache warm failed (renders fall back to S3): {e}")
-
-        asyncio.create_task(_warm_backgrounds())
-
-    guild = Guild('The Aquarium')
-    await client.change_presence(
-        activity=discord.CustomActivity(name=f'{guild.online} members online')
-    )
+    if not getattr(client, 'warmed', False):
+        client.warmed = True
+        # Pre-open the DB pool and the pooled TLS connections, decode shared
+        # assets and prime the guild/territory/colour caches so the first
+        # command after a deploy is not a cold one. Fire-and-forget: startup
+        # never waits on it; the keepalive then stops the sockets idling out.
+        asyncio.create_task(warmup.warm_up())
+        warmup.start_keepalive()
+
+    try:
+        guild = await asyncio.to_thread(Guild, 'The Aquarium')
+        await client.change_presence(
+            activity=discord.CustomActivity(name=f'{guild.online} members online')
+        )
+    except Exception as e:
+        log(ERROR, f"Could not set startup presence: {e}")
     log(SYSTEM, f'Logged in as {client.user}')
     for g in client.guilds:
         log(SYSTEM, f'Connected to guild: {g.name}')
@@ -278,6 +289,7 @@ extensions = [
     'Commands.progress_bar',
     'Commands.rank_badge',
     'Commands.restart',
+    'Commands.latency',
 
     # UserCommands
     'UserCommands.new_member',
@@ -311,7 +323,10 @@ extensions = [
     'Tasks.annihilation_parties',
     'Tasks.annihilation_announcements',
     'Tasks.loop_lag',
+    'Tasks.latency_summary',
     'Tasks.presence_rollup',
+    'Tasks.partition_maintenance',
+    'Tasks.job_scheduler',
 ]
 
 for ext in extensions:
@@ -324,6 +339,42 @@ for ext in extensions:
         traceback.print_exc()
 
 
+# =============================================================================
+# Task-loop telemetry: one `task` record per loop iteration
+# =============================================================================
+# The loop-lag monitor ticks every second; a record per tick would be ~86k
+# lines a day, and it already summarises itself. The histogram summary is
+# telemetry's own plumbing.
+UNTRACED_LOOPS = {"loop_lag", "latency_summary"}
+
+
+def instrument_task_loops():
+    """Wrap every tasks.Loop on the loaded cogs in a telemetry task span.
+
+    Loops re-read their coroutine on each iteration, so swapping it on the
+    bound Loop takes effect even for loops a cog already started in __init__.
+    Span names are the task module, plus the coroutine name where they differ
+    (e.g. `update_member_data`, `update_member_data.daily_activity_snapshot`).
+    """
+    wrapped = 0
+    for cog in client.cogs.values():
+        module = type(cog).__module__.rsplit('.', 1)[-1]
+        for attr, member in vars(type(cog)).items():
+            if not isinstance(member, tasks.Loop):
+                continue
+            loop = getattr(cog, attr)
+            coro_name = loop.coro.__name__
+            if coro_name in UNTRACED_LOOPS:
+                continue
+            name = module if coro_name.strip('_') in (module, 'task') else f"{module}.{coro_name.strip('_')}"
+            loop.coro = telemetry.wrap_task(name, loop.coro)
+            wrapped += 1
+    log(SUCCESS, f"Task telemetry: instrumented {wrapped} loops")
+
+
+instrument_task_loops()
+
+
 # =============================================================================
 # Security Audit: Validate Global Command Registration
 # =============================================================================
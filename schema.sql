@@ -236,6 +236,23 @@ CREATE TABLE IF NOT EXISTS graid_event_placement_bonuses (
   PRIMARY KEY (event_id, placement)
 );
 
+-- Live standings per event, maintained by Helpers/graid_log.record_raids as
+-- raids are logged so leaderboard reads never re-aggregate graid_logs.
+-- Derived data: /graid-event verify compares it to the full recompute and
+-- rebuilds on drift.
+CREATE TABLE IF NOT EXISTS graid_event_standings (
+  event_id     BIGINT      NOT NULL REFERENCES graid_events(id) ON DELETE CASCADE,
+  uuid         UUID        NOT NULL,
+  points       NUMERIC     NOT NULL DEFAULT 0,
+  reached_at   TIMESTAMPTZ NOT NULL,
+  display_name VARCHAR(64),
+  placement    INT,
+  PRIMARY KEY (event_id, uuid)
+);
+
+CREATE INDEX IF NOT EXISTS idx_graid_event_standings_placement
+  ON graid_event_standings(event_id, placement);
+
 -- Per-UUID raid offsets for raids missed during bot downtime
 CREATE TABLE IF NOT EXISTS graid_raid_offsets (
   uuid         UUID PRIMARY KEY,
@@ -267,6 +284,10 @@ CREATE INDEX IF NOT EXISTS idx_graid_log_queue_pending
 -- Activity Tracking
 -- =============================================================================
 
+-- player_activity, presence_buckets, presence_ticks and territory_exchanges
+-- are range-partitioned by month on their time column (Helpers/partitions.py).
+-- Databases created before that are converted by
+-- scripts/partition_history_tables.py.
 CREATE TABLE IF NOT EXISTS player_activity (
   uuid          UUID   NOT NULL,
   playtime      FLOAT  NOT NULL,
@@ -277,7 +298,7 @@ CREATE TABLE IF NOT EXISTS player_activity (
   snapshot_date DATE   NOT NULL,
   created_at    TIMESTAMP DEFAULT NOW(),
   PRIMARY KEY (uuid, snapshot_date)
-);
+) PARTITION BY RANGE (snapshot_date);
 
 -- Migration: Add columns if they don't exist (for existing tables)
 DO $$
@@ -316,7 +337,7 @@ CREATE TABLE IF NOT EXISTS presence_buckets (
   bucket_start TIMESTAMPTZ NOT NULL,           -- floored to 15 minutes, UTC
   samples      SMALLINT    NOT NULL DEFAULT 0, -- ticks seen online in this bucket
   PRIMARY KEY (uuid, bucket_start)
-);
+) PARTITION BY RANGE (bucket_start);
 
 CREATE INDEX IF NOT EXISTS idx_presence_buckets_bucket
   ON presence_buckets(bucket_start DESC);
@@ -339,7 +360,7 @@ CREATE TABLE IF NOT EXISTS presence_ticks (
   member_count     SMALLINT    NOT NULL,
   gap_seconds      INT,                   -- since the previous tick; NULL on the first tick ever
   attributed_count SMALLINT    NOT NULL DEFAULT 0  -- of online_count, how many we can name
-);
+) PARTITION BY RANGE (tick_at);
 
 DO $$
 BEGIN
@@ -453,6 +474,20 @@ BEGIN
   END IF;
 END $$;
 
+-- Rollup bookkeeping (Tasks/presence_rollup.py). Hours before watermark are
+-- final and never re-read; a tick written behind it marks its hour dirty so
+-- the next run redoes that hour alone instead of re-scanning a window.
+CREATE TABLE IF NOT EXISTS presence_rollup_state (
+  id         BOOLEAN     PRIMARY KEY DEFAULT TRUE CHECK (id),  -- single row
+  watermark  TIMESTAMPTZ NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS presence_dirty_hours (
+  hour      TIMESTAMPTZ PRIMARY KEY,
+  marked_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- Migration: Add application overhaul columns
 DO $$
 BEGIN
@@ -624,6 +659,32 @@ CREATE TABLE IF NOT EXISTS cache_entries (
 CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache_entries(expires_at);
 CREATE INDEX IF NOT EXISTS idx_cache_created_at ON cache_entries(created_at);
 
+-- Pending deadlines for Helpers/scheduler.py. A row is deleted once its job
+-- has run; job_key (optional, unique) lets a caller move or cancel its job.
+CREATE TABLE IF NOT EXISTS scheduled_jobs (
+  id         BIGSERIAL   PRIMARY KEY,
+  job        TEXT        NOT NULL,
+  job_key    TEXT        UNIQUE,
+  due_at     TIMESTAMPTZ NOT NULL,
+  payload    JSONB       NOT NULL DEFAULT '{}',
+  attempts   INT         NOT NULL DEFAULT 0,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Completed OpenAI classifications, keyed by a hash of model, prompt/schema
+-- fingerprint and normalised input (Helpers/openai_helper.py).
+CREATE TABLE IF NOT EXISTS openai_result_cache (
+  cache_key    CHAR(64)    PRIMARY KEY,
+  model        TEXT        NOT NULL,
+  content      TEXT        NOT NULL,
+  data         JSONB,
+  created_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  hits         INT         NOT NULL DEFAULT 0,
+  last_hit_at  TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_openai_result_cache_created ON openai_result_cache(created_at);
+
 -- =============================================================================
 -- Annihilation Party System
 -- =============================================================================
@@ -892,7 +953,28 @@ CREATE TABLE IF NOT EXISTS territory_exchanges (
   territory     VARCHAR(100) NOT NULL,
   attacker_name VARCHAR(100) NOT NULL,
   defender_name VARCHAR(100)
-);
+) PARTITION BY RANGE (exchange_time);
+
+CREATE INDEX IF NOT EXISTS idx_te_territory_time
+  ON territory_exchanges (territory, exchange_time DESC);
+CREATE INDEX IF NOT EXISTS idx_te_time
+  ON territory_exchanges (exchange_time);
+
+-- Default partitions for the monthly-partitioned history tables (see
+-- Helpers/partitions.py). Months themselves are created by
+-- Tasks/partition_maintenance.py; rows inserted before it first runs land here
+-- and are moved into their month when it does. Tables still awaiting
+-- scripts/partition_history_tables.py are left alone.
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['player_activity', 'presence_buckets', 'presence_ticks', 'territory_exchanges'] LOOP
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(t)) THEN
+      EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I DEFAULT', t || '_default', t);
+    END IF;
+  END LOOP;
+END $$;
 
 -- =============================================================================
 -- Snipe Tracker
@@ -14,6 +14,9 @@ to read them:
   1. event-loop drift  (loop_lag_summary  -> is the loop congested?)
   2. drift excursions  (loop_lag          -> what blocks it, and when?)
   3. command breakdown (command           -> where does a command's time go?)
+  4. task loops        (task              -> what does each loop cost, and how
+                                             long does it hold the event loop?)
+  5. histograms        (latency_summary   -> per-minute percentiles, merged)
 
 Reads from a file argument, or stdin if none is given. Read-only.
 """
@@ -24,7 +27,7 @@ from statistics import median
 
 
 def _load(stream):
-    summaries, excursions, commands, loop_starts = [], [], [], []
+    summaries, excursions, commands, loop_starts, task_runs, hist = [], [], [], [], [], []
     for line in stream:
         line = line.strip()
         if not line:
@@ -40,9 +43,13 @@ def _load(stream):
             excursions.append(rec)
         elif t == "command":
             commands.append(rec)
+        elif t == "task":
+            task_runs.append(rec)
+        elif t == "latency_summary":
+            hist.append(rec)
         elif "STARTING LOOP" in (rec.get("message") or ""):
             loop_starts.append(rec)
-    return summaries, excursions, commands, loop_starts
+    return summaries, excursions, commands, loop_starts, task_runs, hist
 
 
 def _pct(values, q):
@@ -53,8 +60,9 @@ def _pct(values, q):
     return s[idx]
 
 
-def _buckets(rec):
-    b = rec.get("buckets") or {}
+def _nested(rec, key):
+    # Railway may hand nested objects back as JSON strings.
+    b = rec.get(key) or {}
     if isinstance(b, str):
         try:
             b = json.loads(b)
@@ -63,17 +71,22 @@ def _buckets(rec):
     return b
 
 
+def _buckets(rec):
+    return _nested(rec, "buckets")
+
+
 def _span(records):
     ts = [r.get("timestamp", "") for r in records if r.get("timestamp")]
     return (min(ts), max(ts)) if ts else ("?", "?")
 
 
-def report(summaries, excursions, commands, loop_starts):
-    everything = summaries + excursions + commands + loop_starts
+def report(summaries, excursions, commands, loop_starts, task_runs=(), hist=()):
+    task_runs = list(task_runs)
+    everything = summaries + excursions + commands + loop_starts + task_runs
     lo, hi = _span(everything)
     print(f"Window: {lo}  ->  {hi}")
     print(f"Records: {len(summaries)} summaries, {len(excursions)} excursions, "
-          f"{len(commands)} commands\n")
+          f"{len(commands)} commands, {len(task_runs)} task iterations\n")
 
     # 1. Loop health
     print("== Event-loop drift (loop_lag_summary) ==")
@@ -136,6 +149,62 @@ def report(summaries, excursions, commands, loop_starts):
     else:
         print("  (none)")
 
+    # 4. Task loops
+    print("\n== Task loops (task) ==")
+    if task_runs:
+        by_task = {}
+        for r in task_runs:
+            by_task.setdefault(r.get("task", "?"), []).append(r)
+        print(f"  {'task':<40} {'n':>5} {'fail':>4} {'total p50':>10} {'p95':>8} "
+              f"{'on-loop p50':>12} {'max block':>10}")
+        for name, runs in sorted(by_task.items(),
+                                 key=lambda kv: -max(r.get("max_block_ms", 0) for r in kv[1])):
+            totals = [r.get("total_ms", 0) for r in runs]
+            on_loop = [r.get("loop_ms", 0) for r in runs]
+            fails = sum(1 for r in runs if r.get("ok") is False)
+            print(f"  {name:<40} {len(runs):>5} {fails:>4} {median(totals):>10.0f} "
+                  f"{_pct(totals, 0.95):>8.0f} {median(on_loop):>12.1f} "
+                  f"{max(r.get('max_block_ms', 0) for r in runs):>10.1f}")
+
+            # Mean per-iteration time in each bucket, largest first.
+            per_bucket = {}
+            for r in runs:
+                for k, v in _buckets(r).items():
+                    per_bucket[k] = per_bucket.get(k, 0.0) + v.get("ms", 0)
+            top = sorted(per_bucket.items(), key=lambda kv: -kv[1])[:3]
+            if top:
+                print("      buckets/iter  " + ", ".join(
+                    f"{k}={v / len(runs):.0f}" for k, v in top))
+            per_count = {}
+            for r in runs:
+                for k, v in _nested(r, "counts").items():
+                    per_count.setdefault(k, []).append(v)
+            if per_count:
+                print("      counts p50    " + ", ".join(
+                    f"{k}={median(v):g}" for k, v in sorted(per_count.items())))
+    else:
+        print("  (none)")
+
+    # 5. Histogram summaries. Windows can't be merged exactly from their
+    # percentiles, so report n-weighted p50 and the worst window's p99/max.
+    print("\n== Histogram summaries (latency_summary) ==")
+    if hist:
+        merged = {}
+        for rec in hist:
+            for name, s in _nested(rec, "series").items():
+                m = merged.setdefault(name, {"n": 0, "p50w": 0.0, "p99": 0.0, "max": 0.0})
+                m["n"] += s.get("n", 0)
+                m["p50w"] += s.get("p50", 0) * s.get("n", 0)
+                m["p99"] = max(m["p99"], s.get("p99", 0))
+                m["max"] = max(m["max"], s.get("max", 0))
+        print(f"  {len(hist)} windows")
+        print(f"  {'series':<40} {'n':>7} {'p50~':>8} {'worst p99':>10} {'max':>8}")
+        for name, m in sorted(merged.items(), key=lambda kv: -kv[1]["p99"]):
+            p50 = m["p50w"] / m["n"] if m["n"] else 0.0
+            print(f"  {name:<40} {m['n']:>7} {p50:>8.1f} {m['p99']:>10.1f} {m['max']:>8.1f}")
+    else:
+        print("  (none)")
+
 
 def main():
     if len(sys.argv) > 1:
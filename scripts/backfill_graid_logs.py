@@ -22,6 +22,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 import discord
 from Helpers.classes import DB
+from Helpers.graid_log import record_raids
 from Helpers.variables import RAID_LOG_CHANNEL_ID
 
 RAID_NAMES = [
@@ -35,6 +36,10 @@ RAID_NAMES = [
 # Set of raid names lowercased, used to detect faulty "participant" entries
 RAID_NAMES_LOWER = {n.lower() for n in RAID_NAMES}
 
+# Raids written per record_raids call; each call is a handful of statements
+# whatever its size, so this only bounds the parameter arrays.
+WRITE_BATCH = 200
+
 BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
 # Pattern 1: "**Raid Name** completed by: Player1, Player2, Player3, Player4"
 COMPLETED_BY_RE = re.compile(r"completed by:\s*(.+)", re.IGNORECASE)
@@ -129,6 +134,7 @@ async def backfill(channel: discord.TextChannel, dry_run: bool = False):
         db.cursor.execute("SELECT completed_at FROM graid_logs")
         existing_timestamps = {row[0] for row in db.cursor.fetchall()}
 
+        pending = []
         inserted = 0
         skipped = 0
         bad_format = 0
@@ -182,25 +188,24 @@ async def backfill(channel: discord.TextChannel, dry_run: bool = False):
                     inserted += 1
                     continue
 
-                db.cursor.execute(
-                    "INSERT INTO graid_logs (event_id, raid_type, completed_at) VALUES (%s, %s, %s) RETURNING id",
-                    (event_id, raid_type, ts)
-                )
-                log_id = db.cursor.fetchone()[0]
-
-                for ign in igns:
-                    uuid_val = ign_map.get(ign.lower())
-                    db.cursor.execute(
-                        "INSERT INTO graid_log_participants (log_id, uuid, ign) VALUES (%s, %s, %s)",
-                        (log_id, uuid_val, ign)
-                    )
-
+                pending.append({
+                    "event_id": event_id,
+                    "raid_type": raid_type,
+                    "completed_at": ts,
+                    "participants": [{"uuid": ign_map.get(ign.lower()), "ign": ign} for ign in igns],
+                })
                 existing_timestamps.add(ts)
                 inserted += 1
 
-                if inserted % 50 == 0:
+                if len(pending) >= WRITE_BATCH:
+                    # Historical raids were paid out at the time; log only.
+                    record_raids(db, pending, tally=False)
+                    pending.clear()
                     print(f"  ...inserted {inserted} raids so far", flush=True)
 
+        if pending:
+            record_raids(db, pending, tally=False)
+
         print(f"Scan complete. {msg_count} messages scanned ({first_date} to {last_date}).", flush=True)
 
         if not dry_run:
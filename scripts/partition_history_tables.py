@@ -0,0 +1,146 @@
+"""Convert the history tables to monthly range partitions, rows and all.
+
+For each table in Tasks/partition_maintenance.POLICIES that is still a plain
+table, in one transaction per table:
+
+  1. create a partitioned copy with the same columns and defaults,
+  2. create a partition for every month from the oldest row to a couple of
+     months ahead, plus the default partition,
+  3. copy the rows across and check the count,
+  4. swap it in under the original name, re-creating the original's primary
+     key / unique constraints, indexes and any views that read it.
+
+Months already past the table's retention are not re-homed, except under a
+detach policy (territory_exchanges): there every month is re-homed and the
+expired ones are then detached as archive tables, as maintenance would have
+done. Tables that are already partitioned are skipped, so the script is safe
+to re-run.
+
+The copy holds an exclusive lock on the table being converted, so run it
+while the bot is stopped. Pass --dry-run to report what would happen.
+
+    python scripts/partition_history_tables.py [--dry-run] [--table NAME]
+"""
+import argparse
+import datetime
+import os
+import sys
+from datetime import timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers.database import DB
+from Helpers.partitions import (create_default, ensure_partitions, expire_partitions, is_partitioned,
+                                month_floor, retention_cutoff)
+from Tasks.partition_maintenance import POLICIES
+
+
+def _dependents(db, table):
+    """(constraints, indexes, views) to re-create on the swapped-in table."""
+    db.cursor.execute("""
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u')
+    """, (table,))
+    constraints = db.cursor.fetchall()
+    db.cursor.execute("""
+        SELECT indexname, indexdef
+        FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = %s
+    """, (table,))
+    backing = {name for name, _ in constraints}
+    indexes = [(name, sql) for name, sql in db.cursor.fetchall() if name not in backing]
+    db.cursor.execute("""
+        SELECT v.view_name, pg_get_viewdef(to_regclass(v.view_name))
+        FROM information_schema.view_table_usage v
+        WHERE v.table_schema = current_schema() AND v.table_name = %s
+    """, (table,))
+    views = db.cursor.fetchall()
+    return constraints, indexes, views
+
+
+def convert(db, policy, today, dry_run=False):
+    table, col = policy.table, policy.column
+    db.cursor.execute(f"SELECT MIN({col}), COUNT(*) FROM {table}")
+    oldest, rows = db.cursor.fetchone()
+    first = oldest.date() if isinstance(oldest, datetime.datetime) else (oldest or today)
+    cutoff = retention_cutoff(policy, today)
+    archive = policy.expire == "detach"
+    if cutoff is not None and first < cutoff and not archive:
+        first = cutoff
+    print(f"{table}: {rows} rows, partitions from {month_floor(first):%Y-%m}")
+    if dry_run:
+        return
+
+    staging = f"{table}_partitioned"
+    constraints, indexes, views = _dependents(db, table)
+
+    db.cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+    db.cursor.execute(f"""
+        CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+        PARTITION BY RANGE ({col})
+    """)
+    created = ensure_partitions(db, policy, today, since=first, parent=staging, include_expired=archive)
+    create_default(db, policy, parent=staging)
+
+    where, params = "", ()
+    if cutoff is not None and not archive:
+        bound = datetime.datetime.combine(cutoff, datetime.time(), timezone.utc) if policy.timestamptz else cutoff
+        where, params = f" WHERE {col} >= %s", (bound,)
+    db.cursor.execute(f"INSERT INTO {staging} SELECT * FROM {table}{where}", params)
+    copied = db.cursor.rowcount
+    db.cursor.execute(f"SELECT COUNT(*) FROM {table}{where}", params)
+    expected = db.cursor.fetchone()[0]
+    if copied != expected:
+        raise RuntimeError(f"{table}: copied {copied} rows, expected {expected}")
+
+    for name, _ in views:
+        db.cursor.execute(f"DROP VIEW {name}")
+    db.cursor.execute(f"DROP TABLE {table}")
+    db.cursor.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+    for name, definition in constraints:
+        db.cursor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+    for _, sql in indexes:
+        db.cursor.execute(sql)
+    for name, definition in views:
+        db.cursor.execute(f"CREATE VIEW {name} AS {definition}")
+
+    print(f"  copied {copied} rows into {len(created)} monthly partitions "
+          f"({rows - copied} past retention left behind)")
+    if archive:
+        # After the indexes, so the archive tables carry them too.
+        detached = expire_partitions(db, policy, today)
+        if detached:
+            print(f"  detached {len(detached)} archive partitions: {', '.join(detached)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dry-run", action="store_true", help="report without writing")
+    parser.add_argument("--table", help="only convert this table")
+    args = parser.parse_args()
+
+    today = datetime.datetime.now(timezone.utc).date()
+    db = DB()
+    db.connect()
+    try:
+        for policy in POLICIES:
+            if args.table and policy.table != args.table:
+                continue
+            if is_partitioned(db, policy.table):
+                print(f"{policy.table}: already partitioned")
+                continue
+            try:
+                convert(db, policy, today, dry_run=args.dry_run)
+                db.connection.commit()
+            except Exception:
+                db.connection.rollback()
+                raise
+        if args.dry_run:
+            print("\ndry run — nothing written")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark harness for tests/benchmarks.
+
+Benchmarks are skipped unless asked for, so the normal suite stays fast:
+
+    python -m pytest tests/benchmarks --bench
+    python -m pytest tests/benchmarks --bench --bench-save .bench/baseline.json
+    python -m pytest tests/benchmarks --bench --bench-compare .bench/baseline.json
+
+The options themselves are registered in tests/conftest.py, so ``--bench``
+also works on a run of the whole ``tests`` directory.
+
+``--bench-compare`` fails any benchmark whose median is more than
+``--bench-max-regression`` (default 25%) slower than the stored baseline, so a
+speedup, once saved, is kept. Baselines are per machine: save one before a
+change and compare after it, on the same box. ``--bench-save`` and
+``--bench-compare`` may name the same file to ratchet it forward.
+
+The ``bench`` fixture mirrors pytest-benchmark's call style,
+``bench(fn, *args, **kwargs)``, and returns fn's last result.
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import pytest
+
+DEFAULT_ROUNDS = 15
+WARMUP_ROUNDS = 2
+
+_results: dict = {}
+
+
+class Bench:
+    def __init__(self, name, config, baseline):
+        self.name = name
+        self.config = config
+        self.baseline = baseline
+        self.stats = None
+
+    def __call__(self, fn, *args, rounds=DEFAULT_ROUNDS, setup=None, **kwargs):
+        """Time ``fn(*args, **kwargs)``; ``setup()`` runs untimed before each round."""
+        rounds = self.config.getoption("--bench-rounds") or rounds
+        result = None
+        for _ in range(WARMUP_ROUNDS):
+            if setup:
+                setup()
+            result = fn(*args, **kwargs)
+
+        timings = []
+        for _ in range(rounds):
+            if setup:
+                setup()
+            t = time.perf_counter()
+            result = fn(*args, **kwargs)
+            timings.append(time.perf_counter() - t)
+
+        self.stats = {
+            "rounds": rounds,
+            "min_ms": round(min(timings) * 1000, 4),
+            "median_ms": round(statistics.median(timings) * 1000, 4),
+            "mean_ms": round(statistics.fmean(timings) * 1000, 4),
+        }
+        _results[self.name] = self.stats
+        self._check_regression()
+        return result
+
+    def _check_regression(self):
+        if not self.baseline:
+            return
+        previous = self.baseline.get("benchmarks", {}).get(self.name)
+        if previous is None:
+            return
+        allowed = self.config.getoption("--bench-max-regression")
+        before, now = previous["median_ms"], self.stats["median_ms"]
+        if before > 0 and now > before * (1 + allowed):
+            pytest.fail(
+                f"{self.name} regressed: median {now:.3f}ms vs baseline {before:.3f}ms "
+                f"(+{(now / before - 1) * 100:.0f}%, allowed +{allowed * 100:.0f}%)",
+                pytrace=False,
+            )
+
+
+@pytest.fixture(scope="session")
+def _bench_baseline(pytestconfig):
+    path = pytestconfig.getoption("--bench-compare")
+    if not path:
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def bench(request, pytestconfig, _bench_baseline):
+    if not pytestconfig.getoption("--bench"):
+        pytest.skip("benchmarks run with --bench")
+    return Bench(request.node.name, pytestconfig, _bench_baseline)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    path = session.config.getoption("--bench-save", default=None)
+    if not path or not _results:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "machine": {"python": sys.version.split()[0], "platform": platform.platform()},
+            "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "benchmarks": dict(sorted(_results.items())),
+        }, f, indent=2)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section("benchmarks")
+    width = max(len(name) for name in _results)
+    for name, s in sorted(_results.items()):
+        terminalreporter.write_line(
+            f"{name:<{width}}  median {s['median_ms']:>10.3f}ms  min {s['min_ms']:>10.3f}ms  ({s['rounds']} rounds)"
+        )
@@ -0,0 +1,122 @@
+"""
+Data-path benchmarks: the playtime_daily derivation and the leaderboard
+baseline lookup, over a synthetic year of history for 150 members.
+
+The baseline query runs against a real Postgres, since its cost is in the
+planner and the index, not in Python. Point BENCH_DATABASE_URL at a scratch
+database to run it (e.g. postgresql://postgres@localhost/bench); it works in
+a TEMP table that vanishes with the connection, so nothing is left behind.
+
+Benchmarks:
+1. build_rows over one year of daily snapshots (with gaps and regressions)
+2. _get_member_baselines_from_db for a 7-day window
+3. _get_member_baselines_from_db for a 30-day window, with join dates
+"""
+
+import datetime
+import os
+import random
+import sys
+from datetime import timedelta
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from Helpers.database import _get_member_baselines_from_db
+from Helpers.playtime_daily import build_rows
+
+MEMBERS = 150
+DAYS = 365
+
+
+def _uuid(i):
+    return f"00000000-0000-4000-8000-{i:012d}"
+
+
+def _snapshot_records():
+    """build_rows input: LAG()-paired snapshots, as SOURCE_ROWS returns them."""
+    rng = random.Random(45)
+    start = datetime.date.today() - timedelta(days=DAYS)
+    records = []
+    for i in range(MEMBERS):
+        playtime, wars, raids, prev = 0.0, 0, 0, None
+        for d in range(DAYS):
+            if rng.random() < 0.05:
+                continue  # missed snapshot -> interpolated span
+            day = start + timedelta(days=d)
+            playtime += rng.uniform(-0.5, 6.0) if rng.random() < 0.01 else rng.uniform(0, 6.0)
+            wars += rng.randint(0, 5)
+            raids += rng.randint(0, 2)
+            records.append((_uuid(i), day, round(playtime, 2), wars, raids, *(prev or (None,) * 4)))
+            prev = (day, round(playtime, 2), wars, raids)
+    return records
+
+
+def test_build_rows(bench):
+    records = _snapshot_records()
+    rows = bench(lambda: sum(1 for _ in build_rows(records)), rounds=5)
+    assert rows > MEMBERS * DAYS * 0.9
+
+
+SEED_SQL = """
+    CREATE TEMP TABLE player_activity (
+      uuid          UUID   NOT NULL,
+      playtime      FLOAT  NOT NULL,
+      contributed   BIGINT DEFAULT 0,
+      wars          INTEGER DEFAULT 0,
+      raids         INTEGER DEFAULT 0,
+      shells        INTEGER DEFAULT 0,
+      snapshot_date DATE   NOT NULL,
+      created_at    TIMESTAMP DEFAULT NOW(),
+      PRIMARY KEY (uuid, snapshot_date)
+    );
+    INSERT INTO player_activity (uuid, playtime, contributed, wars, raids, shells, snapshot_date)
+    SELECT ('00000000-0000-4000-8000-' || lpad(m::text, 12, '0'))::uuid,
+           d * 2.5, d::bigint * 1000000 * (m % 7 + 1), d * (m % 5), d / 3, d,
+           CURRENT_DATE - (%(days)s - d)
+    FROM generate_series(0, %(members)s - 1) AS m,
+         generate_series(0, %(days)s - 1) AS d
+    WHERE (m * 31 + d) %% 20 <> 0;  -- ~5%% of days missing
+    ANALYZE player_activity;
+"""
+
+
+class _BenchDB:
+    """The slice of Helpers.database.DB the baseline query uses."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.cursor = connection.cursor()
+
+
+@pytest.fixture(scope="module")
+def seeded_db():
+    url = os.getenv("BENCH_DATABASE_URL")
+    if not url:
+        pytest.skip("set BENCH_DATABASE_URL to run the database benchmarks")
+    import psycopg2
+
+    connection = psycopg2.connect(url)
+    db = _BenchDB(connection)
+    db.cursor.execute(SEED_SQL, {"days": DAYS, "members": MEMBERS})
+    yield db
+    connection.close()
+
+
+def test_member_baselines_7d(bench, seeded_db):
+    joined = {_uuid(i): None for i in range(MEMBERS)}
+    result = bench(_get_member_baselines_from_db, seeded_db, "contributed", 7, joined)
+    assert len(result) == MEMBERS
+
+
+def test_member_baselines_30d_joined(bench, seeded_db):
+    rng = random.Random(45)
+    today = datetime.date.today()
+    joined = {
+        _uuid(i): today - timedelta(days=rng.randint(1, DAYS)) if i % 3 else None
+        for i in range(MEMBERS)
+    }
+    result = bench(_get_member_baselines_from_db, seeded_db, "playtime", 30, joined)
+    assert len(result) == MEMBERS
@@ -0,0 +1,167 @@
+"""
+Render benchmarks: the Pillow hot paths behind /profile, /leaderboard and the
+guild banner. Inputs are pinned (seeded member data, fixed colours and
+banner layers) so runs on the same machine are comparable.
+
+Benchmarks:
+1. vertical_gradient at profile-card size
+2. colorize on a 128px icon
+3. generate_banner with a six-layer banner
+4. create_leaderboard first page over 150 members
+5. _build_profile_card for a linked TAq member
+"""
+
+import asyncio
+import os
+import random
+import sys
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from Helpers.functions import colorize, generate_banner, vertical_gradient
+
+GAME_FONT = "images/profile/game.ttf"
+MEMBERS = 150
+
+GUILD_DATA = {
+    "banner": {
+        "base": "BLUE",
+        "layers": [
+            {"colour": "WHITE", "pattern": "BORDER"},
+            {"colour": "LIGHT_BLUE", "pattern": "BRICKS"},
+            {"colour": "CYAN", "pattern": "CROSS"},
+            {"colour": "BLACK", "pattern": "CREEPER"},
+            {"colour": "YELLOW", "pattern": "STRIPE_TOP"},
+            {"colour": "WHITE", "pattern": "CIRCLE_MIDDLE"},
+        ],
+    },
+}
+
+
+def require_files(*paths):
+    """Skip when a render asset is missing from this checkout."""
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        pytest.skip(f"missing assets: {', '.join(missing)}")
+
+
+@pytest.fixture(autouse=True)
+def _project_root(monkeypatch):
+    # Asset paths in the render code are relative to the project root.
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def _members():
+    rng = random.Random(45)
+    return [
+        {
+            "uuid": f"00000000-0000-4000-8000-{i:012d}",
+            "name": f"member_{i:03d}",
+            "rank": rng.choice(["recruit", "recruiter", "captain", "strategist", "chief"]),
+            "joined": "2024-01-01T00:00:00Z",
+            "contributed": rng.randint(0, 5_000_000_000),
+            "wars": rng.randint(0, 4000),
+        }
+        for i in range(MEMBERS)
+    ]
+
+
+def test_vertical_gradient(bench):
+    bench(vertical_gradient, 850, 1130, "#293786", "#1d275e")
+
+
+def test_colorize(bench):
+    icon = Image.open("images/profile/xp.png").convert("RGBA").resize((128, 128))
+    bench(colorize, icon, "#66ccff")
+
+
+def test_generate_banner(bench):
+    bench(generate_banner, "The Aquarium", 15, "2", guild_data=GUILD_DATA)
+
+
+class _Cursor:
+    def __init__(self):
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        if "MIN(snapshot_date)" in sql:
+            self._rows = [(None,)]
+        else:
+            self._rows = []
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class _DB:
+    def connect(self):
+        self.cursor = _Cursor()
+
+    def close(self):
+        pass
+
+
+def test_create_leaderboard(bench):
+    require_files(GAME_FONT)
+    from Commands import leaderboard
+
+    members = _members()
+    baselines = {m["uuid"]: (m["contributed"] // 2, False) for m in members}
+    with patch.object(leaderboard, "DB", _DB), \
+            patch.object(leaderboard, "get_current_guild_data_with_db", lambda db: {"members": members}), \
+            patch.object(leaderboard, "get_player_activity_baselines_for_members_with_db",
+                         lambda db, key, days, joined: baselines):
+        async def build():
+            # discord.ui views (the paginator) need a running loop to construct.
+            return leaderboard.create_leaderboard(
+                "contributed", "images/profile/xp.png", "images/profile/guxp_title.png", 7)
+
+        loop = asyncio.new_event_loop()
+        try:
+            bench(lambda: loop.run_until_complete(build()), rounds=5)
+        finally:
+            loop.close()
+
+
+def _player():
+    return SimpleNamespace(
+        username="Seaweed_Sam", UUID="00000000-0000-4000-8000-000000000001",
+        tag_color="#66ccff", tag_display="VIP+", gradient=["#293786", "#1d275e"], background=1,
+        guild="The Aquarium", guild_data=GUILD_DATA, guild_rank="captain", rank="Angler",
+        taq=True, linked=True, discord="1", balance=1234, backgrounds_owned=[1, 2, 3],
+        in_guild_for=timedelta(days=200), stats_days=7,
+        online=False, server=None, last_joined="2026-01-01T00:00:00Z",
+        total_level=1690, playtime=1234.5, wars=812, guild_contributed=1_234_567_890,
+        guild_raids=321, chests=4567, quests=250, mobs=100_000,
+        real_pt=42, real_wars=17, real_xp=12_345_678, real_raids=9,
+        last_joined_is_private=False, total_level_is_private=False, playtime_is_private=False,
+        wars_is_private=False, guild_contributed_is_private=False, chests_is_private=False,
+        quests_is_private=False, real_pt_is_private=False, real_wars_is_private=False,
+        real_xp_is_private=False, real_raids_is_private=False,
+        unlock_background=lambda name: None,
+    )
+
+
+def _no_network(*args, **kwargs):
+    raise ConnectionError("benchmarks do not fetch avatars")
+
+
+def test_profile_card(bench):
+    require_files(GAME_FONT)
+    from Commands import profile
+
+    background = Image.new("RGBA", (800, 526), (40, 80, 160, 255))
+    with patch.object(profile, "timed_get", _no_network), \
+            patch.object(profile, "get_background", lambda name: background.copy()), \
+            patch.object(profile, "log", lambda *a, **k: None):
+        bench(profile._build_profile_card, _player(), 7, "1", rounds=5)
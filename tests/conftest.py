@@ -0,0 +1,18 @@
+"""
+Suite-wide pytest options.
+
+The benchmark options live here rather than in tests/benchmarks/conftest.py:
+pytest only accepts command-line options registered by conftests it loads at
+startup, and that is the conftest of each path given and its parents. Here,
+``--bench`` works whether the run names ``tests`` or ``tests/benchmarks``.
+"""
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("bench", "tests/benchmarks")
+    group.addoption("--bench", action="store_true", default=False, help="run the benchmarks")
+    group.addoption("--bench-save", metavar="PATH", default=None, help="write results as a baseline")
+    group.addoption("--bench-compare", metavar="PATH", default=None, help="fail on regressions against a baseline")
+    group.addoption("--bench-max-regression", type=float, default=0.25,
+                    help="allowed slowdown of the median against the baseline (0.25 = 25%%)")
+    group.addoption("--bench-rounds", type=int, default=None, help="override every benchmark's round count")
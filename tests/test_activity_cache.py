@@ -0,0 +1,127 @@
+"""
+Test suite for the /activity result cache (Commands/activity.py).
+
+Tests:
+1. A repeat query for the same snapshot only probes the snapshot key
+2. Another sort order for the same window reuses the computed rows
+3. A new guildData snapshot or a different window recomputes
+4. Sort orders match the command's rules
+"""
+
+import datetime
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Commands import activity
+
+
+def _member(name, playtime, last_join, joined="2024-01-01T00:00:00Z", rank="recruit"):
+    return {
+        "uuid": f"{name}-uuid",
+        "name": name,
+        "playtime": playtime,
+        "lastJoin": last_join,
+        "joined": joined,
+        "rank": rank,
+    }
+
+
+class _State:
+    def __init__(self):
+        self.snapshot_time = 1000
+        self.activity_date = datetime.date(2025, 6, 1)
+        self.members = [
+            _member("active", 50, datetime.datetime.utcnow().isoformat() + "Z"),
+            _member("idle", 10, "2025-01-01T00:00:00Z"),
+        ]
+        self.full_loads = 0
+        self.probes = 0
+
+
+class _FakeCursor:
+    def __init__(self, state):
+        self.state = state
+        self._one = None
+        self._all = []
+
+    def execute(self, sql, params=None):
+        if "MAX(snapshot_date)" in sql:
+            self.state.probes += 1
+            self._one = (str(self.state.snapshot_time), self.state.activity_date)
+        elif "cache_key = 'guildData'" in sql:
+            self.state.full_loads += 1
+            self._one = ({"time": self.state.snapshot_time, "members": self.state.members},)
+        elif "FROM discord_links" in sql:
+            self._all = [("idle-uuid", "Manatee")]
+
+    def fetchone(self):
+        return self._one
+
+    def fetchall(self):
+        return list(self._all)
+
+
+@pytest.fixture
+def state(monkeypatch):
+    state = _State()
+
+    class _FakeDB:
+        def __init__(self):
+            self.cursor = _FakeCursor(state)
+
+        def connect(self):
+            pass
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(activity, "DB", _FakeDB)
+    monkeypatch.setattr(
+        activity, "get_player_activity_baselines_for_members_with_db",
+        lambda db, key, days, joined: {"active-uuid": (40, False), "idle-uuid": (9, False)},
+    )
+    activity._ROWS_CACHE.clear()
+    yield state
+    activity._ROWS_CACHE.clear()
+
+
+def test_repeat_query_is_served_from_cache(state):
+    first = activity._load_sorted_rows("Playtime", 7)
+    second = activity._load_sorted_rows("Playtime", 7)
+
+    assert second is first
+    assert state.full_loads == 1 and state.probes == 2
+    assert [r["name"] for r in first] == ["active", "idle"]
+    assert first[0]["playtime"] == 10
+
+
+def test_other_order_reuses_rows(state):
+    activity._load_sorted_rows("Playtime", 7)
+    inactive = activity._load_sorted_rows("Inactivity", 7)
+
+    assert state.full_loads == 1
+    assert [r["name"] for r in inactive] == ["idle", "active"]
+
+
+def test_new_snapshot_or_window_recomputes(state):
+    activity._load_sorted_rows("Playtime", 7)
+    activity._load_sorted_rows("Playtime", 14)
+    state.snapshot_time = 1180
+    activity._load_sorted_rows("Playtime", 7)
+
+    assert state.full_loads == 3
+
+
+def test_kick_order_puts_low_rank_below_threshold_first():
+    rows = [
+        {"name": "a", "member_for": 30, "below_threshold": False, "discord_rank": "Starfish", "playtime": 9, "last_join": 0},
+        {"name": "b", "member_for": 30, "below_threshold": True, "discord_rank": "Narwhal", "playtime": 1, "last_join": 3},
+        {"name": "c", "member_for": 3, "below_threshold": True, "discord_rank": "Starfish", "playtime": 0, "last_join": 9},
+        {"name": "d", "member_for": 30, "below_threshold": True, "discord_rank": "Starfish", "playtime": 1, "last_join": 3},
+    ]
+    assert [r["name"] for r in activity._sort_rows(rows, "Kick Suitability")] == ["d", "b", "a", "c"]
@@ -0,0 +1,76 @@
+"""
+Test suite for the local application / recruiter pre-classifier
+(Helpers/app_classifier.py), run against the labelled corpus in
+tests/fixtures/application_corpus.json.
+
+Tests:
+1. Every application verdict the classifier gives matches its label
+2. Ambiguous messages are deferred to the model
+3. The clear-cut cases are nearly all settled locally
+4. Recruiter names resolve (or defer) as labelled
+5. detect_application only calls the model for deferred messages
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import app_classifier, openai_helper
+
+with open(os.path.join(os.path.dirname(__file__), "fixtures", "application_corpus.json")) as f:
+    CORPUS = json.load(f)
+
+APPLICATIONS = CORPUS["applications"]
+CLEAR = [a for a in APPLICATIONS if a["label"] != "ambiguous"]
+AMBIGUOUS = [a for a in APPLICATIONS if a["label"] == "ambiguous"]
+
+# Share of clear-cut corpus messages that must be settled without a model call.
+MIN_COVERAGE = 0.9
+
+
+@pytest.mark.parametrize("case", CLEAR, ids=lambda c: c["text"][:30])
+def test_local_verdicts_match_labels(case):
+    result = app_classifier.classify_application(case["text"])
+    if result is not None:
+        assert result["app_type"] == case["label"]
+        assert result["is_application"] == (case["label"] != "none")
+        assert result["error"] is None
+
+
+@pytest.mark.parametrize("case", AMBIGUOUS, ids=lambda c: c["text"][:30])
+def test_ambiguous_messages_are_deferred(case):
+    assert app_classifier.classify_application(case["text"]) is None
+
+
+def test_clear_cases_are_settled_locally():
+    settled = [a for a in CLEAR if app_classifier.classify_application(a["text"]) is not None]
+    assert len(settled) / len(CLEAR) >= MIN_COVERAGE
+
+
+@pytest.mark.parametrize("case", CORPUS["recruiters"]["cases"], ids=lambda c: c["text"])
+def test_recruiter_matching(case):
+    assert app_classifier.match_recruiter(case["text"], CORPUS["recruiters"]["roster"]) == case["expected"]
+
+
+def test_detect_application_skips_the_model_when_settled(monkeypatch):
+    calls = []
+
+    def fake_query(**kwargs):
+        calls.append(kwargs["input_text"])
+        return {"content": "{}", "data": {"is_application": True, "app_type": "guild_member", "confidence": 0.8},
+                "error": None}
+
+    monkeypatch.setattr(openai_helper, "query", fake_query)
+    monkeypatch.setattr(openai_helper, "log", lambda *a, **k: None)
+
+    assert openai_helper.detect_application("hi")["app_type"] == "none"
+    assert openai_helper.detect_application(CLEAR[0]["text"])["app_type"] == "guild_member"
+    assert calls == []
+
+    openai_helper.detect_application(AMBIGUOUS[0]["text"])
+    assert calls == [AMBIGUOUS[0]["text"]]
@@ -0,0 +1,112 @@
+"""
+Test suite for the batched embed feed (Helpers/embed_feed.py).
+
+Tests:
+1. Up to 10 embeds per message, in submission order
+2. A tick above the threshold becomes one summary embed
+3. Summary descriptions stay under Discord's limit and count the overflow
+4. submit() never awaits Discord; a backlog drops the oldest tick
+5. A failed send is logged and the feed keeps going
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import discord
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import embed_feed
+
+
+class _Channel:
+    def __init__(self, fail_first=False, gate=None):
+        self.sent = []
+        self.fail_first = fail_first
+        self.gate = gate
+
+    async def send(self, embeds):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail_first:
+            self.fail_first = False
+            raise discord.HTTPException(type("R", (), {"status": 500, "reason": "x"})(), "boom")
+        self.sent.append([e.title for e in embeds])
+
+
+def _embeds(n, tag="t"):
+    return [discord.Embed(title=f"{tag}{i}") for i in range(n)]
+
+
+def test_packs_ten_per_message_in_order():
+    async def main():
+        feed = embed_feed.EmbedFeed("test")
+        chan = _Channel()
+        feed.submit(chan, _embeds(12, "a"))
+        feed.submit(chan, _embeds(3, "b"))
+        await feed.drain()
+        feed.close()
+        return chan.sent
+
+    sent = asyncio.run(main())
+    assert [len(m) for m in sent] == [10, 2, 3]
+    assert sent[0][0] == "a0" and sent[1] == ["a10", "a11"] and sent[2][0] == "b0"
+
+
+def test_large_tick_becomes_summary():
+    async def main():
+        feed = embed_feed.EmbedFeed("test", summary_threshold=5)
+        chan = _Channel()
+        feed.submit(chan, _embeds(8), [f"line {i}" for i in range(8)], summary_title="8 changed")
+        await feed.drain()
+        feed.close()
+        return chan.sent
+
+    assert asyncio.run(main()) == [["8 changed"]]
+
+
+def test_summary_respects_description_limit():
+    lines = ["x" * 100] * 100
+    (embed,) = embed_feed.summary_embeds("many", lines)
+    assert len(embed.description) <= 4096
+    assert embed.description.endswith("more")
+
+
+def test_submit_does_not_wait_and_drops_oldest(monkeypatch):
+    monkeypatch.setattr(embed_feed, "MAX_PENDING_TICKS", 2)
+
+    async def main():
+        gate = asyncio.Event()
+        feed = embed_feed.EmbedFeed("test")
+        chan = _Channel(gate=gate)
+        with patch.object(embed_feed, "log") as mock_log:
+            feed.submit(chan, _embeds(1, "first"))
+            await asyncio.sleep(0)          # worker takes "first" and blocks on the gate
+            for tag in ("a", "b", "c"):
+                feed.submit(chan, _embeds(1, tag))
+        assert feed.pending() == 2 and feed.dropped_ticks == 1
+        assert mock_log.called
+        gate.set()
+        await feed.drain()
+        feed.close()
+        return chan.sent
+
+    assert asyncio.run(main()) == [["first0"], ["b0"], ["c0"]]
+
+
+def test_failed_send_is_logged_and_feed_continues():
+    async def main():
+        feed = embed_feed.EmbedFeed("test")
+        chan = _Channel(fail_first=True)
+        with patch.object(embed_feed, "log") as mock_log:
+            feed.submit(chan, _embeds(1, "a"))
+            feed.submit(chan, _embeds(1, "b"))
+            await feed.drain()
+        feed.close()
+        return chan.sent, mock_log.called
+
+    sent, logged = asyncio.run(main())
+    assert sent == [["b0"]] and logged
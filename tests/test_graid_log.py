@@ -0,0 +1,168 @@
+"""
+Test suite for the set-based graid write path (Helpers/graid_log.py).
+
+Tests:
+1. A batch of raids costs a fixed number of statements, not one per row
+2. Missing igns resolve from discord_links; given igns are kept
+3. Tallies count each uuid once per raid and skip uuid-less players
+4. Raids outside an event log with NULL event and touch no event totals or standings
+5. tally=False (backfill) writes logs and participants, and still refreshes standings
+6. A manual log (uncollected=False) credits the event and its standings, not uncollected_raids
+7. An empty batch issues no statements
+8. The queue drain writes every row and marks them done in one transaction
+"""
+
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import graid_log
+from Tasks import update_member_data as umd
+
+UUID_A = "11111111-1111-1111-1111-111111111111"
+UUID_B = "22222222-2222-2222-2222-222222222222"
+UUID_C = "33333333-3333-3333-3333-333333333333"
+
+
+class _FakeCursor:
+    """Answers the handful of statements record_raids issues."""
+
+    def __init__(self, active_event=7, links=None):
+        self.calls = []
+        self.active_event = active_event
+        self.links = links or {}
+        self._next_id = 100
+        self._result = []
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        self.calls.append((sql, params))
+        if "FROM graid_events" in sql:
+            self._result = [(self.active_event,)] if self.active_event else []
+        elif "nextval" in sql:
+            n = params[0]
+            self._result = [(self._next_id + i,) for i in range(n)]
+            self._next_id += n
+        elif "INSERT INTO graid_log_participants" in sql:
+            logs, uuids, igns = params
+            self._result = [
+                (l, u, i or self.links.get(u)) for l, u, i in zip(logs, uuids, igns)
+            ]
+        else:
+            self._result = []
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return list(self._result)
+
+
+class _FakeDB:
+    def __init__(self, **kwargs):
+        self.cursor = _FakeCursor(**kwargs)
+        self.commits = 0
+        self.closed = False
+        db = self
+
+        class _Conn:
+            def commit(self):
+                db.commits += 1
+
+        self.connection = _Conn()
+
+    def close(self):
+        self.closed = True
+
+
+def _find(cur, needle):
+    matches = [c for c in cur.calls if needle in c[0]]
+    assert len(matches) == 1, f"expected one {needle!r} statement, got {len(matches)}"
+    return matches[0][1]
+
+
+def _raid(*uuids, raid_type="The Canyon Colossus", **extra):
+    return {"raid_type": raid_type, "participants": [{"uuid": u} for u in uuids], **extra}
+
+
+def test_batch_cost_is_fixed():
+    db = _FakeDB(links={UUID_A: "alpha", UUID_B: "bravo"})
+    ids = graid_log.record_raids(db, [_raid(UUID_A, UUID_B) for _ in range(40)])
+
+    assert ids == list(range(100, 140))
+    assert len(db.cursor.calls) == 8
+    logs = _find(db.cursor, "INSERT INTO graid_logs")
+    assert logs[0] == ids and set(logs[1]) == {7}
+    parts = _find(db.cursor, "INSERT INTO graid_log_participants")
+    assert len(parts[0]) == 80
+
+
+def test_ign_resolution_and_totals():
+    db = _FakeDB(links={UUID_A: "alpha"})
+    graid_log.record_raids(db, [
+        {"raid_type": None, "participants": [
+            {"uuid": UUID_A}, {"uuid": UUID_A}, {"uuid": UUID_B, "ign": "Bravo"}, {"uuid": None, "ign": "ghost"},
+        ]},
+        _raid(UUID_B),
+    ])
+
+    uuids, igns, counts = _find(db.cursor, "INSERT INTO uncollected_raids")
+    assert dict(zip(uuids, counts)) == {UUID_A: 1, UUID_B: 2}
+    assert dict(zip(uuids, igns)) == {UUID_A: "alpha", UUID_B: "Bravo"}
+    events, uuids, totals = _find(db.cursor, "INSERT INTO graid_event_totals")
+    assert set(events) == {7}
+    assert dict(zip(uuids, totals)) == {UUID_A: 1, UUID_B: 2}
+
+
+def test_no_active_event_skips_event_totals():
+    db = _FakeDB(active_event=None)
+    graid_log.record_raids(db, [_raid(UUID_A, UUID_B)])
+
+    assert _find(db.cursor, "INSERT INTO graid_logs")[1] == [None]
+    assert not any("graid_event_totals" in c[0] or "graid_event_standings" in c[0] for c in db.cursor.calls)
+    assert _find(db.cursor, "INSERT INTO uncollected_raids")[2] == [1, 1]
+
+
+def test_backfill_logs_without_tallies():
+    db = _FakeDB()
+    graid_log.record_raids(db, [_raid(UUID_A, UUID_B, event_id=3), _raid(UUID_C, event_id=None)], tally=False)
+
+    assert not any("FROM graid_events" in c[0] for c in db.cursor.calls)
+    assert _find(db.cursor, "INSERT INTO graid_logs")[1] == [3, None]
+    assert not any("uncollected_raids" in c[0] or "graid_event_totals" in c[0] for c in db.cursor.calls)
+    # Standings follow the logs even when nothing is tallied.
+    assert _find(db.cursor, "INSERT INTO graid_event_standings")[0] == [100, 101]
+    assert _find(db.cursor, "UPDATE graid_event_standings")[0] == [3]
+
+
+def test_manual_log_counts_for_event_only():
+    db = _FakeDB()
+    graid_log.record_raids(db, [{"raid_type": "The Canyon Colossus", "participants": [
+        {"uuid": UUID_A, "ign": "alpha"}, {"uuid": None, "ign": "ghost"},
+    ]}], uncollected=False)
+
+    assert not any("uncollected_raids" in c[0] for c in db.cursor.calls)
+    assert _find(db.cursor, "INSERT INTO graid_event_totals")[1] == [UUID_A]
+    assert _find(db.cursor, "INSERT INTO graid_event_standings")[0] == [100]
+    assert _find(db.cursor, "UPDATE graid_event_standings")[0] == [7]
+
+
+def test_empty_batch_is_a_noop():
+    db = _FakeDB()
+    assert graid_log.record_raids(db, [_raid(), {"raid_type": None, "participants": []}]) == []
+    assert db.cursor.calls == []
+
+
+def test_queue_drain_is_one_transaction(monkeypatch):
+    db = _FakeDB()
+    monkeypatch.setattr(umd, "_db_connect_with_retry", lambda *a, **k: db)
+    umd._graid_log_queue_sync([
+        (1, [{"uuid": UUID_A, "ign": "alpha"}, {"uuid": UUID_B, "ign": "bravo"}], "The Canyon Colossus"),
+        (2, [{"uuid": None, "ign": "ghost"}, {"uuid": UUID_C, "ign": "charlie"}], None),
+    ])
+
+    assert db.commits == 1 and db.closed
+    assert _find(db.cursor, "UPDATE graid_log_queue")[0] == [1, 2]
+    assert len(_find(db.cursor, "INSERT INTO graid_logs")[0]) == 2
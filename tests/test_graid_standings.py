@@ -0,0 +1,164 @@
+"""
+Test suite for the live GRAID event standings (Commands/graidevent.py).
+
+Tests:
+1. build_reward_rows still ranks, thresholds and pays out as before
+2. Leaderboard reads come from graid_event_standings, never the full join
+3. An event without standings is rebuilt from the logs once, then committed
+4. The checker reports missing rows and field drift against the recompute
+5. Name tiebreaks use lower() code-point order, as RANK_STANDINGS does
+"""
+
+import datetime
+import os
+import sys
+from datetime import timezone
+from decimal import Decimal
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Commands import graidevent
+
+T0 = datetime.datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+UUID_A = "11111111-1111-1111-1111-111111111111"
+UUID_B = "22222222-2222-2222-2222-222222222222"
+TCC = "The Canyon Colossus"
+NOTG = "Nest of the Grootslangs"
+
+EVENT = {
+    "id": 5,
+    "title": "Summer",
+    "min_points": 3,
+    "le_per_point": 2,
+    "raid_points": {TCC: 2.0, NOTG: 1.5},
+    "milestones": [(4, 10)],
+    "placement_bonuses": {1: 5},
+}
+
+
+def _contrib(log_id, minutes, raid, uuid, name):
+    return {
+        "log_id": log_id,
+        "completed_at": T0 + datetime.timedelta(minutes=minutes),
+        "raid_type": raid,
+        "uuid": uuid,
+        "display_name": name,
+        "discord_id": None,
+    }
+
+
+CONTRIBUTIONS = [
+    _contrib(1, 0, TCC, UUID_A, "alpha"),
+    _contrib(1, 0, TCC, UUID_B, "bravo"),
+    _contrib(2, 5, NOTG, UUID_A, "alpha"),
+    _contrib(3, 9, "Unknown", UUID_B, "bravo"),
+]
+
+
+class _Conn:
+    def __init__(self):
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
+class _FakeCursor:
+    """Routes each statement to canned rows; records what ran."""
+
+    def __init__(self, standings=(), contributions=()):
+        self.calls = []
+        self.standings = [list(r) for r in standings]
+        self.contributions = list(contributions)
+        self.connection = _Conn()
+        self._result = []
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        self.calls.append(sql)
+        if sql.startswith("SELECT s.uuid::text"):
+            self._result = [tuple(r) for r in self.standings]
+        elif "FROM graid_logs gl" in sql:
+            self._result = [
+                (c["log_id"], c["completed_at"], c["raid_type"], c["uuid"], c["display_name"], None)
+                for c in self.contributions
+            ]
+        elif sql.startswith("DELETE FROM graid_event_standings"):
+            self.standings = []
+            self._result = []
+        elif sql.startswith("INSERT INTO graid_event_standings"):
+            _, uuids, points, reached, names, placements = params
+            self.standings = [
+                [u, Decimal(str(p)), r, pl, n, None, None]
+                for u, p, r, n, pl in zip(uuids, points, reached, names, placements)
+            ]
+            self._result = []
+        else:
+            self._result = []
+
+    def fetchall(self):
+        return list(self._result)
+
+
+def _standing(uuid, points, minutes, placement, name):
+    return (uuid, Decimal(points), T0 + datetime.timedelta(minutes=minutes), placement, name, None, "Chief")
+
+
+def test_build_reward_rows_ranking_and_payout():
+    rows = graidevent.build_reward_rows(
+        CONTRIBUTIONS, EVENT["raid_points"], EVENT["milestones"], EVENT["placement_bonuses"],
+        EVENT["min_points"], EVENT["le_per_point"],
+    )
+    assert [r["uuid"] for r in rows] == [UUID_A]
+    (a,) = rows
+    assert a["ranking_points"] == 3.5 and a["placement"] == 1
+    assert a["reward_points"] == 3.5 + 5 and a["total_le"] == 17
+
+
+def test_reads_use_standings_not_the_join():
+    cur = _FakeCursor(standings=[
+        _standing(UUID_A, "3.50", 5, 1, "alpha"),
+        _standing(UUID_B, "2.00", 0, 2, "bravo"),
+    ])
+    rows = graidevent._load_reward_rows(cur, EVENT, include_below_threshold=True)
+
+    assert not any("FROM graid_logs" in sql for sql in cur.calls)
+    assert [(r["placement"], r["ranking_points"], r["rank"]) for r in rows] == [(1, 3.5, "Chief"), (2, 2.0, "Chief")]
+    assert rows[0]["placement_bonus_points"] == 5 and rows[1]["placement_bonus_points"] == 0
+
+    qualifying = graidevent._load_reward_rows(cur, EVENT)
+    assert [r["uuid"] for r in qualifying] == [UUID_A]
+
+
+def test_missing_standings_are_rebuilt_once():
+    cur = _FakeCursor(contributions=CONTRIBUTIONS)
+    rows = graidevent._load_reward_rows(cur, EVENT, include_below_threshold=True)
+
+    assert cur.connection.commits == 1
+    assert [(r["uuid"], r["placement"], r["ranking_points"]) for r in rows] == [(UUID_A, 1, 3.5), (UUID_B, 2, 2.0)]
+    assert rows[0]["reached_at"] == T0 + datetime.timedelta(minutes=5)
+
+    cur.calls.clear()
+    graidevent._load_reward_rows(cur, EVENT)
+    assert not any("FROM graid_logs" in sql for sql in cur.calls)
+
+
+def test_checker_reports_drift():
+    cur = _FakeCursor(contributions=CONTRIBUTIONS, standings=[_standing(UUID_A, "2.00", 0, 1, "alpha")])
+    problems = graidevent.check_standings(cur, EVENT)
+
+    assert any(p.startswith("alpha: ranking_points") for p in problems)
+    assert any(p.startswith("alpha: reached_at") for p in problems)
+    assert any(p.startswith("bravo: missing") for p in problems)
+
+    graidevent.rebuild_standings(cur, EVENT)
+    assert graidevent.check_standings(cur, EVENT) == []
+
+
+def test_name_tiebreak_matches_sql_lower():
+    # casefold() would put "Straße" (strasse) first; lower() keeps "ß" and
+    # sorts it after "s", as lower(display_name) COLLATE "C" does.
+    contributions = [_contrib(1, 0, TCC, UUID_A, "Straße"), _contrib(1, 0, TCC, UUID_B, "strasst")]
+    rows = graidevent.build_reward_rows(contributions, EVENT["raid_points"], [], {}, 0, 1)
+    assert [r["display_name"] for r in rows] == ["strasst", "Straße"]
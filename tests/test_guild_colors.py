@@ -0,0 +1,98 @@
+"""
+Test suite for the shared guild-colour service (Helpers/guild_colors.py).
+
+Tests:
+1. Athena payload loads normalised prefixes and bumps the version
+2. Lookups are in-memory; unknown tags get the default and are queued once
+3. Background resolution fills queued tags and parks failures
+4. A fresh Athena list clears tags it now knows from the queue
+5. An unreachable Athena falls back to the stored list
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import MagicMock
+
+import aiohttp
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import guild_colors, http_client
+from Tasks import cache_guild_colors
+
+
+@pytest.fixture(autouse=True)
+def _clean(monkeypatch):
+    guild_colors._reset_for_tests()
+
+    def no_fetch(*args, **kwargs):
+        raise AssertionError("lookups must not do I/O")
+
+    monkeypatch.setattr(guild_colors, "timed_get", no_fetch)
+    yield
+    guild_colors._reset_for_tests()
+
+
+def test_athena_payload_loads_normalised():
+    kept = guild_colors.load_athena([
+        {"prefix": " taq ", "color": "#00ffcc"},
+        {"prefix": "NoCol", "color": ""},
+        {"name": "no prefix"},
+        "junk",
+    ])
+    assert kept == 1
+    assert guild_colors.get("TAq") == "#00ffcc"
+    assert guild_colors.version == 1
+
+    guild_colors.load_athena([{"prefix": "TAQ", "color": "#00ffcc"}])
+    assert guild_colors.version == 1   # unchanged list, no bump
+
+
+def test_unknown_tags_default_and_queue_once():
+    guild_colors.load_athena([{"prefix": "AAA", "color": "#111111"}])
+    colors = guild_colors.lookup(["aaa", "BBB", "bbb", "", None])
+    assert colors == {"AAA": "#111111", "BBB": guild_colors.DEFAULT_COLOR}
+    assert guild_colors.get("BBB", default="#000000") == "#000000"
+    assert guild_colors.next_batch() == ["BBB"]
+
+
+def test_resolution_fills_and_parks_failures():
+    guild_colors.lookup(["GOOD", "GONE"])
+    version = guild_colors.version
+    fake = {"GOOD": "#abcdef"}
+
+    for prefix in guild_colors.next_batch():
+        guild_colors.resolve_sync(prefix, fetch=fake.get)
+
+    assert guild_colors.get("GOOD") == "#abcdef"
+    assert guild_colors.version == version + 1
+    assert guild_colors.get("GONE") == guild_colors.DEFAULT_COLOR
+    assert guild_colors.next_batch() == []   # parked, not re-queued
+    assert guild_colors.stats()["failed"] == 1
+
+
+def test_athena_refresh_clears_queue():
+    guild_colors.lookup(["NEW"])
+    guild_colors.load_athena([{"prefix": "NEW", "color": "#222222"}])
+    assert guild_colors.next_batch() == []
+    assert guild_colors.get("new") == "#222222"
+
+
+@pytest.mark.parametrize("error", [aiohttp.ClientConnectionError("refused"), asyncio.TimeoutError()])
+def test_unreachable_athena_falls_back_to_db(monkeypatch, error):
+    loads = []
+
+    async def down(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(http_client, "get", down)
+    monkeypatch.setattr(guild_colors, "load_from_db_sync", lambda: loads.append(1))
+    monkeypatch.setattr(cache_guild_colors, "log", lambda *a, **k: None)
+    cog = cache_guild_colors.CacheGuildColors.__new__(cache_guild_colors.CacheGuildColors)
+    cog.client = MagicMock()
+
+    asyncio.run(cache_guild_colors.CacheGuildColors.cache_guild_colors.coro(cog))
+    assert loads == [1]
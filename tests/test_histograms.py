@@ -0,0 +1,119 @@
+"""
+Test suite for the in-process latency histograms (Helpers/histograms.py)
+and their once-a-minute summary (Tasks/latency_summary.py).
+
+Tests:
+1. Slot mapping: every value lands in a slot whose bounds contain it
+2. Percentiles stay within the log-linear error bound
+3. Window drain resets the window but not the since-start histogram
+4. Series cap bounds memory
+5. Telemetry feeds histograms: bucket spans and command totals
+6. Summary record shape; quiet windows emit nothing
+"""
+
+import json
+import os
+import random
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import histograms, telemetry
+from Tasks import latency_summary
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    histograms.reset()
+    token = telemetry._current.set(None)
+    yield
+    telemetry._current.reset(token)
+    histograms.reset()
+
+
+def test_every_value_lands_in_a_containing_slot():
+    values = list(range(0, 4096)) + [random.randrange(histograms._MAX_US) for _ in range(2000)]
+    for us in values:
+        idx = histograms._index(us)
+        assert 0 <= idx < histograms._SLOTS
+        assert histograms._upper_us(idx) >= us
+        assert idx == 0 or histograms._upper_us(idx - 1) < us
+
+
+def test_percentiles_within_error_bound():
+    h = histograms.Histogram()
+    values = [float(v) for v in range(1, 1001)]  # 1..1000 ms
+    random.shuffle(values)
+    for v in values:
+        h.record(v)
+
+    assert h.n == 1000
+    assert h.percentile(0.50) == pytest.approx(500.0, rel=0.07)
+    assert h.percentile(0.90) == pytest.approx(900.0, rel=0.07)
+    assert h.percentile(0.99) == pytest.approx(990.0, rel=0.07)
+    assert h.percentile(1.0) == 1000.0
+    s = h.summary()
+    assert s["max"] == 1000.0
+    assert s["mean"] == pytest.approx(500.5)
+
+
+def test_percentile_of_single_value_is_capped_at_max():
+    h = histograms.Histogram()
+    h.record(123.4)
+    assert h.percentile(0.5) == 123.4
+
+
+def test_drain_resets_window_only():
+    histograms.record("db.query", 10.0)
+    histograms.record("db.query", 20.0)
+
+    window_s, series = histograms.drain_window()
+    assert series["db.query"]["n"] == 2
+    assert histograms.drain_window()[1] == {}
+    assert histograms.snapshot(lifetime=True)["db.query"]["n"] == 2
+
+
+def test_series_cap(monkeypatch):
+    monkeypatch.setattr(histograms, "MAX_SERIES", 2)
+    for host in ("a", "b", "c"):
+        histograms.record(f"http.{host}", 1.0)
+    assert set(histograms.snapshot()) == {"http.a", "http.b"}
+    assert histograms.dropped_series() == 1
+
+
+def test_telemetry_feeds_histograms(monkeypatch, capsys):
+    monkeypatch.setenv("LATENCY_TELEMETRY", "1")
+    telemetry.begin("profile")
+    with telemetry.track("s3.get"):
+        pass
+    with telemetry.track("s3.get"):
+        pass
+    telemetry.finish(ok=True)
+
+    snap = histograms.snapshot()
+    assert snap["s3.get"]["n"] == 2
+    assert snap["command.profile"]["n"] == 1
+
+
+def test_summary_record_shape(monkeypatch, capsys):
+    monkeypatch.setenv("LATENCY_TELEMETRY", "1")
+    histograms.record("command.map", 1500.0)
+    histograms.record("render", 40.0)
+
+    cog = latency_summary.LatencySummary.__new__(latency_summary.LatencySummary)
+    cog._emit_summary()
+
+    payload = json.loads(capsys.readouterr().out.strip())
+    assert payload["type"] == "latency_summary"
+    assert set(payload["series"]) == {"command.map", "render"}
+    assert set(payload["series"]["render"]) == {"n", "p50", "p90", "p99", "max", "mean"}
+
+
+def test_quiet_window_emits_nothing(monkeypatch, capsys):
+    monkeypatch.setenv("LATENCY_TELEMETRY", "1")
+    cog = latency_summary.LatencySummary.__new__(latency_summary.LatencySummary)
+    cog._emit_summary()
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,156 @@
+"""
+Test suite for the shared async HTTP client (Helpers/http_client.py).
+
+Tests:
+1. Response accessors mirror the requests API callers relied on
+2. Calls on one loop reuse one session; a new loop gets a fresh one
+3. Concurrency to a host is capped at its configured limit
+4. Requests are timed into the http.<host> telemetry bucket
+5. The player helpers return False on error statuses
+6. close() closes the shared session; the next request opens a new one
+"""
+
+import asyncio
+import os
+import socket
+import sys
+
+import pytest
+from aiohttp import web
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import http_client, telemetry
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _Server:
+    """Local aiohttp app that tracks how many requests are in flight at once."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.hits = 0
+        self.port = _free_port()
+        self.runner = None
+
+    async def _handle(self, request):
+        self.hits += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if request.path == "/missing":
+            return web.json_response({"error": "nope"}, status=404)
+        return web.json_response({"path": request.path, "q": request.query.get("q")})
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", self._handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "127.0.0.1", self.port).start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await http_client.close()
+        await self.runner.cleanup()
+
+    def url(self, path="/"):
+        return f"http://127.0.0.1:{self.port}{path}"
+
+
+def test_response_accessors():
+    async def main():
+        async with _Server() as srv:
+            ok = await http_client.get(srv.url("/a"), params={"q": "x"})
+            missing = await http_client.get(srv.url("/missing"))
+            return ok, missing
+
+    ok, missing = asyncio.run(main())
+    assert ok.status == ok.status_code == 200 and ok.ok
+    assert ok.json() == {"path": "/a", "q": "x"}
+    assert '"path"' in ok.text
+    ok.raise_for_status()
+
+    assert not missing.ok
+    with pytest.raises(http_client.HTTPStatusError) as err:
+        missing.raise_for_status()
+    assert err.value.response is missing
+    assert isinstance(err.value, http_client.RequestError)
+
+
+def test_session_reused_per_loop():
+    async def main():
+        async with _Server() as srv:
+            await http_client.get(srv.url())
+            first = http_client._state["session"]
+            await http_client.get(srv.url())
+            return first, http_client._state["session"]
+
+    first, second = asyncio.run(main())
+    assert first is second
+
+    async def again():
+        async with _Server() as srv:
+            await http_client.get(srv.url())
+            return http_client._state["session"]
+
+    assert asyncio.run(again()) is not first
+
+
+def test_per_host_limit(monkeypatch):
+    monkeypatch.setattr(http_client, "DEFAULT_HOST_LIMIT", 2)
+
+    async def main():
+        async with _Server(delay=0.05) as srv:
+            await asyncio.gather(*(http_client.get(srv.url(f"/{i}")) for i in range(6)))
+            return srv
+
+    srv = asyncio.run(main())
+    assert srv.hits == 6
+    assert srv.peak == 2
+
+
+def test_requests_are_timed_into_host_bucket():
+    async def main():
+        sample = telemetry.begin("test")
+        async with _Server() as srv:
+            await http_client.get(srv.url())
+            await http_client.get(srv.url("/missing"))
+        return sample
+
+    sample = asyncio.run(main())
+    assert sample.buckets["http.127.0.0.1"]["n"] == 2
+
+
+def test_player_helpers_return_false_on_error(monkeypatch):
+    async def fail(url, **kwargs):
+        return http_client.Response(url, 503, {}, b"")
+
+    monkeypatch.setattr(http_client, "get", fail)
+    assert asyncio.run(http_client.get_player_data("some-uuid")) is False
+    assert asyncio.run(http_client.get_player_uuid("someone")) is False
+
+
+def test_close_closes_the_session():
+    async def main():
+        async with _Server() as srv:
+            await http_client.get(srv.url())
+            first = http_client._state["session"]
+            await http_client.close()
+            assert first.closed and http_client._state["session"] is None
+            await http_client.get(srv.url())
+            return first, http_client._state["session"]
+
+    first, second = asyncio.run(main())
+    assert second is not first and second.closed
@@ -0,0 +1,145 @@
+"""
+Test suite for the Discord log sink (Helpers/logger.py).
+
+Tests:
+1. Repeats inside the window fold into one queued line with a ×N suffix
+2. Repeats after a flush surface as a summary when the window closes
+3. Lines differing only by numbers/UUIDs aggregate together
+4. Per-context rate limit drops excess INFO but never ERROR
+5. Overflow evicts the lowest-priority line, so errors survive
+6. Dropped lines are counted and reported on the next flush
+7. Batches stay under the Discord message limit
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import logger
+from Helpers.logger import ERROR, INFO, WARN
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _fresh_sink(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(logger.time, "monotonic", clock)
+    monkeypatch.setattr(logger, "_queue", logger.deque())
+    monkeypatch.setattr(logger, "_recent", {})
+    monkeypatch.setattr(logger, "_buckets", {})
+    monkeypatch.setattr(logger, "_dropped", {"overflow": 0, "rate_limited": 0})
+    monkeypatch.setattr(logger, "_dropped_unreported", 0)
+    monkeypatch.setattr(logger, "_aggregated", 0)
+    yield clock
+
+
+def _lines():
+    return "\n".join(logger._drain()).splitlines()
+
+
+def test_repeats_fold_into_one_queued_line(capsys):
+    for _ in range(5):
+        logger.log(INFO, "API timeout", context="update_member_data")
+
+    lines = _lines()
+    assert len(lines) == 1
+    assert lines[0].endswith("API timeout (×5)")
+    # The console still sees every line.
+    assert capsys.readouterr().out.count("API timeout") == 5
+
+
+def test_repeats_after_flush_summarised_when_window_closes(_fresh_sink):
+    logger.log(INFO, "API timeout", context="t")
+    assert len(_lines()) == 1
+
+    for _ in range(37):
+        logger.log(INFO, "API timeout", context="t")
+    assert _lines() == []
+
+    _fresh_sink.now += logger.AGGREGATE_WINDOW_S
+    lines = _lines()
+    assert len(lines) == 1
+    assert "API timeout (×37 in the last 5 min)" in lines[0]
+
+
+def test_numbers_and_uuids_share_a_key():
+    logger.log(INFO, "SKIP contrib validation for 0b4d2bd2-0a1c-4a4f-9a7e-6c8f3a1d2e4b: no fresh data", context="u")
+    logger.log(INFO, "SKIP contrib validation for 9c0e5f11-2b3d-4c5e-8f7a-1b2c3d4e5f6a: no fresh data", context="u")
+    logger.log(INFO, "Synced 12 members", context="u")
+    logger.log(INFO, "Synced 13 members", context="u")
+
+    lines = _lines()
+    assert len(lines) == 2
+    assert lines[0].endswith("(×2)")
+    assert lines[1].endswith("Synced 12 members (×2)")
+
+
+def test_rate_limit_drops_info_but_not_errors():
+    for i in range(logger.CONTEXT_RATE_PER_MIN + 10):
+        logger.log(INFO, f"line {chr(65 + i % 26)}{chr(65 + i // 26)}", context="noisy")
+    for i in range(5):
+        logger.log(ERROR, f"fail {chr(65 + i)}", context="noisy")
+
+    stats = logger.stats()
+    assert stats["dropped_rate_limited"] == 10
+    assert stats["queued"] == logger.CONTEXT_RATE_PER_MIN + 5
+
+
+def test_rate_limit_refills(_fresh_sink):
+    for i in range(logger.CONTEXT_RATE_PER_MIN):
+        logger.log(INFO, f"line {chr(65 + i % 26)}{chr(65 + i // 26)}", context="c")
+    logger.log(INFO, "one more", context="c")
+    assert logger.stats()["dropped_rate_limited"] == 1
+
+    _fresh_sink.now += 2.0
+    logger.log(INFO, "after refill", context="c")
+    assert logger.stats()["dropped_rate_limited"] == 1
+
+
+def test_overflow_evicts_lowest_priority(monkeypatch):
+    monkeypatch.setattr(logger, "MAX_QUEUED", 3)
+    logger.log(ERROR, "e one")
+    logger.log(INFO, "i one", context="a")
+    logger.log(WARN, "w one", context="b")
+    logger.log(ERROR, "e two")
+
+    levels = [e.level for e in logger._queue]
+    assert levels == [ERROR, WARN, ERROR]
+    assert logger.stats()["dropped_overflow"] == 1
+
+    # A new INFO line can't displace anything more important: it is dropped.
+    logger.log(INFO, "i two", context="c")
+    assert [e.level for e in logger._queue] == [ERROR, WARN, ERROR]
+    assert logger.stats()["dropped_overflow"] == 2
+
+
+def test_drops_reported_once_on_next_flush(monkeypatch):
+    monkeypatch.setattr(logger, "MAX_QUEUED", 1)
+    logger.log(INFO, "older", context="a")
+    logger.log(INFO, "newer", context="b")
+
+    lines = _lines()
+    assert "1 log line(s) dropped" in lines[0]
+    assert lines[1].endswith("newer")
+    assert _lines() == []
+
+
+def test_batches_respect_message_limit():
+    for i in range(60):
+        logger.log(ERROR, f"{chr(65 + i % 26)}{chr(65 + i // 26)} " + "x" * 100)
+
+    batches = logger._drain()
+    assert len(batches) > 1
+    assert all(len(b) <= logger.MAX_MESSAGE_CHARS for b in batches)
+    assert sum(len(b.splitlines()) for b in batches) == 60
@@ -0,0 +1,119 @@
+"""
+Test suite for the layered /map renderer (Commands/map.py).
+
+Tests:
+1. Unchanged ownership serves the cached PNG without re-rendering
+2. An ownership change renders a new version and drops the old PNGs
+3. Guild filter zooms to that guild and is cached separately
+4. Unknown guild returns the error embed
+5. The tracker's fresh snapshot is used instead of an API call
+"""
+
+import os
+import sys
+import time
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Commands import map as map_cmd
+from Helpers import guild_colors
+from Tasks import territory_tracker
+
+
+def _terr(prefix, start, end):
+    return {"guild": {"name": prefix, "prefix": prefix}, "location": {"start": start, "end": end}}
+
+
+def _snapshot(owner_b="BBB"):
+    return {
+        "Alpha": _terr("AAA", [-2400, -6500], [-2300, -6400]),
+        "Beta": _terr(owner_b, [-1000, -5000], [-900, -4900]),
+    }
+
+
+@pytest.fixture(autouse=True)
+def _clean(monkeypatch):
+    # Small synthetic base so tests don't need the 4262x6644 source map.
+    monkeypatch.setattr(map_cmd, "_base_layers", {map_cmd.SCALE: Image.new("RGBA", (1200, 1200), (40, 90, 40, 255))})
+    monkeypatch.setattr(map_cmd, "_overlay", {"key": None, "img": None})
+    monkeypatch.setattr(map_cmd, "_pngs", map_cmd.OrderedDict())
+    monkeypatch.setattr(map_cmd, "_fetched", {"territories": (0.0, {})})
+    guild_colors._reset_for_tests()
+    guild_colors.load_athena([{"prefix": "AAA", "color": "#FF0000"}, {"prefix": "BBB", "color": "#0000FF"}])
+    monkeypatch.setattr(territory_tracker, "latest_snapshot", {"data": _snapshot(), "at": time.time()})
+
+    def no_fetch(*args, **kwargs):
+        raise AssertionError("unexpected fetch")
+
+    monkeypatch.setattr(map_cmd, "timed_get", no_fetch)
+
+
+def _count_renders(monkeypatch):
+    calls = []
+    real = map_cmd._render_png
+
+    def counting(*args):
+        calls.append(args[3])
+        return real(*args)
+
+    monkeypatch.setattr(map_cmd, "_render_png", counting)
+    return calls
+
+
+def _image(file):
+    return Image.open(BytesIO(file.fp.read()))
+
+
+def test_unchanged_ownership_is_a_lookup(monkeypatch):
+    calls = _count_renders(monkeypatch)
+    first, err = map_cmd.mapCreator()
+    second, _ = map_cmd.mapCreator()
+
+    assert err is None
+    assert calls == [None]
+    assert first.fp.read() == second.fp.read()
+
+
+def test_ownership_change_renders_new_version(monkeypatch):
+    calls = _count_renders(monkeypatch)
+    map_cmd.mapCreator()
+    territory_tracker.latest_snapshot["data"] = _snapshot(owner_b="AAA")
+    map_cmd.mapCreator()
+
+    assert calls == [None, None]
+    assert len(map_cmd._pngs) == 1
+
+
+def test_guild_filter_zooms_and_caches_separately(monkeypatch):
+    calls = _count_renders(monkeypatch)
+    full, _ = map_cmd.mapCreator()
+    zoomed, _ = map_cmd.mapCreator(" aaa ")
+    map_cmd.mapCreator("AAA")
+
+    assert calls == [None, "AAA"]
+    assert _image(zoomed).size < _image(full).size
+
+
+def test_unknown_guild_returns_embed():
+    file, embed = map_cmd.mapCreator("ZZZ")
+    assert file is None
+    assert "ZZZ" in embed.title
+
+
+def test_stale_snapshot_falls_back_to_fetch(monkeypatch):
+    territory_tracker.latest_snapshot["at"] = time.time() - map_cmd.SNAPSHOT_MAX_AGE_S - 1
+
+    class _Resp:
+        def json(self):
+            return _snapshot()
+
+    fetched = []
+    monkeypatch.setattr(map_cmd, "timed_get", lambda url, **kw: fetched.append(url) or _Resp())
+    map_cmd.mapCreator()
+    map_cmd.mapCreator()
+    assert len(fetched) == 1
@@ -0,0 +1,121 @@
+"""
+Test suite for the OpenMetrics endpoint (Helpers/metrics.py).
+
+Tests:
+1. Rendering: TYPE/HELP headers, label escaping, counter suffix, # EOF
+2. Collection covers pools, caches, loop lag, rate limits, tasks and logger
+3. A failing collector drops only its own families
+4. The server is off without METRICS_PORT and serves /metrics with it
+"""
+
+import asyncio
+import os
+import socket
+import sys
+from unittest.mock import patch
+
+import aiohttp
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import metrics, telemetry, wynn_budget
+from Helpers.database import DB
+from Tasks import loop_lag
+
+
+def test_render_format():
+    fam = metrics.Family("things", "counter", "Things seen")
+    fam.add(3, "_total", kind='a"b')
+    gauge = metrics.Family("level", "gauge", "A level")
+    gauge.add(1.5)
+    empty = metrics.Family("nothing", "gauge", "Never sampled")
+
+    text = metrics.render([fam, gauge, empty])
+    assert text.splitlines() == [
+        "# TYPE tort_things counter",
+        "# HELP tort_things Things seen",
+        'tort_things_total{kind="a\\"b"} 3',
+        "# TYPE tort_level gauge",
+        "# HELP tort_level A level",
+        "tort_level 1.5",
+        "# EOF",
+    ]
+
+
+class _FakePool:
+    def __init__(self, used, idle):
+        self._used = {i: object() for i in range(used)}
+        self._pool = [object()] * idle
+
+
+def test_collect_covers_every_source(monkeypatch):
+    monkeypatch.setattr(DB, "_pools", {("false", 1, 10, ()): _FakePool(3, 2)})
+    monkeypatch.setattr(DB, "_pool_waits", 4)
+    monkeypatch.setitem(loop_lag.latest_summary, "p95_ms", 12.5)
+    monkeypatch.setattr(telemetry, "_task_status", {
+        "territory_tracker": {"runs": 5, "failures": 1, "last_end": 1700000000.0, "last_ms": 250.0},
+    })
+    monkeypatch.setenv("WYNN_LOOP_TOKEN", "loop-secret")
+    monkeypatch.setattr(wynn_budget, "_budgets", {})
+    wynn_budget.for_token("WYNN_LOOP_TOKEN").observe({"ratelimit-limit": "180", "ratelimit-remaining": "42"})
+
+    text = metrics.render(metrics.collect(None))
+
+    assert 'tort_db_pool_connections{pool="prod:1-10",state="in_use"} 3' in text
+    assert 'tort_db_pool_connections{pool="prod:1-10",state="idle"} 2' in text
+    assert "tort_db_pool_waits_total 4" in text
+    assert 'tort_cache_entries{cache="backgrounds"}' in text
+    assert 'tort_loop_lag_ms{quantile="0.95"} 12.5' in text
+    assert 'tort_wynn_rate_budget_remaining{token="WYNN_LOOP_TOKEN"} 42' in text
+    assert 'tort_task_runs_total{task="territory_tracker"} 5' in text
+    assert 'tort_task_last_duration_seconds{task="territory_tracker"} 0.25' in text
+    assert 'tort_log_dropped_lines_total{reason="overflow"}' in text
+    assert 'tort_command_rate_limiter_keys{kind="user",limiter="5u-30g-60s"}' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_failing_collector_is_isolated(monkeypatch):
+    def boom():
+        raise RuntimeError("broken")
+
+    monkeypatch.setattr(metrics, "_db_pools", boom)
+    with patch.object(metrics, "log") as mock_log:
+        text = metrics.render(metrics.collect(None))
+    assert "tort_db_pool" not in text
+    assert "tort_cache_entries" in text
+    assert "db_pools" in str(mock_log.call_args)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_server_disabled_without_port(monkeypatch):
+    monkeypatch.delenv("METRICS_PORT", raising=False)
+    asyncio.run(metrics.start(None))
+    assert metrics._runner is None
+
+
+def test_server_serves_openmetrics(monkeypatch):
+    port = _free_port()
+    monkeypatch.setenv("METRICS_PORT", str(port))
+    monkeypatch.setenv("METRICS_HOST", "127.0.0.1")
+
+    async def main():
+        with patch.object(metrics, "log"):
+            await metrics.start(None)
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{port}/metrics") as resp:
+                    return resp.status, resp.headers["Content-Type"], await resp.text()
+        finally:
+            await metrics.stop()
+
+    status, ctype, body = asyncio.run(main())
+    assert status == 200
+    assert ctype.startswith("application/openmetrics-text")
+    assert "tort_process_start_time_seconds" in body
+    assert body.endswith("# EOF\n")
@@ -0,0 +1,193 @@
+"""
+Test suite for the OpenAI result cache (Helpers/openai_helper.py).
+
+Runs against a local fake of the Responses endpoint, so no key or network is
+needed.
+
+Tests:
+1. A repeated classification is answered from memory, then from the table
+   after a restart, without another completion
+2. Whitespace-only differences share a key; prompt, model or input changes don't
+3. Concurrent identical calls make one request between them
+4. Errors are not cached; cache=False always goes to the model
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import OpenAI
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import openai_helper
+
+
+class _FakeCompletions:
+    """Minimal /v1/responses server: answers from ``replies`` keyed on the input."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = []
+        self.replies = {}
+        self.fail = False
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                fake.requests.append(body)
+                time.sleep(fake.delay)
+                if fake.fail:
+                    self._send(500, {"error": {"message": "boom", "type": "server_error"}})
+                    return
+                text = json.dumps(fake.replies.get(body["input"], {}))
+                self._send(200, {
+                    "id": f"resp_{len(fake.requests)}",
+                    "object": "response",
+                    "created_at": 0,
+                    "model": body["model"],
+                    "status": "completed",
+                    "output": [{
+                        "type": "message",
+                        "id": "msg_1",
+                        "role": "assistant",
+                        "status": "completed",
+                        "content": [{"type": "output_text", "text": text, "annotations": []}],
+                    }],
+                    "parallel_tool_calls": False,
+                    "tool_choice": "auto",
+                    "tools": [],
+                })
+
+            def _send(self, status, payload):
+                raw = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+
+class _FakeCursor:
+    def __init__(self, table):
+        self.table = table
+        self._one = None
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        self._one = None
+        if sql.startswith("UPDATE openai_result_cache"):
+            row = self.table.get(params[0])
+            if row is not None:
+                row["hits"] += 1
+                self._one = (row["content"], row["data"])
+        elif sql.startswith("INSERT INTO openai_result_cache"):
+            key, model, content, data = params
+            self.table[key] = {"model": model, "content": content, "data": json.loads(data), "hits": 0}
+
+    def fetchone(self):
+        return self._one
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    server = _FakeCompletions()
+    server.thread.start()
+    table = {}
+
+    class _FakeDB:
+        def __init__(self):
+            self.cursor = None
+            self.connection = self
+
+        def connect(self):
+            self.cursor = _FakeCursor(table)
+
+        def commit(self):
+            pass
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(openai_helper, "DB", _FakeDB)
+    monkeypatch.setattr(openai_helper, "_client", OpenAI(api_key="test", base_url=server.base_url, max_retries=0))
+    monkeypatch.setattr(openai_helper, "log", lambda *a, **k: None)
+    openai_helper.clear_memory_cache()
+    server.table = table
+    yield server
+    openai_helper.clear_memory_cache()
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def test_repeat_call_is_served_from_cache(fake):
+    fake.replies["Recruiter from application: bob\n\nGuild member names:\nBob\nAlice"] = {
+        "matched_name": "Bob", "confidence": 0.95,
+    }
+    first = openai_helper.match_recruiter_name("bob", ["Bob", "Alice"])
+    second = openai_helper.match_recruiter_name("bob", ["Bob", "Alice"])
+
+    assert first == second == {"matched_name": "Bob", "confidence": 0.95, "error": None}
+    assert len(fake.requests) == 1
+
+    # A restart drops the in-process layer; the table still answers.
+    openai_helper.clear_memory_cache()
+    assert openai_helper.match_recruiter_name("bob", ["Bob", "Alice"])["matched_name"] == "Bob"
+    assert len(fake.requests) == 1
+    assert next(iter(fake.table.values()))["hits"] == 1
+
+
+def test_key_covers_model_prompt_and_normalised_input():
+    key = openai_helper.cache_key("prompt", "IGN:  Bob\n", "gpt-5-nano")
+    assert key == openai_helper.cache_key("prompt", "IGN: Bob", "gpt-5-nano")
+    assert key != openai_helper.cache_key("prompt", "IGN: bob", "gpt-5-nano")
+    assert key != openai_helper.cache_key("prompt v2", "IGN: Bob", "gpt-5-nano")
+    assert key != openai_helper.cache_key("prompt", "IGN: Bob", "gpt-5-mini")
+    assert key != openai_helper.cache_key("prompt", "IGN: Bob", "gpt-5-nano", openai_helper.IGNExtraction)
+
+
+def test_concurrent_identical_calls_share_one_request(fake):
+    fake.delay = 0.2
+    fake.replies["IGN: Bob"] = {"ign": "Bob", "confidence": 0.9}
+    results = []
+
+    def worker():
+        results.append(openai_helper.extract_ign("IGN: Bob"))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(fake.requests) == 1
+    assert results == [{"ign": "Bob", "confidence": 0.9, "error": None}] * 5
+
+
+def test_errors_are_not_cached_and_cache_can_be_bypassed(fake):
+    fake.fail = True
+    assert openai_helper.extract_ign("IGN: Bob")["error"]
+    fake.fail = False
+    fake.replies["IGN: Bob"] = {"ign": "Bob", "confidence": 0.9}
+    assert openai_helper.extract_ign("IGN: Bob")["ign"] == "Bob"
+    assert len(fake.requests) == 2
+
+    openai_helper.query(openai_helper._IGN_INSTRUCTIONS, "IGN: Bob", json_schema=openai_helper.IGNExtraction,
+                        max_tokens=100, cache=False)
+    assert len(fake.requests) == 3
@@ -0,0 +1,124 @@
+"""
+Test suite for on-demand page rendering (Helpers/pagination.py LazyPaginator).
+
+Tests:
+1. Nothing renders up front; respond renders the first page off the event loop
+2. Navigating renders the target page once; revisits are memoized
+3. Neighbours of the shown page are prefetched in the background
+4. A failed prefetch is logged and retried on navigation
+5. A click on an unrendered page is acknowledged before the render
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from discord.ext import pages
+
+from Helpers.classes import Page
+from Helpers.pagination import LazyPaginator
+
+
+def _renderer(fail=(), threads=None):
+    calls = []
+
+    def render(i):
+        calls.append(i)
+        if threads is not None:
+            threads.append(threading.get_ident())
+        if i in fail:
+            fail.remove(i)
+            raise RuntimeError("boom")
+        return Page(content=f"page {i}")
+
+    return render, calls
+
+
+async def _settle():
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+
+
+def test_first_page_rendered_off_loop_on_respond():
+    async def main():
+        threads = []
+        render, calls = _renderer(threads=threads)
+        p = LazyPaginator(15, render, prefetch=0)
+        assert calls == []
+        assert p.page_count == 14
+        with patch.object(pages.Paginator, "respond", new=AsyncMock()) as base_respond:
+            await p.respond("interaction")
+        assert calls == [0]
+        assert threads != [threading.get_ident()]
+        assert p.pages[0].content == "page 0"
+        base_respond.assert_awaited_once()
+
+    asyncio.run(main())
+
+
+def test_goto_renders_once_and_memoizes():
+    async def main():
+        render, calls = _renderer()
+        p = LazyPaginator(10, render, prefetch=0)
+        with patch.object(pages.Paginator, "goto_page", new=AsyncMock()) as base_goto:
+            await p.goto_page(6)
+            await p.goto_page(6)
+        assert calls == [6]
+        assert p.pages[6].content == "page 6"
+        assert base_goto.await_count == 2
+
+    asyncio.run(main())
+
+
+def test_neighbours_prefetched():
+    async def main():
+        render, calls = _renderer()
+        p = LazyPaginator(10, render)
+        with patch.object(pages.Paginator, "goto_page", new=AsyncMock()):
+            await p.goto_page(4)
+            await _settle()
+        assert sorted(calls) == [3, 4, 5]
+
+    asyncio.run(main())
+
+
+def test_failed_prefetch_retried_on_navigation():
+    async def main():
+        render, calls = _renderer(fail=[1])
+        p = LazyPaginator(3, render)
+        with patch("Helpers.pagination.log") as mock_log, \
+                patch.object(pages.Paginator, "goto_page", new=AsyncMock()):
+            p._prefetch_around(0)
+            await _settle()
+            assert mock_log.called
+            await p.goto_page(1)
+        assert p.pages[1].content == "page 1"
+
+    asyncio.run(main())
+
+
+def test_click_deferred_before_render():
+    async def main():
+        render, calls = _renderer()
+        p = LazyPaginator(5, render, prefetch=0)
+        interaction = MagicMock()
+        interaction.response.is_done.return_value = False
+        interaction.response.defer = AsyncMock(side_effect=lambda: calls.append("defer"))
+
+        with patch.object(pages.Paginator, "goto_page", new=AsyncMock()) as base_goto:
+            await p.goto_page(3, interaction=interaction)
+            await p.goto_page(3, interaction=interaction)
+
+        assert calls == ["defer", 3]
+        assert p.pages[3].content == "page 3"
+        # Cold: already acknowledged, so the base edits the stored message.
+        # Warm: the base handles the click itself.
+        assert base_goto.await_args_list[0].kwargs == {"interaction": None}
+        assert base_goto.await_args_list[1].kwargs == {"interaction": interaction}
+
+    asyncio.run(main())
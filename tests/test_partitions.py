@@ -0,0 +1,147 @@
+"""
+Test suite for monthly history partitions (Helpers/partitions.py) and the
+policies in Tasks/partition_maintenance.py.
+
+Tests:
+1. Month arithmetic crosses year boundaries
+2. A month only expires once all of it is past the cutoff
+3. Maintenance creates this month and the ones ahead, skipping existing ones
+4. Rows stranded in the default partition are moved into their new month
+5. Expired months are dropped, or detached where the policy says so
+6. player_activity never expires
+7. A table not yet partitioned keeps its retention by DELETE, unless it archives by detach
+"""
+
+import datetime
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import partitions
+from Helpers.partitions import PartitionPolicy, add_months, expired_months, months_between
+from Tasks.partition_maintenance import POLICIES
+
+D = datetime.date
+TODAY = D(2026, 10, 18)
+TICKS = PartitionPolicy("presence_ticks", "tick_at", timestamptz=True, retention_days=90)
+
+
+class FakeCursor:
+    """Answers the catalog queries partitions.py makes; records everything else."""
+
+    def __init__(self, partitioned=True, attached=(), stranded=False):
+        self.partitioned = partitioned
+        self.attached = list(attached)
+        self.stranded = stranded
+        self.ddl = []
+        self.rowcount = 0
+        self._row = None
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        if "pg_partitioned_table" in sql:
+            self._row = (self.partitioned,)
+        elif "to_regclass(%s) IS NOT NULL" in sql:
+            self._row = (True,)
+        elif "pg_inherits" in sql:
+            self._row = None
+        elif sql.startswith("SELECT EXISTS (SELECT 1 FROM"):
+            self._row = (self.stranded,)
+        else:
+            self.ddl.append(sql)
+            if sql.startswith("CREATE TABLE") and "DEFAULT" not in sql:
+                self.attached.append(sql.split()[2])
+            if "DETACH PARTITION" in sql or sql.startswith("DROP TABLE"):
+                name = sql.split()[-1]
+                if name in self.attached:
+                    self.attached.remove(name)
+            self.rowcount = 7
+
+    def fetchone(self):
+        return self._row
+
+    def fetchall(self):
+        return [(name,) for name in self.attached]
+
+
+class FakeDB:
+    def __init__(self, **kwargs):
+        self.cursor = FakeCursor(**kwargs)
+
+
+def test_month_arithmetic():
+    assert add_months(D(2026, 11, 1), 2) == D(2027, 1, 1)
+    assert add_months(D(2026, 1, 1), -1) == D(2025, 12, 1)
+    assert months_between(D(2026, 11, 20), D(2027, 1, 3)) == [D(2026, 11, 1), D(2026, 12, 1), D(2027, 1, 1)]
+
+
+def test_month_expires_only_when_wholly_past_cutoff():
+    months = [D(2026, 6, 1), D(2026, 7, 1), D(2026, 8, 1)]
+    assert expired_months(months, D(2026, 7, 31)) == [D(2026, 6, 1)]
+    assert expired_months(months, D(2026, 8, 1)) == [D(2026, 6, 1), D(2026, 7, 1)]
+    assert expired_months(months, None) == []
+
+
+def test_creates_current_and_upcoming_months():
+    db = FakeDB(attached=["presence_ticks_p202610", "presence_ticks_default"])
+    summary = partitions.maintain(db, TICKS, today=TODAY)
+
+    assert "created presence_ticks_p202611, presence_ticks_p202612" in summary
+    creates = [s for s in db.cursor.ddl if s.startswith("CREATE TABLE")]
+    assert len(creates) == 2
+    assert all("PARTITION OF presence_ticks FOR VALUES" in s for s in creates)
+
+
+def test_stranded_default_rows_move_into_their_month():
+    db = FakeDB(attached=["presence_ticks_p202610", "presence_ticks_p202611"], stranded=True)
+    partitions.maintain(db, TICKS, today=TODAY)
+
+    steps = [s.split(" WHERE")[0] for s in db.cursor.ddl[:5]]
+    assert steps == [
+        "ALTER TABLE presence_ticks DETACH PARTITION presence_ticks_default",
+        "CREATE TABLE presence_ticks_p202612 PARTITION OF presence_ticks FOR VALUES FROM (%s) TO (%s)",
+        "INSERT INTO presence_ticks_p202612 SELECT * FROM presence_ticks_default",
+        "DELETE FROM presence_ticks_default",
+        "ALTER TABLE presence_ticks ATTACH PARTITION presence_ticks_default DEFAULT",
+    ]
+
+
+def _current(table):
+    return [f"{table}_p{m:%Y%m}" for m in months_between(D(2026, 10, 1), D(2026, 12, 1))]
+
+
+def test_expired_months_are_dropped_or_detached():
+    by_table = {p.table: p for p in POLICIES}
+
+    ticks = FakeDB(attached=["presence_ticks_p202606", "presence_ticks_p202607", *_current("presence_ticks")])
+    summary = partitions.maintain(ticks, by_table["presence_ticks"], today=TODAY)
+    assert "dropped presence_ticks_p202606" in summary  # July still holds rows inside 90 days
+    assert "DROP TABLE presence_ticks_p202606" in ticks.cursor.ddl
+
+    old = D(2024, 9, 1)
+    exchanges = FakeDB(attached=[f"territory_exchanges_p{old:%Y%m}", *_current("territory_exchanges")])
+    partitions.maintain(exchanges, by_table["territory_exchanges"], today=TODAY)
+    assert "ALTER TABLE territory_exchanges DETACH PARTITION territory_exchanges_p202409" in exchanges.cursor.ddl
+    assert not any(s.startswith(("DROP", "DELETE")) for s in exchanges.cursor.ddl)
+
+
+def test_player_activity_never_expires():
+    policy = next(p for p in POLICIES if p.table == "player_activity")
+    db = FakeDB(attached=["player_activity_p201901", *_current("player_activity")])
+    assert partitions.maintain(db, policy, today=TODAY) == "player_activity: current"
+    assert db.cursor.ddl == []
+
+
+def test_unpartitioned_table_falls_back_to_delete():
+    db = FakeDB(partitioned=False)
+    summary = partitions.maintain(db, TICKS, today=TODAY)
+
+    assert db.cursor.ddl == ["DELETE FROM presence_ticks WHERE tick_at < %s"]
+    assert summary == "presence_ticks: not partitioned, deleted 7 rows"
+
+    exchanges = next(p for p in POLICIES if p.table == "territory_exchanges")
+    db = FakeDB(partitioned=False)
+    assert partitions.maintain(db, exchanges, today=TODAY) == "territory_exchanges: not partitioned"
+    assert db.cursor.ddl == []
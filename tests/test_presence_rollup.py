@@ -0,0 +1,100 @@
+"""
+Test suite for the watermark-driven presence rollup (Tasks/presence_rollup.py).
+
+Tests:
+1. A steady-state run aggregates only from the watermark through the open hour
+2. An hour is not finalised until the close grace has passed
+3. The first run resumes after the hours already in presence_coverage_hourly
+4. After an outage a run is capped at MAX_HOURS_PER_RUN and resumes from there
+5. Dirty hours behind the watermark are redone one hour at a time
+"""
+
+import datetime
+import os
+import sys
+import types
+from datetime import timezone, timedelta
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Tasks import presence_rollup as pr
+
+H = timedelta(hours=1)
+NOW = datetime.datetime(2026, 10, 18, 14, 27, tzinfo=timezone.utc)
+OPEN = NOW.replace(minute=0)
+
+
+class _FakeCursor:
+    def __init__(self, watermark=None, coverage_max=None, dirty=()):
+        self.answers = {
+            "FROM presence_rollup_state": (watermark,) if watermark else None,
+            "MAX(hour) FROM presence_coverage_hourly": (coverage_max,),
+            "MIN(tick_at)": (None,),
+        }
+        self.dirty = [(h,) for h in dirty]
+        self.windows = []
+        self.saved = None
+        self._row = None
+
+    def execute(self, sql, params=None):
+        if sql is pr.ROLLUP_SQL:
+            self.windows.append(params)
+            self._row = (3, 1)
+        elif "INSERT INTO presence_rollup_state" in sql:
+            self.saved = params[0]
+        elif "DELETE FROM presence_dirty_hours" in sql:
+            self.dirty = [d for d in self.dirty if d[0] < params[0]]
+        else:
+            self._row = next(v for k, v in self.answers.items() if k in sql)
+
+    def fetchone(self):
+        return self._row
+
+    def fetchall(self):
+        return self.dirty
+
+
+def _run(monkeypatch, now=NOW, **state):
+    cursor = _FakeCursor(**state)
+    db = types.SimpleNamespace(connect=lambda: None, close=lambda: None, cursor=cursor, connection=MagicMock())
+    monkeypatch.setattr(pr, "DB", lambda: db)
+    monkeypatch.setattr(pr, "datetime", types.SimpleNamespace(datetime=types.SimpleNamespace(now=lambda tz=None: now)))
+    summary = pr._rollup_sync()
+    db.connection.commit.assert_called_once()
+    return cursor, summary
+
+
+def test_steady_state_touches_only_open_hours(monkeypatch):
+    cursor, _ = _run(monkeypatch, watermark=OPEN - H)
+    assert cursor.windows == [(OPEN - H, OPEN + H)]
+    assert cursor.saved == OPEN
+
+
+def test_hour_waits_for_close_grace(monkeypatch):
+    just_after = OPEN + timedelta(minutes=2)
+    cursor, _ = _run(monkeypatch, now=just_after, watermark=OPEN - H)
+    assert cursor.windows == [(OPEN - H, OPEN + H)]
+    assert cursor.saved == OPEN - H  # the 13:00 hour may still gain a tick
+
+
+def test_first_run_resumes_after_existing_rollups(monkeypatch):
+    cursor, _ = _run(monkeypatch, coverage_max=OPEN - 3 * H)
+    assert cursor.windows == [(OPEN - 3 * H, OPEN + H)]
+    assert cursor.saved == OPEN
+
+
+def test_outage_catch_up_is_bounded(monkeypatch):
+    start = OPEN - 500 * H
+    cursor, _ = _run(monkeypatch, watermark=start)
+    end = start + pr.MAX_HOURS_PER_RUN * H
+    assert cursor.windows == [(start, end)]
+    assert cursor.saved == end
+
+
+def test_dirty_hours_are_redone_individually(monkeypatch):
+    late = [OPEN - 30 * H, OPEN - 5 * H]
+    cursor, summary = _run(monkeypatch, watermark=OPEN - H, dirty=late)
+    assert cursor.windows == [(late[0], late[0] + H), (late[1], late[1] + H), (OPEN - H, OPEN + H)]
+    assert "2 late hour(s) redone" in summary
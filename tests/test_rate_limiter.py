@@ -0,0 +1,109 @@
+"""
+Test suite for the GCRA command rate limiter (Helpers/rate_limiter.py).
+
+Tests:
+1. A full burst is allowed, then one call per emission interval
+2. A guild rejection does not charge the caller's user bucket
+3. Idle keys are evicted once their bucket has refilled
+4. The decorator skips home guilds and DMs and refuses over-limit calls
+5. N calls spread over one window are allowed; a flat-out caller peaks at 2N - 1
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import rate_limiter
+from Helpers.rate_limiter import RateLimiter, RateLimitExceeded, external_rate_limit
+
+HOME_GUILD = 729147655875199017
+EXTERNAL_GUILD = 111
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limiter, "_limiters", [])
+    return now
+
+
+def test_burst_then_steady_rate(clock):
+    lim = RateLimiter(per_user_limit=5, per_guild_limit=100, window_seconds=60)
+
+    assert [lim.check(1, EXTERNAL_GUILD)[0] for _ in range(6)] == [True] * 5 + [False]
+    clock[0] += 11
+    assert lim.check(1, EXTERNAL_GUILD) == (False, "Per-user rate limit exceeded.")
+    clock[0] += 1  # one emission interval (60 / 5) after the burst
+    assert lim.check(1, EXTERNAL_GUILD) == (True, "")
+    assert lim.check(1, EXTERNAL_GUILD)[0] is False
+    assert lim.check(2, EXTERNAL_GUILD)[0] is True
+    assert lim.rejected == 3
+
+
+def test_guild_rejection_does_not_charge_user(clock):
+    lim = RateLimiter(per_user_limit=2, per_guild_limit=3, window_seconds=60)
+    for user in (1, 2, 3):
+        assert lim.check(user, EXTERNAL_GUILD)[0] is True
+
+    assert lim.check(4, EXTERNAL_GUILD) == (False, "Per-guild rate limit exceeded.")
+    assert 4 not in lim._user_calls
+    assert lim.check(4, EXTERNAL_GUILD + 1)[0] is True
+
+
+def test_idle_keys_are_evicted(clock):
+    lim = RateLimiter(per_user_limit=5, per_guild_limit=1000, window_seconds=60)
+    for user in range(1000):
+        lim.check(user, EXTERNAL_GUILD + user % 10)
+    assert rate_limiter.limiter_stats()[0]["users"] == 1000
+
+    clock[0] += 61
+    lim.check(5000, EXTERNAL_GUILD)
+    stats = rate_limiter.limiter_stats()[0]
+    assert (stats["users"], stats["guilds"]) == (1, 1)
+
+
+def test_decorator_limits_only_external_guilds(clock):
+    check = external_rate_limit(per_user=1, per_guild=10, window=60)
+    predicate = check.predicate
+
+    def ctx(guild_id):
+        guild = SimpleNamespace(id=guild_id) if guild_id else None
+        return SimpleNamespace(guild=guild, author=SimpleNamespace(id=7), respond=AsyncMock())
+
+    async def scenario():
+        for _ in range(3):
+            assert await predicate(ctx(HOME_GUILD)) is True
+            assert await predicate(ctx(None)) is True
+        assert await predicate(ctx(EXTERNAL_GUILD)) is True
+        refused = ctx(EXTERNAL_GUILD)
+        with pytest.raises(RateLimitExceeded):
+            await predicate(refused)
+        refused.respond.assert_awaited_once()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("limit", [1, 2, 5, 30])
+def test_spread_calls_allowed_and_peak_bounded(clock, limit):
+    lim = RateLimiter(per_user_limit=limit, per_guild_limit=10_000, window_seconds=60)
+    start = clock[0]
+    for i in range(limit):
+        clock[0] = start + i * 59 / limit
+        assert lim.check(1, EXTERNAL_GUILD)[0] is True
+
+    lim = RateLimiter(per_user_limit=limit, per_guild_limit=10_000, window_seconds=60)
+    allowed = []
+    for step in range(2400):  # ten minutes, a try every quarter second
+        clock[0] = start + 600 + step * 0.25
+        if lim.check(2, EXTERNAL_GUILD)[0]:
+            allowed.append(clock[0])
+
+    assert max(sum(t <= u < t + 60 for u in allowed) for t in allowed) == 2 * limit - 1
@@ -0,0 +1,156 @@
+"""
+Test suite for the tiered S3 image cache (Helpers/storage.py), against a
+filesystem-backed fake of the bucket.
+
+Tests:
+1. Repeat reads are served from memory without touching S3
+2. After a restart the disk copy is revalidated with a bodiless 304
+3. A changed object (new ETag) replaces both tiers
+4. put_image and delete write through to both tiers
+5. An unreachable bucket still serves the last known copy
+"""
+
+import hashlib
+import io
+import os
+import sys
+
+import pytest
+from botocore.exceptions import ClientError
+from PIL import Image
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import storage as storage_mod
+from Helpers.storage import S3Storage
+
+
+def _png(color) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGBA", (4, 4), color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _client_error(status, code):
+    return ClientError({"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, "GetObject")
+
+
+class FakeS3:
+    """The slice of the boto3 S3 client S3Storage uses, backed by a directory."""
+
+    def __init__(self, root):
+        self.root = root
+        self.calls = []
+        self.down = False
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.root, key.replace("/", "__"))
+
+    def upload(self, key, data):
+        with open(self._path(key), "wb") as f:
+            f.write(data)
+
+    def _etag(self, data):
+        return '"' + hashlib.md5(data).hexdigest() + '"'
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None):
+        self.calls.append(("get", Key, IfNoneMatch))
+        if self.down:
+            raise ConnectionError("bucket unreachable")
+        try:
+            with open(self._path(Key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise _client_error(404, "NoSuchKey")
+        if IfNoneMatch == self._etag(data):
+            raise _client_error(304, "304")
+        return {"Body": io.BytesIO(data), "ETag": self._etag(data)}
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):
+        self.calls.append(("put", Key, None))
+        self.upload(Key, Body)
+        return {"ETag": self._etag(Body)}
+
+    def delete_object(self, Bucket, Key):
+        self.calls.append(("delete", Key, None))
+        try:
+            os.remove(self._path(Key))
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture
+def s3(tmp_path, monkeypatch):
+    monkeypatch.setenv("S3_ENDPOINT_URL", "http://fake")
+    monkeypatch.setenv("S3_ACCESS_KEY_ID", "key")
+    monkeypatch.setenv("S3_CACHE_DIR", str(tmp_path / "cache"))
+    fake = FakeS3(str(tmp_path / "bucket"))
+
+    def make():
+        st = S3Storage()
+        st._client = fake
+        return st
+
+    fake.make = make
+    return fake
+
+
+KEY = "shell_exchange/ings/ancient_heart.png"
+
+
+def test_repeat_reads_hit_memory(s3):
+    s3.upload(KEY, _png("red"))
+    st = s3.make()
+    first = st.get_cached_image(KEY)
+    first.putpixel((0, 0), (0, 0, 0, 0))
+    second = st.get_cached_image(KEY)
+
+    assert [c[0] for c in s3.calls] == ["get"]
+    assert second.getpixel((0, 0)) == (255, 0, 0, 255)
+    assert st.image_cache_info()["hits"] == 1
+
+
+def test_restart_revalidates_disk_copy(s3):
+    s3.upload(KEY, _png("red"))
+    s3.make().get_cached_image(KEY)
+
+    restarted = s3.make()
+    img = restarted.get_cached_image(KEY)
+    assert img.getpixel((0, 0)) == (255, 0, 0, 255)
+    assert s3.calls[-1][2] is not None  # conditional request
+    assert restarted.image_cache_info()["disk_hits"] == 1
+
+
+def test_changed_object_replaces_both_tiers(s3, monkeypatch):
+    s3.upload(KEY, _png("red"))
+    st = s3.make()
+    st.get_cached_image(KEY)
+    s3.upload(KEY, _png("blue"))  # out-of-band upload, e.g. from the website
+
+    assert st.get_cached_image(KEY).getpixel((0, 0))[0] == 255  # still trusted
+    monkeypatch.setattr(S3Storage, "IMAGE_REVALIDATE_S", 0)
+    assert st.get_cached_image(KEY).getpixel((0, 0))[2] == 255
+    assert s3.make().get_cached_image(KEY).getpixel((0, 0))[2] == 255
+
+
+def test_writes_go_through(s3, monkeypatch):
+    st = s3.make()
+    monkeypatch.setattr(storage_mod, "storage", st)
+    storage_mod.save_shell_exchange_icon("ings", "ancient heart", Image.new("RGBA", (4, 4), "green"))
+    calls = len(s3.calls)
+
+    assert storage_mod.get_shell_exchange_icon("ings", "ancient heart").getpixel((0, 0))[1] == 128
+    assert len(s3.calls) == calls  # served from the write-through entry
+
+    storage_mod.delete_shell_exchange_icon("ings", "ancient heart")
+    assert storage_mod.get_shell_exchange_icon("ings", "ancient heart") is None
+    assert s3.make()._disk_read(KEY) is None
+
+
+def test_unreachable_bucket_serves_last_copy(s3):
+    s3.upload(KEY, _png("red"))
+    s3.make().get_cached_image(KEY)
+    s3.down = True
+    assert s3.make().get_cached_image(KEY).getpixel((0, 0)) == (255, 0, 0, 255)
@@ -0,0 +1,248 @@
+"""
+Test suite for the deadline scheduler (Helpers/scheduler.py) and the GRAID
+auto-stop job (Tasks/graid_event_stop.py).
+
+Tests:
+1. Due jobs come off the heap earliest first; moved and cancelled ones are skipped
+2. The sleeper waits exactly until the next deadline, or indefinitely when idle
+3. A sooner job wakes the sleeper early and fires before the one it was waiting on
+4. Pending rows are reloaded on start and deleted once their handler returns
+5. A failing handler is retried with back-off, then dropped after MAX_ATTEMPTS
+6. A database error while firing keeps the sleeper alive and retries the job
+7. A GRAID stop whose end_ts moved later re-arms itself for the new end
+"""
+
+import asyncio
+import datetime
+import os
+import sys
+from datetime import timezone, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import scheduler as scheduler_mod
+from Helpers.scheduler import Scheduler
+from Tasks import graid_event_stop as ges
+
+NOW = datetime.datetime(2026, 10, 18, 14, 0, tzinfo=timezone.utc)
+
+
+class _FakeCursor:
+    """scheduled_jobs as a dict of id -> [job, key, due_at, payload, attempts]."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self._result = []
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        self._result = []
+        if sql.startswith("INSERT INTO scheduled_jobs"):
+            job, key, due_at, payload = params
+            existing = next((i for i, r in self.rows.items() if key is not None and r[1] == key), None)
+            job_id = existing or max(self.rows, default=0) + 1
+            self.rows[job_id] = [job, key, due_at, payload, 0]
+            self._result = [(job_id,)]
+        elif sql.startswith("DELETE FROM scheduled_jobs WHERE job_key"):
+            ids = [i for i, r in self.rows.items() if r[1] == params[0]]
+            self._result = [(self.rows.pop(i) and i,) for i in ids]
+        elif sql.startswith("SELECT id, due_at FROM scheduled_jobs"):
+            self._result = [(i, r[2]) for i, r in self.rows.items()]
+        elif sql.startswith("SELECT job, payload, attempts"):
+            row = self.rows.get(params[0])
+            if row and row[2] == params[1]:
+                self._result = [(row[0], row[3], row[4])]
+        elif sql.startswith("DELETE FROM scheduled_jobs WHERE id"):
+            row = self.rows.get(params[0])
+            if row and row[2] == params[1]:
+                del self.rows[params[0]]
+        elif sql.startswith("UPDATE scheduled_jobs"):
+            retry_at, attempts, job_id, due_at = params
+            row = self.rows.get(job_id)
+            self.rowcount = int(bool(row and row[2] == due_at))
+            if self.rowcount:
+                row[2], row[4] = retry_at, attempts
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+
+class _FakeDB:
+    def __init__(self, rows):
+        self.cursor = _FakeCursor(rows)
+        self.connection = MagicMock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _scheduler(monkeypatch, rows=None, clock=None):
+    rows = {} if rows is None else rows
+    monkeypatch.setattr(scheduler_mod, "DB", lambda: _FakeDB(rows))
+    monkeypatch.setattr(scheduler_mod, "log", lambda *a, **k: None)
+    if clock is not None:
+        monkeypatch.setattr(scheduler_mod, "_now", lambda: clock[0])
+    sched = Scheduler()
+    sched.rows = rows
+    return sched
+
+
+def test_pop_due_skips_stale_entries():
+    sched = Scheduler()
+    for job_id, minutes in [(1, 5), (2, 1), (3, 3), (4, 30)]:
+        sched._push(job_id, NOW + timedelta(minutes=minutes))
+    sched._push(3, NOW + timedelta(minutes=45))   # moved later
+    del sched._due[1]                             # cancelled
+
+    assert sched.pop_due(NOW + timedelta(minutes=10)) == [(2, NOW + timedelta(minutes=1))]
+    assert sched.pop_due(NOW + timedelta(hours=1)) == [(4, NOW + timedelta(minutes=30)),
+                                                        (3, NOW + timedelta(minutes=45))]
+    assert sched.pop_due(NOW + timedelta(days=1)) == []
+
+
+def test_next_delay_is_exact_or_idle():
+    sched = Scheduler()
+    assert sched.next_delay(NOW) is None
+
+    sched._push(1, NOW + timedelta(seconds=90))
+    sched._push(2, NOW + timedelta(seconds=30))
+    del sched._due[2]
+    assert sched.next_delay(NOW) == 90.0
+    assert sched.next_delay(NOW + timedelta(minutes=5)) == 0.0
+
+
+def test_sooner_job_wakes_the_sleeper(monkeypatch):
+    sched = _scheduler(monkeypatch)
+    fired = []
+
+    async def handler(payload):
+        fired.append(payload["n"])
+
+    async def scenario():
+        sched.register("ping", handler)
+        sched.start()
+        now = datetime.datetime.now(timezone.utc)
+        await sched.schedule("ping", now + timedelta(seconds=30), {"n": "late"})
+        await asyncio.sleep(0.01)
+        await sched.schedule("ping", now + timedelta(milliseconds=50), {"n": "soon"})
+        await asyncio.sleep(0.2)
+        sched.stop()
+
+    asyncio.run(scenario())
+    assert fired == ["soon"]
+    assert [r[3] for r in sched.rows.values()] == ['{"n": "late"}']
+    assert sched.status()["wakeups"] == 1  # no idle polling in between
+
+
+def test_pending_rows_reload_and_are_deleted(monkeypatch):
+    past = NOW - timedelta(minutes=3)
+    rows = {7: ["ping", "ping:7", past, {"n": 7}, 0], 8: ["ping", None, NOW + timedelta(days=1), {"n": 8}, 0]}
+    sched = _scheduler(monkeypatch, rows, clock=[NOW])
+    fired = []
+
+    async def handler(payload):
+        fired.append(payload["n"])
+
+    async def scenario():
+        sched.register("ping", handler)
+        sched.start()
+        await asyncio.sleep(0.05)
+        sched.stop()
+
+    asyncio.run(scenario())
+    assert fired == [7]
+    assert list(sched.rows) == [8]
+    assert sched.status()["pending"] == 1
+
+
+def test_failing_handler_backs_off_then_gives_up(monkeypatch):
+    clock = [NOW]
+    rows = {1: ["flaky", None, NOW, {}, 0]}
+    sched = _scheduler(monkeypatch, rows, clock=clock)
+
+    async def handler(payload):
+        raise RuntimeError("discord is down")
+
+    async def scenario():
+        sched.register("flaky", handler)
+        sched._push(1, NOW)
+        await sched._fire(1, NOW)
+        assert rows[1][2] == NOW + timedelta(seconds=scheduler_mod.RETRY_AFTER_S)
+        assert rows[1][4] == 1
+        for attempt in range(2, scheduler_mod.MAX_ATTEMPTS + 1):
+            due_at = rows[1][2]
+            clock[0] = due_at
+            await sched._fire(1, due_at)
+            if attempt < scheduler_mod.MAX_ATTEMPTS:
+                assert rows[1][2] == due_at + timedelta(seconds=scheduler_mod.RETRY_AFTER_S * attempt)
+
+    asyncio.run(scenario())
+    assert rows == {}
+    assert sched.status() == {"pending": 0, "fired": 0, "failed": scheduler_mod.MAX_ATTEMPTS,
+                              "dropped": 0, "wakeups": 0}
+
+
+def test_database_error_does_not_stop_the_sleeper(monkeypatch):
+    sched = _scheduler(monkeypatch)
+    monkeypatch.setattr(scheduler_mod, "RETRY_AFTER_S", 0.05)
+    fetch = Scheduler._fetch_sync
+    outage = [True]
+
+    def flaky_fetch(job_id, due_at):
+        if outage[0]:
+            outage[0] = False
+            raise RuntimeError("db down")
+        return fetch(job_id, due_at)
+
+    monkeypatch.setattr(sched, "_fetch_sync", flaky_fetch)
+    fired = []
+
+    async def handler(payload):
+        fired.append(payload["n"])
+
+    async def scenario():
+        sched.register("ping", handler)
+        sched.start()
+        await sched.schedule("ping", datetime.datetime.now(timezone.utc), {"n": 1})
+        await asyncio.sleep(0.02)
+        assert sched.running and fired == []
+        await asyncio.sleep(0.15)
+        assert sched.running
+        sched.stop()
+
+    asyncio.run(scenario())
+    assert fired == [1]
+    assert sched.rows == {}
+    assert sched.status()["failed"] == 1
+
+
+def test_graid_stop_rearms_for_moved_end(monkeypatch):
+    later = NOW + timedelta(hours=6)
+    scheduled = []
+
+    async def fake_schedule_stop(event_id, end_ts):
+        scheduled.append((event_id, end_ts))
+
+    monkeypatch.setattr(ges, "_stop_sync", lambda event_id: (None, later))
+    monkeypatch.setattr(ges, "schedule_stop", fake_schedule_stop)
+    monkeypatch.setattr(ges.scheduler, "register", lambda job, handler: None)
+    cog = ges.GraidAutoStop(SimpleNamespace())
+
+    asyncio.run(cog._stop({"event_id": 12}))
+    assert scheduled == [(12, later)]
+
+    scheduled.clear()
+    monkeypatch.setattr(ges, "_stop_sync", lambda event_id: ((12, "Fall GRAID", NOW), None))
+    monkeypatch.setattr(ges, "log", lambda *a, **k: None)
+    asyncio.run(cog._stop({"event_id": 12}))
+    assert scheduled == []
@@ -0,0 +1,154 @@
+"""
+Test suite for the in-memory settings store (Helpers/settings.py).
+
+Tests:
+1. One load serves every later read, bot and guild settings alike
+2. Writes reach the database before memory, and a failed write changes nothing
+3. Successful writes bump the version and notify subscribers
+4. A failing subscriber does not break the write or other subscribers
+5. get_guild_setting / set_guild_setting go through the store
+6. Reads never load: before a successful load they serve defaults, off the database
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import database
+from Helpers import settings as settings_mod
+from Helpers.settings import SettingsStore
+
+GUILD = 729147655875199017
+
+
+class _FakeCursor:
+    def __init__(self, tables, log):
+        self.tables = tables
+        self.log = log
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.log.append((" ".join(sql.split()), params))
+        if self.tables.get("fail"):
+            raise RuntimeError("database unavailable")
+        if sql.startswith("SELECT key, value FROM bot_settings"):
+            self._rows = list(self.tables["bot"].items())
+        elif sql.startswith("SELECT guild_id"):
+            self._rows = [(g, k, v) for (g, k), v in self.tables["guild"].items()]
+
+    def fetchall(self):
+        return self._rows
+
+
+class _FakeDB:
+    opened = 0
+
+    def __init__(self, tables, log):
+        self.cursor = _FakeCursor(tables, log)
+        self.connection = MagicMock()
+
+    def __enter__(self):
+        _FakeDB.opened += 1
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def store(monkeypatch):
+    tables = {"bot": {"musing_index": "3", "kick_list_message_id": "123"}, "guild": {(GUILD, "attack_ping"): False}}
+    log = []
+    _FakeDB.opened = 0
+    monkeypatch.setattr(settings_mod, "DB", lambda: _FakeDB(tables, log))
+    monkeypatch.setattr(settings_mod, "log", lambda *a, **k: None)
+    st = SettingsStore()
+    st.tables, st.sql = tables, log
+    return st
+
+
+def test_one_load_serves_all_reads(store):
+    store.load()
+    for _ in range(50):
+        assert store.get_int("musing_index") == 3
+        assert store.get("kick_list_message_id") == "123"
+        assert store.guild(GUILD, "attack_ping") is False
+        assert store.guild(GUILD, "unset_toggle", True) is True
+        assert store.get("missing", "fallback") == "fallback"
+
+    assert _FakeDB.opened == 1
+    assert store.cache_stats()["loads"] == 1
+
+
+def test_write_through_and_failed_write(store):
+    store.set("musing_index", 4)
+    assert "INSERT INTO bot_settings" in store.sql[-1][0]
+    assert store.sql[-1][1] == ("musing_index", "4")
+    assert store.get_int("musing_index") == 4
+
+    store.tables["fail"] = True
+    with pytest.raises(RuntimeError):
+        store.set_guild(GUILD, "attack_ping", True)
+    assert store.guild(GUILD, "attack_ping") is False
+    assert store.version == 1
+
+
+def test_subscribers_see_changes(store):
+    seen = []
+    unsubscribe = store.subscribe(lambda key, value: seen.append((key, value)))
+
+    store.set("kick_list_thread_id", 99)
+    store.set_guild(GUILD, "attack_ping", True)
+    unsubscribe()
+    store.set("musing_index", 0)
+
+    assert seen == [("kick_list_thread_id", "99"), ((GUILD, "attack_ping"), True)]
+    assert store.version == 3
+
+
+def test_failing_subscriber_is_isolated(store):
+    seen = []
+
+    def broken(key, value):
+        raise ValueError("boom")
+
+    store.subscribe(broken)
+    store.subscribe(lambda key, value: seen.append(key))
+    store.set("musing_index", 1)
+
+    assert seen == ["musing_index"]
+    assert store.get_int("musing_index") == 1
+
+
+def test_database_wrappers_use_the_store(store, monkeypatch):
+    monkeypatch.setattr(settings_mod, "settings", store)
+    store.load()
+    assert database.get_guild_setting(GUILD, "attack_ping", True) is False
+
+    caller_db = _FakeDB(store.tables, store.sql)
+    database.set_guild_setting(caller_db, GUILD, "attack_ping", True)
+
+    caller_db.connection.commit.assert_called_once()
+    assert database.get_guild_setting(GUILD, "attack_ping", False) is True
+    assert _FakeDB.opened == 1  # the write used the caller's connection
+
+
+def test_reads_never_load(store):
+    assert store.loaded is False
+    assert store.guild(GUILD, "attack_ping", True) is True
+    assert store.get("musing_index") is None
+    assert _FakeDB.opened == 0
+
+    store.tables["fail"] = True
+    assert store.load() is False
+    assert store.loaded is False and store.get_int("musing_index", 0) == 0
+
+    store.tables["fail"] = False
+    assert store.load() is True
+    assert store.loaded is True and store.get_int("musing_index") == 3
+    assert _FakeDB.opened == 2
@@ -0,0 +1,130 @@
+"""
+Test suite for the incremental shell-exchange panel renderer
+(Helpers/shell_exchange_generator.py) and the no-op repost skip
+(Commands/shell_exchange.py).
+
+Tests:
+1. An incremental re-render matches a from-scratch render pixel for pixel
+2. A one-price edit draws and pastes a single tile
+3. Entries that disappear leave background behind, not a stale tile
+4. An unchanged panel is not re-uploaded; a changed one is
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import shell_exchange_generator as gen
+
+ICONS = {
+    name: Image.new("RGBA", (16 + i, 16), (i * 30, 120, 200, 255))
+    for i, name in enumerate(["ancient heart", "bob's tear", "corrupted fragment", "dragon scale", "eye"])
+}
+CONFIG = {"cols_ings": 2, "cols_mats": 2}
+
+
+def _ings():
+    return {k: {"shells": i + 1, "per": 1, "highlight": i == 1, "toggled": True} for i, k in enumerate(ICONS)}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_renderer():
+    gen._tiles.clear()
+    gen._panels.clear()
+    for k in gen.render_stats:
+        gen.render_stats[k] = 0
+    with patch.object(gen, "get_shell_exchange_icon", lambda category, key: ICONS[key]):
+        yield
+    gen._tiles.clear()
+    gen._panels.clear()
+
+
+def _render(ings):
+    return gen.generate_images("ingredients", CONFIG, ings_data=ings)["ingredients"]
+
+
+def _from_scratch(ings):
+    gen._tiles.clear()
+    gen._panels.clear()
+    return _render(ings)
+
+
+def test_incremental_matches_full_render():
+    ings = _ings()
+    _render(ings)
+    ings["eye"]["shells"] = 40
+    ings["bob's tear"]["highlight"] = False
+    incremental = _render(ings)
+
+    assert incremental.tobytes() == _from_scratch(ings).tobytes()
+
+
+def test_one_price_edit_costs_one_tile():
+    ings = _ings()
+    _render(ings)
+    before = dict(gen.render_stats)
+
+    ings["dragon scale"]["per"] = 2
+    _render(ings)
+
+    assert gen.render_stats["tiles_drawn"] - before["tiles_drawn"] == 1
+    assert gen.render_stats["tiles_pasted"] - before["tiles_pasted"] == 1
+
+
+def test_removed_entries_leave_background():
+    ings = _ings()
+    _render(ings)
+    ings["eye"]["toggled"] = False  # same grid size, one slot emptied
+    incremental = _render(ings)
+
+    assert incremental.tobytes() == _from_scratch(ings).tobytes()
+
+
+class _Msg:
+    def __init__(self, msg_id):
+        self.id = msg_id
+        self.edits = 0
+
+    async def edit(self, **kwargs):
+        self.edits += 1
+
+
+class _Channel:
+    def __init__(self):
+        self.messages = {}
+        self.sent = 0
+
+    async def fetch_message(self, msg_id):
+        return self.messages[msg_id]
+
+    async def send(self, **kwargs):
+        self.sent += 1
+        msg = self.messages[100 + self.sent] = _Msg(100 + self.sent)
+        return msg
+
+
+def test_unchanged_panel_is_not_reuploaded():
+    from Commands.shell_exchange import ShellExchange
+
+    cog = ShellExchange.__new__(ShellExchange)
+    channel, config = _Channel(), {}
+    _, digest = gen.panel_png(_render(_ings()))
+
+    async def post(d):
+        await cog._post_panel(channel, config, "ings", object(), d)
+
+    asyncio.run(post(digest))
+    asyncio.run(post(digest))
+    msg = channel.messages[config["ings_message_id"]]
+    assert channel.sent == 1 and msg.edits == 0
+
+    asyncio.run(post("changed"))
+    assert channel.sent == 1 and msg.edits == 1
+    assert config["ings_panel_sha256"] == "changed"
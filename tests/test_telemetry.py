@@ -9,6 +9,8 @@ Tests:
 5. Exceptions: a raising body still records, and the exception propagates
 6. No-op: track() outside an invocation does nothing and does not raise
 7. Kill switch: emit() writes nothing when disabled
+8. Task spans: wrap_task emits one `task` record per call with buckets,
+   counts and the iteration's own on-loop (blocking) time
 """
 
 import asyncio
@@ -212,3 +214,101 @@ def test_snowflake_derivation_matches_created_time():
 
     derived = discord.utils.snowflake_time(fake_id)
     assert telemetry.queue_ms_from(derived, now=now) == pytest.approx(1200.0, abs=2.0)
+
+
+def _task_records(out):
+    import json
+    return [json.loads(ln) for ln in out.splitlines() if '"type":"task"' in ln]
+
+
+def test_wrap_task_emits_one_record_per_iteration(monkeypatch, capsys):
+    monkeypatch.setenv("LATENCY_TELEMETRY", "1")
+
+    async def iteration():
+        def blocking():
+            with telemetry.track("db.query"):
+                time.sleep(0.01)
+        await asyncio.to_thread(blocking)
+        telemetry.count("members", 150)
+        await asyncio.sleep(0.02)
+        return "done"
+
+    wrapped = telemetry.wrap_task("update_member_data", iteration)
+
+    async def main():
+        return [await wrapped(), await wrapped()]
+
+    assert asyncio.run(main()) == ["done", "done"]
+    records = _task_records(capsys.readouterr().out)
+    assert len(records) == 2
+    rec = records[0]
+    assert rec["task"] == "update_member_data"
+    assert rec["ok"] is True
+    assert rec["buckets"]["db.query"]["n"] == 1
+    assert rec["counts"] == {"members": 150}
+    # Thread and sleep time are off the loop.
+    assert rec["total_ms"] >= 25.0
+    assert rec["loop_ms"] < 10.0
+    assert rec["steps"] >= 3
+
+
+def test_wrap_task_measures_blocking_stretch(monkeypatch, capsys):
+    monkeypatch.setenv("LATENCY_TELEMETRY", "1")
+
+    async def iteration():
+        await asyncio.sleep(0)
+        time.sleep(0.03)  # blocks the loop
+        await asyncio.sleep(0)
+
+    asyncio.run(telemetry.wrap_task("territory_tracker", iteration)())
+    rec = _task_records(capsys.readouterr().out)[0]
+    assert rec["max_block_ms"] >= 28.0
+    assert rec["loop_ms"] >= rec["max_block_ms"]
+
+
+def test_wrap_task_failure_records_and_propagates(monkeypatch, capsys):
+    monkeypatch.setenv("LATENCY_TELEMETRY", "1")
+
+    async def iteration():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(telemetry.wrap_task("presence_rollup", iteration)())
+    rec = _task_records(capsys.readouterr().out)[0]
+    assert rec["ok"] is False
+    assert telemetry._current.get() is None
+
+
+def test_wrap_task_passes_cancellation_through(monkeypatch, capsys):
+    monkeypatch.setenv("LATENCY_TELEMETRY", "1")
+
+    async def iteration():
+        await asyncio.sleep(10)
+
+    async def main():
+        task = asyncio.create_task(telemetry.wrap_task("recruitment_checker", iteration)())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert _task_records(capsys.readouterr().out)[0]["ok"] is False
+
+
+def test_wrap_task_is_idempotent_and_respects_kill_switch(monkeypatch, capsys):
+    monkeypatch.setenv("LATENCY_TELEMETRY", "0")
+
+    async def iteration():
+        return 1
+
+    wrapped = telemetry.wrap_task("a", iteration)
+    assert telemetry.wrap_task("b", wrapped) is wrapped
+    assert wrapped.__name__ == "iteration"
+    assert asyncio.run(wrapped()) == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_count_outside_a_record_is_noop():
+    telemetry.count("members", 3)  # must not raise
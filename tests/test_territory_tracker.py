@@ -7,6 +7,9 @@ still rewriting when the row is missing (self-heal after external deletion).
 
 from unittest.mock import MagicMock
 
+from Helpers import settings as settings_mod
+from Helpers.settings import SettingsStore
+
 import pytest
 
 from Tasks import territory_tracker as tt
@@ -90,3 +93,112 @@ async def test_missing_row_rewrites(monkeypatch):
 async def test_failed_fetch_writes_nothing(monkeypatch):
     saves, _ = await _run_tick(monkeypatch, _snapshot(), False)
     assert saves == []
+
+
+# ---------- Ownership index / claim alerts ----------
+
+def _aquarium_holds_corkus(acquired="2026-01-01T00:00:00Z"):
+    data = {t: _terr("The Aquarium", "TAq", acquired) for t in tt.claims["Corkus"]["connections"]}
+    data[tt.claims["Corkus"]["hq"]] = _terr("The Aquarium", "TAq", acquired)
+    for i in range(8):
+        data[f"Filler {i}"] = _terr("The Aquarium", "TAq", acquired)
+    return data
+
+
+def test_ownership_index_lookups():
+    data = _snapshot()
+    data["Gamma"] = _terr("Guild A", "AAA", acquired="2026-01-03T04:05:06Z")
+    index = tt.OwnershipIndex(data)
+
+    assert index.owner("Alpha Plains") == "Guild A"
+    assert index.count("Guild A") == 2
+    assert index.owns_all("Guild A", ["Alpha Plains", "Gamma"])
+    assert not index.owns_all("Guild A", ["Alpha Plains", "Beta Woods"])
+    assert index.acquired("Gamma").hour == 4
+    assert index.changes(tt.OwnershipIndex(_snapshot())) == []
+
+
+@pytest.mark.asyncio
+async def test_claim_break_alert_uses_cached_setting(monkeypatch):
+    old = _aquarium_holds_corkus()
+    new = dict(old)
+    new["Corkus City"] = _terr("Raiders", "RDR", acquired="2026-01-02T00:00:00Z")
+
+    military = MagicMock()
+    military.guild.id = 123
+
+    async def _send(msg):
+        sent.append(msg)
+
+    sent = []
+    military.send = _send
+    setting_reads = []
+    monkeypatch.setattr(tt, "get_guild_setting", lambda gid, key, default: setting_reads.append((gid, key)) or False)
+    monkeypatch.setattr(tt, "settings", MagicMock(loaded=True))
+    monkeypatch.setattr(tt, "_read_territories_sync", lambda: old)
+    monkeypatch.setattr(tt, "saveTerritoryData", lambda data: None)
+    monkeypatch.setattr(tt, "save_territory_exchanges", lambda changes: None)
+
+    async def fake_fetch():
+        return new
+
+    monkeypatch.setattr(tt, "getTerritoryData", fake_fetch)
+    cog = _make_cog()
+    cog.client.get_channel.side_effect = lambda cid: (
+        military if cid == tt.MILITARY_CHANNEL_ID
+        else MagicMock() if cid == tt.TERRITORY_TRACKER_CHANNEL_ID else None
+    )
+    await TerritoryTracker.territory_tracker.coro(cog)
+
+    assert setting_reads == [(123, "attack_ping")]
+    assert any("Attack on Corkus!" in m and "Raiders [RDR]" in m and "<@&" not in m for m in sent)
+
+
+# ---------- attack_ping toggle ----------
+
+class _SettingsDB:
+    """guild_settings with attack_ping turned off; ``fail`` makes every query raise."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.cursor = self
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self._rows = [(1, "attack_ping", False)] if "guild_settings" in sql else []
+
+    def fetchall(self):
+        return self._rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_disabled_attack_ping_holds_before_settings_load(monkeypatch):
+    store = SettingsStore()
+    monkeypatch.setattr(settings_mod, "settings", store)
+    monkeypatch.setattr(tt, "settings", store)
+    monkeypatch.setattr(settings_mod, "DB", lambda: _SettingsDB())
+
+    assert not store.loaded
+    assert await tt._attack_ping_enabled(1) is False
+    assert store.loaded
+
+
+@pytest.mark.asyncio
+async def test_unreadable_settings_send_no_ping(monkeypatch):
+    store = SettingsStore()
+    monkeypatch.setattr(settings_mod, "settings", store)
+    monkeypatch.setattr(tt, "settings", store)
+    monkeypatch.setattr(settings_mod, "DB", lambda: _SettingsDB(fail=True))
+    monkeypatch.setattr(settings_mod, "log", lambda *a, **k: None)
+    monkeypatch.setattr(tt, "log", lambda *a, **k: None)
+
+    assert await tt._attack_ping_enabled(1) is False
+    assert not store.loaded
@@ -0,0 +1,72 @@
+"""
+Test suite for startup warmup and keep-warm (Helpers/warmup.py).
+
+Tests:
+1. Every startup step runs; one failing step does not stop the others
+2. The keepalive loop re-runs only the socket steps on its interval, async ones on the loop
+3. Row templates are decoded once and shared across PlaceTemplate instances
+"""
+
+import asyncio
+import os
+import sys
+
+from PIL import Image
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import warmup
+from Helpers.classes import PlaceTemplate, _place_template_parts
+
+
+def test_failed_step_is_isolated(monkeypatch):
+    ran = []
+
+    def ok():
+        ran.append("ok")
+        return 3
+
+    def boom():
+        ran.append("boom")
+        raise RuntimeError("host down")
+
+    monkeypatch.setattr(warmup, "STARTUP_STEPS", {"ok": ok, "boom": boom})
+    monkeypatch.setattr(warmup, "log", lambda *a, **k: None)
+    failures = warmup.stats["failures"]
+
+    results = asyncio.run(warmup.warm_up())
+
+    assert sorted(ran) == ["boom", "ok"]
+    assert results["ok"] == 3 and isinstance(results["boom"], RuntimeError)
+    assert warmup.stats["failures"] == failures + 1
+
+
+def test_keepalive_runs_socket_steps(monkeypatch):
+    calls = []
+
+    async def http():
+        calls.append("http")
+
+    monkeypatch.setattr(warmup, "KEEPALIVE_STEPS", {"db": lambda: calls.append("db"), "http": http})
+
+    async def main():
+        warmup.start_keepalive(interval=0.01)
+        warmup.start_keepalive(interval=0.01)   # idempotent
+        await asyncio.sleep(0.1)
+        warmup.stop_keepalive()
+
+    asyncio.run(main())
+    assert len(calls) >= 4 and set(calls) == {"db", "http"}
+
+
+def test_place_template_decoded_once(tmp_path):
+    path = str(tmp_path / "row.png")
+    Image.new("RGBA", (8, 32), (255, 0, 0, 255)).save(path)
+    _place_template_parts.cache_clear()
+
+    a, b = PlaceTemplate(path), PlaceTemplate(path)
+
+    assert a.divider is b.divider
+    assert a.divider.size == (2, 32) and a.ending.size == (5, 32)
+    assert _place_template_parts.cache_info().misses == 1
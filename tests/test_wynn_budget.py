@@ -0,0 +1,174 @@
+"""
+Test suite for the Wynncraft rate budget (Helpers/wynn_budget.py).
+
+Tests:
+1. Headers replace the default limit/remaining/reset
+2. Background acquires stop at the interactive reserve and resume on reset
+3. 429 empties the window; header-less responses still debit
+4. Budgets are shared by token value and labelled by env var
+5. Acquire tickets settle across asyncio.to_thread via timed_get
+6. Malformed headers never raise
+7. A cancelled http_client request gives its slot back
+8. An unset token ("Bearer None") settles against the budget it acquired from
+9. A slot nothing settles is forgotten when the window rolls
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Helpers import http_client, wynn_budget
+from Helpers.functions import timed_get
+
+
+@pytest.fixture(autouse=True)
+def _clean(monkeypatch):
+    monkeypatch.setattr(wynn_budget, "_budgets", {})
+    monkeypatch.setenv("WYNN_TOKEN", "cmd-secret")
+    monkeypatch.setenv("WYNN_LOOP_TOKEN", "loop-secret")
+    monkeypatch.setenv("RECRUITMENT_TOKEN", "loop-secret")
+
+
+def _headers(limit, remaining, reset):
+    return {"ratelimit-limit": str(limit), "ratelimit-remaining": str(remaining), "ratelimit-reset": str(reset)}
+
+
+def test_headers_replace_defaults():
+    b = wynn_budget.RateBudget("t")
+    b.observe(_headers(180, 150, 30), status=200, now=1000.0)
+    assert (b.limit, b.remaining, b.learned) == (180, 150, True)
+    assert b.reset_at == 1030.0
+
+
+def test_acquire_stops_at_reserve_and_resumes_on_reset():
+    b = wynn_budget.RateBudget("t")
+    b.observe(_headers(10, 4, 20), status=200, now=1000.0)   # reserve = 2
+
+    assert b.try_acquire(now=1001.0) == 0.0
+    assert b.try_acquire(now=1001.0) == 0.0
+    wait = b.try_acquire(now=1001.0)                           # 4 - 2 in flight == reserve
+    assert wait == pytest.approx(19.0 + wynn_budget.RESET_SLACK_S)
+
+    b.observe(_headers(10, 2, 19), status=200, acquired=True, now=1001.5)
+    b.observe(_headers(10, 1, 19), status=200, acquired=True, now=1001.5)
+    assert b.in_flight == 0
+    assert b.try_acquire(now=1021.0) == 0.0                    # window rolled back to 10
+
+
+def test_429_empties_window():
+    b = wynn_budget.RateBudget("t")
+    b.observe({}, status=429, now=1000.0)
+    assert b.remaining == 0 and b.throttled == 1
+    assert b.try_acquire(now=1000.0) > 0
+
+
+def test_headerless_response_debits():
+    b = wynn_budget.RateBudget("t", limit=10)
+    b.observe({}, status=200)
+    b.observe("not a mapping", status=200)
+    assert b.remaining == 8
+
+
+def test_malformed_headers_never_raise():
+    b = wynn_budget.RateBudget("t")
+    b.observe({"ratelimit-limit": "lots", "ratelimit-remaining": None}, status=200)
+    b.observe(None)
+    assert b.limit == wynn_budget.DEFAULT_LIMIT
+
+
+def test_budgets_shared_by_token_value():
+    loop = wynn_budget.for_token("WYNN_LOOP_TOKEN")
+    assert wynn_budget.for_token("RECRUITMENT_TOKEN") is loop
+    assert wynn_budget.for_authorization("Bearer loop-secret") is loop
+    assert wynn_budget.for_token() is not loop
+    assert loop.label == "WYNN_LOOP_TOKEN+RECRUITMENT_TOKEN"
+    assert wynn_budget.for_authorization(None).label == "anonymous"
+
+
+def test_ticket_settles_through_to_thread():
+    resp = SimpleNamespace(status_code=200, headers=_headers(120, 99, 40))
+
+    async def main():
+        await wynn_budget.acquire("WYNN_LOOP_TOKEN")
+        budget = wynn_budget.for_token("WYNN_LOOP_TOKEN")
+        assert budget.in_flight == 1
+        with patch("Helpers.functions._session.get", return_value=resp):
+            await asyncio.to_thread(
+                timed_get, "https://api.wynncraft.com/v3/player/x",
+                headers={"Authorization": "Bearer loop-secret"},
+            )
+        return budget
+
+    budget = asyncio.run(main())
+    assert budget.in_flight == 0
+    assert budget.remaining == 99
+
+
+def test_failed_request_releases_slot():
+    async def main():
+        await wynn_budget.acquire("WYNN_LOOP_TOKEN")
+        with patch("Helpers.functions._session.get", side_effect=ConnectionError("down")):
+            with pytest.raises(ConnectionError):
+                timed_get("https://api.wynncraft.com/v3/guild/x", headers={"Authorization": "Bearer loop-secret"})
+        return wynn_budget.for_token("WYNN_LOOP_TOKEN")
+
+    assert asyncio.run(main()).in_flight == 0
+
+
+def test_other_hosts_are_not_recorded():
+    with patch("Helpers.functions._session.get", return_value=SimpleNamespace(status_code=429, headers={})):
+        timed_get("https://api.mojang.com/users/profiles/minecraft/x")
+    assert wynn_budget.stats() == []
+
+
+def test_cancelled_request_releases_slot(monkeypatch):
+    class _Hang:
+        async def __aenter__(self):
+            await asyncio.sleep(60)
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(http_client, "_session", lambda: SimpleNamespace(request=lambda *a, **k: _Hang()))
+
+    async def main():
+        await wynn_budget.acquire("WYNN_LOOP_TOKEN")
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(http_client.get(
+                "https://api.wynncraft.com/v3/guild/x", headers={"Authorization": "Bearer loop-secret"},
+            ), timeout=0.01)
+        return wynn_budget.for_token("WYNN_LOOP_TOKEN")
+
+    assert asyncio.run(main()).in_flight == 0
+
+
+def test_unset_token_settles_its_own_budget(monkeypatch):
+    monkeypatch.delenv("WYNN_TOKEN")
+    resp = SimpleNamespace(status_code=200, headers=_headers(120, 99, 40))
+
+    async def main():
+        await wynn_budget.acquire()
+        with patch("Helpers.functions._session.get", return_value=resp):
+            timed_get("https://api.wynncraft.com/v3/player/x", headers={"Authorization": "Bearer None"})
+        return wynn_budget.for_token()
+
+    budget = asyncio.run(main())
+    assert budget is wynn_budget.for_authorization(None)
+    assert budget.in_flight == 0 and budget.remaining == 99
+
+
+def test_leaked_slot_expires_with_the_window():
+    b = wynn_budget.RateBudget("t")
+    b.observe(_headers(10, 10, 20), status=200, now=1000.0)
+    assert b.try_acquire(now=1001.0) == 0.0
+    assert b.in_flight == 1
+
+    assert b.try_acquire(now=1021.0) == 0.0   # the first slot's request never settled
+    assert b.in_flight == 1